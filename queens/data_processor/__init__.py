@@ -17,6 +17,7 @@
 Extract data from simulation output.
 """
 
+from queens.data_processor.data_processor_binary import DataProcessorBinary
 from queens.data_processor.data_processor_csv import DataProcessorCsv
 from queens.data_processor.data_processor_ensight import DataProcessorEnsight
 from queens.data_processor.data_processor_ensight_interface import (
@@ -25,6 +26,7 @@ from queens.data_processor.data_processor_ensight_interface import (
 from queens.data_processor.data_processor_numpy import DataProcessorNumpy
 
 VALID_TYPES = {
+    "binary": DataProcessorBinary,
     "csv": DataProcessorCsv,
     "ensight": DataProcessorEnsight,
     "ensight_interface_discrepancy": DataProcessorEnsightInterfaceDiscrepancy,
@@ -0,0 +1,151 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Data processor class for memory-mapped binary data extraction."""
+
+import logging
+
+import numpy as np
+
+from queens.data_processor.data_processor import DataProcessor
+from queens.utils.logger_settings import log_init_args
+
+_logger = logging.getLogger(__name__)
+
+
+class DataProcessorBinary(DataProcessor):
+    """Class for extracting data from binary files by memory mapping.
+
+    In contrast to the other data processors, the file is not parsed completely. Only the
+    selected parts are read from the memory-mapped file, such that the read-in time is
+    independent of the file size.
+
+    Attributes:
+        dtype (np.dtype): Data type of raw binary files
+        offset (int): Number of bytes before the data in raw binary files
+        shape (tuple, None): Shape of the data in raw binary files
+        row_slice (slice): Slice of the selected rows, i.e., entries along the first axis
+        row_indices (np.array, None): Indices of the selected rows
+        columns (np.array, None): Indices of the selected columns, i.e., entries along the second
+                                  axis
+    """
+
+    @log_init_args
+    def __init__(
+        self,
+        file_name_identifier=None,
+        file_options_dict=None,
+        files_to_be_deleted_regex_lst=None,
+    ):
+        """Instantiate data processor class for binary data.
+
+        Args:
+            file_name_identifier (str): Identifier of file name.
+                                        The file prefix can contain regex expression
+                                        and subdirectories. Files with the suffix *.npy* are
+                                        read as numpy binaries, all other files as raw binary
+                                        data.
+            file_options_dict (dict): Dictionary with read-in options for the file:
+                - dtype (str): Data type of raw binary files. Defaults to little-endian float64,
+                               i.e., '<f8'.
+                - offset (int): Number of bytes before the data in raw binary files, e.g., the
+                                size of a header. Defaults to 0.
+                - shape (lst): Shape of the data in raw binary files. Defaults to a flat array.
+                - start (int): First selected row, i.e., entry along the first axis
+                - stop (int): Stop of the selected rows
+                - stride (int): Stride of the selected rows
+                - rows (lst): Indices of the selected rows. Cannot be combined with start, stop
+                              and stride.
+                - columns (lst): Indices of the selected columns, i.e., entries along the second
+                                 axis
+            files_to_be_deleted_regex_lst (lst): List with paths to files that should be deleted.
+                                                 The paths can contain regex expressions.
+
+        Returns:
+            Instance of DataProcessorBinary class
+        """
+        super().__init__(
+            file_name_identifier=file_name_identifier,
+            file_options_dict=file_options_dict,
+            files_to_be_deleted_regex_lst=files_to_be_deleted_regex_lst,
+        )
+        rows = file_options_dict.get("rows")
+        slice_options = [file_options_dict.get(option) for option in ("start", "stop", "stride")]
+        if rows is not None and any(option is not None for option in slice_options):
+            raise ValueError(
+                "The option 'rows' cannot be combined with the options 'start', 'stop' and "
+                "'stride'. Abort..."
+            )
+
+        shape = file_options_dict.get("shape")
+        columns = file_options_dict.get("columns")
+
+        self.dtype = np.dtype(file_options_dict.get("dtype", "<f8"))
+        self.offset = file_options_dict.get("offset", 0)
+        self.shape = None if shape is None else tuple(shape)
+        self.row_slice = slice(*slice_options)
+        self.row_indices = None if rows is None else np.asarray(rows, dtype=int)
+        self.columns = None if columns is None else np.asarray(columns, dtype=int)
+
+    def get_raw_data_from_file(self, file_path):
+        """Get the raw data from the files of interest.
+
+        The file is memory-mapped, such that no data is read yet.
+
+        Args:
+            file_path (Path): Actual path to the file of interest.
+
+        Returns:
+            raw_data (np.memmap): Memory-mapped data from file.
+        """
+        try:
+            if file_path.suffix == ".npy":
+                raw_data = np.load(file_path, mmap_mode="r")
+            else:
+                raw_data = np.memmap(
+                    file_path, dtype=self.dtype, mode="r", offset=self.offset, shape=self.shape
+                )
+            _logger.info("Successfully mapped data from %s.", file_path)
+            return raw_data
+        except (OSError, ValueError) as error:
+            _logger.warning(
+                "Could not read the file: %s. The following %s was raised: %s. "
+                "Skipping the file and continuing.",
+                file_path,
+                type(error).__name__,
+                error,
+            )
+        return None
+
+    def filter_and_manipulate_raw_data(self, raw_data):
+        """Read the selected data from the memory-mapped file.
+
+        Args:
+            raw_data (np.memmap): Memory-mapped data from file.
+
+        Returns:
+            processed_data (np.array): Selected data read into memory.
+        """
+        if raw_data is None:
+            return None
+
+        if self.row_indices is None:
+            processed_data = raw_data[self.row_slice]
+        else:
+            processed_data = raw_data[self.row_indices]
+        if self.columns is not None:
+            processed_data = processed_data[:, self.columns]
+
+        # copy the selection into memory, such that the file is released
+        return np.array(processed_data)
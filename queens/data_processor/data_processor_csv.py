@@ -14,17 +14,33 @@
 #
 """Data processor class for csv data extraction."""
 
+import hashlib
+import io
+import itertools
+import json
 import logging
+import os
+import re
+from importlib.util import find_spec
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
 from queens.data_processor.data_processor import DataProcessor
+from queens.utils.config_directories import row_index_directory
 from queens.utils.logger_settings import log_init_args
 from queens.utils.valid_options_utils import get_option
 
 _logger = logging.getLogger(__name__)
 
+PYARROW_AVAILABLE = find_spec("pyarrow") is not None
+
+# Row indices of the files of the csv data processors of this process, keyed by the options of the
+# data processor and the leading lines and size of the files. The row indices are also stored in
+# the row index directory, such that jobs in other processes and restarts reuse them.
+_ROW_INDICES = {}
+
 
 class DataProcessorCsv(DataProcessor):
     """Class for extracting data from csv files.
@@ -50,8 +66,14 @@ class DataProcessorCsv(DataProcessor):
         filter_target_values (list): Target values to filter.
         filter_tol (float): Tolerance for the filter range.
         returned_filter_format (str): Returned data format after filtering.
+        cache_row_index (bool): If true, the rows selected by the filter are indexed once and
+                                only these rows are read from later files.
+        row_index_dir (Path): Directory in which the row indices are stored as npz files.
+        chunk_size (int): Number of rows per chunk if the file is read in chunks
     """
 
+    chunk_size = 100_000
+
     expected_filter_entire_file = {"type": "entire_file"}
     expected_filter_by_row_index = {"type": "by_row_index", "rows": [1, 2]}
     expected_filter_by_target_values = {
@@ -85,6 +107,15 @@ class DataProcessorCsv(DataProcessor):
                                            not use the first column as the index. Index_column is
                                            used for filtering the remaining columns.
                 - returned_filter_format (str): Returned data format after filtering
+                - cache_row_index (bool): If true, the lines of the rows selected by the filter
+                                          are indexed when the first file is parsed. For later
+                                          files, only the indexed lines are parsed. This
+                                          requires the same layout of the files of all jobs,
+                                          which is validated by the values of the index column.
+                                          Hence, an index column is required. Defaults to False.
+                - row_index_dir (str, opt): Directory in which the row indices are stored, such
+                                            that they are reused across processes and restarts.
+                                            Defaults to the row index directory of QUEENS.
                 - filter (dict): Dictionary with filter options:
                     -- type (str): Filter type to use
                     -- rows (lst): In case this options is used, the list contains the indices of
@@ -139,6 +170,7 @@ class DataProcessorCsv(DataProcessor):
             )
 
         returned_filter_format = file_options_dict.get("returned_filter_format", "numpy")
+        cache_row_index = file_options_dict.get("cache_row_index", False)
 
         filter_options_dict = file_options_dict.get("filter")
         self.check_valid_filter_options(filter_options_dict)
@@ -193,6 +225,16 @@ class DataProcessorCsv(DataProcessor):
         self.filter_target_values = filter_target_values
         self.filter_tol = filter_tol
         self.returned_filter_format = returned_filter_format
+        self.cache_row_index = cache_row_index and filter_type != "entire_file"
+        if self.cache_row_index and index_column is False:
+            raise ValueError(
+                "The option 'cache_row_index' requires an 'index_column' to validate the cached "
+                "row index against the files of later jobs. Abort..."
+            )
+        self.row_index_dir = None
+        if self.cache_row_index:
+            self.row_index_dir = Path(file_options_dict.get("row_index_dir", row_index_directory()))
+            self.row_index_dir.mkdir(parents=True, exist_ok=True)
 
     @classmethod
     def check_valid_filter_options(cls, filter_options_dict):
@@ -235,7 +277,9 @@ class DataProcessorCsv(DataProcessor):
         """Get the raw data from the files of interest.
 
         This method loads the desired parts of the csv file as a pandas
-        dataframe.
+        dataframe. The filter options are pushed down to the read-in, such that rows that are
+        certainly filtered out are not parsed. If a row index is cached, only the indexed rows
+        are read and the returned data frame is already filtered.
 
         Args:
             file_path (str): Actual path to the file of interest.
@@ -244,15 +288,22 @@ class DataProcessorCsv(DataProcessor):
             raw_data (DataFrame): Raw data from file.
         """
         try:
-            raw_data = pd.read_csv(
-                file_path,
-                sep=r",|\s+",
-                usecols=self.use_cols_lst,
-                skiprows=self.skip_rows,
-                header=self.header_row,
-                engine="python",
-                index_col=self.index_column,
-            )
+            if self.cache_row_index:
+                row_index = self._load_row_index(file_path)
+                if row_index is not None:
+                    raw_data = self._read_indexed_rows(file_path, row_index)
+                    if raw_data is not None:
+                        return raw_data
+                    _logger.warning(
+                        "The rows of %s do not match the cached row index. Reading the whole "
+                        "file.",
+                        file_path,
+                    )
+                # the row index is built from the whole file
+                raw_data = self._read_csv(file_path)
+                raw_data.attrs["file_path"] = str(file_path)
+            else:
+                raw_data = self._read_csv_with_pushdown(file_path)
             _logger.info("Successfully read-in data from %s.", file_path)
             return raw_data
         except IOError as error:
@@ -284,7 +335,12 @@ class DataProcessorCsv(DataProcessor):
         filter_method = get_option(
             valid_filter_types, self.filter_type, error_message=error_message
         )
-        processed_data = filter_method(raw_data)
+        if raw_data.attrs.get("indexed_rows"):
+            processed_data = raw_data
+        else:
+            processed_data = filter_method(raw_data)
+            if "file_path" in raw_data.attrs:
+                self._build_row_index(raw_data, filter_method)
         filter_formats_dict = {
             "numpy": processed_data.to_numpy(),
             "dict": processed_data.to_dict("list"),
@@ -302,6 +358,310 @@ class DataProcessorCsv(DataProcessor):
             )
         return processed_data
 
+    @property
+    def row_index_key(self):
+        """Key of the row index of this data processor.
+
+        Returns:
+            str: Key of the row index
+        """
+        return json.dumps(
+            [self.file_name_identifier, self.file_options_dict], sort_keys=True, default=str
+        )
+
+    def _row_index_file_key(self, file_path):
+        """Hash the options of the data processor and the layout of a file.
+
+        Files with other leading lines or another size get another row index.
+
+        Args:
+            file_path (str): Actual path to the file of interest.
+
+        Returns:
+            str: Key of the row index of the file
+        """
+        with open(file_path, "r", encoding="utf-8") as file:
+            leading_lines = list(itertools.islice(file, self._num_leading_lines()))
+        file_layout = json.dumps([self.row_index_key, leading_lines, os.path.getsize(file_path)])
+        return hashlib.sha256(file_layout.encode()).hexdigest()
+
+    def _load_row_index(self, file_path):
+        """Get the row index of a file.
+
+        The row index is looked up in memory and then in the row index directory.
+
+        Args:
+            file_path (str): Actual path to the file of interest.
+
+        Returns:
+            dict: Row index of the file (None if the file is not indexed yet)
+        """
+        key = self._row_index_file_key(file_path)
+        if key not in _ROW_INDICES:
+            index_file = self.row_index_dir / f"row_index_{key}.npz"
+            if not index_file.is_file():
+                return None
+            with np.load(index_file) as row_index:
+                _ROW_INDICES[key] = dict(row_index)
+        return _ROW_INDICES[key]
+
+    def _read_csv(self, file_path_or_buffer, allow_pyarrow=False, **read_options):
+        """Read csv data with the read-in options of the data processor.
+
+        The separator of the data processor matches commas and whitespaces. As such a regular
+        expression can only be parsed by the slow python engine of pandas, the actual separator
+        is detected from the first data row if possible, such that the faster C or pyarrow
+        engines can be used.
+
+        Args:
+            file_path_or_buffer (str, io.StringIO): Path to the file or buffer with csv data
+            allow_pyarrow (bool, opt): If true, the pyarrow engine is used if it is available and
+                                       supports the read-in
+            read_options: Additional options for *pd.read_csv*, e.g., *nrows* or *chunksize*
+
+        Returns:
+            DataFrame, TextFileReader: Data or iterator over chunks of data
+        """
+        separator = self._detect_separator(file_path_or_buffer)
+        read_options = {
+            "usecols": self.use_cols_lst,
+            "skiprows": self.skip_rows,
+            "header": self.header_row,
+            "index_col": self.index_column,
+            **read_options,
+        }
+        if separator is None:
+            return pd.read_csv(file_path_or_buffer, sep=r",|\s+", engine="python", **read_options)
+
+        if allow_pyarrow and separator == "," and PYARROW_AVAILABLE:
+            try:
+                return pd.read_csv(
+                    file_path_or_buffer, sep=separator, engine="pyarrow", **read_options
+                )
+            except ValueError as error:
+                _logger.debug("Falling back to the C engine of pandas: %s", error)
+                if isinstance(file_path_or_buffer, io.StringIO):
+                    file_path_or_buffer.seek(0)
+        return pd.read_csv(file_path_or_buffer, sep=separator, engine="c", **read_options)
+
+    def _detect_separator(self, file_path_or_buffer):
+        """Detect the separator of csv data from its first data row.
+
+        Args:
+            file_path_or_buffer (str, io.StringIO): Path to the file or buffer with csv data
+
+        Returns:
+            str, None: Separator (None if the rows are separated by a mix of commas and
+            whitespaces)
+        """
+        if isinstance(file_path_or_buffer, io.StringIO):
+            first_lines = file_path_or_buffer.getvalue().splitlines()
+        else:
+            with open(file_path_or_buffer, "r", encoding="utf-8") as file:
+                first_lines = list(itertools.islice(file, self._num_leading_lines() + 1))
+
+        first_data_row = first_lines[-1].strip() if first_lines else ""
+        if "," not in first_data_row:
+            return r"\s+"
+        if re.search(r"\s", first_data_row):
+            return None
+        return ","
+
+    def _read_csv_with_pushdown(self, file_path):
+        """Read only the part of a csv file that can pass the filter.
+
+        Row index filters limit the number of read rows. Range and target value filters iterate
+        over chunks of the file and stop as soon as all rows of interest are found. The returned
+        data still has to be filtered.
+
+        Args:
+            file_path (str): Actual path to the file of interest.
+
+        Returns:
+            DataFrame: Data containing at least all rows that pass the filter
+        """
+        if self.filter_type == "by_row_index" and self.use_rows_lst:
+            if min(self.use_rows_lst) >= 0:
+                return self._read_csv(file_path, nrows=max(self.use_rows_lst) + 1)
+            if max(self.use_rows_lst) < 0:
+                return self._read_tail(file_path, -min(self.use_rows_lst))
+        if self.filter_type == "by_range":
+            return self._read_range(file_path)
+        if self.filter_type == "by_target_values":
+            return self._read_target_values(file_path)
+        return self._read_csv(file_path, allow_pyarrow=True)
+
+    def _read_tail(self, file_path, num_rows):
+        """Read the last rows of a csv file.
+
+        Args:
+            file_path (str): Actual path to the file of interest.
+            num_rows (int): Number of rows
+
+        Returns:
+            DataFrame: Last rows of the file
+        """
+        tail = None
+        with self._read_csv(file_path, chunksize=self.chunk_size) as reader:
+            for chunk in reader:
+                tail = chunk if tail is None else pd.concat([tail, chunk])
+                tail = tail.iloc[-num_rows:]
+        if tail is None:
+            return self._read_csv(file_path)
+        return tail
+
+    def _read_range(self, file_path):
+        """Read the rows of a csv file from the start to the end of the filter range.
+
+        Args:
+            file_path (str): Actual path to the file of interest.
+
+        Returns:
+            DataFrame: Rows in the filter range (empty if the range does not start)
+        """
+        range_start, range_end = self.filter_range[0], self.filter_range[-1]
+        selected_chunks = []
+        range_started = False
+        with self._read_csv(file_path, chunksize=self.chunk_size) as reader:
+            for chunk in reader:
+                if not selected_chunks:
+                    # keep the empty chunk as result if the range does not start
+                    selected_chunks.append(chunk.iloc[:0])
+                if not range_started:
+                    start = np.flatnonzero(np.abs(chunk.index - range_start) <= self.filter_tol)
+                    if start.size == 0:
+                        continue
+                    range_started = True
+                    chunk = chunk.iloc[start[0] :]
+
+                end = np.flatnonzero(np.abs(chunk.index - range_end) <= self.filter_tol)
+                if end.size > 0:
+                    selected_chunks.append(chunk.iloc[: end[-1] + 1])
+                    break
+                selected_chunks.append(chunk)
+        if not selected_chunks:
+            return self._read_csv(file_path)
+        return pd.concat(selected_chunks)
+
+    def _read_target_values(self, file_path):
+        """Read the rows of a csv file matching the target values.
+
+        Args:
+            file_path (str): Actual path to the file of interest.
+
+        Returns:
+            DataFrame: Rows matching the target values (empty if none match)
+        """
+        target_values = np.asarray(self.filter_target_values, dtype=float)
+        unmatched_targets = np.ones(len(target_values), dtype=bool)
+        selected_chunks = []
+        with self._read_csv(file_path, chunksize=self.chunk_size) as reader:
+            for chunk in reader:
+                matches = (
+                    np.abs(chunk.index.to_numpy()[:, np.newaxis] - target_values) <= self.filter_tol
+                )
+                selected_chunks.append(chunk.iloc[np.flatnonzero(matches.any(axis=1))])
+                unmatched_targets &= ~matches.any(axis=0)
+                if not unmatched_targets.any():
+                    break
+        if not selected_chunks:
+            return self._read_csv(file_path)
+        return pd.concat(selected_chunks)
+
+    def _num_leading_lines(self):
+        """Get the number of lines before the data rows.
+
+        Returns:
+            int: Number of skipped and header lines
+        """
+        if self.header_row is None:
+            return self.skip_rows
+        return self.skip_rows + self.header_row + 1
+
+    def _build_row_index(self, raw_data, filter_method):
+        """Index the lines of the rows selected by the filter.
+
+        The row index contains the line numbers of the selected rows in the file, their order
+        after filtering and the values of their index column for validation. It is kept in memory
+        and stored in the row index directory.
+
+        Args:
+            raw_data (DataFrame): Raw data of the whole file
+            filter_method (callable): Filter method of the data processor
+        """
+        positions = pd.DataFrame({"position": np.arange(len(raw_data))}, index=raw_data.index)
+        positions = filter_method(positions)["position"].to_numpy()
+
+        num_leading_lines = self._num_leading_lines()
+        with open(raw_data.attrs["file_path"], "r", encoding="utf-8") as file:
+            line_numbers = np.array(
+                [
+                    line_number
+                    for line_number, line in enumerate(file)
+                    if line_number >= num_leading_lines and line.strip()
+                ]
+            )
+        if len(line_numbers) != len(raw_data):
+            _logger.debug("The rows of the csv file could not be indexed.")
+            return
+
+        index_values = raw_data.index.to_numpy()[positions]
+        if index_values.dtype.kind not in "biufc":
+            index_values = index_values.astype(str)
+
+        unique_positions, order = np.unique(positions, return_inverse=True)
+        row_index = {
+            "line_numbers": line_numbers[unique_positions],
+            "order": order,
+            "index_values": index_values,
+        }
+        key = self._row_index_file_key(raw_data.attrs["file_path"])
+        index_file = self.row_index_dir / f"row_index_{key}.npz"
+        temporary_file = index_file.with_name(f"{index_file.stem}.{os.getpid()}.tmp")
+        with open(temporary_file, "wb") as file:
+            np.savez(file, **row_index)
+        os.replace(temporary_file, index_file)
+        _ROW_INDICES[key] = row_index
+
+    def _read_indexed_rows(self, file_path, row_index):
+        """Read only the indexed rows of a file.
+
+        Args:
+            file_path (str): Actual path to the file of interest.
+            row_index (dict): Row index of the file
+
+        Returns:
+            raw_data (DataFrame, None): Filtered data (None if the file does not match the index)
+        """
+        num_leading_lines = self._num_leading_lines()
+        line_numbers = row_index["line_numbers"]
+        with open(file_path, "r", encoding="utf-8") as file:
+            lines = list(itertools.islice(file, num_leading_lines))
+            next_line_number = num_leading_lines
+            for line_number in line_numbers:
+                line = next(itertools.islice(file, line_number - next_line_number, None), None)
+                if line is None:
+                    return None
+                lines.append(line)
+                next_line_number = line_number + 1
+
+        raw_data = self._read_csv(io.StringIO("".join(lines)))
+        if len(raw_data) != len(line_numbers):
+            return None
+        raw_data = raw_data.iloc[row_index["order"]]
+        index_values = raw_data.index.to_numpy()
+        if index_values.dtype.kind in "fc" and row_index["index_values"].dtype.kind in "fc":
+            index_matches = np.allclose(index_values, row_index["index_values"])
+        else:
+            index_matches = np.array_equal(
+                index_values.astype(str), row_index["index_values"].astype(str)
+            )
+        if not index_matches:
+            return None
+
+        raw_data.attrs["indexed_rows"] = True
+        return raw_data
+
     def _filter_entire_file(self, raw_data):
         """Keep entire csv file data.
 
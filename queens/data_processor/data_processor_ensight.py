@@ -14,17 +14,25 @@
 #
 """Data processor class for reading vtk-ensight data."""
 
+import hashlib
 import logging
+import os
+from pathlib import Path
 
 import numpy as np
 import vtk
-from vtkmodules.util.numpy_support import numpy_to_vtk, vtk_to_numpy
+from vtkmodules.util.numpy_support import vtk_to_numpy
 
 from queens.data_processor.data_processor import DataProcessor
 from queens.utils.logger_settings import log_init_args
 
 _logger = logging.getLogger(__name__)
 
+# Last probe mapping from the mesh to the target coordinates, keyed by mesh and coordinate hash.
+# Only one mapping is kept to bound the memory, e.g., for deforming meshes, other mappings are
+# served by the probe cache directory.
+_PROBE_MAPPINGS = {}
+
 
 class DataProcessorEnsight(DataProcessor):
     """Class for data-processing ensight output.
@@ -47,6 +55,8 @@ class DataProcessorEnsight(DataProcessor):
                                 (This might be dependent on the simulation software that generated
                                 the vtk file).
         geometric_set_data (dict): Dictionary describing the topology of the geometry
+        probe_cache_dir (Path): Directory in which the probe mappings are stored as npz files.
+        target_coordinates (dict): Target coordinates per time value or geometric set.
     """
 
     @log_init_args
@@ -77,7 +87,10 @@ class DataProcessorEnsight(DataProcessor):
                     -- field_components (lst): List with vector components that should be extracted
                                         from the field
                     -- vtk_array_type (str): Type of vtk array (e.g., point_array)
-
+                - probe_cache_dir (str, opt): Directory in which the mappings from the mesh to the
+                                              geometric target are stored, so that they are
+                                              computed once for all jobs sharing the mesh. Without
+                                              it, they are only cached in memory.
 
             files_to_be_deleted_regex_lst (lst): List with paths to files that should be deleted.
                                                  The paths can contain regex expressions.
@@ -167,6 +180,11 @@ class DataProcessorEnsight(DataProcessor):
         self.vtk_field_components = vtk_field_components
         self.vtk_array_type = vtk_array_type
         self.geometric_target = geometric_target
+        self.probe_cache_dir = file_options_dict.get("probe_cache_dir")
+        if self.probe_cache_dir is not None:
+            self.probe_cache_dir = Path(self.probe_cache_dir)
+            self.probe_cache_dir.mkdir(parents=True, exist_ok=True)
+        self.target_coordinates = {}
 
     @staticmethod
     def _check_field_specification_dict(file_options_dict):
@@ -203,6 +221,9 @@ class DataProcessorEnsight(DataProcessor):
     def get_raw_data_from_file(self, file_path):
         """Read-in EnSight files using the vtkEnsightGoldBinaryReader.
 
+        Only the meta data is read here. The reader is restricted to the field of interest, which
+        is read per target time step.
+
         Args:
             file_path (str): Actual path to the file of interest.
 
@@ -212,7 +233,13 @@ class DataProcessorEnsight(DataProcessor):
         # Set vtk reader object as raw file data
         raw_data = vtk.vtkEnSightGoldBinaryReader()
         raw_data.SetCaseFileName(file_path)
-        raw_data.Update()
+        raw_data.UpdateInformation()
+        raw_data.GetPointDataArraySelection().DisableAllArrays()
+        raw_data.GetCellDataArraySelection().DisableAllArrays()
+        if self.vtk_array_type == "point_array":
+            raw_data.GetPointDataArraySelection().EnableArray(self.vtk_field_label)
+        elif self.vtk_array_type == "cell_array":
+            raw_data.GetCellDataArraySelection().EnableArray(self.vtk_field_label)
         return raw_data
 
     def filter_and_manipulate_raw_data(self, raw_data):
@@ -295,34 +322,33 @@ class DataProcessorEnsight(DataProcessor):
             interpolated_data (np.array): Array of field values interpolated to coordinates
                                           of experimental data
         """
-        experimental_coordinates_for_snapshot = []
-        if self.time_label_experimental:
-            for _, row in self.experimental_data.iterrows():
-                if time_value == row[self.time_label_experimental]:
-                    experimental_coordinates_for_snapshot.append(
-                        row[self.coordinates_label_experimental].to_list()
-                    )
-        else:
-            for coord in self.coordinates_label_experimental:
-                experimental_coordinates_for_snapshot.append(
-                    np.array(self.experimental_data[coord]).reshape(-1, 1)
-                )
-            if len(experimental_coordinates_for_snapshot) != 3:
-                raise ValueError("Please provide 3d coordinates in the observation data")
-            experimental_coordinates_for_snapshot = np.concatenate(
-                experimental_coordinates_for_snapshot, axis=1
-            )
+        if time_value not in self.target_coordinates:
+            self.target_coordinates[time_value] = self._experimental_coordinates(time_value)
+
         # interpolate vtk solution to experimental coordinates
-        interpolated_data = DataProcessorEnsight._interpolate_vtk(
-            experimental_coordinates_for_snapshot,
-            vtk_data_obj,
-            self.vtk_array_type,
-            self.vtk_field_label,
-            self.vtk_field_components,
-        )
+        interpolated_data = self._interpolate_vtk(self.target_coordinates[time_value], vtk_data_obj)
 
         return interpolated_data
 
+    def _experimental_coordinates(self, time_value):
+        """Get the experimental coordinates of a time step.
+
+        Args:
+            time_value (float): Current time value at which the simulation shall be evaluated
+
+        Returns:
+            np.array: Coordinates of the experimental data
+        """
+        if self.time_label_experimental:
+            snapshot = self.experimental_data[
+                self.experimental_data[self.time_label_experimental] == time_value
+            ]
+            return snapshot[self.coordinates_label_experimental].to_numpy(dtype=float)
+
+        if len(self.coordinates_label_experimental) != 3:
+            raise ValueError("Please provide 3d coordinates in the observation data")
+        return self.experimental_data[self.coordinates_label_experimental].to_numpy(dtype=float)
+
     def _get_data_from_geometric_set(
         self,
         vtk_data_obj,
@@ -336,7 +362,25 @@ class DataProcessorEnsight(DataProcessor):
             data (np.array): Array of field values for nodes of geometric set
         """
         geometric_set = self.geometric_target[1]
+        if geometric_set not in self.target_coordinates:
+            self.target_coordinates[geometric_set] = self._geometric_set_coordinates(geometric_set)
 
+        # interpolate vtk solution to experimental coordinates
+        interpolated_data = self._interpolate_vtk(
+            self.target_coordinates[geometric_set], vtk_data_obj
+        )
+
+        return interpolated_data
+
+    def _geometric_set_coordinates(self, geometric_set):
+        """Get the node coordinates of a geometric set.
+
+        Args:
+            geometric_set (str): Name of the geometric set
+
+        Returns:
+            np.array: Coordinates of the nodes of the geometric set
+        """
         # get node coordinates by geometric set, loop over all topologies
         nodes_of_interest = None
         for nodes in self.geometric_set_data["node_topology"]:
@@ -357,89 +401,109 @@ class DataProcessorEnsight(DataProcessor):
         if nodes_of_interest is None:
             raise ValueError("Nodes of interest are not in the geometric set.")
 
-        both = set(nodes_of_interest).intersection(
-            self.geometric_set_data["node_coordinates"]["node_mesh"]
-        )
-        indices = [self.geometric_set_data["node_coordinates"]["node_mesh"].index(x) for x in both]
-        geometric_set_coordinates = [
-            self.geometric_set_data["node_coordinates"]["coordinates"][index] for index in indices
-        ]
-
-        # interpolate vtk solution to experimental coordinates
-        interpolated_data = DataProcessorEnsight._interpolate_vtk(
-            geometric_set_coordinates,
-            vtk_data_obj,
-            self.vtk_array_type,
-            self.vtk_field_label,
-            self.vtk_field_components,
-        )
-
-        return interpolated_data
+        node_indices = {
+            node: index
+            for index, node in enumerate(self.geometric_set_data["node_coordinates"]["node_mesh"])
+        }
+        both = set(nodes_of_interest).intersection(node_indices)
+        coordinates = self.geometric_set_data["node_coordinates"]["coordinates"]
+        return np.array([coordinates[node_indices[node]] for node in both], dtype=float)
 
-    @staticmethod
-    def _interpolate_vtk(
-        coordinates, vtk_data_obj, vtk_array_type, vtk_field_label, vtk_field_components
-    ):
+    def _interpolate_vtk(self, coordinates, vtk_data_obj):
         """Interpolate the vtk solution field to given coordinates.
 
+        The mapping from the mesh to the coordinates is cached, so that only the field has to be
+        read for each job and time step sharing the mesh.
+
         Args:
             coordinates (np.array): Coordinates at which the vtk solution field should be
                                     interpolated at
             vtk_data_obj (obj): VTK ensight object that contains that solution fields of
                                      interest
-            vtk_array_type (str): Type of vtk array (cell array or point array)
-            vtk_field_label (str): Field label that should be extracted
-            vtk_field_components (lst): List of components of the respective fields that should
-                                        be extracted
 
         Returns:
             interpolated_data (np.array): Solution data interpolated to respective coordinates.
         """
-        # -- create vtk point object from experimental coordinates --
-        vtk_points_obj = vtk.vtkPoints()
-        vtk_points_obj.SetData(numpy_to_vtk(coordinates))
-        # from vtk point obj create polydata obj
-        polydata_obj = vtk.vtkPolyData()
-        polydata_obj.SetPoints(vtk_points_obj)
-
-        # Generate a vtk filter with desired vtk data as source
-        probe_filter_obj = vtk.vtkProbeFilter()
-        probe_filter_obj.SetSourceData(vtk_data_obj)
-
-        # Evaluate/interpolate this filter at experimental coordinates
-        probe_filter_obj.SetInputData(polydata_obj)
-        probe_filter_obj.Update()
-
-        # Return the fields as numpy array
-        if vtk_array_type == "point_array":
-            field = vtk_to_numpy(
-                probe_filter_obj.GetOutput().GetPointData().GetArray(vtk_field_label)
-            )
+        probe_mapping = self._get_probe_mapping(coordinates, vtk_data_obj)
+        field = self._get_field_components(vtk_data_obj)
 
-        elif vtk_array_type == "cell_array":
-            field = vtk_to_numpy(
-                probe_filter_obj.GetOutput().GetCellData().GetArray(vtk_field_label)
+        if self.vtk_array_type == "point_array":
+            interpolated_data = np.einsum(
+                "ij,ijk->ik", probe_mapping["weights"], field[probe_mapping["point_ids"]]
             )
+        else:
+            cell_ids = probe_mapping["cell_ids"]
+            interpolated_data = field[np.maximum(cell_ids, 0)]
+            # coordinates outside of the mesh are set to zero like by the vtkProbeFilter
+            interpolated_data[cell_ids < 0] = 0.0
+
+        return interpolated_data
+
+    def _get_field_components(self, vtk_data_obj):
+        """Get the components of interest of the vtk solution field.
 
+        Args:
+            vtk_data_obj (obj): VTK ensight object that contains that solution fields of
+                                     interest
+
+        Returns:
+            np.array: Field values of the components per point or cell
+        """
+        if self.vtk_array_type == "point_array":
+            field = vtk_to_numpy(vtk_data_obj.GetPointData().GetArray(self.vtk_field_label))
+        elif self.vtk_array_type == "cell_array":
+            field = vtk_to_numpy(vtk_data_obj.GetCellData().GetArray(self.vtk_field_label))
         else:
             raise ValueError(
                 "VTK array type must be either 'point_array' or 'cell_array', but you provided"
-                f"{vtk_array_type}! Abort..."
+                f"{self.vtk_array_type}! Abort..."
+            )
+
+        # QUEENS expects a float64 numpy object as result
+        if field.ndim == 1:
+            return np.repeat(
+                field.reshape(-1, 1).astype("float64"), len(self.vtk_field_components), axis=1
             )
+        return field[:, self.vtk_field_components].astype("float64")
 
-        data = []
+    def _get_probe_mapping(self, coordinates, vtk_data_obj):
+        """Get the mapping from the mesh to the coordinates.
 
-        for i in vtk_field_components:
-            if field.ndim == 1:
-                data.append(field.reshape(-1, 1))
-            else:
-                data.append(field[:, i].reshape(-1, 1))
-        data = np.concatenate(data, axis=1)
+        The mapping is looked up in memory, then in the probe cache directory, and only computed
+        if it was not found. Only the last mapping is kept in memory.
 
-        # QUEENS expects a float64 numpy object as result
-        interpolated_data = data.astype("float64")
+        Args:
+            coordinates (np.array): Coordinates at which the vtk solution field should be
+                                    interpolated at
+            vtk_data_obj (obj): VTK ensight object that contains the mesh
 
-        return interpolated_data
+        Returns:
+            dict: Probe mapping, see _compute_probe_mapping
+        """
+        key = _probe_mapping_key(coordinates, vtk_data_obj)
+        if key is None:
+            return _compute_probe_mapping(coordinates, vtk_data_obj)
+
+        if key not in _PROBE_MAPPINGS:
+            cache_file = None
+            if self.probe_cache_dir is not None:
+                cache_file = self.probe_cache_dir / f"probe_mapping_{key}.npz"
+
+            if cache_file is not None and cache_file.is_file():
+                with np.load(cache_file) as cached_mapping:
+                    probe_mapping = dict(cached_mapping)
+            else:
+                _logger.debug("Computing the probe mapping for %d coordinates.", len(coordinates))
+                probe_mapping = _compute_probe_mapping(coordinates, vtk_data_obj)
+                if cache_file is not None:
+                    temporary_file = cache_file.with_name(f"{cache_file.stem}.{os.getpid()}.tmp")
+                    with open(temporary_file, "wb") as file:
+                        np.savez(file, **probe_mapping)
+                    os.replace(temporary_file, cache_file)
+            _PROBE_MAPPINGS.clear()
+            _PROBE_MAPPINGS[key] = probe_mapping
+
+        return _PROBE_MAPPINGS[key]
 
     def _vtk_from_ensight(self, raw_data, target_time):
         """Load a vtk-object from the ensight file.
@@ -507,3 +571,73 @@ class DataProcessorEnsight(DataProcessor):
         }
 
         return geometric_set_data
+
+
+def _probe_mapping_key(coordinates, vtk_data_obj):
+    """Hash the mesh and the coordinates of a probe mapping.
+
+    Args:
+        coordinates (np.array): Coordinates at which the vtk solution field should be interpolated
+        vtk_data_obj (obj): VTK ensight object that contains the mesh
+
+    Returns:
+        str: Key of the probe mapping or None if the mesh type is not supported
+    """
+    if not isinstance(vtk_data_obj, vtk.vtkPointSet):
+        return None
+
+    hasher = hashlib.sha256()
+    hasher.update(vtk_data_obj.GetClassName().encode())
+    hasher.update(np.ascontiguousarray(coordinates, dtype=float).tobytes())
+    hasher.update(vtk_to_numpy(vtk_data_obj.GetPoints().GetData()).tobytes())
+    if isinstance(vtk_data_obj, vtk.vtkUnstructuredGrid):
+        cells = vtk_data_obj.GetCells()
+        hasher.update(vtk_to_numpy(cells.GetOffsetsArray()).tobytes())
+        hasher.update(vtk_to_numpy(cells.GetConnectivityArray()).tobytes())
+        hasher.update(vtk_to_numpy(vtk_data_obj.GetCellTypesArray()).tobytes())
+    elif isinstance(vtk_data_obj, vtk.vtkStructuredGrid):
+        hasher.update(repr(vtk_data_obj.GetDimensions()).encode())
+    else:
+        return None
+    return hasher.hexdigest()
+
+
+def _compute_probe_mapping(coordinates, vtk_data_obj):
+    """Compute the mapping from the mesh to the coordinates.
+
+    For each coordinate, the cell containing it is located like by the vtkProbeFilter. The ids and
+    interpolation weights of the points of the cell are stored padded to the maximum cell size.
+
+    Args:
+        coordinates (np.array): Coordinates at which the vtk solution field should be interpolated
+        vtk_data_obj (obj): VTK ensight object that contains the mesh
+
+    Returns:
+        dict: Cell ids (-1 outside of the mesh), point ids and interpolation weights
+    """
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 3)
+    max_cell_size = max(vtk_data_obj.GetMaxCellSize(), 1)
+    cell_ids = np.full(len(coordinates), -1, dtype=np.int64)
+    point_ids = np.zeros((len(coordinates), max_cell_size), dtype=np.int64)
+    weights = np.zeros((len(coordinates), max_cell_size))
+
+    cell_locator = vtk.vtkStaticCellLocator()
+    cell_locator.SetDataSet(vtk_data_obj)
+    cell_locator.BuildLocator()
+    tolerance_squared = 1e-12 * vtk_data_obj.GetLength2()
+    cell = vtk.vtkGenericCell()
+    sub_id = vtk.reference(0)
+    parametric_coordinates = [0.0, 0.0, 0.0]
+    cell_weights = [0.0] * max_cell_size
+    for i, coordinate in enumerate(coordinates):
+        cell_id = cell_locator.FindCell(
+            coordinate, tolerance_squared, cell, sub_id, parametric_coordinates, cell_weights
+        )
+        if cell_id < 0:
+            continue
+        number_of_points = cell.GetNumberOfPoints()
+        cell_ids[i] = cell_id
+        point_ids[i, :number_of_points] = [cell.GetPointId(j) for j in range(number_of_points)]
+        weights[i, :number_of_points] = cell_weights[:number_of_points]
+
+    return {"cell_ids": cell_ids, "point_ids": point_ids, "weights": weights}
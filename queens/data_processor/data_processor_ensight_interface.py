@@ -24,6 +24,9 @@ from vtkmodules.util.numpy_support import vtk_to_numpy
 from queens.data_processor.data_processor import DataProcessor
 from queens.utils.logger_settings import log_init_args
 
+# Maximum number of line-element pairs intersected at once
+INTERSECTION_CHUNK_SIZE = 2**18
+
 
 class DataProcessorEnsightInterfaceDiscrepancy(DataProcessor):
     """Discrepancy measure for boundaries and shapes.
@@ -148,45 +151,38 @@ class DataProcessorEnsightInterfaceDiscrepancy(DataProcessor):
                     npoints = int(npoints[0])
                     continue
                 if i < npoints:
-                    npoint_lines.append(line.split())
+                    npoint_lines.append(line)
                     i += 1
                     continue
-                if i - npoints - 1 < steps:
-                    steps_lines.append(line.split())
+                steps_lines.append(line)
 
             if npoints == 0 or steps == 0:
                 raise ValueError(
                     "read_monitorfile did not find useful content. Monitor format is probably wrong"
                 )
 
-        # read numeric content from file data
-        npoint_lines = [[int(ii) for ii in i] for i in npoint_lines]
-        steps_lines = [[float(ii) for ii in i] for i in steps_lines]
+        # read numeric content from file data, lines after the announced steps are ignored
+        steps_values = np.loadtxt(steps_lines[:steps], ndmin=2)
+
+        # the columns after the time value contain for each point pair the coordinates of both
+        # points in the listed dimensions
+        pair_ids, point_ids, dimension_ids = [], [], []
+        for pair_id, npoint_line in enumerate(npoint_lines):
+            dimensions = [int(dimension) for dimension in npoint_line.split()[1:]]
+            pair_ids.extend([pair_id] * 2 * len(dimensions))
+            point_ids.extend([0] * len(dimensions) + [1] * len(dimensions))
+            dimension_ids.extend(dimensions * 2)
 
-        # prefill monfile_data of adequate size with zeros
         # monfile_data has dimensions
         # [number of timesteps][2][number of points][2][3dim]
         # it contains pairs of points on the interface and in the domain (for distance
         # in prescribed direction) measured in experiment
-        monfile_data = []
-        for i in steps_lines:
-            monfile_data.append(
-                [[0.0e0], [[[0, 0, 0] for j in range(0, 2)] for k in range(0, npoints)]]
-            )
-
-        # for all npoint_lines read according data from steps_lines to monfile_data
-        # loop over time steps
-
-        for i, steps_line in enumerate(steps_lines):
-            k = 1
-            # save time value for time step
-            monfile_data[i][0] = steps_line[0]
-            # loop over points
-            for ii, npoint_line in enumerate(npoint_lines):
-                for x in range(0, 2):
-                    for iii in range(0, npoint_line[0]):
-                        monfile_data[i][1][ii][x][npoint_line[iii + 1]] = steps_line[k]
-                        k += 1
+        point_pairs = np.zeros((len(steps_values), npoints, 2, 3))
+        point_pairs[:, pair_ids, point_ids, dimension_ids] = steps_values[:, 1 : len(pair_ids) + 1]
+        monfile_data = [
+            [time, step_point_pairs]
+            for time, step_point_pairs in zip(steps_values[:, 0].tolist(), point_pairs.tolist())
+        ]
         return monfile_data
 
     def get_raw_data_from_file(self, file_path):
@@ -211,6 +207,34 @@ class DataProcessorEnsightInterfaceDiscrepancy(DataProcessor):
         evaluate surface distance measurement for every given time step from the
         experiment.
 
+        Args:
+            raw_data (obj): Raw data from file.
+
+        Returns:
+            residual (list): Full residual from this data_processor class
+        """
+        if self.visualization_bool:
+            return self._filter_and_visualize_raw_data(raw_data)
+
+        residual_distance_lst = []
+        for current_step_experimental_data in self.experimental_ref_data_lst:
+            grid = self.deformed_grid(raw_data, current_step_experimental_data[0])
+            geo = vtk.vtkGeometryFilter()
+            geo.SetInputData(grid)
+            geo.Update()
+            geometry_output = geo.GetOutput()
+            outline_out, _ = self._get_dim_dependent_vtk_output(geometry_output)
+
+            boundary_elements = self._get_boundary_elements(outline_out)
+            measured_point_pairs = np.array(current_step_experimental_data[1], dtype=float)
+            distances = self.compute_distances(boundary_elements, measured_point_pairs)
+            residual_distance_lst.extend(distances.tolist())
+
+        return residual_distance_lst
+
+    def _filter_and_visualize_raw_data(self, raw_data):
+        """Get deformed boundary from vtk point pair by point pair and visualize it.
+
         Args:
             raw_data (obj): Raw data from file.
 
@@ -247,6 +271,43 @@ class DataProcessorEnsightInterfaceDiscrepancy(DataProcessor):
 
         return residual_distance_lst
 
+    def _get_boundary_elements(self, outline_out):
+        """Get the coordinates of the boundary elements.
+
+        Quadrilaterals are split into two triangles.
+
+        Args:
+            outline_out (obj): VTK boundary outline (2d) or surface (3d)
+
+        Returns:
+            np.array: Point coordinates per boundary line (2d) or triangle (3d)
+        """
+        if self.problem_dimension == "2d":
+            cells = outline_out.GetLines()
+        else:
+            cells = outline_out.GetPolys()
+        coordinates = vtk_to_numpy(outline_out.GetPoints().GetData()).astype(float)
+        offsets = vtk_to_numpy(cells.GetOffsetsArray())
+        connectivity = vtk_to_numpy(cells.GetConnectivityArray())
+        cell_sizes = np.diff(offsets)
+        cell_starts = offsets[:-1]
+
+        if self.problem_dimension == "2d":
+            if np.any(cell_sizes != 2):
+                raise ValueError("Unknown local_element type for structure surface discretization.")
+            corners = [[0, 1]]
+        else:
+            if np.any((cell_sizes != 3) & (cell_sizes != 4)):
+                raise ValueError("Unknown local_element type for structure surface discretization.")
+            corners = [[0, 1, 2], [0, 2, 3]]
+
+        element_point_ids = []
+        for i, element_corners in enumerate(corners):
+            # only quadrilaterals have a second triangle
+            starts = cell_starts[cell_sizes > max(element_corners)] if i else cell_starts
+            element_point_ids.append(connectivity[starts[:, np.newaxis] + element_corners])
+        return coordinates[np.concatenate(element_point_ids)]
+
     def _get_intersection_points(self, outline_data, outline_out, point_vector):
         """Get intersection points."""
         counter = 0
@@ -434,6 +495,49 @@ class DataProcessorEnsightInterfaceDiscrepancy(DataProcessor):
 
         return distance
 
+    def compute_distances(self, boundary_elements, measured_point_pairs):
+        """Compute the distances to the boundary for all point pairs of a time step.
+
+        Vectorized version of *stretch_vector*, the intersection with the boundary elements and
+        *compute_distance* for all point pairs. The point pairs are processed in chunks to limit
+        the memory.
+
+        Args:
+            boundary_elements (np.array): Point coordinates per boundary line (2d) or
+                                          triangle (3d)
+            measured_point_pairs (np.array): Pairs of points from monitor file
+
+        Returns:
+            distances (np.array): Signed distance between root point and furthest outward
+                                  intersection point per point pair
+        """
+        root_points = measured_point_pairs[:, 0]
+        directions = measured_point_pairs[:, 1] - root_points
+        # stretch the point pairs by a factor of 10 on both ends
+        line_starts = root_points - 10 * directions
+        line_ends = measured_point_pairs[:, 1] + 10 * directions
+
+        if boundary_elements.shape[1] == 2:
+            intersect = _intersect_lines_with_segments
+        else:
+            intersect = _intersect_lines_with_triangles
+
+        distances = np.full(len(measured_point_pairs), np.inf)
+        chunk_size = max(1, INTERSECTION_CHUNK_SIZE // max(len(boundary_elements), 1))
+        for start in range(0, len(measured_point_pairs), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            found, intersection_points = intersect(
+                line_starts[chunk], line_ends[chunk], boundary_elements
+            )
+            offsets = intersection_points - root_points[chunk, np.newaxis]
+            signed_distances = np.linalg.norm(offsets, axis=-1)
+            signed_distances[np.einsum("ijk,ik->ij", offsets, directions[chunk]) < 0] *= -1
+            signed_distances[~found] = np.inf
+            if signed_distances.shape[1]:
+                distances[chunk] = signed_distances.min(axis=1)
+
+        return distances
+
     def deformed_grid(self, raw_data, time):
         """Read deformed grid from Ensight file at specified time.
 
@@ -504,3 +608,105 @@ class DataProcessorEnsightInterfaceDiscrepancy(DataProcessor):
         deformed_grid = vtk_warp_vector.GetUnstructuredGridOutput()
 
         return deformed_grid
+
+
+def _intersect_lines_with_segments(line_starts, line_ends, segments, tolerance=1e-8):
+    """Intersect lines with line segments.
+
+    Vectorized counterpart of vtkLine.Intersection based on the closest points of the lines. The
+    closest points are subject to rounding errors that scale with the lengths of the lines, hence
+    the distance between them is compared relative to these lengths.
+
+    Args:
+        line_starts (np.array): Start points of the lines
+        line_ends (np.array): End points of the lines
+        segments (np.array): Start and end points of the segments
+        tolerance (float): Maximum distance between the lines at the intersection relative to
+                           the sum of their lengths
+
+    Returns:
+        found (np.array): Whether line i intersects segment j
+        intersection_points (np.array): Intersection point of line i with segment j
+    """
+    line_directions = (line_ends - line_starts)[:, np.newaxis]
+    segment_directions = (segments[:, 1] - segments[:, 0])[np.newaxis]
+    offsets = segments[np.newaxis, :, 0] - line_starts[:, np.newaxis]
+
+    a = np.einsum("ijk,ijk->ij", line_directions, line_directions)
+    b = np.einsum("ijk,ijk->ij", line_directions, segment_directions)
+    c = np.einsum("ijk,ijk->ij", segment_directions, segment_directions)
+    d = np.einsum("ijk,ijk->ij", line_directions, offsets)
+    e = np.einsum("ijk,ijk->ij", segment_directions, offsets)
+    denominator = a * c - b * b
+    parallel = np.abs(denominator) <= 1e-12 * a * c
+    denominator[parallel] = 1.0
+
+    # parametric coordinates of the closest points on the lines and segments
+    line_coordinates = (c * d - b * e) / denominator
+    segment_coordinates = (b * d - a * e) / denominator
+
+    intersection_points = segments[np.newaxis, :, 0] + segment_coordinates[..., np.newaxis] * (
+        segment_directions
+    )
+    closest_points = line_starts[:, np.newaxis] + line_coordinates[..., np.newaxis] * (
+        line_directions
+    )
+    found = (
+        ~parallel
+        & (line_coordinates >= 0)
+        & (line_coordinates <= 1)
+        & (segment_coordinates >= 0)
+        & (segment_coordinates <= 1)
+        & (
+            np.sum((intersection_points - closest_points) ** 2, axis=-1)
+            <= tolerance**2 * (np.sqrt(a) + np.sqrt(c)) ** 2
+        )
+    )
+    return found, intersection_points
+
+
+def _intersect_lines_with_triangles(line_starts, line_ends, triangles, tolerance=1e-12):
+    """Intersect lines with triangles.
+
+    Vectorized counterpart of vtkTriangle.IntersectWithLine based on the Moeller-Trumbore
+    algorithm.
+
+    Args:
+        line_starts (np.array): Start points of the lines
+        line_ends (np.array): End points of the lines
+        triangles (np.array): Corner points of the triangles
+        tolerance (float): Tolerance of the barycentric coordinates
+
+    Returns:
+        found (np.array): Whether line i intersects triangle j
+        intersection_points (np.array): Intersection point of line i with triangle j
+    """
+    line_directions = (line_ends - line_starts)[:, np.newaxis]
+    first_edges = (triangles[:, 1] - triangles[:, 0])[np.newaxis]
+    second_edges = (triangles[:, 2] - triangles[:, 0])[np.newaxis]
+
+    normals = np.cross(line_directions, second_edges)
+    determinant = np.einsum("ijk,ijk->ij", first_edges, normals)
+    parallel = np.abs(determinant) <= 1e-12 * np.linalg.norm(line_directions, axis=-1) * np.sqrt(
+        np.sum(first_edges**2, axis=-1) * np.sum(second_edges**2, axis=-1)
+    )
+    determinant[parallel] = 1.0
+
+    offsets = line_starts[:, np.newaxis] - triangles[np.newaxis, :, 0]
+    first_coordinates = np.einsum("ijk,ijk->ij", offsets, normals) / determinant
+    offset_normals = np.cross(offsets, first_edges)
+    second_coordinates = np.einsum("ijk,ijk->ij", line_directions, offset_normals) / determinant
+    line_coordinates = np.einsum("ijk,ijk->ij", second_edges, offset_normals) / determinant
+
+    intersection_points = line_starts[:, np.newaxis] + line_coordinates[..., np.newaxis] * (
+        line_directions
+    )
+    found = (
+        ~parallel
+        & (line_coordinates >= 0)
+        & (line_coordinates <= 1)
+        & (first_coordinates >= -tolerance)
+        & (second_coordinates >= -tolerance)
+        & (first_coordinates + second_coordinates <= 1 + tolerance)
+    )
+    return found, intersection_points
@@ -14,7 +14,10 @@
 #
 """Data processor class for pvd data extraction."""
 
+import hashlib
 import logging
+from pathlib import Path
+from xml.etree import ElementTree
 
 import numpy as np
 import pyvista as pv
@@ -24,6 +27,9 @@ from queens.utils.logger_settings import log_init_args
 
 _logger = logging.getLogger(__name__)
 
+# Parsed pvd collections, keyed by the hash of the pvd file content
+_PVD_COLLECTIONS = {}
+
 
 class DataProcessorPvd(DataProcessor):
     """Class for extracting data from pvd.
@@ -81,30 +87,73 @@ class DataProcessorPvd(DataProcessor):
     def get_raw_data_from_file(self, file_path):
         """Get the raw data from the files of interest.
 
+        Only the collection of the pvd file is read here. As the pvd files of all jobs usually
+        have the same content, the parsed collection is cached.
+
         Args:
             file_path (str): Actual path to the file of interest.
 
         Returns:
-            raw_data (pv.PVDReader): PVDReader object.
+            raw_data (dict): Directory of the pvd file and datasets per time value.
         """
-        raw_data = pv.get_reader(file_path)
+        file_path = Path(file_path)
+        content = file_path.read_bytes()
+        key = hashlib.sha256(content).hexdigest()
+        if key not in _PVD_COLLECTIONS:
+            _PVD_COLLECTIONS[key] = self._parse_collection(content)
+        raw_data = {"directory": file_path.parent, "datasets": _PVD_COLLECTIONS[key]}
         return raw_data
 
+    @staticmethod
+    def _parse_collection(content):
+        """Parse the collection of a pvd file like the pyvista PVDReader.
+
+        Args:
+            content (bytes): Content of the pvd file
+
+        Returns:
+            dict: Datasets (pv.PVDDataSet) sorted by part per time value, sorted by time value
+        """
+        root = ElementTree.fromstring(content)
+        datasets = sorted(
+            pv.PVDDataSet(
+                float(element.attrib.get("timestep", 0)),
+                int(element.attrib.get("part", 0)),
+                element.attrib["file"],
+                element.attrib.get("group"),
+            )
+            for element in root[0].findall("DataSet")
+        )
+        collection = {}
+        for dataset in datasets:
+            collection.setdefault(dataset.time, []).append(dataset)
+        return collection
+
     def filter_and_manipulate_raw_data(self, raw_data):
         """Filter and manipulate the raw data.
 
+        Only the file of the considered block is read for each time step, restricted to the
+        field of interest.
+
         Args:
-            raw_data (pv.PVDReader): PVDReader object.
+            raw_data (dict): Directory of the pvd file and datasets per time value.
 
         Returns:
             processed_data (np.array): Cleaned, filtered or manipulated *data_processor* data.
         """
+        time_values = list(raw_data["datasets"])
         processed_data = []
         for time_step in self.time_steps:
-            raw_data.set_active_time_value(raw_data.time_values[time_step])
-            processed_data.append(
-                getattr(raw_data.read()[self.block], self.data_attribute)[self.field_name]
-            )
+            dataset = raw_data["datasets"][time_values[time_step]][self.block]
+            reader = pv.get_reader(raw_data["directory"] / dataset.path)
+            if hasattr(reader, "disable_all_point_arrays"):
+                reader.disable_all_point_arrays()
+                reader.disable_all_cell_arrays()
+                if self.data_attribute == "point_data":
+                    reader.enable_point_array(self.field_name)
+                else:
+                    reader.enable_cell_array(self.field_name)
+            processed_data.append(getattr(reader.read(), self.data_attribute)[self.field_name])
         processed_data = np.vstack(processed_data)
 
         return processed_data
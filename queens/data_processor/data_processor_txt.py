@@ -14,10 +14,14 @@
 #
 """Data processor class for txt data extraction."""
 
+import io
 import logging
+import mmap
 import re
 from pathlib import Path
 
+import numpy as np
+
 from queens.data_processor.data_processor import DataProcessor
 from queens.utils.logger_settings import log_init_args
 
@@ -38,10 +42,11 @@ class DataProcessorTxt(DataProcessor):
         This is due to the current design, which loads the entire content of the
         .txt file into memory.
 
-    Potential Improvement:
-        Use a generator for reading the content of the file in chunks.
-        This however requires a more advanced logic with the possibility to nest functions
-        calls in a flexible way.
+    Streaming:
+        With stream_raw_data=True the file is not loaded into memory. The raw data is then
+        the path to the file, which can be processed section by section with
+        _iter_sections_from_file and _extract_numeric_blocks_from_file. These memory-map
+        the file and only decode the extracted sections, so the file size is not limited.
     """
 
     @log_init_args
@@ -54,6 +59,7 @@ class DataProcessorTxt(DataProcessor):
         logger_prefix=r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} - "
         r"queens\.drivers\.driver_\d* - INFO -",
         max_file_size_in_mega_byte=200,
+        stream_raw_data=False,
     ):
         """Instantiate data processor class for txt data.
 
@@ -71,7 +77,9 @@ class DataProcessorTxt(DataProcessor):
                                                     each line of the queens log file.
             max_file_size_in_mega_byte (int):       Upper limit of the file size to be read into
                                                     memory in megabyte (MB). See comment above on
-                                                    Potential Improvement.
+                                                    Streaming.
+            stream_raw_data (bool):                 If True, the file is not read into memory
+                                                    and the raw data is the path to the file.
 
         Returns:
             Instance of DataProcessorTxt class
@@ -84,6 +92,9 @@ class DataProcessorTxt(DataProcessor):
         self.remove_logger_prefix_from_raw_data = remove_logger_prefix_from_raw_data
         self.logger_prefix = logger_prefix
         self.max_file_size_in_mega_byte = max_file_size_in_mega_byte
+        self.stream_raw_data = stream_raw_data
+        self._logger_prefix_bytes = rb"[^\n]*?(?:" + logger_prefix.encode("utf-8") + rb")"
+        self._logger_prefix_regex = re.compile(rb"^" + self._logger_prefix_bytes, re.MULTILINE)
 
     def get_raw_data_from_file(self, file_path):
         """Load the text file into memory.
@@ -92,8 +103,12 @@ class DataProcessorTxt(DataProcessor):
             file_path (str): Actual path to the file of interest.
 
         Returns:
-            raw_data (lst): A list of strings read in from file_path.
+            raw_data (lst, Path): A list of strings read in from file_path or, if the raw data
+                                  is streamed, the path to the file.
         """
+        if self.stream_raw_data:
+            return Path(file_path)
+
         raw_data = []
         try:
             self._check_file_size(file_path)
@@ -175,28 +190,176 @@ class DataProcessorTxt(DataProcessor):
                                             counter and the corresponding value is the
                                             extracted section of text (str).
         """
+        self._check_marker_type(marker_type, regex_start, regex_end)
         if marker_type == "start":
-            if regex_start == "":
-                raise ValueError("regex_start must be set when marker_type is 'start'")
             raw_section_data = self._extract_section_with_start_marker(raw_data, regex_start)
+        elif marker_type == "end":
+            raw_section_data = self._extract_section_with_end_marker(raw_data, regex_end)
+        else:
+            raw_section_data = self._extract_section_with_start_and_end_marker(
+                raw_data, regex_start, regex_end
+            )
+
+        return raw_section_data
 
+    @staticmethod
+    def _check_marker_type(marker_type, regex_start, regex_end):
+        """Check that the markers required by the marker type are set.
+
+        Args:
+            marker_type (str):  The type of marker indicating how the section should be
+                                extracted.
+            regex_start (str):  The regular expression pattern indicating the start of the
+                                section.
+            regex_end (str):    The regular expression pattern indicating the end of the
+                                section.
+        """
+        if marker_type == "start":
+            if regex_start == "":
+                raise ValueError("regex_start must be set when marker_type is 'start'")
         elif marker_type == "end":
             if regex_end == "":
                 raise ValueError("regex_end must be set when marker_type is 'end'")
-            raw_section_data = self._extract_section_with_end_marker(raw_data, regex_end)
-
         elif marker_type == "start_end":
             if regex_end == "" or regex_start == "":
                 raise ValueError(
                     "regex_start and regex_end must be set when marker_type is 'start_end'"
                 )
-            raw_section_data = self._extract_section_with_start_and_end_marker(
-                raw_data, regex_start, regex_end
-            )
         else:
             raise ValueError(f"Unrecognised marker_type: '{marker_type}'")
 
-        return raw_section_data
+    def _iter_sections_from_file(self, file_path, marker_type, regex_start="", regex_end=""):
+        """Stream the sections of a file.
+
+        Streaming counterpart of _extract_section_from_raw_data. The file is memory-mapped
+        and the markers are searched with precompiled byte-level regular expressions, so
+        only the extracted sections are decoded. The sections are the same as the ones of
+        _extract_section_from_raw_data applied to the raw data of the file, except that
+        empty sections are skipped.
+
+        The markers are matched per line after the logger prefix has been removed. A
+        leading '^' or trailing '$' anchors the marker at the start or end of the line.
+
+        Args:
+            file_path (str, Path):          Path to the file.
+            marker_type (str):              The type of marker indicating how the
+                                            section should be extracted.
+            regex_start (str, optional):    The regular expression pattern
+                                            indicating the start of the section.
+            regex_end (str, optional):      The regular expression pattern indicating
+                                            the end of the section.
+
+        Yields:
+            section (lst): Lines (str) of the section.
+        """
+        for section, _ in self._iter_section_slices(file_path, marker_type, regex_start, regex_end):
+            yield self._decode_lines(section)
+
+    def _extract_numeric_blocks_from_file(
+        self, file_path, marker_type, regex_start="", regex_end="", **loadtxt_options
+    ):
+        """Stream the numeric blocks between the markers of a file.
+
+        The body of each section, i.e. the section without its marker lines, is parsed with
+        np.loadtxt. Only the body of the current section is held in memory.
+
+        Args:
+            file_path (str, Path):          Path to the file.
+            marker_type (str):              The type of marker indicating how the
+                                            section should be extracted.
+            regex_start (str, optional):    The regular expression pattern
+                                            indicating the start of the section.
+            regex_end (str, optional):      The regular expression pattern indicating
+                                            the end of the section.
+            loadtxt_options (dict):         Additional keyword arguments for np.loadtxt.
+
+        Yields:
+            block (np.ndarray): Two-dimensional array of the numeric values of the section.
+        """
+        loadtxt_options.setdefault("ndmin", 2)
+        for _, body in self._iter_section_slices(file_path, marker_type, regex_start, regex_end):
+            lines = [line for line in self._decode_lines(body) if line.strip()]
+            if not lines:
+                yield np.empty((0, 0))
+                continue
+            yield np.loadtxt(lines, **loadtxt_options)
+
+    def _iter_section_slices(self, file_path, marker_type, regex_start, regex_end):
+        """Stream the byte slices of the sections of a file.
+
+        Args:
+            file_path (str, Path):  Path to the file.
+            marker_type (str):      The type of marker indicating how the section should be
+                                    extracted.
+            regex_start (str):      The regular expression pattern indicating the start of
+                                    the section.
+            regex_end (str):        The regular expression pattern indicating the end of the
+                                    section.
+
+        Yields:
+            section (bytes): The section including its marker lines.
+            body (bytes): The section without its marker lines.
+        """
+        self._check_marker_type(marker_type, regex_start, regex_end)
+        if Path(file_path).stat().st_size == 0:
+            return
+
+        with (
+            open(file_path, "rb") as file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file,
+        ):
+            if marker_type == "start":
+                spans = _start_marker_spans(mapped_file, self._compile_marker(regex_start))
+            elif marker_type == "end":
+                spans = _end_marker_spans(mapped_file, self._compile_marker(regex_end))
+            else:
+                spans = _start_and_end_marker_spans(
+                    mapped_file, self._compile_marker(regex_start), self._compile_marker(regex_end)
+                )
+            for start, end, body_start, body_end in spans:
+                if start < end:
+                    yield mapped_file[start:end], mapped_file[body_start:body_end]
+
+    def _compile_marker(self, regex):
+        """Compile a marker into byte-level regular expressions.
+
+        The candidate pattern is the bare marker, which is searched through the file. Its
+        matches are verified with the line pattern, which applies the logger prefix and
+        the line anchors.
+
+        Args:
+            regex (str): The regular expression pattern of the marker.
+
+        Returns:
+            candidate_regex (re.Pattern): Pattern of the marker without line anchors.
+            line_regex (re.Pattern): Pattern matching a whole marker line from its start.
+        """
+        pattern = regex.encode("utf-8")
+        line_pattern = pattern
+        if pattern.startswith(b"^"):
+            pattern = line_pattern = pattern[1:]
+        else:
+            line_pattern = rb"[^\n]*?(?:" + line_pattern + rb")"
+        if pattern.endswith(b"$") and not pattern.endswith(rb"\$"):
+            pattern = pattern[:-1]
+            line_pattern = line_pattern[:-1] + rb"[ \t\r]*$"
+        if self.remove_logger_prefix_from_raw_data:
+            line_pattern = self._logger_prefix_bytes + rb"[ \t]*" + line_pattern
+        return re.compile(pattern), re.compile(line_pattern, re.MULTILINE)
+
+    def _decode_lines(self, data):
+        """Decode a byte slice of the file into lines.
+
+        Args:
+            data (bytes): Byte slice of the file consisting of whole lines.
+
+        Returns:
+            lines (lst): The lines (str) as they would be in the raw data.
+        """
+        if self.remove_logger_prefix_from_raw_data:
+            data = self._logger_prefix_regex.sub(b"", data)
+            return [line.strip() for line in io.StringIO(data.decode("utf-8"))]
+        return list(io.StringIO(data.decode("utf-8")))
 
     @staticmethod
     def _extract_section_with_start_marker(raw_data, regex):
@@ -329,3 +492,110 @@ class DataProcessorTxt(DataProcessor):
         """
         matches = re.findall(regexp, line)
         return matches
+
+
+def _end_of_line(mapped_file, position):
+    """Get the position after the line containing the given position.
+
+    Args:
+        mapped_file (mmap.mmap): Memory-mapped file.
+        position (int): Position in the file.
+
+    Returns:
+        int: Position of the start of the next line or the end of the file.
+    """
+    newline = mapped_file.find(b"\n", position)
+    return len(mapped_file) if newline == -1 else newline + 1
+
+
+def _marker_lines(mapped_file, marker, position=0, end_position=None):
+    """Find the lines matching a marker.
+
+    Args:
+        mapped_file (mmap.mmap): Memory-mapped file.
+        marker (tuple): Candidate and line pattern of the marker.
+        position (int, optional): Position of the line to start the search at.
+        end_position (int, optional): Position to end the search at.
+
+    Yields:
+        int: Start position of the next marker line.
+    """
+    candidate_regex, line_regex = marker
+    if end_position is None:
+        end_position = len(mapped_file)
+    while position < end_position:
+        match = candidate_regex.search(mapped_file, position, end_position)
+        if match is None:
+            return
+        line_start = mapped_file.rfind(b"\n", 0, match.start()) + 1
+        line_end = _end_of_line(mapped_file, match.start())
+        if line_regex.match(mapped_file, line_start, line_end):
+            yield line_start
+        position = line_end
+
+
+def _start_marker_spans(mapped_file, start_marker):
+    """Get the spans of sections marked by their start.
+
+    Args:
+        mapped_file (mmap.mmap): Memory-mapped file.
+        start_marker (tuple): Candidate and line pattern of the start marker.
+
+    Yields:
+        tuple: Start and end of the section and of its body.
+    """
+    previous = None
+    for start in _marker_lines(mapped_file, start_marker):
+        if previous is not None:
+            yield previous, start, _end_of_line(mapped_file, previous), start
+        previous = start
+    if previous is not None:
+        yield previous, len(mapped_file), _end_of_line(mapped_file, previous), len(mapped_file)
+
+
+def _end_marker_spans(mapped_file, end_marker):
+    """Get the spans of sections marked by their end.
+
+    Args:
+        mapped_file (mmap.mmap): Memory-mapped file.
+        end_marker (tuple): Candidate and line pattern of the end marker.
+
+    Yields:
+        tuple: Start and end of the section and of its body.
+    """
+    previous = 0
+    for end_line in _marker_lines(mapped_file, end_marker):
+        end = _end_of_line(mapped_file, end_line)
+        yield previous, end, previous, end_line
+        previous = end
+    yield previous, len(mapped_file), previous, len(mapped_file)
+
+
+def _start_and_end_marker_spans(mapped_file, start_marker, end_marker):
+    """Get the spans of sections marked by their start and end.
+
+    A start line restarts the current section. Sections without an end line are dropped.
+
+    Args:
+        mapped_file (mmap.mmap): Memory-mapped file.
+        start_marker (tuple): Candidate and line pattern of the start marker.
+        end_marker (tuple): Candidate and line pattern of the end marker.
+
+    Yields:
+        tuple: Start and end of the section and of its body.
+    """
+    start = next(_marker_lines(mapped_file, start_marker), None)
+    end_line = None
+    while start is not None:
+        body_start = _end_of_line(mapped_file, start)
+        if end_line is None or end_line < body_start:
+            end_line = next(_marker_lines(mapped_file, end_marker, body_start), None)
+            if end_line is None:
+                return
+        section_end = _end_of_line(mapped_file, end_line)
+        next_start = next(_marker_lines(mapped_file, start_marker, body_start, section_end), None)
+        if next_start is not None:
+            start = next_start
+            continue
+        yield start, section_end, body_start, end_line
+        start = next(_marker_lines(mapped_file, start_marker, section_end), None)
@@ -27,8 +27,13 @@ class Driver(metaclass=abc.ABCMeta):
     Attributes:
         parameters (Parameters): Parameters object
         files_to_copy (list): files or directories to copy to experiment_dir
+        vectorized (bool): True if the driver runs whole batches of samples at once
+        batch_size (int, None): Maximum number of samples per batch for vectorized drivers
     """
 
+    vectorized = False
+    batch_size = None
+
     def __init__(self, parameters, files_to_copy=None):
         """Initialize Driver object.
 
@@ -41,6 +41,7 @@ class FourcDriver(JobscriptDriver):
         post_processor=None,
         post_options="",
         mpi_cmd="/usr/bin/mpirun --bind-to none",
+        log_chunk_size=None,
     ):
         """Initialize FourcDriver object.
 
@@ -54,6 +55,8 @@ class FourcDriver(JobscriptDriver):
             post_processor (path, opt): path to post_processor
             post_options (str, opt): options for post-processing
             mpi_cmd (str, opt): mpi command
+            log_chunk_size (int, opt): If provided, the output of 4C is read in chunks of this size
+                                       in bytes and written to the log files as is
         """
         extra_options = {
             "post_processor": post_processor,
@@ -69,4 +72,5 @@ class FourcDriver(JobscriptDriver):
             data_processor=data_processor,
             gradient_data_processor=gradient_data_processor,
             extra_options=extra_options,
+            log_chunk_size=log_chunk_size,
         )
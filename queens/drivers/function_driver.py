@@ -33,6 +33,8 @@ class FunctionDriver(Driver):
     Attributes:
         function (function): Function to evaluate.
         function_requires_job_id (bool): True if function requires job_id
+        vectorized (bool): True if the function is called once per batch of samples
+        batch_size (int, None): Maximum number of samples per batch in vectorized mode
     """
 
     @log_init_args
@@ -41,6 +43,8 @@ class FunctionDriver(Driver):
         parameters,
         function,
         external_python_module_function=None,
+        vectorized=False,
+        batch_size=None,
     ):
         """Initialize FunctionDriver object.
 
@@ -48,6 +52,12 @@ class FunctionDriver(Driver):
             parameters (Parameters): Parameters object
             function (callable, str): Function or name of example function provided by QUEENS
             external_python_module_function (Path | str): Path to external module with function
+            vectorized (bool, opt): If true, the function is called with column arrays of a whole
+                                    batch of samples instead of once per sample. The function
+                                    then has to return results (and gradients) stacked along the
+                                    first axis. Only use this for NumPy-vectorizable functions.
+            batch_size (int, opt): Maximum number of samples per batch in vectorized mode. By
+                                   default, the samples are split into one batch per job.
         """
         super().__init__(parameters=parameters)
         if external_python_module_function is None:
@@ -66,8 +76,14 @@ class FunctionDriver(Driver):
             or "job_id" in inspect.getfullargspec(my_function).args
         )
 
+        self.vectorized = vectorized
+        self.batch_size = batch_size
+
         # Wrap function to clean the output
-        self.function = self.function_wrapper(my_function)
+        if self.vectorized:
+            self.function = self.vectorized_function_wrapper(my_function)
+        else:
+            self.function = self.function_wrapper(my_function)
 
     @staticmethod
     def function_wrapper(function):
@@ -108,9 +124,54 @@ class FunctionDriver(Driver):
 
         return reshaped_output_function
 
+    @staticmethod
+    def vectorized_function_wrapper(function):
+        """Wrap the function to be used in vectorized mode.
+
+        The function is called with column arrays of the batch and the output is reshaped to the
+        per-sample convention, i.e. a scalar output per sample yields results of shape
+        (num_samples, 1) and gradients of shape (num_samples, 1, num_parameters).
+
+        Args:
+            function (function): Function to be wrapped
+
+        Returns:
+            reshaped_output_function (function): Wrapped function
+        """
+
+        def reshaped_output_function(samples_dict):
+            """Call function and reshape output.
+
+            Args:
+                samples_dict (dict): Dictionary containing column arrays of the parameters and
+                                     `job_id`
+
+            Returns:
+                (np.ndarray): Stacked results of the function call
+            """
+            result_array = function(**samples_dict)
+            if isinstance(result_array, tuple):
+                # here we expect a gradient return
+                result = np.asarray(result_array[0])
+                gradient = np.asarray(result_array[1])
+                if result.ndim == 1:
+                    result = np.expand_dims(result, axis=1)
+                    gradient = np.expand_dims(gradient, axis=1)
+                return result, gradient
+            # here no gradient return
+            result_array = np.asarray(result_array)
+            if result_array.ndim == 1:
+                result_array = np.expand_dims(result_array, axis=1)
+            return result_array, None
+
+        return reshaped_output_function
+
     def run(self, sample, job_id, num_procs, experiment_dir, experiment_name):
         """Run the driver.
 
+        In vectorized mode, *sample* is a batch of samples and *job_id* the corresponding array of
+        job ids.
+
         Args:
             sample (dict): Dict containing sample
             job_id (int): Job ID
@@ -121,7 +182,10 @@ class FunctionDriver(Driver):
         Returns:
             Result and potentially the gradient
         """
-        sample_dict = self.parameters.sample_as_dict(sample)
+        if self.vectorized:
+            sample_dict = self.parameters.samples_as_dict(sample)
+        else:
+            sample_dict = self.parameters.sample_as_dict(sample)
         if self.function_requires_job_id:
             sample_dict["job_id"] = job_id
         results = self.function(sample_dict)
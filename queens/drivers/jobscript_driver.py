@@ -14,19 +14,48 @@
 #
 """Driver to run a jobscript."""
 
+import asyncio
+import atexit
 import logging
+import os
+import shutil
+import socket
+import tarfile
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 
 from queens.drivers.driver import Driver
-from queens.utils.injector import inject, inject_in_template
+from queens.utils.config_directories import JOB_ARCHIVES_FOLDER_NAME, current_job_directory
+from queens.utils.injector import TemplateCache
 from queens.utils.io_utils import read_file
 from queens.utils.logger_settings import log_init_args
-from queens.utils.metadata import SimulationMetadata
-from queens.utils.run_subprocess import run_subprocess_with_logging
+from queens.utils.metadata import MetadataStore, SimulationMetadata
+from queens.utils.run_subprocess import (
+    run_subprocess_with_logging,
+    run_subprocess_with_logging_async,
+)
 
 _logger = logging.getLogger(__name__)
 
+# Job archives opened by the threads of this process, kept open to append without rescanning
+_JOB_ARCHIVES = {}
+
+# Regular expression in the output of a job on which the job is terminated
+TERMINATE_EXPRESSION = "PROC.*ERROR"
+
+
+def available_cores():
+    """Get the number of cores available to this process.
+
+    Returns:
+        int: Number of available cores
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
 
 @dataclass
 class JobOptions:
@@ -78,6 +107,21 @@ class JobscriptDriver(Driver):
         jobscript_template (str): read in jobscript template as string
         jobscript_options (dict): Dictionary containing jobscript options
         jobscript_file_name (str): Jobscript file name (default: 'jobscript.sh')
+        shard_levels (int): Number of shard directory levels of the job directories
+        scratch_dir (str, None): Node-local directory in which the jobs are run
+        archive_job_dirs (bool): If true, finished job directories are packed into one archive
+                                 per worker
+        template_cache (TemplateCache): Compiled input and jobscript templates
+        write_metadata_yaml (bool): If true, the metadata of each job is also written to a yaml
+                                    file in its job directory
+        write_metadata_store (bool): If true, the metadata of the jobs of each driver run is
+                                     appended to the metadata store of the experiment
+        max_concurrent_jobs (int, str, None): Maximum number of concurrently running jobs per
+                                              driver run if the jobs are run concurrently
+        vectorized (bool): True if a batch of jobs is run concurrently per driver run
+        batch_size (int, None): Maximum number of jobs per batch
+        log_chunk_size (int, None): Size of the chunks in bytes in which the output of the jobs
+                                    is streamed to the log files
     """
 
     @log_init_args
@@ -92,6 +136,14 @@ class JobscriptDriver(Driver):
         gradient_data_processor=None,
         jobscript_file_name="jobscript.sh",
         extra_options=None,
+        shard_levels=0,
+        scratch_dir=None,
+        archive_job_dirs=False,
+        write_metadata_yaml=True,
+        write_metadata_store=True,
+        max_concurrent_jobs=None,
+        batch_size=None,
+        log_chunk_size=None,
     ):
         """Initialize JobscriptDriver object.
 
@@ -105,6 +157,41 @@ class JobscriptDriver(Driver):
             gradient_data_processor (obj, opt): instance of data processor class for gradient data
             jobscript_file_name (str): Jobscript file name (default: 'jobscript.sh')
             extra_options (dict): Extra options to inject into jobscript template
+            shard_levels (int, opt): Number of shard directory levels of the job directories, e.g.,
+                                     two levels result in *experiment_dir/12/34/1234*. Use
+                                     sharding for a large number of jobs to limit the number of
+                                     entries per directory.
+            scratch_dir (str, opt): Node-local directory in which the jobs are run, e.g.,
+                                    "$TMPDIR". Environment variables are expanded on the worker.
+                                    Only the files of the data processors, the log and the error
+                                    file are copied back to the job directory.
+            archive_job_dirs (bool, opt): If true, finished job directories are appended to one
+                                          tar archive per worker in the job archives folder of
+                                          the experiment directory and removed afterwards
+            write_metadata_yaml (bool, opt): If true, the metadata of each job is also written to
+                                             a yaml file in its job directory.
+            write_metadata_store (bool, opt): If true, the metadata of the jobs of each driver run
+                                              is appended in one transaction to the metadata store
+                                              of the experiment. The records are written by the
+                                              workers, not by the scheduler. Hence, a batch only
+                                              spans the jobs of one driver run, i.e., one job
+                                              per transaction unless the jobs are run
+                                              concurrently with *max_concurrent_jobs*.
+            max_concurrent_jobs (int, str, opt): If provided, each driver run gets a batch of
+                                                 samples whose jobscripts are run concurrently by
+                                                 asyncio with at most this number of running
+                                                 jobscripts. With "auto", the number of available
+                                                 cores divided by the number of processors per job
+                                                 is used. Use this for I/O-bound jobscripts to
+                                                 drive many jobs from a single worker. By default,
+                                                 one job is run per driver run.
+            batch_size (int, opt): Maximum number of jobs per batch if the jobs are run
+                                   concurrently. By default, the samples are split into one batch
+                                   per scheduler job.
+            log_chunk_size (int, opt): If provided, the output of the jobs is read in chunks of
+                                       this size in bytes and written to the log files as is,
+                                       instead of logging it line by line. Use this for jobs with
+                                       a large output, e.g. solvers printing residuals.
         """
         super().__init__(parameters=parameters, files_to_copy=files_to_copy)
         self.input_templates = self.create_input_templates_dict(input_templates)
@@ -123,6 +210,23 @@ class JobscriptDriver(Driver):
         self.jobscript_options = extra_options
         self.jobscript_options["executable"] = executable
         self.jobscript_file_name = jobscript_file_name
+        self.shard_levels = shard_levels
+        self.scratch_dir = scratch_dir
+        self.archive_job_dirs = archive_job_dirs
+        self.template_cache = TemplateCache()
+        self.write_metadata_yaml = write_metadata_yaml
+        self.write_metadata_store = write_metadata_store
+
+        if max_concurrent_jobs is not None and max_concurrent_jobs != "auto":
+            if not isinstance(max_concurrent_jobs, int) or max_concurrent_jobs < 1:
+                raise ValueError(
+                    "max_concurrent_jobs has to be a positive integer or 'auto', "
+                    f"not {max_concurrent_jobs}."
+                )
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.vectorized = max_concurrent_jobs is not None
+        self.batch_size = batch_size
+        self.log_chunk_size = log_chunk_size
 
     @staticmethod
     def create_input_templates_dict(input_templates):
@@ -146,6 +250,10 @@ class JobscriptDriver(Driver):
     def run(self, sample, job_id, num_procs, experiment_dir, experiment_name):
         """Run the driver.
 
+        If the jobs are run concurrently, *sample* is a batch of samples and *job_id* the
+        corresponding array of job ids. The metadata records of the run are appended to the
+        metadata store in one transaction at the end of the run.
+
         Args:
             sample (dict): Dict containing sample
             job_id (int): Job ID
@@ -156,13 +264,209 @@ class JobscriptDriver(Driver):
         Returns:
             Result and potentially the gradient
         """
-        job_dir, output_dir, output_file, input_files, log_file, error_file = self._manage_paths(
-            job_id, experiment_dir, experiment_name
+        metadata_records = []
+        try:
+            if self.vectorized:
+                return asyncio.run(
+                    self._run_concurrently(
+                        sample, job_id, num_procs, experiment_dir, experiment_name, metadata_records
+                    )
+                )
+
+            with self._job_directory(
+                sample, job_id, experiment_dir, experiment_name, metadata_records
+            ) as (job_dir, sample_dict, metadata):
+                execute_cmd, output_dir, log_file, error_file = self._prepare_job(
+                    job_dir,
+                    sample_dict,
+                    metadata,
+                    job_id,
+                    num_procs,
+                    experiment_dir,
+                    experiment_name,
+                )
+                with metadata.time_code("run_jobscript"):
+                    self._run_executable(job_id, execute_cmd, log_file, error_file, verbose=False)
+                return self._process_results(output_dir, metadata)
+        finally:
+            if self.write_metadata_store:
+                MetadataStore(experiment_dir).append(metadata_records)
+
+    async def _run_concurrently(
+        self, samples, job_ids, num_procs, experiment_dir, experiment_name, metadata_records
+    ):
+        """Run a batch of jobs concurrently.
+
+        The jobscripts are run as asyncio subprocesses, such that a single worker can drive many
+        jobs at once. The number of concurrently running jobscripts is bounded by a semaphore.
+
+        Args:
+            samples (np.array): Batch of samples
+            job_ids (np.array): Job IDs of the samples
+            num_procs (int): number of processors per job
+            experiment_dir (Path): Path to QUEENS experiment directory.
+            experiment_name (str): name of QUEENS experiment.
+            metadata_records (list): List to which the metadata records of the jobs are appended
+
+        Returns:
+            results (list): Results of the jobs
+            gradients (list, None): Gradients of the jobs (None if no gradients are computed)
+        """
+        semaphore = asyncio.Semaphore(self.get_max_concurrent_jobs(num_procs))
+        job_results = await asyncio.gather(
+            *(
+                self._run_job_async(
+                    semaphore,
+                    sample,
+                    int(job_id),
+                    num_procs,
+                    experiment_dir,
+                    experiment_name,
+                    metadata_records,
+                )
+                for sample, job_id in zip(samples, job_ids)
+            ),
+            return_exceptions=True,
         )
+        for job_result in job_results:
+            if isinstance(job_result, BaseException):
+                raise job_result
+
+        results, gradients = zip(*job_results)
+        if all(gradient is None for gradient in gradients):
+            return list(results), None
+        return list(results), list(gradients)
+
+    async def _run_job_async(
+        self,
+        semaphore,
+        sample,
+        job_id,
+        num_procs,
+        experiment_dir,
+        experiment_name,
+        metadata_records,
+    ):
+        """Run a single job of a batch.
+
+        Args:
+            semaphore (asyncio.Semaphore): Semaphore bounding the number of running jobscripts
+            sample (np.array): Sample
+            job_id (int): Job ID
+            num_procs (int): number of processors
+            experiment_dir (Path): Path to QUEENS experiment directory.
+            experiment_name (str): name of QUEENS experiment.
+            metadata_records (list): List to which the metadata record of the job is appended
+
+        Returns:
+            Result and potentially the gradient
+        """
+        with self._job_directory(
+            sample, job_id, experiment_dir, experiment_name, metadata_records
+        ) as (job_dir, sample_dict, metadata):
+            # the input injection and the data processing run in threads, such that the output of
+            # the other jobs is still read meanwhile
+            execute_cmd, output_dir, log_file, error_file = await asyncio.to_thread(
+                self._prepare_job,
+                job_dir,
+                sample_dict,
+                metadata,
+                job_id,
+                num_procs,
+                experiment_dir,
+                experiment_name,
+            )
+            async with semaphore:
+                with metadata.time_code("run_jobscript"):
+                    await run_subprocess_with_logging_async(
+                        execute_cmd,
+                        terminate_expression=TERMINATE_EXPRESSION,
+                        logger_name=__name__ + f"_{job_id}",
+                        log_file=str(log_file),
+                        error_file=str(error_file),
+                        raise_error_on_subprocess_failure=False,
+                        log_chunk_size=self.log_chunk_size,
+                    )
+            return await asyncio.to_thread(self._process_results, output_dir, metadata)
+
+    def get_max_concurrent_jobs(self, num_procs):
+        """Get the maximum number of concurrently running jobs.
+
+        Args:
+            num_procs (int): number of processors per job
+
+        Returns:
+            int: Maximum number of concurrently running jobs
+        """
+        if self.max_concurrent_jobs != "auto":
+            return self.max_concurrent_jobs
+        return max(available_cores() // max(num_procs, 1), 1)
+
+    @contextmanager
+    def _job_directory(self, sample, job_id, experiment_dir, experiment_name, metadata_records):
+        """Provide the directory of a job and collect its metadata.
+
+        The job is run in the scratch directory if one is used. After the job, the outputs are
+        copied back, the metadata record is collected for the metadata store and, if the job was
+        successful, the job directory is archived.
+
+        Args:
+            sample (np.array): Sample
+            job_id (int): Job ID
+            experiment_dir (Path): Path to QUEENS experiment directory.
+            experiment_name (str): name of QUEENS experiment.
+            metadata_records (list): List to which the metadata record of the job is appended
+
+        Yields:
+            job_dir (Path): Path to the job directory in which the job is run
+            sample_dict (dict): Dict containing sample
+            metadata (SimulationMetadata): Metadata of the job
+        """
+        final_job_dir = current_job_directory(experiment_dir, job_id, self.shard_levels)
+        scratch_job_dir = self._scratch_job_directory(job_id, experiment_name)
+        final_job_dir.mkdir(parents=True, exist_ok=True)
 
         sample_dict = self.parameters.sample_as_dict(sample)
 
-        metadata = SimulationMetadata(job_id=job_id, inputs=sample_dict, job_dir=job_dir)
+        metadata = SimulationMetadata(
+            job_id=job_id,
+            inputs=sample_dict,
+            job_dir=final_job_dir,
+            export_yaml=self.write_metadata_yaml,
+        )
+        try:
+            yield scratch_job_dir or final_job_dir, sample_dict, metadata
+        finally:
+            if scratch_job_dir is not None:
+                self._copy_back_from_scratch(scratch_job_dir, final_job_dir)
+            metadata_records.append(metadata.to_record())
+
+        if self.archive_job_dirs:
+            self._archive_job_directory(final_job_dir, experiment_dir)
+
+    def _prepare_job(
+        self, job_dir, sample_dict, metadata, job_id, num_procs, experiment_dir, experiment_name
+    ):
+        """Prepare the input files and the jobscript in a job directory.
+
+        Args:
+            job_dir (Path): Path to the job directory in which the job is run
+            sample_dict (dict): Dict containing sample
+            metadata (SimulationMetadata): Metadata of the job
+            job_id (int): Job ID
+            num_procs (int): number of processors
+            experiment_dir (Path): Path to QUEENS experiment directory.
+            experiment_name (str): name of QUEENS experiment.
+
+        Returns:
+            execute_cmd (str): Command to run the jobscript
+            output_dir (Path): Path to output directory
+            log_file (Path): Path to log file
+            error_file (Path): Path to error file
+        """
+        job_dir, output_dir, output_file, input_files, log_file, error_file = self._manage_paths(
+            job_id, job_dir, experiment_name
+        )
 
         with metadata.time_code("prepare_input_files"):
             job_options = JobOptions(
@@ -184,28 +488,34 @@ class JobscriptDriver(Driver):
             jobscript_file = job_dir / self.jobscript_file_name
 
             # Create jobscript
-            inject_in_template(
-                job_options.add_data_and_to_dict(self.jobscript_options),
-                self.jobscript_template,
-                str(jobscript_file),
+            self.template_cache.from_string(self.jobscript_template).write(
+                job_options.add_data_and_to_dict(self.jobscript_options), jobscript_file
             )
 
-        with metadata.time_code("run_jobscript"):
-            execute_cmd = "bash " + str(jobscript_file)
-            self._run_executable(job_id, execute_cmd, log_file, error_file, verbose=False)
+        execute_cmd = "bash " + str(jobscript_file)
+        return execute_cmd, output_dir, log_file, error_file
+
+    def _process_results(self, output_dir, metadata):
+        """Process the results of a job.
+
+        Args:
+            output_dir (Path): Path to output directory
+            metadata (SimulationMetadata): Metadata of the job
 
+        Returns:
+            Result and potentially the gradient
+        """
         with metadata.time_code("data_processing"):
             results = self._get_results(output_dir)
             metadata.outputs = results
-
         return results
 
-    def _manage_paths(self, job_id, experiment_dir, experiment_name):
+    def _manage_paths(self, job_id, job_dir, experiment_name):
         """Manage paths for driver run.
 
         Args:
             job_id (int): Job id.
-            experiment_dir (Path): Path to QUEENS experiment directory.
+            job_dir (Path): Path to the job directory
             experiment_name (str): name of QUEENS experiment.
 
         Returns:
@@ -216,7 +526,6 @@ class JobscriptDriver(Driver):
             log_file (Path): Path to log file
             error_file (Path): Path to error file
         """
-        job_dir = experiment_dir / str(job_id)
         output_dir = job_dir / "output"
         output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -235,8 +544,75 @@ class JobscriptDriver(Driver):
 
         return job_dir, output_dir, output_file, input_files, log_file, error_file
 
+    def _scratch_job_directory(self, job_id, experiment_name):
+        """Get the job directory in the node-local scratch directory.
+
+        Args:
+            job_id (int): Job id
+            experiment_name (str): name of QUEENS experiment.
+
+        Returns:
+            Path, None: Path to the scratch job directory (None if no scratch directory is used)
+        """
+        if self.scratch_dir is None:
+            return None
+
+        scratch_dir = os.path.expandvars(self.scratch_dir)
+        if "$" in scratch_dir:
+            _logger.warning(
+                "Scratch directory %s could not be expanded. Running job %s in the job directory.",
+                self.scratch_dir,
+                job_id,
+            )
+            return None
+        return Path(scratch_dir) / experiment_name / str(job_id)
+
+    def _copy_back_from_scratch(self, scratch_job_dir, job_dir):
+        """Copy outputs from the scratch directory to the job directory and clean up.
+
+        Args:
+            scratch_job_dir (Path): Path to the scratch job directory
+            job_dir (Path): Path to the job directory
+        """
+        scratch_output_dir = scratch_job_dir / "output"
+        patterns = ["*.log", "*.err"] + [
+            data_processor.file_name_identifier
+            for data_processor in (self.data_processor, self.gradient_data_processor)
+            if data_processor is not None
+        ]
+        for pattern in patterns:
+            for file in scratch_output_dir.glob(pattern):
+                destination = job_dir / "output" / file.relative_to(scratch_output_dir)
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(file, destination)
+        shutil.rmtree(scratch_job_dir, ignore_errors=True)
+
     @staticmethod
-    def _run_executable(job_id, execute_cmd, log_file, error_file, verbose=False):
+    def _archive_job_directory(job_dir, experiment_dir):
+        """Append a job directory to the archive of this worker thread and remove it.
+
+        Each thread of a worker appends to its own archive, such that no lock is needed. The
+        archive stays open and is flushed after each job.
+
+        Args:
+            job_dir (Path): Path to the job directory
+            experiment_dir (Path): Path to QUEENS experiment directory.
+        """
+        archive_dir = Path(experiment_dir) / JOB_ARCHIVES_FOLDER_NAME
+        archive_path = (
+            archive_dir / f"{socket.gethostname()}_{os.getpid()}_{threading.get_ident()}.tar"
+        )
+        if archive_path not in _JOB_ARCHIVES:
+            archive_dir.mkdir(exist_ok=True)
+            # closed by close_job_archives at exit
+            archive = tarfile.open(archive_path, "a")  # pylint: disable=consider-using-with
+            _JOB_ARCHIVES[archive_path] = (os.getpid(), archive)
+        archive = _JOB_ARCHIVES[archive_path][1]
+        archive.add(job_dir, arcname=job_dir.relative_to(experiment_dir))
+        archive.fileobj.flush()
+        shutil.rmtree(job_dir)
+
+    def _run_executable(self, job_id, execute_cmd, log_file, error_file, verbose=False):
         """Run executable.
 
         Args:
@@ -248,12 +624,13 @@ class JobscriptDriver(Driver):
         """
         run_subprocess_with_logging(
             execute_cmd,
-            terminate_expression="PROC.*ERROR",
+            terminate_expression=TERMINATE_EXPRESSION,
             logger_name=__name__ + f"_{job_id}",
             log_file=str(log_file),
             error_file=str(error_file),
             streaming=verbose,
             raise_error_on_subprocess_failure=False,
+            log_chunk_size=self.log_chunk_size,
         )
 
     def _get_results(self, output_dir):
@@ -286,8 +663,20 @@ class JobscriptDriver(Driver):
             input_files (dict): Dict with name and path of the input file(s)
         """
         for input_template_name, input_template_path in self.input_templates.items():
-            inject(
-                sample_dict,
-                experiment_dir / input_template_path.name,
-                input_files[input_template_name],
+            self.template_cache.from_file(experiment_dir / input_template_path.name).write(
+                sample_dict, input_files[input_template_name]
             )
+
+
+def close_job_archives():
+    """Close the job archives opened by this process.
+
+    Archives inherited by forked processes are left to their parent process.
+    """
+    for archive_path, (pid, archive) in list(_JOB_ARCHIVES.items()):
+        if pid == os.getpid():
+            archive.close()
+            del _JOB_ARCHIVES[archive_path]
+
+
+atexit.register(close_job_archives)
@@ -17,15 +17,42 @@
 # pylint: disable=too-many-lines
 import copy
 import fileinput
+import hashlib
+import io
+import logging
+import mmap
 import os
 import re
 import shutil
+from pathlib import Path
 
 import numpy as np
 
 from queens.external_geometry.external_geometry import ExternalGeometry
 from queens.utils.logger_settings import log_init_args
 
+_logger = logging.getLogger(__name__)
+
+# Bump if the layout of the parsed dat files changes, to invalidate the geometry cache files
+GEOMETRY_CACHE_VERSION = 1
+
+# Last parsed dat file of this process, keyed by its content hash. Only one file is kept to bound
+# the memory, repeated reads of other files are served by the geometry cache files.
+_PARSED_DAT_FILES = {}
+
+_SECTION_NAME_REGEX = re.compile("^-+([^-].+)$")
+_SECTION_CANDIDATE_REGEX = re.compile(rb"^[^\S\n]*-[^\n]*", re.MULTILINE)
+_CONTENT_LINE_REGEX = re.compile(rb"^[^\S\n]*(?!//)\S", re.MULTILINE)
+_ELEMENT_LINE_REGEX = re.compile(
+    rb"^[^\S\n]*(\d+)[ \t]+\S+[ \t]+\S+([^\n]*?)MAT[ \t]*(\d+)", re.MULTILINE
+)
+_TOPOLOGY_ATTRIBUTES = {
+    "DNODE": "node_topology",
+    "DLINE": "line_topology",
+    "DSURFACE": "surface_topology",
+    "DVOL": "volume_topology",
+}
+
 
 class FourcDatExternalGeometry(ExternalGeometry):
     """Class to read in external geometries based on 4C dat files.
@@ -68,6 +95,8 @@ class FourcDatExternalGeometry(ExternalGeometry):
         random_neumann_flag (bool): Flag to check if a random Neumann BC exists.
         nodes_written (bool): Flag to check whether nodes have already been written.
         random_fields (lst): List of random field descriptions.
+        geometry_cache_dir (Path): Directory in which the parsed dat files are stored as npz
+                                   files.
 
     Returns:
         geometry_obj (obj): Instance of FourcDatExternalGeometry class
@@ -110,6 +139,7 @@ class FourcDatExternalGeometry(ExternalGeometry):
         list_geometric_sets=None,
         associated_material_numbers_geometric_set=None,
         random_fields=None,
+        geometry_cache_dir=None,
     ):
         """Initialize 4C external geometry.
 
@@ -122,6 +152,10 @@ class FourcDatExternalGeometry(ExternalGeometry):
             associated_material_numbers_geometric_set (lst): List of associated material numbers wrt
                                                              to the geometric sets of interest
             random_fields (lst): List of random field descriptions
+            geometry_cache_dir (str, opt): Directory in which the parsed dat file is stored, so
+                                           that it is only parsed once for all runs sharing the
+                                           same dat file. Without it, the parsed dat file is only
+                                           cached in memory.
         """
         super().__init__()
         # settings / inputs
@@ -156,10 +190,15 @@ class FourcDatExternalGeometry(ExternalGeometry):
         self.nodes_written = False
         self.random_fields = random_fields
 
+        self.geometry_cache_dir = geometry_cache_dir
+        if self.geometry_cache_dir is not None:
+            self.geometry_cache_dir = Path(self.geometry_cache_dir)
+            self.geometry_cache_dir.mkdir(parents=True, exist_ok=True)
+
     # --------------- child methods that must be implemented --------------------------------------
     def read_external_data(self):
         """Read the external input file with geometric data."""
-        self.read_geometry_from_dat_file()
+        self.read_geometry_from_dat_file_in_bulk()
 
     def organize_sections(self):
         """Organize the sections of the external *external_geometry_obj*."""
@@ -194,20 +233,129 @@ class FourcDatExternalGeometry(ExternalGeometry):
                     self.get_materials(line)
                     self.get_elements_belonging_to_desired_material(line)
 
+    def read_geometry_from_dat_file_in_bulk(self):
+        """Read the dat-file section-wise with vectorized parsing.
+
+        Yields the same geometry as *read_geometry_from_dat_file*, but the sections of the dat-file
+        are parsed as a whole and the parsed dat-file is cached, such that it is parsed only once
+        per content.
+        """
+        parsed_dat_file = self._get_parsed_dat_file()
+
+        self.nodeset_names.update(parsed_dat_file["DNODE_sets"].tolist())
+        nodes_of_interest = []
+        for topology_type, section in self.section_match_dict.items():
+            topology_attribute = _TOPOLOGY_ATTRIBUTES[topology_type]
+            topology = []
+            for topology_name in self.desired_dat_sections.get(section, []):
+                set_type, set_number = topology_name.split()
+                if set_type != topology_type:
+                    continue
+                in_set = parsed_dat_file[f"{topology_type}_sets"] == int(set_number)
+                if not np.any(in_set):
+                    continue
+                topology.append(
+                    {
+                        "node_mesh": parsed_dat_file[f"{topology_type}_nodes"][in_set].tolist(),
+                        topology_attribute: parsed_dat_file[f"{topology_type}_sets"][
+                            in_set
+                        ].tolist(),
+                        "topology_name": topology_name,
+                    }
+                )
+                nodes_of_interest.extend(topology[-1]["node_mesh"])
+            if topology:
+                setattr(self, topology_attribute, topology)
+
+        if parsed_dat_file["node_ids"].size:
+            self.nodes_of_interest = list(set(nodes_of_interest))
+            of_interest = np.isin(parsed_dat_file["node_ids"], self.nodes_of_interest)
+            self.node_coordinates["node_mesh"].extend(
+                parsed_dat_file["node_ids"][of_interest].tolist()
+            )
+            self.node_coordinates["coordinates"].extend(
+                parsed_dat_file["node_coordinates"][of_interest].tolist()
+            )
+
+        self.original_materials_in_dat.extend(parsed_dat_file["materials"].tolist())
+
+        if self.list_associated_material_numbers:
+            # TODO atm we only can handle one material # pylint: disable=fixme
+            material_number = self.list_associated_material_numbers[0][0]
+            of_material = np.flatnonzero(parsed_dat_file["element_materials"] == material_number)
+            offsets = np.concatenate(([0], np.cumsum(parsed_dat_file["element_node_counts"])))
+            element_nodes = parsed_dat_file["element_nodes"].tolist()
+            self.element_topology[0]["element_number"].extend(
+                parsed_dat_file["element_numbers"][of_material].tolist()
+            )
+            self.element_topology[0]["nodes"].extend(
+                element_nodes[start:end]
+                for start, end in zip(
+                    offsets[of_material].tolist(), offsets[of_material + 1].tolist()
+                )
+            )
+            self.element_topology[0]["material"].extend(
+                parsed_dat_file["element_materials"][of_material].tolist()
+            )
+
+    def _get_parsed_dat_file(self):
+        """Get the parsed dat-file from the cache or parse it.
+
+        Returns:
+            parsed_dat_file (dict): Arrays of the parsed dat-file (see *parse_dat_file*)
+        """
+        key = _dat_file_key(self.path_to_dat_file)
+        if key not in _PARSED_DAT_FILES:
+            cache_file = None
+            if self.geometry_cache_dir is not None:
+                cache_file = self.geometry_cache_dir / f"fourc_dat_{key}.npz"
+
+            if cache_file is not None and cache_file.is_file():
+                with np.load(cache_file) as cached_dat_file:
+                    parsed_dat_file = dict(cached_dat_file)
+                _logger.debug("Loaded parsed dat file from %s.", cache_file)
+            else:
+                parsed_dat_file = parse_dat_file(self.path_to_dat_file, self.dat_sections)
+                if cache_file is not None:
+                    temporary_file = cache_file.with_name(f"{cache_file.stem}.{os.getpid()}.tmp")
+                    with open(temporary_file, "wb") as file:
+                        np.savez(file, **parsed_dat_file)
+                    os.replace(temporary_file, cache_file)
+            _PARSED_DAT_FILES.clear()
+            _PARSED_DAT_FILES[key] = parsed_dat_file
+
+        return _PARSED_DAT_FILES[key]
+
     def _get_element_centers(self):
         """Calculate the geometric center of each finite element."""
-        element_centers = []
         # TODO atm we only take first element of the list and dont loop over several random fields # pylint: disable=fixme
-        for element_node_lst in self.element_topology[0]["nodes"]:
-            element_center = np.array([0.0, 0.0, 0.0])
-            for node in element_node_lst:
-                element_center += np.array(
-                    self.node_coordinates["coordinates"][
-                        self.node_coordinates["node_mesh"].index(int(node))
-                    ]
+        element_nodes = self.element_topology[0]["nodes"]
+        if not element_nodes:
+            self.element_centers = np.array([])
+            return
+
+        node_mesh = np.asarray(self.node_coordinates["node_mesh"], dtype=np.int64)
+        coordinates = np.asarray(self.node_coordinates["coordinates"], dtype=float).reshape(
+            len(node_mesh), -1
+        )
+        sorter = np.argsort(node_mesh, kind="stable")
+
+        # elements with the same number of nodes are treated at once
+        num_element_nodes = np.array([len(nodes) for nodes in element_nodes])
+        element_centers = np.empty((len(element_nodes), coordinates.shape[1]))
+        for num_nodes in np.unique(num_element_nodes):
+            elements = np.flatnonzero(num_element_nodes == num_nodes)
+            nodes = np.array([element_nodes[element] for element in elements], dtype=np.int64)
+            node_indices = sorter[
+                np.searchsorted(node_mesh, nodes, sorter=sorter).clip(max=len(node_mesh) - 1)
+            ]
+            missing_nodes = node_mesh[node_indices] != nodes
+            if np.any(missing_nodes):
+                raise ValueError(
+                    f"No coordinates found for the element nodes {nodes[missing_nodes].tolist()}."
                 )
-            element_centers.append(element_center / float(len(element_node_lst)))
-        self.element_centers = np.array(element_centers)
+            element_centers[elements] = coordinates[node_indices].sum(axis=1) / float(num_nodes)
+        self.element_centers = element_centers
 
     def get_current_dat_section(self, line):
         """Check if the current line starts a new section in the dat-file.
@@ -221,22 +369,9 @@ class FourcDatExternalGeometry(ExternalGeometry):
         Returns:
             bool (boolean): True or False depending if current line is the section match
         """
-        # regex for the sections
-        section_name_re = re.compile("^-+([^-].+)$")
-        match = section_name_re.match(line)
         # get the current section of the dat file
-        if match:
-            # remove whitespaces and horizontal line
-            section_string = line.strip("-")
-            section_string = section_string.strip()
-            # check for comments
-            if line[:2] == "//":
-                return True
-            # ignore comment pattern after actual string
-            if section_string.strip("//") in self.dat_sections:
-                self.current_dat_section = section_string
-                return True
-            self.current_dat_section = None
+        if _SECTION_NAME_REGEX.match(line):
+            self.current_dat_section = _get_dat_section(line, self.dat_sections)
             return True
         return False
 
@@ -1239,3 +1374,141 @@ class FourcDatExternalGeometry(ExternalGeometry):
             field_coords (np.ndarray): Coordinates of the discretized random field
         """
         self.coords_dict[field_name] = {"keys": field_keys, "coords": field_coords}
+
+
+def _get_dat_section(line, dat_sections):
+    """Get the dat-section started by a section line.
+
+    Args:
+        line (str): Stripped section line of the dat-file
+        dat_sections (list): Names of the dat-sections of interest
+
+    Returns:
+        dat_section (str): Name of the dat-section or None if it is not of interest
+    """
+    # remove whitespaces and horizontal line
+    section_string = line.strip("-").strip()
+    # ignore comment pattern after actual string
+    if section_string.strip("//") in dat_sections:
+        return section_string
+    return None
+
+
+def _dat_file_key(path_to_dat_file):
+    """Hash the content of a dat-file.
+
+    Args:
+        path_to_dat_file (str, Path): Path to the dat-file
+
+    Returns:
+        key (str): Hex digest of the dat-file and the cache version
+    """
+    hasher = hashlib.sha256(str(GEOMETRY_CACHE_VERSION).encode())
+    with open(path_to_dat_file, "rb") as file:
+        for chunk in iter(lambda: file.read(2**24), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _load_columns(buffer, start, end, columns, dtype):
+    """Load columns of the lines in a slice of the dat-file.
+
+    Args:
+        buffer (mmap.mmap): Memory-mapped dat-file
+        start (int): Start of the slice
+        end (int): End of the slice
+        columns (tuple): Indices of the whitespace separated columns to load
+        dtype (type): Data type of the columns
+
+    Returns:
+        np.ndarray: Array with one row per line and one column per loaded column
+    """
+    if _CONTENT_LINE_REGEX.search(buffer, start, end) is None:
+        return np.empty((0, len(columns)), dtype=dtype)
+    return np.loadtxt(
+        io.BytesIO(buffer[start:end]), usecols=columns, dtype=dtype, comments="//", ndmin=2
+    )
+
+
+def parse_dat_file(path_to_dat_file, dat_sections):
+    """Parse the geometry of a dat-file independent of the geometric sets of interest.
+
+    The section lines are located in one pass over the memory-mapped dat-file. The sections are
+    then parsed as a whole, such that the parsing cost does not scale with the number of Python
+    operations per line.
+
+    Args:
+        path_to_dat_file (str, Path): Path to the dat-file
+        dat_sections (list): Names of the dat-sections of interest
+
+    Returns:
+        parsed_dat_file (dict): Arrays of the topology per topology type (*<type>_nodes* and
+                                *<type>_sets*), the node ids and coordinates, the element
+                                numbers, materials and nodes (flattened, with *element_node_counts*
+                                nodes per element) and the material numbers
+    """
+    section_match_dict = FourcDatExternalGeometry.section_match_dict
+    parsed_sections = {section: [] for section in ["NODE COORDS", "MATERIALS", "ELEMENTS"]}
+    parsed_sections.update({section: [] for section in section_match_dict.values()})
+
+    with open(path_to_dat_file, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            buffer = b""
+        else:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # locate the sections in one pass over the file
+        section_spans = []
+        for candidate in _SECTION_CANDIDATE_REGEX.finditer(buffer):
+            line = candidate.group().decode("utf-8").strip()
+            if _SECTION_NAME_REGEX.match(line):
+                if section_spans:
+                    section_spans[-1][2] = candidate.start()
+                section_spans.append([_get_dat_section(line, dat_sections), candidate.end(), None])
+        if section_spans:
+            section_spans[-1][2] = len(buffer)
+
+        for section, start, end in section_spans:
+            if section in section_match_dict.values():
+                parsed_sections[section].append(_load_columns(buffer, start, end, (1, 3), np.int64))
+            elif section == "NODE COORDS":
+                parsed_sections[section].append(
+                    _load_columns(buffer, start, end, (1, 3, 4, 5), float)
+                )
+            elif section == "MATERIALS":
+                parsed_sections[section].append(_load_columns(buffer, start, end, (1,), np.int64))
+            elif section is not None and "ELEMENTS" in section:
+                parsed_sections["ELEMENTS"].extend(_ELEMENT_LINE_REGEX.findall(buffer, start, end))
+
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+    parsed_dat_file = {}
+    for topology_type, section in section_match_dict.items():
+        topology = np.concatenate(parsed_sections[section] or [np.empty((0, 2), np.int64)])
+        parsed_dat_file[f"{topology_type}_nodes"] = topology[:, 0]
+        parsed_dat_file[f"{topology_type}_sets"] = topology[:, 1]
+
+    nodes = np.concatenate(parsed_sections["NODE COORDS"] or [np.empty((0, 4))])
+    parsed_dat_file["node_ids"] = nodes[:, 0].astype(np.int64)
+    parsed_dat_file["node_coordinates"] = nodes[:, 1:]
+
+    elements = parsed_sections["ELEMENTS"]
+    element_nodes = [nodes.split() for _, nodes, _ in elements]
+    parsed_dat_file["element_numbers"] = np.array(
+        [number for number, _, _ in elements], dtype=np.int64
+    )
+    parsed_dat_file["element_materials"] = np.array(
+        [material for _, _, material in elements], dtype=np.int64
+    )
+    parsed_dat_file["element_node_counts"] = np.array(
+        [len(nodes) for nodes in element_nodes], dtype=np.int64
+    )
+    parsed_dat_file["element_nodes"] = np.array(
+        [node for nodes in element_nodes for node in nodes], dtype=np.int64
+    )
+
+    parsed_dat_file["materials"] = np.concatenate(
+        parsed_sections["MATERIALS"] or [np.empty((0, 1), np.int64)]
+    )[:, 0]
+    return parsed_dat_file
@@ -15,6 +15,15 @@
 """Base module for iterators or methods."""
 
 import abc
+import logging
+import pickle
+import random
+
+import numpy as np
+
+from queens.utils.checkpointing import find_schedulers
+
+_logger = logging.getLogger(__name__)
 
 
 class Iterator(metaclass=abc.ABCMeta):
@@ -31,6 +40,9 @@ class Iterator(metaclass=abc.ABCMeta):
                                           the output directory
     """
 
+    # Attributes that are created from the input and therefore not part of the state
+    non_state_attributes = ("model", "parameters", "global_settings", "checkpoint")
+
     def __init__(self, model, parameters, global_settings):
         """Initialize iterator object.
 
@@ -51,6 +63,15 @@ class Iterator(metaclass=abc.ABCMeta):
     def core_run(self):
         """Core part of the run, implemented by all derived classes."""
 
+    def checkpoint(self):
+        """Mark a point of the core run from which the run can resume.
+
+        Iterators call this method where their state fully determines the rest of the core run,
+        e.g., at the start of an iteration of their main loop. During checkpointing, a state
+        snapshot is written here, and restarts continue the core run from the latest snapshot.
+        Otherwise, nothing is done.
+        """
+
     def post_run(self):
         """Optional post-run portion of run.
 
@@ -62,3 +83,44 @@ class Iterator(metaclass=abc.ABCMeta):
         self.pre_run()
         self.core_run()
         self.post_run()
+
+    def get_state(self):
+        """Get the state of the iterator, e.g., for checkpoints.
+
+        By default, the state contains all picklable attributes (except for the ones created
+        from the input), the states of the random number generators and the next job ids of the
+        schedulers. Iterators can extend the state if needed.
+
+        Returns:
+            state (dict): State of the iterator
+        """
+        attributes = {}
+        for name, value in vars(self).items():
+            if name in self.non_state_attributes:
+                continue
+            try:
+                pickle.dumps(value)
+            except Exception:  # pylint: disable=broad-exception-caught
+                _logger.debug("Attribute %s is not picklable and not part of the state.", name)
+                continue
+            attributes[name] = value
+
+        return {
+            "attributes": attributes,
+            "numpy_random_state": np.random.get_state(),
+            "random_state": random.getstate(),
+            "next_job_ids": [scheduler.next_job_id for scheduler in find_schedulers(self)],
+        }
+
+    def set_state(self, state):
+        """Set the state of the iterator, e.g., from a checkpoint.
+
+        Args:
+            state (dict): State of the iterator, see get_state
+        """
+        for name, value in state["attributes"].items():
+            setattr(self, name, value)
+        np.random.set_state(state["numpy_random_state"])
+        random.setstate(state["random_state"])
+        for scheduler, next_job_id in zip(find_schedulers(self), state["next_job_ids"]):
+            scheduler.next_job_id = next_job_id
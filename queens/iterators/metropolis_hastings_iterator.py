@@ -69,6 +69,7 @@ class MetropolisHastingsIterator(Iterator):
         seed (int): Seed for random number generation.
         accepted (np.array): Number of accepted proposals per chain.
         accepted_interval (np.array): Number of proposals per chain in current tuning interval.
+        next_step_id (int): Index of the next step of the chains.
     """
 
     @log_init_args
@@ -154,6 +155,7 @@ class MetropolisHastingsIterator(Iterator):
 
         self.accepted = np.zeros((self.num_chains, 1))
         self.accepted_interval = np.zeros((self.num_chains, 1))
+        self.next_step_id = 1
 
     def eval_log_prior(self, samples):
         """Evaluate natural logarithm of prior at samples of chains.
@@ -255,6 +257,7 @@ class MetropolisHastingsIterator(Iterator):
             self.proposal_distribution = NormalDistribution(mean=mean, covariance=cov_mat)
 
         self.gamma = gamma
+        self.next_step_id = 1
 
         self.chains[0] = initial_samples
         self.log_likelihood[0] = initial_log_like
@@ -271,21 +274,42 @@ class MetropolisHastingsIterator(Iterator):
         if not self.as_smc_rejuvenation_step:
             _logger.info("Metropolis-Hastings core run.")
 
+        # a resumed run starts at a later step
+        first_step_id = self.next_step_id
+
         # Burn-in phase
-        for i in tqdm(range(1, self.num_burn_in + 1)):
+        for i in self._resumable_steps(first_step_id, self.num_burn_in + 1):
             self.do_mh_step(i)
 
-        if self.num_burn_in:
-            burn_in_accept_rate = np.exp(np.log(self.accepted) - np.log(self.num_burn_in))
-            _logger.info("Acceptance rate during burn in: %s", burn_in_accept_rate)
-        # reset number of accepted samples
-        self.accepted = np.zeros((self.num_chains, 1))
-        self.accepted_interval = 0
+        if first_step_id <= self.num_burn_in + 1:
+            if first_step_id <= self.num_burn_in:
+                burn_in_accept_rate = np.exp(np.log(self.accepted) - np.log(self.num_burn_in))
+                _logger.info("Acceptance rate during burn in: %s", burn_in_accept_rate)
+            # reset number of accepted samples
+            self.accepted = np.zeros((self.num_chains, 1))
+            self.accepted_interval = 0
 
         # Sampling phase
-        for i in tqdm(range(self.num_burn_in + 1, self.num_burn_in + self.num_samples + 1)):
+        for i in self._resumable_steps(
+            max(first_step_id, self.num_burn_in + 1), self.num_burn_in + self.num_samples + 1
+        ):
             self.do_mh_step(i)
 
+    def _resumable_steps(self, start, stop):
+        """Iterate over the step ids and mark the start of each step as resumable.
+
+        Args:
+            start (int): First step id
+            stop (int): Step id after the last step
+
+        Yields:
+            int: Current step id
+        """
+        for step_id in tqdm(range(start, stop)):
+            self.next_step_id = step_id
+            self.checkpoint()
+            yield step_id
+
     def post_run(self):
         """Analyze the resulting chain."""
         avg_accept_rate = np.exp(
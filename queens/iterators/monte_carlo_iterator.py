@@ -18,10 +18,16 @@ import logging
 
 import matplotlib.pyplot as plt
 import numpy as np
+from scipy.stats import norm
 
 from queens.iterators.iterator import Iterator
 from queens.utils.logger_settings import log_init_args
-from queens.utils.process_outputs import process_outputs, write_results
+from queens.utils.process_outputs import (
+    process_outputs,
+    process_streaming_statistics,
+    write_results,
+)
+from queens.utils.streaming_statistics import StreamingStatistics
 
 _logger = logging.getLogger(__name__)
 
@@ -29,12 +35,29 @@ _logger = logging.getLogger(__name__)
 class MonteCarloIterator(Iterator):
     """Basic Monte Carlo Iterator to enable MC sampling.
 
+    In chunked mode, the samples are drawn and evaluated in chunks, whose outputs are only
+    accumulated in streaming statistics. The memory is then independent of the number of samples,
+    and the sampling can stop as soon as the mean of the outputs is estimated precisely enough.
+
     Attributes:
         seed  (int): Seed for random number generation.
         num_samples (int): Number of samples to compute.
         result_description (dict):  Description of desired results.
-        samples (np.array):         Array with all samples.
-        output (np.array):          Array with all model outputs.
+        samples (np.array):         Array with all samples (of the last chunk in chunked mode).
+        output (np.array):          Array with all model outputs (of the last chunk in chunked
+                                    mode).
+        chunk_size (int): Number of samples per chunk, or None to evaluate all samples at once.
+        spill_outputs (bool): True if the samples and outputs of each chunk are written to disk.
+        target_relative_standard_error (float): Relative standard error of the mean at which the
+                                                sampling stops.
+        target_confidence_interval_width (float): Width of the confidence interval of the mean at
+                                                  which the sampling stops.
+        confidence_level (float): Confidence level of the confidence interval.
+        stopping_output_indices (np.ndarray): Indices of the flattened outputs whose precision
+                                              is checked, or None for all outputs.
+        min_samples (int): Number of samples before the precision is checked.
+        statistics (StreamingStatistics): Streaming statistics of the outputs in chunked mode.
+        num_chunks (int): Number of evaluated chunks in chunked mode.
     """
 
     @log_init_args
@@ -46,6 +69,13 @@ class MonteCarloIterator(Iterator):
         seed,
         num_samples,
         result_description=None,
+        chunk_size=None,
+        spill_outputs=False,
+        target_relative_standard_error=None,
+        target_confidence_interval_width=None,
+        confidence_level=0.95,
+        stopping_output_indices=None,
+        min_samples=100,
     ):
         """Initialise Monte Carlo iterator.
 
@@ -57,25 +87,135 @@ class MonteCarloIterator(Iterator):
             seed  (int):                Seed for random number generation
             num_samples (int):          Number of samples to compute
             result_description (dict, opt):  Description of desired results
+            chunk_size (int, opt): Number of samples per chunk. Defaults to evaluating all samples
+                                   at once.
+            spill_outputs (bool, opt): Write the samples and outputs of each chunk to disk
+            target_relative_standard_error (float, opt): Stop the sampling once the standard
+                                                         error of the mean relative to the mean
+                                                         is reached
+            target_confidence_interval_width (float, opt): Stop the sampling once the confidence
+                                                           interval of the mean is narrower
+            confidence_level (float, opt): Confidence level of the confidence interval
+            stopping_output_indices (list, opt): Indices of the flattened outputs whose precision
+                                                 is checked. Defaults to all outputs.
+            min_samples (int, opt): Number of samples before the precision is checked, such that
+                                    the standard error is not estimated from too few samples
         """
         super().__init__(model, parameters, global_settings)
+        if chunk_size is None and (
+            spill_outputs
+            or target_relative_standard_error is not None
+            or target_confidence_interval_width is not None
+        ):
+            raise ValueError("Spilling outputs and stopping early require a chunk size.")
+        if (
+            chunk_size is not None
+            and result_description is not None
+            and "result_interval" not in result_description
+            and any(
+                result_description.get(option, False)
+                for option in ("estimate_pdf", "estimate_cdf", "estimate_icdf", "estimate_all")
+            )
+        ):
+            raise ValueError(
+                "Estimating the pdf, cdf or icdf in chunked mode requires a result_interval in "
+                "the result description, since the outputs are not kept."
+            )
         self.seed = seed
         self.num_samples = num_samples
         self.result_description = result_description
         self.samples = None
         self.output = None
+        self.chunk_size = chunk_size
+        self.spill_outputs = spill_outputs
+        self.target_relative_standard_error = target_relative_standard_error
+        self.target_confidence_interval_width = target_confidence_interval_width
+        self.confidence_level = confidence_level
+        self.stopping_output_indices = stopping_output_indices
+        if stopping_output_indices is not None:
+            self.stopping_output_indices = np.asarray(stopping_output_indices, dtype=int)
+        self.min_samples = min_samples
+        self.statistics = None
+        self.num_chunks = 0
 
     def pre_run(self):
         """Generate samples for subsequent MC analysis and update model."""
         np.random.seed(self.seed)
-        self.samples = self.parameters.draw_samples(self.num_samples)
+        if self.chunk_size is None:
+            self.samples = self.parameters.draw_samples(self.num_samples)
+        else:
+            self.statistics = StreamingStatistics.from_output_description(
+                self.result_description or {}
+            )
+            self.num_chunks = 0
 
     def core_run(self):
-        """Run Monte Carlo Analysis on model."""
-        self.output = self.model.evaluate(self.samples)
+        """Run Monte Carlo Analysis on model.
+
+        In chunked mode, the run can resume from a checkpoint at the start of each chunk.
+        """
+        if self.chunk_size is None:
+            self.output = self.model.evaluate(self.samples)
+            return
+
+        while self.statistics.num_samples < self.num_samples:
+            self.checkpoint()
+            num_chunk_samples = min(self.chunk_size, self.num_samples - self.statistics.num_samples)
+            self.samples = self.parameters.draw_samples(num_chunk_samples)
+            self.output = self.model.evaluate(self.samples)
+            self.statistics.update(self.output["result"])
+            if self.spill_outputs:
+                np.savez(
+                    self.global_settings.result_file(
+                        ".npz", suffix=f"_chunk_{self.num_chunks:06d}"
+                    ),
+                    samples=self.samples,
+                    result=self.output["result"],
+                )
+            self.num_chunks += 1
+            _logger.info(
+                "Evaluated %d of %d samples", self.statistics.num_samples, self.num_samples
+            )
+            if self.precision_reached():
+                _logger.info(
+                    "Target precision reached after %d samples", self.statistics.num_samples
+                )
+                break
+
+    def precision_reached(self):
+        """Check if the mean of the outputs is estimated precisely enough.
+
+        Returns:
+            bool: True if all targets on the precision of the mean are reached
+        """
+        if (
+            self.target_relative_standard_error is None
+            and self.target_confidence_interval_width is None
+        ) or self.statistics.num_samples < max(self.min_samples, 2):
+            return False
+
+        mean = self.statistics.moments.mean.reshape(-1)
+        standard_error = self.statistics.moments.standard_error.reshape(-1)
+        if self.stopping_output_indices is not None:
+            mean = mean[self.stopping_output_indices]
+            standard_error = standard_error[self.stopping_output_indices]
+
+        reached = True
+        if self.target_relative_standard_error is not None:
+            reached &= np.all(standard_error <= self.target_relative_standard_error * np.abs(mean))
+        if self.target_confidence_interval_width is not None:
+            confidence_interval_width = (
+                2 * norm.ppf(0.5 + self.confidence_level / 2) * standard_error
+            )
+            reached &= np.all(confidence_interval_width <= self.target_confidence_interval_width)
+        return bool(reached)
 
     def post_run(self):
         """Analyze the results."""
+        if self.chunk_size is not None:
+            self.post_run_chunked()
+            return
+
         if self.result_description is not None:
             results = process_outputs(self.output, self.result_description, self.samples)
             if self.result_description["write_results"]:
@@ -103,3 +243,13 @@ class MonteCarloIterator(Iterator):
         _logger.debug("Inputs %s", self.samples)
         _logger.debug("Size of outputs %s", self.output["result"].shape)
         _logger.debug("Outputs %s", self.output["result"])
+
+    def post_run_chunked(self):
+        """Analyze the streaming statistics of the chunked mode."""
+        _logger.info("Number of evaluated samples: %d", self.statistics.num_samples)
+        _logger.debug("Mean of outputs %s", self.statistics.moments.mean)
+        _logger.debug("Standard error of mean %s", self.statistics.moments.standard_error)
+        if self.result_description is not None:
+            results = process_streaming_statistics(self.statistics, self.result_description)
+            if self.result_description["write_results"]:
+                write_results(results, self.global_settings.result_file(".pickle"))
@@ -263,7 +263,11 @@ class PyMCIterator(Iterator):
         self.step = self.init_mcmc_method()
 
     def core_run(self):
-        """Core run of PyMC iterator."""
+        """Core run of PyMC iterator.
+
+        The sampler runs as a whole within PyMC, hence the core run has no point to resume from
+        and restarts from a checkpoint replay all logged evaluations.
+        """
         self.results = pm.sample(
             draws=self.num_samples,
             step=self.step,
@@ -84,8 +84,13 @@ class SequentialMonteCarloIterator(Iterator):
                    of the MCMC kernel.
         b (float): Parameter for the scaling of the covariance matrix of the proposal distribution
                    of the MCMC kernel.
+        step (int): Number of completed tempering steps.
+        avg_accept (float): Average acceptance rate of the last rejuvenation step.
     """
 
+    # the MCMC kernel is reinitialized in each step and shares the model with the iterator
+    non_state_attributes = Iterator.non_state_attributes + ("mcmc_kernel",)
+
     @log_init_args
     def __init__(
         self,
@@ -175,6 +180,9 @@ class SequentialMonteCarloIterator(Iterator):
         self.a = 1.0 / 9.0
         self.b = 8.0 / 9.0
 
+        self.step = 0
+        self.avg_accept = 1.0
+
     def eval_log_prior(self, sample_batch):
         """Evaluate natural logarithm of prior at sample.
 
@@ -361,12 +369,9 @@ class SequentialMonteCarloIterator(Iterator):
     def core_run(self):
         """Core run of Sequential Monte Carlo iterator."""
         _logger.info("Welcome to SMC core run.")
-        # counter
-        step = 0
-        # average accept rate of MCMC kernel
-        avg_accept = 1.0
         while self.gamma_cur < 1:
-            step += 1
+            self.checkpoint()
+            self.step += 1
 
             # Adapt step size
             self.update_gamma(self.calc_new_gamma(self.gamma_cur))
@@ -394,7 +399,7 @@ class SequentialMonteCarloIterator(Iterator):
 
                 self.update_ess(resampled=True)
 
-            _logger.info("step %s gamma: %.5f ESS: %.5f", step, self.gamma_cur, self.ess_cur)
+            _logger.info("step %s gamma: %.5f ESS: %.5f", self.step, self.gamma_cur, self.ess_cur)
 
             # estimate current covariance matrix
             cov_mat = np.atleast_2d(
@@ -402,7 +407,7 @@ class SequentialMonteCarloIterator(Iterator):
             )
 
             # scale covariance based on average acceptance rate of last rejuvenation step
-            scale_prop_cov = self.a + self.b * avg_accept
+            scale_prop_cov = self.a + self.b * self.avg_accept
             cov_mat *= scale_prop_cov**2
 
             # Rejuvenate
@@ -415,12 +420,12 @@ class SequentialMonteCarloIterator(Iterator):
                 self.log_likelihood,
                 self.log_prior,
                 self.log_posterior,
-                avg_accept,
+                self.avg_accept,
             ) = self.mcmc_kernel.post_run()
 
             # plot the trace every plot_trace_every-th iteration
-            if self.plot_trace_every and not step % self.plot_trace_every:
-                self.draw_trace(step)
+            if self.plot_trace_every and not self.step % self.plot_trace_every:
+                self.draw_trace(self.step)
 
     def post_run(self):
         """Analyze the resulting importance sample."""
@@ -78,6 +78,10 @@ class VariationalInferenceIterator(Iterator):
         verbose_every_n_iter (int): Number of iterations between printing, plotting, and saving
     """
 
+    # the stochastic optimizer refers to the gradient method of the iterator, its state is
+    # handled separately
+    non_state_attributes = Iterator.non_state_attributes + ("stochastic_optimizer",)
+
     def __init__(
         self,
         model,
@@ -157,10 +161,10 @@ class VariationalInferenceIterator(Iterator):
         """Core run for stochastic variational inference."""
         start = time.time()
 
-        self.iteration_data.add(variational_parameters=self.variational_params)
         old_parameters = self.variational_params.copy()
 
         # Stochastic optimization
+        self.checkpoint()
         for self.variational_params in self.stochastic_optimizer:
             self._catch_non_converging_simulations(old_parameters)
 
@@ -177,6 +181,7 @@ class VariationalInferenceIterator(Iterator):
             self.iteration_data.add(learning_rate=self.stochastic_optimizer.learning_rate)
             self.iteration_data.add(variational_parameters=self.variational_params)
             old_parameters = self.variational_params.copy()
+            self.checkpoint()
 
         end = time.time()
 
@@ -205,6 +210,32 @@ class VariationalInferenceIterator(Iterator):
         # set the gradient according to input
         self.stochastic_optimizer.set_gradient_function(self.get_gradient_function())
         self.stochastic_optimizer.current_variational_parameters = self.variational_params
+        self.iteration_data.add(variational_parameters=self.variational_params)
+
+    def get_state(self):
+        """Get the state of the iterator including the state of the stochastic optimizer.
+
+        Returns:
+            state (dict): State of the iterator
+        """
+        state = super().get_state()
+        state["stochastic_optimizer"] = {
+            name: value
+            for name, value in vars(self.stochastic_optimizer).items()
+            if name != "gradient"
+        }
+        return state
+
+    def set_state(self, state):
+        """Set the state of the iterator including the state of the stochastic optimizer.
+
+        Args:
+            state (dict): State of the iterator, see get_state
+        """
+        super().set_state(state)
+        vars(self.stochastic_optimizer).update(state["stochastic_optimizer"])
+        # the pre-run is skipped when resuming from a snapshot
+        self.stochastic_optimizer.set_gradient_function(self.get_gradient_function())
 
     def post_run(self):
         """Write results and potentially visualize them."""
@@ -19,20 +19,28 @@ import sys
 import time
 
 from queens.global_settings import GlobalSettings
-from queens.utils.cli_utils import get_cli_options, print_greeting_message
+from queens.utils.checkpointing import CHECKPOINT_FOLDER_SUFFIX, Checkpoint
+from queens.utils.cli_utils import (
+    get_checkpoint_cli_options,
+    get_cli_options,
+    print_greeting_message,
+)
 from queens.utils.fcc_utils import from_config_create_iterator
 from queens.utils.io_utils import load_input_file
 
 _logger = logging.getLogger(__name__)
 
 
-def run(input_file, output_dir, debug=False):
+def run(input_file, output_dir, debug=False, restart=False, checkpoint_every=None):
     """Do a QUEENS run.
 
     Args:
         input_file (Path): Path object to the input file
         output_dir (Path): Path object to the output directory
         debug (bool): True if debug mode is to be used
+        restart (bool, opt): If true, the run is restarted from its checkpoint
+        checkpoint_every (int, opt): Write a state snapshot at most every n scheduler
+                                     evaluations. By default, no checkpoint is written.
     """
     start_time_input = time.time()
 
@@ -56,16 +64,27 @@ def run(input_file, output_dir, debug=False):
         _logger.info("")
 
         # perform analysis
-        run_iterator(my_iterator, global_settings)
+        run_iterator(
+            my_iterator, global_settings, restart=restart, checkpoint_every=checkpoint_every
+        )
 
 
-def run_iterator(iterator, global_settings):
+def run_iterator(iterator, global_settings, restart=False, checkpoint_every=None):
     """Run the main queens iterator.
 
+    With checkpointing, all scheduler evaluations are logged and the iterator state is written
+    regularly to the checkpoint folder in the output directory. A restart restores the latest
+    state and replays the logged evaluations after it, such that the iterator continues where the
+    previous run stopped.
+
     Args:
         iterator (Iterator): Main queens iterator
         global_settings (GlobalSettings): settings of the QUEENS experiment including its name
                                   and the output directory
+        restart (bool, opt): If true, the run is restarted from its checkpoint
+        checkpoint_every (int, opt): Write a state snapshot at most every n scheduler
+                                     evaluations. By default, no checkpoint is written unless the
+                                     run is restarted.
     """
     global_settings.print_git_information()
 
@@ -79,11 +98,18 @@ def run_iterator(iterator, global_settings):
     _logger.info("")
 
     try:
-        iterator.run()
+        if restart or checkpoint_every is not None:
+            checkpoint_dir = (
+                global_settings.output_dir
+                / f"{global_settings.experiment_name}_{CHECKPOINT_FOLDER_SUFFIX}"
+            )
+            with Checkpoint(iterator, checkpoint_dir, checkpoint_every or 1, restart) as checkpoint:
+                checkpoint.run()
+        else:
+            iterator.run()
     except Exception as exception:
         _logger.exception(exception)
         global_settings.__exit__(None, None, None)
-        # TODO: Write iterator in pickle file # pylint: disable=fixme
         raise exception
 
     end_time_calc = time.time()
@@ -100,7 +126,7 @@ def main():
     if len(args) > 0:
         # do QUEENS run
         input_file_path, output_dir, debug = get_cli_options(args)
-        run(input_file_path, output_dir, debug)
+        run(input_file_path, output_dir, debug, **get_checkpoint_cli_options(args))
     else:
         # print some infos
         print_greeting_message()
@@ -16,6 +16,7 @@
 
 import logging
 
+from queens.drivers.jobscript_driver import JobscriptDriver
 from queens.models.simulation_model import SimulationModel
 from queens.utils.config_directories import current_job_directory
 from queens.utils.io_utils import write_to_csv
@@ -75,9 +76,13 @@ class DifferentiableSimulationModelAdjoint(SimulationModel):
         last_job_ids = [self.scheduler.next_job_id - num_samples + i for i in range(num_samples)]
         experiment_dir = self.scheduler.experiment_dir
 
+        shard_levels = 0
+        if isinstance(self.gradient_driver, JobscriptDriver):
+            shard_levels = self.gradient_driver.shard_levels
+
         # write adjoint data for each sample to adjoint files in old job directories
         for job_id, grad_objective in zip(last_job_ids, upstream_gradient):
-            job_dir = current_job_directory(experiment_dir, job_id)
+            job_dir = current_job_directory(experiment_dir, job_id, shard_levels)
             adjoint_file_path = job_dir.joinpath(self.adjoint_file)
             write_to_csv(adjoint_file_path, grad_objective.reshape(1, -1))
 
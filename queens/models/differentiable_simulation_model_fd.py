@@ -47,7 +47,15 @@ class DifferentiableSimulationModelFD(SimulationModel):
     """
 
     @log_init_args
-    def __init__(self, scheduler, driver, finite_difference_method, step_size=1e-5, bounds=None):
+    def __init__(
+        self,
+        scheduler,
+        driver,
+        finite_difference_method,
+        step_size=1e-5,
+        bounds=None,
+        evaluation_cache=None,
+    ):
         """Initialize model.
 
         Args:
@@ -65,8 +73,10 @@ class DifferentiableSimulationModelFD(SimulationModel):
                                                scalar, in the latter case the bound will be the
                                                same for all variables. Use it to limit the
                                                range of function evaluation.
+            evaluation_cache (EvaluationCache, opt): Cache serving repeated samples, e.g. of
+                                                     overlapping stencils, from disk
         """
-        super().__init__(scheduler=scheduler, driver=driver)
+        super().__init__(scheduler=scheduler, driver=driver, evaluation_cache=evaluation_cache)
 
         check_if_valid_options(VALID_FINITE_DIFFERENCE_METHODS, finite_difference_method)
         self.finite_difference_method = finite_difference_method
@@ -89,7 +99,7 @@ class DifferentiableSimulationModelFD(SimulationModel):
             response (dict): Response of the underlying model at input samples
         """
         if not self.evaluate_and_gradient_bool:
-            self.response = self.scheduler.evaluate(samples, driver=self.driver)
+            self.response = self.evaluate_on_scheduler(samples)
         else:
             self.response = self.evaluate_finite_differences(samples)
         return self.response
@@ -144,9 +154,9 @@ class DifferentiableSimulationModelFD(SimulationModel):
 
         # stack samples and stencil points and evaluate entire batch
         combined_samples = np.vstack((samples, stencil_samples))
-        all_responses = self.scheduler.evaluate(combined_samples, driver=self.driver)[
-            "result"
-        ].reshape(combined_samples.shape[0], -1)
+        all_responses = self.evaluate_on_scheduler(combined_samples)["result"].reshape(
+            combined_samples.shape[0], -1
+        )
 
         response = all_responses[:num_samples, :]
         additional_response_lst = np.array_split(all_responses[num_samples:, :], num_samples)
@@ -20,6 +20,8 @@ import numpy as np
 
 from queens.distributions.normal import NormalDistribution
 from queens.models.likelihood_models.likelihood_model import LikelihoodModel
+from queens.models.reducers import GaussianLogLikelihoodReducer
+from queens.models.simulation_model import SimulationModel
 from queens.utils.exceptions import InvalidOptionError
 from queens.utils.logger_settings import log_init_args
 from queens.utils.numpy_utils import add_nugget_to_diagonal
@@ -44,6 +46,9 @@ class GaussianLikelihood(LikelihoodModel):
                                      Fixed or MAP estimate with Jeffreys prior
         noise_var_iterative_averaging (obj): Iterative averaging object
         normal_distribution (obj): Underlying normal distribution object
+        reduce_on_workers (bool): True if the log-likelihood is computed on the workers
+        reducing_model (SimulationModel): View of the forward model computing the log-likelihood
+                                          on the workers
 
     Returns:
         Instance of GaussianLikelihood Class
@@ -59,6 +64,7 @@ class GaussianLikelihood(LikelihoodModel):
         noise_var_iterative_averaging=None,
         y_obs=None,
         experimental_data_reader=None,
+        reduce_on_workers=False,
     ):
         """Initialize likelihood model.
 
@@ -71,6 +77,10 @@ class GaussianLikelihood(LikelihoodModel):
             noise_var_iterative_averaging (obj): Iterative averaging object
             y_obs (array_like): Vector with observations
             experimental_data_reader (obj): Experimental data reader
+            reduce_on_workers (bool, opt): If true, the log-likelihood is computed by the workers
+                                           of the forward model, such that the model outputs are
+                                           not sent to the client. Requires a fixed noise and a
+                                           SimulationModel as forward model.
         """
         if y_obs is not None and experimental_data_reader is not None:
             warnings.warn(
@@ -114,6 +124,25 @@ class GaussianLikelihood(LikelihoodModel):
         self.noise_var_iterative_averaging = noise_var_iterative_averaging
         self.normal_distribution = normal_distribution
 
+        self.reduce_on_workers = reduce_on_workers
+        self.reducing_model = None
+        if reduce_on_workers:
+            if not noise_type.startswith("fixed"):
+                raise InvalidOptionError(
+                    f"The noise type {noise_type} requires the model outputs on the client. "
+                    "Reducing on the workers is only possible with a fixed noise."
+                )
+            # derived models, e.g., with finite differences, need the full outputs
+            if type(forward_model) is not SimulationModel:  # pylint: disable=unidiomatic-typecheck
+                raise InvalidOptionError(
+                    "Reducing on the workers requires a SimulationModel as forward model."
+                )
+            if forward_model.reducer is not None:
+                raise InvalidOptionError("The forward model already has a reducer.")
+            self.reducing_model = forward_model.reducing_view(
+                GaussianLogLikelihoodReducer(normal_distribution)
+            )
+
     def evaluate(self, samples):
         """Evaluate likelihood with current set of input samples.
 
@@ -123,6 +152,9 @@ class GaussianLikelihood(LikelihoodModel):
         Returns:
             dict: log-likelihood values at input samples
         """
+        if self.reduce_on_workers:
+            self.response = self.reducing_model.evaluate(samples)
+            return {"result": self.response["result"].reshape(-1)}
         self.response = self.forward_model.evaluate(samples)
         if self.noise_type.startswith("MAP"):
             self.update_covariance(self.response["result"])
@@ -146,6 +178,12 @@ class GaussianLikelihood(LikelihoodModel):
             gradient (np.array): Gradient w.r.t. current set of input samples
                                  :math:`\frac{\partial g}{\partial f} \frac{df}{dx}`
         """
+        if self.reduce_on_workers:
+            if self.response.get("gradient") is None:
+                raise ValueError("Gradient information not available.")
+            log_likelihood_grad = self.response["gradient"].reshape(len(samples), -1)
+            return upstream_gradient.reshape(-1, 1) * log_likelihood_grad
+
         # shape convention: num_samples x jacobian_shape
         log_likelihood_grad = self.normal_distribution.grad_logpdf(self.response["result"])
         upstream_gradient = upstream_gradient * log_likelihood_grad
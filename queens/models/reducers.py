@@ -0,0 +1,216 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Reducers of simulation outputs on the workers.
+
+A reducer attached to a *SimulationModel* is shipped to the workers together with the driver and
+applied to the outputs inside the run of the driver. Only the reduced outputs are sent back to the
+client, e.g., the log-likelihood of a displacement field instead of the field itself.
+"""
+
+import abc
+
+import numpy as np
+
+from queens.drivers.driver import Driver
+
+
+class Reducer(metaclass=abc.ABCMeta):
+    """Base class for reducers of simulation outputs.
+
+    Reducers act on batches of outputs, such that they can be applied to vectorized drivers
+    without a loop over the samples.
+    """
+
+    @abc.abstractmethod
+    def reduce(self, results, gradients=None):
+        """Reduce the outputs of a batch of samples.
+
+        Args:
+            results (np.ndarray): Results of the samples with shape (num_samples, ...)
+            gradients (np.ndarray, None): Gradients of the results with shape
+                                          (num_samples, num_inputs, num_outputs)
+
+        Returns:
+            reduced_results (np.ndarray): Reduced results with shape (num_samples, ...)
+            reduced_gradients (np.ndarray, None): Gradients of the reduced results with shape
+                                                  (num_samples, num_inputs, num_reduced_outputs)
+        """
+
+
+class SelectionReducer(Reducer):
+    """Reducer selecting quantities of interest from the outputs.
+
+    Attributes:
+        indices (np.ndarray): Indices of the quantities of interest in the flattened output
+    """
+
+    def __init__(self, indices):
+        """Initialize the selection reducer.
+
+        Args:
+            indices (array_like): Indices of the quantities of interest in the flattened output of
+                                  a sample
+        """
+        self.indices = np.asarray(indices, dtype=int)
+
+    def reduce(self, results, gradients=None):
+        """Select the quantities of interest of a batch of samples.
+
+        Args:
+            results (np.ndarray): Results of the samples with shape (num_samples, ...)
+            gradients (np.ndarray, None): Gradients of the results with shape
+                                          (num_samples, num_inputs, num_outputs)
+
+        Returns:
+            reduced_results (np.ndarray): Quantities of interest with shape
+                                          (num_samples, num_indices)
+            reduced_gradients (np.ndarray, None): Gradients of the quantities of interest
+        """
+        reduced_results = results.reshape(len(results), -1)[:, self.indices]
+        if gradients is None:
+            return reduced_results, None
+        return (
+            reduced_results,
+            gradients.reshape(len(results), -1, results[0].size)[:, :, self.indices],
+        )
+
+
+class FunctionReducer(Reducer):
+    """Reducer applying a function to the results.
+
+    Attributes:
+        function (callable): Function mapping the results of a batch of samples to the reduced
+                             results
+    """
+
+    def __init__(self, function):
+        """Initialize the function reducer.
+
+        Args:
+            function (callable): Function mapping the results of a batch of samples with shape
+                                 (num_samples, ...) to the reduced results with shape
+                                 (num_samples, ...). It is pickled by value to the workers.
+        """
+        self.function = function
+
+    def reduce(self, results, gradients=None):
+        """Apply the function to the results of a batch of samples.
+
+        Gradients are not propagated through the function.
+
+        Args:
+            results (np.ndarray): Results of the samples with shape (num_samples, ...)
+            gradients (np.ndarray, None): Gradients of the results (ignored)
+
+        Returns:
+            reduced_results (np.ndarray): Reduced results with shape (num_samples, ...)
+            reduced_gradients (None): No gradients
+        """
+        return np.asarray(self.function(results)), None
+
+
+class GaussianLogLikelihoodReducer(Reducer):
+    """Reducer computing the Gaussian log-likelihood of the outputs.
+
+    Attributes:
+        normal_distribution (NormalDistribution): Normal distribution of the observations
+    """
+
+    def __init__(self, normal_distribution):
+        """Initialize the Gaussian log-likelihood reducer.
+
+        Args:
+            normal_distribution (NormalDistribution): Normal distribution of the observations
+        """
+        self.normal_distribution = normal_distribution
+
+    def reduce(self, results, gradients=None):
+        """Compute the log-likelihood of a batch of samples.
+
+        Args:
+            results (np.ndarray): Results of the samples with shape (num_samples, ...)
+            gradients (np.ndarray, None): Gradients of the results with shape
+                                          (num_samples, num_inputs, num_outputs)
+
+        Returns:
+            reduced_results (np.ndarray): Log-likelihoods with shape (num_samples, 1)
+            reduced_gradients (np.ndarray, None): Gradients of the log-likelihoods with shape
+                                                  (num_samples, num_inputs, 1)
+        """
+        results = results.reshape(len(results), -1)
+        log_likelihood = self.normal_distribution.logpdf(results).reshape(-1, 1)
+        if gradients is None:
+            return log_likelihood, None
+        log_likelihood_grad = self.normal_distribution.grad_logpdf(results)
+        gradients = gradients.reshape(len(results), -1, results.shape[1])
+        return log_likelihood, np.einsum("no,nio->ni", log_likelihood_grad, gradients)[..., None]
+
+
+class ReducingDriver(Driver):
+    """Driver applying a reducer to the outputs of another driver.
+
+    Attributes:
+        driver (Driver): Driver running the simulations
+        reducer (Reducer): Reducer applied to the outputs of the driver
+    """
+
+    def __init__(self, driver, reducer):
+        """Initialize the reducing driver.
+
+        Args:
+            driver (Driver): Driver running the simulations
+            reducer (Reducer): Reducer applied to the outputs of the driver
+        """
+        super().__init__(parameters=driver.parameters, files_to_copy=driver.files_to_copy)
+        self.driver = driver
+        self.reducer = reducer
+        self.vectorized = driver.vectorized
+        self.batch_size = driver.batch_size
+
+    def run(self, sample, job_id, num_procs, experiment_dir, experiment_name):
+        """Run the driver and reduce its outputs.
+
+        Args:
+            sample (dict): Dict containing sample
+            job_id (int): Job ID
+            num_procs (int): number of processors
+            experiment_name (str): name of QUEENS experiment.
+            experiment_dir (Path): Path to QUEENS experiment directory.
+
+        Returns:
+            Reduced result and potentially the reduced gradient
+        """
+        task_result = self.driver.run(
+            sample,
+            job_id,
+            num_procs=num_procs,
+            experiment_dir=experiment_dir,
+            experiment_name=experiment_name,
+        )
+        if not isinstance(task_result, tuple):
+            task_result = (task_result, None)
+        result, gradient = task_result
+        if result is None:
+            return result, gradient
+
+        if self.vectorized:
+            return self.reducer.reduce(
+                np.asarray(result), None if gradient is None else np.asarray(gradient)
+            )
+        reduced_result, reduced_gradient = self.reducer.reduce(
+            np.asarray(result)[np.newaxis],
+            None if gradient is None else np.asarray(gradient)[np.newaxis],
+        )
+        return reduced_result[0], None if reduced_gradient is None else reduced_gradient[0]
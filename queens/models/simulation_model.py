@@ -14,9 +14,12 @@
 #
 """Simulation model class."""
 
+import copy
+
 import numpy as np
 
 from queens.models.model import Model
+from queens.models.reducers import ReducingDriver
 from queens.utils.logger_settings import log_init_args
 
 
@@ -26,19 +29,29 @@ class SimulationModel(Model):
     Attributes:
         scheduler (Scheduler): Scheduler for the simulations
         driver (Driver): Driver for the simulations
+        evaluation_cache (EvaluationCache): Cache serving repeated samples from disk
+        reducer (Reducer): Reducer applied to the outputs on the workers
     """
 
     @log_init_args
-    def __init__(self, scheduler, driver):
+    def __init__(self, scheduler, driver, evaluation_cache=None, reducer=None):
         """Initialize simulation model.
 
         Args:
             scheduler (Scheduler): Scheduler for the simulations
             driver (Driver): Driver for the simulations
+            evaluation_cache (EvaluationCache, opt): Cache serving repeated samples from disk.
+                                                     Defaults to no caching.
+            reducer (Reducer, opt): Reducer applied to the outputs inside the run of the driver,
+                                    such that only the reduced outputs are sent back from the
+                                    workers. Defaults to the full outputs.
         """
         super().__init__()
         self.scheduler = scheduler
         self.driver = driver
+        self.evaluation_cache = evaluation_cache
+        self.reducer = reducer
+        self._reducing_driver = None
         self.scheduler.copy_files_to_experiment_dir(self.driver.files_to_copy)
 
     def evaluate(self, samples):
@@ -50,9 +63,63 @@ class SimulationModel(Model):
         Returns:
             response (dict): Response of the underlying model at input samples
         """
-        self.response = self.scheduler.evaluate(samples, driver=self.driver)
+        self.response = self.evaluate_on_scheduler(samples)
         return self.response
 
+    def evaluate_on_scheduler(self, samples):
+        """Evaluate the driver at the samples using the scheduler.
+
+        If an evaluation cache is provided, only samples missing in the cache are submitted. If a
+        reducer is provided, the response contains the reduced outputs.
+
+        Args:
+            samples (np.ndarray): Input samples
+
+        Returns:
+            response (dict): Response of the driver at input samples
+        """
+        driver = self.get_worker_driver()
+        if self.evaluation_cache is None:
+            return self.scheduler.evaluate(samples, driver=driver)
+        return self.evaluation_cache.evaluate(samples, scheduler=self.scheduler, driver=driver)
+
+    def get_worker_driver(self):
+        """Get the driver run on the workers.
+
+        The reducing driver is kept as long as the driver and the reducer do not change, such that
+        the evaluation cache identifies it.
+
+        Returns:
+            driver (Driver): Driver applying the reducer, or the driver itself without reducer
+        """
+        if self.reducer is None:
+            return self.driver
+        if (
+            self._reducing_driver is None
+            or self._reducing_driver.driver is not self.driver
+            or self._reducing_driver.reducer is not self.reducer
+        ):
+            self._reducing_driver = ReducingDriver(self.driver, self.reducer)
+        return self._reducing_driver
+
+    def reducing_view(self, reducer):
+        """Get a view of this model that applies a reducer on the workers.
+
+        The view shares the scheduler, the driver and the evaluation cache with this model, which
+        itself is left unchanged.
+
+        Args:
+            reducer (Reducer): Reducer applied to the outputs on the workers
+
+        Returns:
+            model (SimulationModel): Reducing view of this model
+        """
+        model = copy.copy(self)
+        model.reducer = reducer
+        model.response = None
+        model._reducing_driver = None  # pylint: disable=protected-access
+        return model
+
     def grad(self, samples, upstream_gradient):
         r"""Evaluate gradient of model w.r.t. current set of input samples.
 
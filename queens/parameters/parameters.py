@@ -243,6 +243,23 @@ class Parameters:
             sample_dict[key] = sample[j]
         return sample_dict
 
+    def samples_as_dict(self, samples):
+        """Return a batch of samples as a dict of column arrays.
+
+        Args:
+            samples (np.ndarray): Samples, each row represents a sample
+
+        Returns:
+            samples_dict (dict): Dictionary containing the parameter keys and the corresponding
+            column arrays of the samples
+        """
+        samples = samples.reshape(-1, self.num_parameters)
+        if self.random_field_flag:
+            samples = np.array([self.expand_random_field_realization(s) for s in samples])
+            samples = samples.reshape(-1, len(self.parameters_keys))
+        samples_dict = {key: samples[:, j] for j, key in enumerate(self.parameters_keys)}
+        return samples_dict
+
     def expand_random_field_realization(self, truncated_sample):
         """Expand truncated representation of random fields.
 
@@ -84,6 +84,7 @@ class ClusterScheduler(DaskScheduler):
         restart_workers=False,
         allowed_failures=5,
         verbose=True,
+        max_result_memory_in_mb=None,
     ):
         """Init method for the cluster scheduler.
 
@@ -100,10 +101,15 @@ class ClusterScheduler(DaskScheduler):
             num_nodes (int, opt): Number of cluster nodes per job
             queue (str, opt): Destination queue for each worker job
             cluster_internal_address (str, opt): Internal address of cluster
-            restart_workers (bool): If true, restart workers after each finished job. For larger
-                                    jobs (>1min) this should be set to true in most cases.
+            restart_workers (bool, dict): If true, restart workers after each finished job. For
+                                          larger jobs (>1min) this should be set to true in most
+                                          cases. A dict defines a recycling policy, e.g.
+                                          {"max_tasks_per_worker": 10, "max_memory_in_mb": 2000},
+                                          such that workers are only restarted when needed.
             allowed_failures (int): Number of allowed failures for a task before an error is raised
             verbose (bool, opt): Verbosity of evaluations. Defaults to True.
+            max_result_memory_in_mb (float, opt): Size of the results of a batch above which they
+                                                  are memory-mapped to the experiment directory
         """
         self.remote_connection = remote_connection
         self.remote_connection.open()
@@ -207,6 +213,7 @@ class ClusterScheduler(DaskScheduler):
             client=client,
             restart_workers=restart_workers,
             verbose=verbose,
+            max_result_memory_in_mb=max_result_memory_in_mb,
         )
 
     def restart_worker(self, worker):
@@ -223,9 +230,11 @@ class ClusterScheduler(DaskScheduler):
     def copy_files_to_experiment_dir(self, paths):
         """Copy file to experiment directory.
 
+        Only files whose content changed since the last copy to the experiment directory are
+        copied.
+
         Args:
             paths (Path, list): paths to files or directories that should be copied to experiment
                                 directory
         """
-        destination = f"{self.experiment_dir}/"
-        self.remote_connection.copy_to_remote(paths, destination)
+        self.remote_connection.sync_to_remote(paths, self.experiment_dir)
@@ -16,14 +16,14 @@
 
 import abc
 import logging
-import time
 
 import numpy as np
 import tqdm
 from dask.distributed import as_completed
 
-from queens.schedulers.scheduler import Scheduler
+from queens.schedulers.scheduler import Scheduler, SubmissionHandle
 from queens.utils.print_utils import get_str_table
+from queens.utils.worker_recycling import WorkerRecyclingPolicy
 
 _logger = logging.getLogger(__name__)
 
@@ -36,7 +36,7 @@ class DaskScheduler(Scheduler):
     Attributes:
         num_procs (int): number of processors per job
         client (Client): Dask client that connects to and submits computation to a Dask cluster
-        restart_workers (bool): If true, restart workers after each finished job
+        worker_recycling_policy (WorkerRecyclingPolicy, None): Policy when to restart workers
     """
 
     def __init__(
@@ -48,6 +48,7 @@ class DaskScheduler(Scheduler):
         client,
         restart_workers,
         verbose=True,
+        max_result_memory_in_mb=None,
     ):
         """Initialize scheduler.
 
@@ -57,18 +58,25 @@ class DaskScheduler(Scheduler):
             num_jobs (int): Maximum number of parallel jobs
             num_procs (int): number of processors per job
             client (Client): Dask client that connects to and submits computation to a Dask cluster
-            restart_workers (bool): If true, restart workers after each finished job
+            restart_workers (bool, dict): If true, restart workers after each finished job. A dict
+                                          defines the options of a worker recycling policy, see
+                                          WorkerRecyclingPolicy.
             verbose (bool, opt): Verbosity of evaluations. Defaults to True.
+            max_result_memory_in_mb (float, opt): Size of the results of a batch above which they
+                                                  are memory-mapped to the experiment directory
         """
         super().__init__(
             experiment_name=experiment_name,
             experiment_dir=experiment_dir,
             num_jobs=num_jobs,
             verbose=verbose,
+            max_result_memory_in_mb=max_result_memory_in_mb,
         )
         self.num_procs = num_procs
         self.client = client
-        self.restart_workers = restart_workers
+        self.worker_recycling_policy = WorkerRecyclingPolicy.from_restart_workers_option(
+            restart_workers
+        )
         global SHUTDOWN_CLIENTS  # pylint: disable=global-variable-not-assigned
         SHUTDOWN_CLIENTS.append(client.shutdown)
 
@@ -83,39 +91,16 @@ class DaskScheduler(Scheduler):
         Returns:
             result_dict (dict): Dictionary containing results
         """
-        if self.restart_workers:
-            # This is necessary, because the subprocess in the driver does not get killed
-            # sometimes when the worker is restarted.
-            def run_driver(*args, **kwargs):
-                time.sleep(5)
-                return driver.run(*args, **kwargs)
-
-        else:
-            run_driver = driver.run
-
-        if job_ids is None:
-            job_ids = self.get_job_ids(len(samples))
-        futures = self.client.map(
-            run_driver,
-            samples,
-            job_ids,
-            pure=False,
-            num_procs=self.num_procs,
-            experiment_dir=self.experiment_dir,
-            experiment_name=self.experiment_name,
-        )
+        handle = self.submit(samples, driver, job_ids)
 
         # The theoretical number of sequential jobs
         num_sequential_jobs = int(np.ceil(len(samples) / self.num_jobs))
 
-        results = {future.key: None for future in futures}
-        with tqdm.tqdm(total=len(futures)) as progressbar:
-            for future in as_completed(futures):
-                results[future.key] = future.result()
+        result_assembler = self.create_result_assembler(handle, squeeze=True)
+        with tqdm.tqdm(total=handle.num_samples) as progressbar:
+            for index, result, gradient in self.as_completed(handle):
+                result_assembler.add(index, result, gradient)
                 progressbar.update(1)
-                if self.restart_workers:
-                    worker = list(self.client.who_has(future).values())[0]
-                    self.restart_worker(worker)
 
             if self.verbose:
                 elapsed_time = progressbar.format_dict["elapsed"]
@@ -127,21 +112,76 @@ class DaskScheduler(Scheduler):
                     "number of procs": self.num_procs,
                     "total elapsed time": f"{elapsed_time:.3e}s",
                     "average time per parallel job": f"{averaged_time_per_job:.3e}s",
+                    **self.batch_summary,
                 }
                 _logger.info(
                     get_str_table(
-                        f"Batch summary for jobs {min(job_ids)} - {max(job_ids)}", run_time_dict
+                        f"Batch summary for jobs {min(handle.job_ids)} - {max(handle.job_ids)}",
+                        run_time_dict,
                     )
                 )
 
-        result_dict = {"result": [], "gradient": []}
-        for result in results.values():
-            # We should remove this squeeze! It is only introduced for consistency with old test.
-            result_dict["result"].append(np.atleast_1d(np.array(result[0]).squeeze()))
-            result_dict["gradient"].append(result[1])
-        result_dict["result"] = np.array(result_dict["result"])
-        result_dict["gradient"] = np.array(result_dict["gradient"])
-        return result_dict
+        self.batch_summary = {}
+        return result_assembler.to_dict()
+
+    def submit(self, samples, driver, job_ids=None):
+        """Submit jobs to driver without waiting for the results.
+
+        Args:
+            samples (np.array): Array of samples
+            driver (Driver): Driver object that runs simulation
+            job_ids (lst, opt): List of job IDs corresponding to samples
+
+        Returns:
+            handle (SubmissionHandle): Handle of the submitted jobs
+        """
+        if self.worker_recycling_policy is not None:
+            run_driver = self.worker_recycling_policy.wrap(driver.run)
+        else:
+            run_driver = driver.run
+
+        if job_ids is None:
+            job_ids = self.get_job_ids(len(samples))
+        sample_batches, job_id_batches, task_indices = self.split_into_batches(
+            samples, job_ids, driver
+        )
+
+        futures = self.client.map(
+            run_driver,
+            sample_batches,
+            job_id_batches,
+            pure=False,
+            num_procs=self.num_procs,
+            experiment_dir=self.experiment_dir,
+            experiment_name=self.experiment_name,
+        )
+        return SubmissionHandle(
+            job_ids=np.asarray(job_ids),
+            tasks=futures,
+            task_indices=task_indices,
+            vectorized=driver.vectorized,
+        )
+
+    def as_completed(self, handle):
+        """Yield the results of submitted jobs as soon as they are finished.
+
+        Args:
+            handle (SubmissionHandle): Handle of the submitted jobs
+
+        Yields:
+            index (int): Index of the sample in the submitted samples
+            result (np.array): Result of the job
+            gradient (np.array, None): Gradient of the job (potentially None)
+        """
+        task_numbers = {future.key: i for i, future in enumerate(handle.tasks)}
+        for future in as_completed(handle.tasks):
+            task_result = future.result()
+            if self.worker_recycling_policy is not None:
+                task_result, recycle_worker = task_result
+                if recycle_worker:
+                    worker = list(self.client.who_has(future).values())[0]
+                    self.restart_worker(worker)
+            yield from self.unpack_task_result(handle, task_numbers[future.key], task_result)
 
     @abc.abstractmethod
     def restart_worker(self, worker):
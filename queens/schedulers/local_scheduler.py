@@ -30,7 +30,13 @@ class LocalScheduler(DaskScheduler):
 
     @log_init_args
     def __init__(
-        self, experiment_name, num_jobs=1, num_procs=1, restart_workers=False, verbose=True
+        self,
+        experiment_name,
+        num_jobs=1,
+        num_procs=1,
+        restart_workers=False,
+        verbose=True,
+        max_result_memory_in_mb=None,
     ):
         """Initialize local scheduler.
 
@@ -38,9 +44,15 @@ class LocalScheduler(DaskScheduler):
             experiment_name (str): name of the current experiment
             num_jobs (int, opt): Maximum number of parallel jobs
             num_procs (int, opt): number of processors per job
-            restart_workers (bool): If true, restart workers after each finished job. Try setting it
-                                    to true in case you are experiencing memory-leakage warnings.
+            restart_workers (bool, dict): If true, restart workers after each finished job. Try
+                                          setting it to true in case you are experiencing
+                                          memory-leakage warnings. A dict defines a recycling
+                                          policy, e.g. {"max_tasks_per_worker": 10,
+                                          "max_memory_in_mb": 2000}, such that workers are only
+                                          restarted when needed.
             verbose (bool, opt): Verbosity of evaluations. Defaults to True.
+            max_result_memory_in_mb (float, opt): Size of the results of a batch above which they
+                                                  are memory-mapped to the experiment directory
         """
         experiment_dir = experiment_directory(experiment_name=experiment_name)
 
@@ -62,6 +74,7 @@ class LocalScheduler(DaskScheduler):
             client=client,
             restart_workers=restart_workers,
             verbose=verbose,
+            max_result_memory_in_mb=max_result_memory_in_mb,
         )
 
     def restart_worker(self, worker):
@@ -15,42 +15,97 @@
 """Pool scheduler for QUEENS runs."""
 
 import logging
+import time
 from functools import partial
 
 import numpy as np
 from tqdm import tqdm
 
-from queens.schedulers.scheduler import Scheduler
+from queens.schedulers.scheduler import Scheduler, SubmissionHandle
 from queens.utils.config_directories import experiment_directory
 from queens.utils.logger_settings import log_init_args
-from queens.utils.pool_utils import create_pool
+from queens.utils.pool_utils import SharedArray, SharedObject, create_pool
+from queens.utils.print_utils import get_str_table
 
 _logger = logging.getLogger(__name__)
 
+# Targeted duration of a chunk of tasks sent to a worker in seconds
+TARGET_CHUNK_DURATION = 0.1
+
+# Weight of the latest task in the moving average of the task duration
+TASK_DURATION_WEIGHT = 0.2
+
+
+def _run_shared_task(task, driver, samples, run_kwargs):
+    """Run a task in a pool worker.
+
+    Args:
+        task (tuple): Task number, index of the samples and job id(s) of the task
+        driver (SharedObject): Shared driver
+        samples (SharedArray): Shared samples
+        run_kwargs (dict): Keyword arguments of the run method of the driver
+
+    Returns:
+        task_number (int): Task number
+        task_result (tuple): Result and gradient (or None) returned by the driver
+        duration (float): Run time of the task in seconds
+    """
+    start_time = time.time()
+    task_number, index, job_id = task
+    task_result = driver.load().run(samples.read(index), job_id, **run_kwargs)
+    return task_number, task_result, time.time() - start_time
+
+
+def _iterate_and_release(tasks, shared_objects):
+    """Iterate over tasks and release shared memory afterwards.
+
+    Args:
+        tasks (iterator): Running tasks
+        shared_objects (list): Shared objects used by the tasks
+
+    Yields:
+        Results of the tasks
+    """
+    try:
+        yield from tasks
+    finally:
+        for shared_object in shared_objects:
+            shared_object.close()
+
 
 class PoolScheduler(Scheduler):
     """Pool scheduler class for QUEENS.
 
+    With a pool, the driver is serialized once per evaluation and loaded once per worker. The
+    samples are shared with the workers through shared memory, such that a task only contains the
+    indices of its samples. Tasks are sent in chunks whose size is adapted to the measured run time
+    of previous tasks.
+
     Attributes:
         pool (pathos pool): Multiprocessing pool.
+        task_duration (float, None): Moving average of the run time of a task in seconds
     """
 
     @log_init_args
-    def __init__(self, experiment_name, num_jobs=1, verbose=True):
+    def __init__(self, experiment_name, num_jobs=1, verbose=True, max_result_memory_in_mb=None):
         """Initialize PoolScheduler.
 
         Args:
             experiment_name (str): name of the current experiment
             num_jobs (int, opt): Maximum number of parallel jobs
             verbose (bool, opt): Verbosity of evaluations. Defaults to True.
+            max_result_memory_in_mb (float, opt): Size of the results of a batch above which they
+                                                  are memory-mapped to the experiment directory
         """
         super().__init__(
             experiment_name=experiment_name,
             experiment_dir=experiment_directory(experiment_name=experiment_name),
             num_jobs=num_jobs,
             verbose=verbose,
+            max_result_memory_in_mb=max_result_memory_in_mb,
         )
         self.pool = create_pool(num_jobs)
+        self.task_duration = None
 
     def evaluate(self, samples, driver, job_ids=None):
         """Submit jobs to driver.
@@ -63,31 +118,141 @@ class PoolScheduler(Scheduler):
         Returns:
             result_dict (dict): Dictionary containing results
         """
-        function = partial(
-            driver.run,
-            num_procs=1,
-            experiment_dir=self.experiment_dir,
-            experiment_name=self.experiment_name,
-        )
+        handle = self.submit(samples, driver, job_ids)
+
+        result_assembler = self.create_result_assembler(handle)
+        with tqdm(total=handle.num_samples, disable=not self.verbose) as progressbar:
+            for index, result, gradient in self.as_completed(handle):
+                result_assembler.add(index, result, gradient)
+                progressbar.update(1)
+
+        output = result_assembler.to_dict()
+
+        if self.verbose and self.batch_summary:
+            _logger.info(
+                get_str_table(
+                    f"Batch summary for jobs {min(handle.job_ids)} - {max(handle.job_ids)}",
+                    self.batch_summary,
+                )
+            )
+        self.batch_summary = {}
+        return output
+
+    def submit(self, samples, driver, job_ids=None):
+        """Submit jobs to driver without waiting for the results.
+
+        Without a pool, the jobs are run lazily while the results are consumed. The pool is kept
+        alive between submissions.
+
+        Args:
+            samples (np.array): Array of samples
+            driver (Driver): Driver object that runs simulation
+            job_ids (lst, opt): List of job IDs corresponding to samples
+
+        Returns:
+            handle (SubmissionHandle): Handle of the submitted jobs
+        """
+        run_kwargs = {
+            "num_procs": 1,
+            "experiment_dir": self.experiment_dir,
+            "experiment_name": self.experiment_name,
+        }
+
         if job_ids is None:
             job_ids = self.get_job_ids(len(samples))
+        sample_batches, job_id_batches, task_indices = self.split_into_batches(
+            samples, job_ids, driver
+        )
+
+        task_numbers = range(len(task_indices))
         # Pool or no pool
         if self.pool:
-            results = self.pool.map(function, samples, job_ids)
-        elif self.verbose:
-            results = list(map(function, tqdm(samples), job_ids))
-        else:
-            results = list(map(function, samples, job_ids))
-
-        output = {}
-        # check if gradient is returned --> tuple
-        if isinstance(results[0], tuple):
-            results_iterator, gradient_iterator = zip(*results)
-            results_array = np.array(list(results_iterator))
-            gradients_array = np.array(list(gradient_iterator))
-            output["gradient"] = gradients_array
+            tasks = self._submit_to_pool(samples, driver, job_id_batches, task_indices, run_kwargs)
         else:
-            results_array = np.array(results)
+            function = partial(driver.run, **run_kwargs)
 
-        output["result"] = results_array
-        return output
+            def run_task(task_number, sample, job_id):
+                return task_number, function(sample, job_id), None
+
+            tasks = map(run_task, task_numbers, sample_batches, job_id_batches)
+
+        return SubmissionHandle(
+            job_ids=np.asarray(job_ids),
+            tasks=tasks,
+            task_indices=task_indices,
+            vectorized=driver.vectorized,
+        )
+
+    def as_completed(self, handle):
+        """Yield the results of submitted jobs as soon as they are finished.
+
+        Args:
+            handle (SubmissionHandle): Handle of the submitted jobs
+
+        Yields:
+            index (int): Index of the sample in the submitted samples
+            result (np.array): Result of the job
+            gradient (np.array, None): Gradient of the job (potentially None)
+        """
+        for task_number, task_result, duration in handle.tasks:
+            if duration is not None:
+                self._update_task_duration(duration)
+            yield from self.unpack_task_result(handle, task_number, task_result)
+
+    def _submit_to_pool(self, samples, driver, job_id_batches, task_indices, run_kwargs):
+        """Submit tasks to the pool using shared memory.
+
+        Args:
+            samples (np.array): Array of samples
+            driver (Driver): Driver object that runs simulation
+            job_id_batches (list, np.array): Job id(s) of each task
+            task_indices (list): Indices of the samples in each task
+            run_kwargs (dict): Keyword arguments of the run method of the driver
+
+        Returns:
+            iterator: Unordered results of the tasks
+        """
+        shared_driver = SharedObject(driver)
+        shared_samples = SharedArray(samples)
+
+        tasks = []
+        for task_number, (indices, job_id) in enumerate(zip(task_indices, job_id_batches)):
+            if np.ndim(indices):
+                # Batches of vectorized drivers are contiguous
+                indices = slice(indices[0], indices[-1] + 1)
+            tasks.append((task_number, indices, job_id))
+
+        function = partial(
+            _run_shared_task, driver=shared_driver, samples=shared_samples, run_kwargs=run_kwargs
+        )
+        results = self.pool.uimap(function, tasks, chunksize=self.get_chunksize(len(tasks)))
+        return _iterate_and_release(results, [shared_driver, shared_samples])
+
+    def get_chunksize(self, num_tasks):
+        """Get the number of tasks sent to a worker at once.
+
+        Chunks should take about TARGET_CHUNK_DURATION to amortize the communication overhead of
+        cheap tasks. To balance the load, each worker gets at least four chunks.
+
+        Args:
+            num_tasks (int): Number of tasks
+
+        Returns:
+            int: Chunk size
+        """
+        if self.task_duration is None:
+            return 1
+        max_chunksize = max(int(np.ceil(num_tasks / (4 * self.num_jobs))), 1)
+        chunksize = int(TARGET_CHUNK_DURATION / max(self.task_duration, 1e-9))
+        return int(np.clip(chunksize, 1, max_chunksize))
+
+    def _update_task_duration(self, duration):
+        """Update the moving average of the task duration.
+
+        Args:
+            duration (float): Run time of the latest task in seconds
+        """
+        if self.task_duration is None:
+            self.task_duration = duration
+        else:
+            self.task_duration += TASK_DURATION_WEIGHT * (duration - self.task_duration)
@@ -16,14 +16,44 @@
 
 import abc
 import logging
+import uuid
+from dataclasses import dataclass
 
 import numpy as np
 
-from queens.utils.rsync import rsync
+from queens.utils.config_directories import experiment_directory
+from queens.utils.result_assembler import ResultAssembler
+from queens.utils.rsync import sync_with_manifest
 
 _logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SubmissionHandle:
+    """Handle of jobs submitted to a scheduler.
+
+    Attributes:
+        job_ids (np.ndarray): Job ids of the submitted samples
+        tasks (object): Scheduler specific tasks, e.g. dask futures
+        task_indices (list): Indices of the samples evaluated by each task
+        vectorized (bool): True if each task evaluates a batch of samples
+    """
+
+    job_ids: np.ndarray
+    tasks: object
+    task_indices: list
+    vectorized: bool = False
+
+    @property
+    def num_samples(self):
+        """Number of submitted samples.
+
+        Returns:
+            int: Number of submitted samples
+        """
+        return len(self.job_ids)
+
+
 class Scheduler(metaclass=abc.ABCMeta):
     """Abstract base class for schedulers in QUEENS.
 
@@ -33,9 +63,15 @@ class Scheduler(metaclass=abc.ABCMeta):
         num_jobs (int): Maximum number of parallel jobs
         next_job_id (int): Next job ID.
         verbose (bool): Verbosity of evaluations
+        batch_summary (dict): Additional entries for the summary of the next batch, e.g. provided
+                              by an evaluation cache
+        max_result_memory_in_mb (float, None): Size of the results of a batch above which they are
+                                               memory-mapped to the experiment directory
     """
 
-    def __init__(self, experiment_name, experiment_dir, num_jobs, verbose=True):
+    def __init__(
+        self, experiment_name, experiment_dir, num_jobs, verbose=True, max_result_memory_in_mb=None
+    ):
         """Initialize scheduler.
 
         Args:
@@ -43,12 +79,17 @@ class Scheduler(metaclass=abc.ABCMeta):
             experiment_dir (Path): Path to QUEENS experiment directory.
             num_jobs (int): Maximum number of parallel jobs
             verbose (bool, opt): Verbosity of evaluations. Defaults to True.
+            max_result_memory_in_mb (float, opt): Size of the results of a batch above which they
+                                                  are memory-mapped to the experiment directory.
+                                                  By default, results are kept in memory.
         """
         self.experiment_name = experiment_name
         self.experiment_dir = experiment_dir
         self.num_jobs = num_jobs
         self.next_job_id = 0
         self.verbose = verbose
+        self.batch_summary = {}
+        self.max_result_memory_in_mb = max_result_memory_in_mb
 
     @abc.abstractmethod
     def evaluate(self, samples, driver, job_ids=None):
@@ -63,15 +104,127 @@ class Scheduler(metaclass=abc.ABCMeta):
             result_dict (dict): Dictionary containing results
         """
 
+    @abc.abstractmethod
+    def submit(self, samples, driver, job_ids=None):
+        """Submit jobs to driver without waiting for the results.
+
+        Args:
+            samples (np.array): Array of samples
+            driver (Driver): Driver object that runs simulation
+            job_ids (lst, opt): List of job IDs corresponding to samples
+
+        Returns:
+            handle (SubmissionHandle): Handle of the submitted jobs
+        """
+
+    @abc.abstractmethod
+    def as_completed(self, handle):
+        """Yield the results of submitted jobs as soon as they are finished.
+
+        Args:
+            handle (SubmissionHandle): Handle of the submitted jobs
+
+        Yields:
+            index (int): Index of the sample in the submitted samples
+            result (np.array): Result of the job
+            gradient (np.array, None): Gradient of the job (potentially None)
+        """
+
     def copy_files_to_experiment_dir(self, paths):
         """Copy file to experiment directory.
 
+        Only files whose content changed since the last copy to the experiment directory are
+        copied.
+
         Args:
             paths (str, Path, list): paths to files or directories that should be copied to
                                      experiment directory
         """
-        destination = f"{self.experiment_dir}/"
-        rsync(paths, destination)
+        sync_with_manifest(paths, self.experiment_dir)
+
+    def split_into_batches(self, samples, job_ids, driver):
+        """Split samples and job ids into batches for vectorized drivers.
+
+        By default, one batch per parallel job is created. If the driver provides a batch size,
+        the samples are split into more batches if necessary. For non-vectorized drivers, every
+        sample is a separate task.
+
+        Args:
+            samples (np.array): Array of samples
+            job_ids (lst, np.array): Job IDs corresponding to samples
+            driver (Driver): Driver object that runs simulation
+
+        Returns:
+            sample_batches (list, np.array): Batches of samples
+            job_id_batches (list, np.array): Batches of job ids
+            task_indices (list): Indices of the samples in each batch
+        """
+        if not driver.vectorized:
+            return samples, job_ids, list(range(len(samples)))
+
+        num_batches = self.num_jobs
+        if driver.batch_size is not None:
+            num_batches = max(num_batches, int(np.ceil(len(samples) / driver.batch_size)))
+        num_batches = max(min(num_batches, len(samples)), 1)
+
+        job_ids = np.asarray(job_ids)
+        task_indices = np.array_split(np.arange(len(samples)), num_batches)
+        sample_batches = [samples[indices] for indices in task_indices]
+        job_id_batches = [job_ids[indices] for indices in task_indices]
+        return sample_batches, job_id_batches, task_indices
+
+    @staticmethod
+    def unpack_task_result(handle, task_number, task_result):
+        """Unpack the result of a task into per-sample results.
+
+        Args:
+            handle (SubmissionHandle): Handle of the submitted jobs
+            task_number (int): Number of the task
+            task_result (tuple): Result and gradient (or None) returned by the driver
+
+        Yields:
+            index (int): Index of the sample in the submitted samples
+            result (np.array): Result of the job
+            gradient (np.array, None): Gradient of the job (potentially None)
+        """
+        if not isinstance(task_result, tuple):
+            task_result = (task_result, None)
+        result, gradient = task_result
+
+        indices = handle.task_indices[task_number]
+        if not handle.vectorized:
+            yield indices, result, gradient
+            return
+        for i, index in enumerate(indices):
+            yield index, result[i], None if gradient is None else gradient[i]
+
+    def create_result_assembler(self, handle, squeeze=False):
+        """Create a result assembler for submitted jobs.
+
+        Memory-mapped results are written to the local experiment directory, as the results are
+        assembled on the machine running QUEENS.
+
+        Args:
+            handle (SubmissionHandle): Handle of the submitted jobs
+            squeeze (bool, opt): If true, singleton dimensions of the individual results are removed
+
+        Returns:
+            ResultAssembler: Result assembler for the submitted jobs
+        """
+        memmap_dir = None
+        memmap_name = ""
+        if self.max_result_memory_in_mb is not None and handle.num_samples:
+            memmap_dir = experiment_directory(self.experiment_name) / "results"
+            # the unique suffix keeps repeated job ids from overwriting arrays still in use
+            job_id_range = f"{min(handle.job_ids)}-{max(handle.job_ids)}"
+            memmap_name = f"_jobs_{job_id_range}_{uuid.uuid4().hex[:8]}"
+        return ResultAssembler(
+            handle.num_samples,
+            squeeze=squeeze,
+            memmap_dir=memmap_dir,
+            memmap_name=memmap_name,
+            max_memory_in_mb=self.max_result_memory_in_mb,
+        )
 
     def get_job_ids(self, num_samples):
         """Get job ids and update next_job_id.
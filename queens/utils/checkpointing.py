@@ -0,0 +1,379 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Checkpointing of iterator runs.
+
+A checkpoint consists of a log of all scheduler evaluations and snapshots of the iterator state.
+On restart, the latest state snapshot (or the initial state) of the iterator is restored and the
+logged evaluations after it are replayed in order, such that the iterator reaches the state of the
+interrupted run without running any simulation again. Afterwards, the run continues normally.
+
+Snapshots are only written at the points of the core run that an iterator marks as resumable by
+calling its *checkpoint* method. Without such points, restarts replay all logged evaluations. The
+log is split into segments, and each snapshot starts a new segment and removes the previous one,
+such that the log only holds the evaluations after the latest snapshot.
+"""
+
+import logging
+import os
+import pickle
+
+import numpy as np
+
+from queens.schedulers.scheduler import Scheduler
+
+_logger = logging.getLogger(__name__)
+
+CHECKPOINT_FOLDER_SUFFIX = "checkpoint"
+EVALUATION_LOG_FILE_NAME = "evaluations_{}.pickle"
+INITIAL_STATE_FILE_NAME = "initial_state.pickle"
+STATE_FILE_NAME = "state.pickle"
+
+
+def find_schedulers(obj):
+    """Find all schedulers used by an object, e.g., an iterator and its models.
+
+    Only attributes of QUEENS objects and of containers are searched.
+
+    Args:
+        obj (obj): Object to search
+
+    Returns:
+        list: Schedulers in a deterministic order
+    """
+    schedulers = []
+    visited = set()
+    objects_to_search = [obj]
+    while objects_to_search:
+        current_object = objects_to_search.pop()
+        if id(current_object) in visited:
+            continue
+        visited.add(id(current_object))
+
+        if isinstance(current_object, Scheduler):
+            schedulers.append(current_object)
+        elif isinstance(current_object, dict):
+            objects_to_search.extend(reversed(list(current_object.values())))
+        elif isinstance(current_object, (list, tuple)):
+            objects_to_search.extend(reversed(current_object))
+        elif _is_queens_object(current_object):
+            objects_to_search.extend(reversed(list(vars(current_object).values())))
+    return schedulers
+
+
+def _is_queens_object(obj):
+    """Check if an object is an instance of a QUEENS class or a subclass of one.
+
+    Args:
+        obj (obj): Object to check
+
+    Returns:
+        bool: True for QUEENS objects
+    """
+    return hasattr(obj, "__dict__") and any(
+        cls.__module__.startswith("queens.") for cls in type(obj).__mro__
+    )
+
+
+def write_state(state, file_path):
+    """Write a state snapshot atomically.
+
+    Args:
+        state (dict): State to write
+        file_path (Path): Path to the snapshot
+    """
+    temporary_path = file_path.with_suffix(".tmp")
+    with open(temporary_path, "wb") as file:
+        pickle.dump(state, file)
+    os.replace(temporary_path, file_path)
+
+
+class Checkpoint:
+    """Checkpoint of an iterator run.
+
+    Use the checkpoint as context manager and run the iterator with its *run* method. The
+    evaluations of all schedulers of the iterator are logged while the context is active.
+
+    Attributes:
+        iterator (Iterator): Iterator to checkpoint
+        checkpoint_dir (Path): Directory of the checkpoint
+        checkpoint_every (int): Minimum number of scheduler evaluations between state snapshots
+        restart (bool): If true, the run is restarted from the checkpoint
+        num_evaluations (int): Number of scheduler evaluations including replayed ones
+        num_replayed (int): Number of replayed scheduler evaluations
+    """
+
+    def __init__(self, iterator, checkpoint_dir, checkpoint_every=1, restart=False):
+        """Initialize checkpoint.
+
+        Args:
+            iterator (Iterator): Iterator to checkpoint
+            checkpoint_dir (Path): Directory of the checkpoint
+            checkpoint_every (int, opt): Minimum number of scheduler evaluations between state
+                                         snapshots
+            restart (bool, opt): If true, the run is restarted from the checkpoint
+        """
+        self.iterator = iterator
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_every = checkpoint_every
+        self.restart = restart
+        self.num_evaluations = 0
+        self.num_replayed = 0
+        self._schedulers = []
+        self._log_file = None
+        self._log_segment = 0
+        self._replay_offset = None
+        self._resumed_from_snapshot = False
+        self._num_evaluations_at_snapshot = 0
+        self._evaluation_depth = 0
+
+    def __enter__(self):
+        """Prepare the iterator and start logging the evaluations.
+
+        Returns:
+            Checkpoint: The checkpoint
+        """
+        if self.restart:
+            if not (self.checkpoint_dir / INITIAL_STATE_FILE_NAME).is_file():
+                raise FileNotFoundError(f"No checkpoint to restart from in {self.checkpoint_dir}.")
+            self._log_segment, self._replay_offset = self._restore_state()
+            self._remove_log_segments(keep=self._log_segment)
+            # pylint: disable-next=consider-using-with
+            self._log_file = open(self._log_path(self._log_segment), "r+b")
+            self._log_file.seek(self._replay_offset)
+        else:
+            self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            (self.checkpoint_dir / STATE_FILE_NAME).unlink(missing_ok=True)
+            self._remove_log_segments(keep=self._log_segment)
+            write_state(self.iterator.get_state(), self.checkpoint_dir / INITIAL_STATE_FILE_NAME)
+            # pylint: disable-next=consider-using-with
+            self._log_file = open(self._log_path(self._log_segment), "wb")
+
+        self._schedulers = find_schedulers(self.iterator)
+        for scheduler_index, scheduler in enumerate(self._schedulers):
+            scheduler.evaluate = self._logged_evaluate(scheduler_index, scheduler.evaluate)
+            scheduler.submit = self._guarded_submit(scheduler.submit)
+        self.iterator.checkpoint = self.write_state_snapshot
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        """Stop logging.
+
+        Args:
+            exception_type: Type of the exception (if raised)
+            exception_value: Exception (if raised)
+            traceback: Traceback of the exception (if raised)
+        """
+        for scheduler in self._schedulers:
+            # Remove the instance attributes to restore the methods of the class
+            del scheduler.evaluate
+            del scheduler.submit
+        del self.iterator.checkpoint
+        self._stop_replay()
+        self._log_file.close()
+        if exception_type is not None:
+            _logger.info(
+                "Checkpoint with %s evaluations written to %s.",
+                self.num_evaluations,
+                self.checkpoint_dir,
+            )
+
+    def run(self):
+        """Run the iterator.
+
+        After a restart from a state snapshot, the pre-run is skipped since the snapshot was
+        written during the core run.
+        """
+        if not self._resumed_from_snapshot:
+            self.iterator.pre_run()
+        self.iterator.core_run()
+        self.iterator.post_run()
+
+    def _log_path(self, segment):
+        """Get the path of a segment of the evaluation log.
+
+        Args:
+            segment (int): Number of the segment
+
+        Returns:
+            Path: Path of the segment
+        """
+        return self.checkpoint_dir / EVALUATION_LOG_FILE_NAME.format(segment)
+
+    def _remove_log_segments(self, keep):
+        """Remove the segments of the evaluation log except for one.
+
+        Args:
+            keep (int): Number of the segment to keep
+        """
+        for log_path in self.checkpoint_dir.glob(EVALUATION_LOG_FILE_NAME.format("*")):
+            if log_path != self._log_path(keep):
+                log_path.unlink()
+
+    def _restore_state(self):
+        """Restore the latest state snapshot or the initial state of the iterator.
+
+        Returns:
+            int: Segment of the evaluation log from which the evaluations are replayed
+            int: Offset in the segment from which the evaluations are replayed
+        """
+        snapshot_path = self.checkpoint_dir / STATE_FILE_NAME
+        if snapshot_path.is_file():
+            with open(snapshot_path, "rb") as file:
+                snapshot = pickle.load(file)
+            self.iterator.set_state(snapshot["state"])
+            self.num_evaluations = snapshot["num_evaluations"]
+            self._num_evaluations_at_snapshot = self.num_evaluations
+            self._resumed_from_snapshot = True
+            _logger.info(
+                "Restarting from the state snapshot after %s evaluations.", self.num_evaluations
+            )
+            return snapshot["log_segment"], snapshot["log_offset"]
+
+        with open(self.checkpoint_dir / INITIAL_STATE_FILE_NAME, "rb") as file:
+            self.iterator.set_state(pickle.load(file))
+        _logger.info("Restarting from the initial state.")
+        return 0, 0
+
+    def write_state_snapshot(self):
+        """Write a snapshot of the current iterator state if due.
+
+        The snapshot contains the position in the evaluation log up to which the state is
+        complete. Outside of the replay, a new log segment is started with the snapshot and the
+        previous segment is removed.
+        """
+        if self.num_evaluations - self._num_evaluations_at_snapshot < self.checkpoint_every:
+            return
+        new_log_file = None
+        if self._replay_offset is not None:
+            # the logged evaluations after the replay offset are still needed
+            log_segment, log_offset = self._log_segment, self._replay_offset
+        else:
+            log_segment, log_offset = self._log_segment + 1, 0
+            new_log_file = open(  # pylint: disable=consider-using-with
+                self._log_path(log_segment), "wb"
+            )
+        write_state(
+            {
+                "state": self.iterator.get_state(),
+                "log_segment": log_segment,
+                "log_offset": log_offset,
+                "num_evaluations": self.num_evaluations,
+            },
+            self.checkpoint_dir / STATE_FILE_NAME,
+        )
+        self._num_evaluations_at_snapshot = self.num_evaluations
+        if new_log_file is not None:
+            self._log_file.close()
+            self._log_path(self._log_segment).unlink()
+            self._log_file = new_log_file
+            self._log_segment = log_segment
+
+    def _read_logged_evaluation(self):
+        """Read the next logged evaluation.
+
+        Incomplete entries at the end of the log, e.g., due to a kill while writing, are ignored.
+
+        Returns:
+            dict: Logged evaluation or None at the end of the log
+        """
+        try:
+            return pickle.load(self._log_file)
+        except (EOFError, pickle.UnpicklingError):
+            return None
+
+    def _logged_evaluate(self, scheduler_index, evaluate):
+        """Wrap the evaluate method of a scheduler.
+
+        Args:
+            scheduler_index (int): Index of the scheduler
+            evaluate (method): Evaluate method of the scheduler
+
+        Returns:
+            function: Evaluate method that replays and logs the evaluations
+        """
+        scheduler = self._schedulers[scheduler_index]
+
+        def logged_evaluate(samples, driver, job_ids=None):
+            if self._replay_offset is not None:
+                entry = self._read_logged_evaluation()
+                if (
+                    entry is not None
+                    and entry["scheduler_index"] == scheduler_index
+                    and np.array_equal(entry["samples"], samples)
+                    and np.array_equal(entry["job_ids"], job_ids)
+                ):
+                    self._replay_offset = self._log_file.tell()
+                    self.num_replayed += 1
+                    self.num_evaluations += 1
+                    scheduler.next_job_id = entry["next_job_id"]
+                    return entry["response"]
+                if entry is not None:
+                    _logger.warning(
+                        "The run deviates from the checkpoint after %s evaluations. Continuing "
+                        "without the remaining logged evaluations.",
+                        self.num_evaluations,
+                    )
+            self._stop_replay()
+
+            self._evaluation_depth += 1
+            try:
+                response = evaluate(samples, driver, job_ids=job_ids)
+            finally:
+                self._evaluation_depth -= 1
+            entry = {
+                "scheduler_index": scheduler_index,
+                "samples": samples,
+                "job_ids": job_ids,
+                "response": response,
+                "next_job_id": scheduler.next_job_id,
+            }
+            pickle.dump(entry, self._log_file)
+            self._log_file.flush()
+            self.num_evaluations += 1
+            return response
+
+        return logged_evaluate
+
+    def _guarded_submit(self, submit):
+        """Wrap the submit method of a scheduler.
+
+        Results consumed with *as_completed* arrive in an arbitrary order and cannot be replayed,
+        so submissions are only allowed as part of an evaluation.
+
+        Args:
+            submit (method): Submit method of the scheduler
+
+        Returns:
+            function: Submit method that rejects submissions outside of evaluations
+        """
+
+        def guarded_submit(samples, driver, job_ids=None):
+            if self._evaluation_depth == 0:
+                raise RuntimeError(
+                    "Checkpointing only supports evaluations with Scheduler.evaluate, not with "
+                    "Scheduler.submit and Scheduler.as_completed."
+                )
+            return submit(samples, driver, job_ids=job_ids)
+
+        return guarded_submit
+
+    def _stop_replay(self):
+        """Stop replaying and drop logged evaluations that were not replayed."""
+        if self._replay_offset is None:
+            return
+        _logger.info("Replayed %s evaluations from the checkpoint.", self.num_replayed)
+        self._log_file.seek(self._replay_offset)
+        self._log_file.truncate()
+        self._replay_offset = None
@@ -262,6 +262,7 @@ def get_cli_options(args):
         help="Output directory to write results to. The directory has to be created by the user!",
     )
     parser.add_argument("--debug", type=str_to_bool, default=False, help="Debug mode yes/no.")
+    _add_checkpoint_arguments(parser)
 
     args = parser.parse_args(args)
 
@@ -278,6 +279,46 @@ def get_cli_options(args):
     return input_file, output_dir, debug
 
 
+def _add_checkpoint_arguments(parser):
+    """Add the checkpoint options to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser of the cli arguments
+    """
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Restart the run from the checkpoint in the output directory.",
+    )
+    parser.add_argument(
+        "--checkpoint_every",
+        type=int,
+        default=None,
+        help="Write a state snapshot at most every n scheduler evaluations.",
+    )
+
+
+def get_checkpoint_cli_options(args):
+    """Get the checkpoint options from args.
+
+    Args:
+        args (list): cli arguments
+
+    Returns:
+        dict: Checkpoint options that were provided, i.e., restart and checkpoint_every
+    """
+    parser = argparse.ArgumentParser(description="QUEENS")
+    _add_checkpoint_arguments(parser)
+    args, _ = parser.parse_known_args(args)
+
+    checkpoint_options = {}
+    if args.restart:
+        checkpoint_options["restart"] = True
+    if args.checkpoint_every is not None:
+        checkpoint_options["checkpoint_every"] = args.checkpoint_every
+    return checkpoint_options
+
+
 @cli_logging
 def print_greeting_message():
     """Print a greeting message and how to use QUEENS."""
@@ -24,6 +24,12 @@ _logger = logging.getLogger(__name__)
 BASE_DATA_DIR = "queens-simulation-data"
 EXPERIMENTS_BASE_FOLDER_NAME = "experiments"
 TESTS_BASE_FOLDER_NAME = "tests"
+EVALUATION_CACHE_FOLDER_NAME = "evaluation_cache"
+JOB_ARCHIVES_FOLDER_NAME = "job_archives"
+ROW_INDICES_FOLDER_NAME = "row_indices"
+
+# Maximum number of entries of a shard directory of job directories
+JOB_DIR_SHARD_SIZE = 100
 
 
 def base_directory():
@@ -53,40 +59,101 @@ def experiment_directory(experiment_name):
     return experiment_dir
 
 
+def evaluation_cache_directory():
+    """Hold the evaluation cache shared by all experiments on the computing machine."""
+    base_dir = base_directory()
+    evaluation_cache_dir = base_dir / EVALUATION_CACHE_FOLDER_NAME
+    create_directory(evaluation_cache_dir)
+    return evaluation_cache_dir
+
+
+def row_index_directory():
+    """Hold the row indices of the csv data processors on the computing machine."""
+    base_dir = base_directory()
+    row_index_dir = base_dir / ROW_INDICES_FOLDER_NAME
+    create_directory(row_index_dir)
+    return row_index_dir
+
+
 def create_directory(dir_path):
     """Create a directory either local or remote."""
     _logger.debug("Creating folder %s.", dir_path)
     create_folder_if_not_existent(dir_path)
 
 
-def current_job_directory(experiment_dir, job_id):
+def current_job_directory(experiment_dir, job_id, shard_levels=0):
     """Directory of the latest submitted job.
 
+    With sharding, the job directories are distributed over nested shard directories with at most
+    JOB_DIR_SHARD_SIZE entries each, e.g., *experiment_dir/12/34/1234* for two shard levels.
+
     Args:
         experiment_dir (Path): Experiment directory
         job_id (str): Job ID of the current job
+        shard_levels (int, opt): Number of shard directory levels
 
     Returns:
         job_dir (Path): Path to the current job directory.
     """
-    job_dir = experiment_dir / str(job_id)
+    shards = [
+        f"{(int(job_id) // JOB_DIR_SHARD_SIZE**level) % JOB_DIR_SHARD_SIZE:02d}"
+        for level in range(shard_levels - 1, -1, -1)
+    ]
+    job_dir = Path(experiment_dir).joinpath(*shards, str(job_id))
     return job_dir
 
 
+def _is_shard_directory(directory):
+    """Check if a directory is a shard directory of job directories.
+
+    Shard directories have two-digit names and contain only directories with numeric names. They
+    can be empty once their job directories are archived. Job directories always contain files,
+    e.g., the jobscript or the metadata.
+
+    Args:
+        directory (Path): Directory to check
+
+    Returns:
+        bool: True if the directory is a shard directory
+    """
+    if len(directory.name) != 2:
+        return False
+    return all(child.is_dir() and child.name.isdigit() for child in directory.iterdir())
+
+
 def job_dirs_in_experiment_dir(experiment_dir):
     """Get job directories in experiment_dir.
 
+    Job directories in shard directories are found as well.
+
     Args:
         experiment_dir (pathlib.Path, str): Path with the job dirs
 
     Returns:
         job_directories (list): List with job_dir paths
     """
-    experiment_dir = Path(experiment_dir)
     job_directories = []
-    for job_directory in experiment_dir.iterdir():
-        if job_directory.is_dir() and job_directory.name.isdigit():
-            job_directories.append(job_directory)
+    directories = [Path(experiment_dir)]
+    while directories:
+        for directory in directories.pop().iterdir():
+            if not (directory.is_dir() and directory.name.isdigit()):
+                continue
+            if _is_shard_directory(directory):
+                directories.append(directory)
+            else:
+                job_directories.append(directory)
 
     # Sort the jobs directories
     return sorted(job_directories, key=lambda x: int(x.name))
+
+
+def job_archives_in_experiment_dir(experiment_dir):
+    """Get archives of job directories in experiment_dir.
+
+    Args:
+        experiment_dir (pathlib.Path, str): Path with the job dirs
+
+    Returns:
+        list: Sorted paths to the archives
+    """
+    return sorted((Path(experiment_dir) / JOB_ARCHIVES_FOLDER_NAME).glob("*.tar"))
@@ -0,0 +1,437 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Persistent evaluation cache.
+
+The cache stores the response of a driver for a single sample on disk. Entries are addressed by
+the hash of the sample and a fingerprint of the driver, such that repeated samples, e.g. rejected
+MCMC proposals, overlapping finite difference stencils or restarted experiments, are served
+without running the driver again.
+"""
+
+import hashlib
+import io
+import logging
+import re
+import socket
+import sqlite3
+import subprocess
+import tarfile
+import threading
+import time
+import types
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from queens.utils.config_directories import evaluation_cache_directory
+from queens.utils.logger_settings import log_init_args
+from queens.utils.print_utils import get_str_table
+from queens.utils.result_assembler import ResultAssembler
+
+_logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = "index.sqlite"
+BLOB_FOLDER_NAME = "blobs"
+
+# Runtime handles, e.g., of the metadata store or the job archives, differ between processes and
+# are therefore fingerprinted by their type only
+_RUNTIME_HANDLE_TYPES = (
+    io.IOBase,
+    sqlite3.Connection,
+    sqlite3.Cursor,
+    tarfile.TarFile,
+    socket.socket,
+    subprocess.Popen,
+    threading.Thread,
+    type(threading.Lock()),
+    type(threading.RLock()),
+)
+
+# Memory addresses in the representations of objects
+_MEMORY_ADDRESS_PATTERN = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+class EvaluationCache:
+    """Content-addressed on-disk cache for driver evaluations.
+
+    The index is a sqlite database holding the size and the last access time of each entry. The
+    responses themselves are stored as npz files. If a maximum size is provided, the least recently
+    used entries are evicted once the cache exceeds it.
+
+    Attributes:
+        cache_dir (Path): Directory of the cache
+        max_size (int, None): Maximum size of the stored responses in bytes
+        driver_fingerprint (str, None): Fingerprint of the driver provided by the user
+        num_hits (int): Number of samples served from the cache
+        num_misses (int): Number of samples evaluated by the scheduler
+    """
+
+    @log_init_args
+    def __init__(self, cache_dir=None, max_size_in_mb=None, driver_fingerprint=None):
+        """Initialize evaluation cache.
+
+        Args:
+            cache_dir (str, Path, opt): Directory of the cache. Defaults to a directory shared by
+                                        all experiments in the QUEENS base directory.
+            max_size_in_mb (float, opt): Maximum size of the cache in MB. Defaults to no limit.
+            driver_fingerprint (str, opt): Fingerprint identifying the driver configuration. By
+                                           default, it is computed from the driver attributes.
+                                           Provide it if the driver depends on state that can
+                                           not be hashed, e.g. an external executable.
+        """
+        if cache_dir is None:
+            cache_dir = evaluation_cache_directory()
+        self.cache_dir = Path(cache_dir)
+        (self.cache_dir / BLOB_FOLDER_NAME).mkdir(parents=True, exist_ok=True)
+
+        self.max_size = None
+        if max_size_in_mb is not None:
+            self.max_size = int(max_size_in_mb * 1024**2)
+
+        self.driver_fingerprint = driver_fingerprint
+        self.num_hits = 0
+        self.num_misses = 0
+        self._driver_fingerprints = {}
+
+        with self._index() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+
+    def evaluate(self, samples, scheduler, driver):
+        """Evaluate samples and serve repeated samples from the cache.
+
+        Only samples that are not in the cache are submitted to the scheduler. Duplicates within
+        the batch are evaluated once.
+
+        Args:
+            samples (np.ndarray): Input samples
+            scheduler (Scheduler): Scheduler for the simulations
+            driver (Driver): Driver for the simulations
+
+        Returns:
+            response (dict): Response of the driver at the input samples
+        """
+        fingerprint = self.get_driver_fingerprint(driver)
+        keys = [self.sample_key(sample, fingerprint) for sample in samples]
+        entries = self.load(set(keys))
+
+        missing_rows = {}
+        for row, key in enumerate(keys):
+            if key not in entries and key not in missing_rows:
+                missing_rows[key] = row
+
+        num_hits = len(keys) - len(missing_rows)
+        self.num_hits += num_hits
+        self.num_misses += len(missing_rows)
+        cache_summary = {
+            "cache hits": num_hits,
+            "cache misses": len(missing_rows),
+        }
+
+        if missing_rows:
+            scheduler.batch_summary.update(cache_summary)
+            response = scheduler.evaluate(samples[list(missing_rows.values())], driver=driver)
+            gradients = response.get("gradient")
+            for i, key in enumerate(missing_rows):
+                result = response["result"][i]
+                gradient = None if gradients is None else gradients[i]
+                entries[key] = (result, gradient)
+                self.store(key, result, gradient)
+            self.evict()
+        elif scheduler.verbose:
+            _logger.info(get_str_table("Evaluation cache summary", cache_summary))
+
+        result_assembler = ResultAssembler(len(keys))
+        for row, key in enumerate(keys):
+            result_assembler.add(row, *entries[key])
+        return result_assembler.to_dict()
+
+    def get_driver_fingerprint(self, driver):
+        """Get the fingerprint of a driver.
+
+        Args:
+            driver (Driver): Driver for the simulations
+
+        Returns:
+            str: Fingerprint of the driver
+        """
+        if self.driver_fingerprint is not None:
+            return self.driver_fingerprint
+        if id(driver) not in self._driver_fingerprints:
+            self._driver_fingerprints[id(driver)] = (driver, fingerprint_object(driver))
+        return self._driver_fingerprints[id(driver)][1]
+
+    @staticmethod
+    def sample_key(sample, fingerprint):
+        """Compute the cache key of a sample.
+
+        Args:
+            sample (np.ndarray): Single input sample
+            fingerprint (str): Fingerprint of the driver
+
+        Returns:
+            str: Cache key
+        """
+        hasher = hashlib.sha256(fingerprint.encode())
+        hasher.update(np.ascontiguousarray(sample, dtype=np.float64).tobytes())
+        return hasher.hexdigest()
+
+    def load(self, keys):
+        """Load entries from the cache.
+
+        Args:
+            keys (set): Cache keys to look up
+
+        Returns:
+            entries (dict): Result and gradient for all keys found in the cache
+        """
+        entries = {}
+        if not keys:
+            return entries
+
+        with self._index() as connection:
+            stored_keys = set()
+            for chunk in _chunks(list(keys)):
+                placeholders = ",".join("?" * len(chunk))
+                stored_keys.update(
+                    key
+                    for (key,) in connection.execute(
+                        f"SELECT key FROM entries WHERE key IN ({placeholders})", chunk
+                    )
+                )
+
+            now = time.time()
+            for key in stored_keys:
+                blob_path = self._blob_path(key)
+                try:
+                    with np.load(blob_path, allow_pickle=False) as data:
+                        gradient = data["gradient"] if "gradient" in data.files else None
+                        entries[key] = (data["result"], gradient)
+                except FileNotFoundError:
+                    _logger.debug("Cache entry %s is missing on disk and is discarded.", key)
+                    connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    continue
+                connection.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        return entries
+
+    def store(self, key, result, gradient=None):
+        """Store an entry in the cache.
+
+        Args:
+            key (str): Cache key
+            result (np.ndarray): Result of the driver
+            gradient (np.ndarray, opt): Gradient of the driver
+        """
+        arrays = {"result": np.asarray(result)}
+        if gradient is not None:
+            arrays["gradient"] = np.asarray(gradient)
+        blob_path = self._blob_path(key)
+        blob_path.parent.mkdir(exist_ok=True)
+        with open(blob_path, "wb") as blob_file:
+            np.savez(blob_file, **arrays)
+
+        with self._index() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, size, last_access) VALUES (?, ?, ?)",
+                (key, blob_path.stat().st_size, time.time()),
+            )
+
+    def evict(self):
+        """Evict the least recently used entries until the cache fits its maximum size."""
+        if self.max_size is None:
+            return
+
+        with self._index() as connection:
+            (total_size,) = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            if total_size <= self.max_size:
+                return
+
+            evicted_keys = []
+            for key, size in connection.execute(
+                "SELECT key, size FROM entries ORDER BY last_access ASC"
+            ):
+                if total_size <= self.max_size:
+                    break
+                evicted_keys.append(key)
+                total_size -= size
+
+            for key in evicted_keys:
+                connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._blob_path(key).unlink(missing_ok=True)
+        _logger.debug("Evicted %d entries from the evaluation cache.", len(evicted_keys))
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._index() as connection:
+            for (key,) in connection.execute("SELECT key FROM entries").fetchall():
+                self._blob_path(key).unlink(missing_ok=True)
+            connection.execute("DELETE FROM entries")
+
+    @contextmanager
+    def _index(self):
+        """Open a transaction on the index database.
+
+        Yields:
+            sqlite3.Connection: Connection to the index
+        """
+        with closing(sqlite3.connect(self.cache_dir / INDEX_FILE_NAME, timeout=60)) as connection:
+            with connection:
+                yield connection
+
+    def _blob_path(self, key):
+        """Get the path of the blob of an entry.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Path: Path to the npz file
+        """
+        return self.cache_dir / BLOB_FOLDER_NAME / key[:2] / f"{key}.npz"
+
+
+def fingerprint_object(obj):
+    """Compute a fingerprint of an object.
+
+    The fingerprint is computed recursively from the attributes of the object. Files referenced by
+    paths are hashed by their content and functions by their byte code, so that changing a template
+    or the simulator function invalidates the cache. Runtime handles like locks, connections or
+    open files are skipped, such that the fingerprint is the same in every process.
+
+    Args:
+        obj (obj): Object to fingerprint, e.g. a driver
+
+    Returns:
+        str: Fingerprint of the object
+    """
+    hasher = hashlib.sha256()
+    _update_fingerprint(hasher, obj, set())
+    return hasher.hexdigest()
+
+
+def _update_fingerprint(hasher, obj, seen):
+    """Update the hasher with the content of an object.
+
+    Args:
+        hasher (hashlib._Hash): Hasher to update
+        obj (obj): Object to hash
+        seen (set): Ids of the objects that were already hashed
+    """
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        hasher.update(repr(obj).encode())
+        return
+
+    if id(obj) in seen:
+        hasher.update(b"<cycle>")
+        return
+    seen.add(id(obj))
+
+    hasher.update(f"{type(obj).__module__}.{type(obj).__qualname__}".encode())
+    match obj:
+        case _ if isinstance(obj, _RUNTIME_HANDLE_TYPES):
+            return
+        case Path():
+            hasher.update(str(obj).encode())
+            if obj.is_file():
+                hasher.update(_hash_file(obj))
+        case np.ndarray():
+            hasher.update(f"{obj.dtype}{obj.shape}".encode())
+            if obj.dtype.hasobject:
+                for value in obj.flat:
+                    _update_fingerprint(hasher, value, seen)
+            else:
+                hasher.update(np.ascontiguousarray(obj).tobytes())
+        case np.generic():
+            hasher.update(repr(obj.item()).encode())
+        case dict():
+            for key in sorted(obj, key=str):
+                _update_fingerprint(hasher, key, seen)
+                _update_fingerprint(hasher, obj[key], seen)
+        case list() | tuple():
+            for value in obj:
+                _update_fingerprint(hasher, value, seen)
+        case set() | frozenset():
+            for value in sorted(obj, key=repr):
+                _update_fingerprint(hasher, value, seen)
+        case types.FunctionType():
+            hasher.update(f"{obj.__module__}.{obj.__qualname__}".encode())
+            _update_fingerprint_with_code(hasher, obj.__code__)
+            for cell in obj.__closure__ or ():
+                _update_fingerprint(hasher, cell.cell_contents, seen)
+        case types.MethodType():
+            _update_fingerprint(hasher, obj.__func__, seen)
+            _update_fingerprint(hasher, obj.__self__, seen)
+        case types.BuiltinFunctionType() | types.ModuleType() | type():
+            hasher.update(f"{getattr(obj, '__module__', '')}.{obj.__qualname__}".encode())
+        case _ if hasattr(obj, "__dict__"):
+            _update_fingerprint(hasher, vars(obj), seen)
+        case _:
+            hasher.update(_MEMORY_ADDRESS_PATTERN.sub("", repr(obj)).encode())
+
+
+def _update_fingerprint_with_code(hasher, code):
+    """Update the hasher with a code object.
+
+    Args:
+        hasher (hashlib._Hash): Hasher to update
+        code (types.CodeType): Code object
+    """
+    hasher.update(code.co_code)
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            _update_fingerprint_with_code(hasher, constant)
+        else:
+            hasher.update(repr(constant).encode())
+    hasher.update(repr(code.co_names).encode())
+
+
+def _hash_file(file_path):
+    """Hash the content of a file.
+
+    Args:
+        file_path (Path): Path to the file
+
+    Returns:
+        bytes: Digest of the file content
+    """
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(2**20), b""):
+            hasher.update(block)
+    return hasher.digest()
+
+
+def _chunks(values, chunk_size=500):
+    """Split a list into chunks.
+
+    sqlite limits the number of variables per statement.
+
+    Args:
+        values (list): Values to split
+        chunk_size (int, opt): Maximum size of a chunk
+
+    Yields:
+        list: Chunk of values
+    """
+    for start in range(0, len(values), chunk_size):
+        yield values[start : start + chunk_size]
+
+
+VALID_CACHE_TYPES = {"evaluation_cache": EvaluationCache}
@@ -33,6 +33,7 @@ from queens.schedulers import VALID_TYPES as VALID_SCHEDULER_TYPES
 from queens.schedulers import Scheduler
 from queens.stochastic_optimizers import VALID_TYPES as VALID_STOCHASTIC_OPTIMIZER_TYPES
 from queens.utils.classifier import VALID_CLASSIFIER_LEARNING_TYPES, VALID_CLASSIFIER_TYPES
+from queens.utils.evaluation_cache import VALID_CACHE_TYPES
 from queens.utils.exceptions import InvalidOptionError
 from queens.utils.experimental_data_reader import (
     VALID_TYPES as VALID_EXPERIMENTAL_DATA_READER_TYPES,
@@ -46,6 +47,7 @@ _logger = logging.getLogger(__name__)
 
 
 VALID_TYPES = {
+    **VALID_CACHE_TYPES,
     **VALID_CLASSIFIER_LEARNING_TYPES,
     **VALID_CLASSIFIER_TYPES,
     **VALID_CONNECTION_TYPES,
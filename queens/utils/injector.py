@@ -18,12 +18,17 @@ The module supplies functions to inject parameter values into a template
 text file.
 """
 
+import os
 from pathlib import Path
 
 from jinja2 import Environment, StrictUndefined, Undefined
+from jinja2.exceptions import TemplateSyntaxError, UndefinedError
 
 from queens.utils.io_utils import read_file
 
+# Names that jinja interprets as constants instead of variables
+_JINJA_CONSTANTS = {"true", "false", "none", "True", "False", "None"}
+
 
 def render_template(params, template, strict=True):
     """Function to insert parameters into a template.
@@ -36,10 +41,7 @@ def render_template(params, template, strict=True):
     Returns:
         str: injected template
     """
-    undefined = StrictUndefined if strict else Undefined
-
-    environment = Environment(undefined=undefined).from_string(template)
-    return environment.render(**params)
+    return InjectionTemplate(template, strict).render(params)
 
 
 def inject_in_template(params, template, output_file, strict=True):
@@ -51,8 +53,7 @@ def inject_in_template(params, template, output_file, strict=True):
         output_file (str, Path): Name of output file with injected parameters
         strict (bool): Raises exception if mismatch between provided and required parameters
     """
-    injected_template = render_template(params, template, strict)
-    Path(output_file).write_text(injected_template, encoding="utf-8")
+    InjectionTemplate(template, strict).write(params, output_file)
 
 
 def inject(params, template_path, output_file, strict=True):
@@ -66,3 +67,205 @@ def inject(params, template_path, output_file, strict=True):
     """
     template = read_file(template_path)
     inject_in_template(params, template, output_file, strict)
+
+
+def split_at_placeholders(template):
+    """Split a template into text chunks and placeholder names.
+
+    This is only possible if the template contains nothing but plain placeholders like
+    *{{ name }}*, i.e., no filters, attributes, statements or comments.
+
+    Args:
+        template (str): Template
+
+    Returns:
+        chunks (list, None): Text between the placeholders (None if the template is not simple)
+        names (list, None): Names of the placeholders (None if the template is not simple)
+    """
+    chunks = []
+    names = []
+    text = []
+    state = "data"
+    try:
+        # The lexer already applies the newline handling of jinja
+        tokens = list(Environment().lex(template))
+    except TemplateSyntaxError:
+        return None, None
+
+    for _, token_type, value in tokens:
+        if token_type == "whitespace" and state != "data":
+            continue
+        if state == "data" and token_type == "data":
+            text.append(value)
+        elif state == "data" and token_type == "variable_begin":
+            state = "begin"
+        elif state == "begin" and token_type == "name" and value not in _JINJA_CONSTANTS:
+            chunks.append("".join(text))
+            names.append(value)
+            text = []
+            state = "name"
+        elif state == "name" and token_type == "variable_end":
+            state = "data"
+        else:
+            return None, None
+    chunks.append("".join(text))
+    return chunks, names
+
+
+class InjectionTemplate:
+    """Template that is compiled once and injected many times.
+
+    Templates that only contain plain placeholders are written by splicing: the unchanged text
+    between the placeholders is encoded once and only the substituted values are formatted per
+    injection. All other templates are compiled once by jinja.
+
+    Attributes:
+        template (str): Template
+        strict (bool): Raises exception if required parameters from the template are missing
+    """
+
+    def __init__(self, template, strict=True):
+        """Initialize injection template.
+
+        Args:
+            template (str): Template
+            strict (bool, opt): Raises exception if required parameters from the template are
+                                missing
+        """
+        self.template = template
+        self.strict = strict
+        self._compiled = None
+
+    @property
+    def compiled(self):
+        """Compiled template.
+
+        Returns:
+            tuple: Encoded text chunks and placeholder names for simple templates, otherwise the
+            compiled jinja template
+        """
+        if self._compiled is None:
+            chunks, names = split_at_placeholders(self.template)
+            if chunks is None:
+                undefined = StrictUndefined if self.strict else Undefined
+                self._compiled = Environment(undefined=undefined).from_string(self.template)
+            else:
+                self._compiled = ([chunk.encode("utf-8") for chunk in chunks], names)
+        return self._compiled
+
+    def __getstate__(self):
+        """Get the state for pickling without the compiled template.
+
+        Returns:
+            dict: State of the template
+        """
+        state = self.__dict__.copy()
+        state["_compiled"] = None
+        return state
+
+    def _splice(self, params):
+        """Splice the values of the placeholders into the text chunks of a simple template.
+
+        Args:
+            params (dict): Dict with parameters to inject
+
+        Yields:
+            bytes: Encoded parts of the injected template
+        """
+        chunks, names = self.compiled
+        for chunk, name in zip(chunks, names):
+            yield chunk
+            if name in params:
+                yield str(params[name]).encode("utf-8")
+            elif self.strict:
+                raise UndefinedError(f"'{name}' is undefined")
+        yield chunks[-1]
+
+    def render(self, params):
+        """Insert parameters into the template.
+
+        Args:
+            params (dict): Dict with parameters to inject
+
+        Returns:
+            str: injected template
+        """
+        if not isinstance(self.compiled, tuple):
+            return self.compiled.render(**params)
+        return b"".join(self._splice(params)).decode("utf-8")
+
+    def write(self, params, output_file):
+        """Insert parameters into the template and write to file.
+
+        Args:
+            params (dict): Dict with parameters to inject
+            output_file (str, Path): Name of output file with injected parameters
+        """
+        if not isinstance(self.compiled, tuple):
+            Path(output_file).write_text(self.render(params), encoding="utf-8")
+            return
+
+        # Render before opening the file, such that no file is left behind on errors
+        parts = list(self._splice(params))
+        with open(output_file, "wb") as file:
+            file.writelines(parts)
+
+
+class TemplateCache:
+    """Cache of injection templates, e.g., of a driver.
+
+    Template files are only read and compiled again if they changed. The cache is not pickled,
+    such that each worker process compiles the templates once.
+
+    Attributes:
+        strict (bool): Raises exception if required parameters from the templates are missing
+    """
+
+    def __init__(self, strict=True):
+        """Initialize template cache.
+
+        Args:
+            strict (bool, opt): Raises exception if required parameters from the templates are
+                                missing
+        """
+        self.strict = strict
+        self._file_templates = {}
+        self._string_templates = {}
+
+    def __getstate__(self):
+        """Get the state for pickling without the cached templates.
+
+        Returns:
+            dict: State of the cache
+        """
+        return {"strict": self.strict, "_file_templates": {}, "_string_templates": {}}
+
+    def from_file(self, template_path):
+        """Get the template of a file.
+
+        Args:
+            template_path (str, Path): Path to template
+
+        Returns:
+            InjectionTemplate: Template of the file
+        """
+        stat = os.stat(template_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        key = str(template_path)
+        if key not in self._file_templates or self._file_templates[key][0] != version:
+            template = InjectionTemplate(read_file(template_path), self.strict)
+            self._file_templates[key] = (version, template)
+        return self._file_templates[key][1]
+
+    def from_string(self, template):
+        """Get the template of a string.
+
+        Args:
+            template (str): Template
+
+        Returns:
+            InjectionTemplate: Template of the string
+        """
+        if template not in self._string_templates:
+            self._string_templates[template] = InjectionTemplate(template, self.strict)
+        return self._string_templates[template]
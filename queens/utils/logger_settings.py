@@ -14,18 +14,27 @@
 #
 """Logging in QUEENS."""
 
+import asyncio
 import functools
 import inspect
 import io
 import logging
 import re
 import sys
+import threading
 import time
 
 from queens.utils.print_utils import get_str_table
 
 LIBRARY_LOGGER_NAME = "queens"
 
+# Length in bytes above which lines of streamed job output are searched for the terminate
+# expression in parts
+MAX_STREAMED_LINE_LENGTH = 2**20
+
+# Size in bytes of the chunks in which the job output is read by asyncio
+ASYNC_STDOUT_CHUNK_SIZE = 2**16
+
 
 class LogFilter(logging.Filter):
     """Filters (lets through) all messages with level <= LEVEL.
@@ -280,6 +289,7 @@ def job_logging(command_string, process, job_logger, terminate_expression):
     """
     # initialize stderr to None
     stderr = None
+    terminate_pattern = re.compile(terminate_expression) if terminate_expression else None
 
     # start logging
     job_logger.info("run_subprocess started with:")
@@ -300,9 +310,9 @@ def job_logging(command_string, process, job_logger, terminate_expression):
                 for errline in io.StringIO(stderr):
                     job_logger.error(errline)
             break
-        if terminate_expression:
+        if terminate_pattern:
             # two seconds in time.sleep(2) are arbitrary. Feel free to tune it to your needs.
-            if re.search(terminate_expression, line):
+            if terminate_pattern.search(line):
                 job_logger.warning("run_subprocess detected terminate expression:")
                 job_logger.error(line)
                 # give program the chance to terminate by itself, because terminate expression
@@ -320,6 +330,375 @@ def job_logging(command_string, process, job_logger, terminate_expression):
     return stderr
 
 
+class JobOutputStreamer:
+    """Stream the raw output of a job to its log file.
+
+    The output is written to the log file as is, without passing each line through the logging
+    handlers. The terminate expression is searched for in whole chunks of complete lines and only
+    the last line of a chunk is forwarded to the job logger, at most once per forwarding
+    interval. Forwarded lines are not written to the log file a second time.
+
+    Attributes:
+        job_logger (logging.Logger): Job logger
+        log_file_handler (logging.FileHandler): Handler of the log file
+        terminate_pattern (re.Pattern, None): Compiled terminate expression
+        chunk_size (int): Maximum size of the chunks of output in bytes
+        forwarding_interval (float, None): Minimal time in seconds between forwarded lines (None if
+                                           no lines are forwarded)
+        last_forwarding_time (float): Time of the last forwarded line
+        incomplete_line (bytes): Incomplete last line of the output so far
+        terminate_expression_found (bool): True if the terminate expression was found
+    """
+
+    def __init__(
+        self,
+        job_logger,
+        log_file_handler,
+        terminate_expression,
+        chunk_size=2**20,
+        forwarded_lines_per_second=1.0,
+    ):
+        """Initialize JobOutputStreamer object.
+
+        Args:
+            job_logger (logging.Logger): Job logger
+            log_file_handler (logging.FileHandler): Handler of the log file
+            terminate_expression (str, None): Expression on which to terminate
+            chunk_size (int, opt): Maximum size of the chunks of output in bytes
+            forwarded_lines_per_second (float, opt): Maximum number of lines forwarded to the job
+                                                     logger per second. No lines are forwarded if
+                                                     zero.
+        """
+        self.job_logger = job_logger
+        self.log_file_handler = log_file_handler
+        self.terminate_pattern = None
+        if terminate_expression:
+            self.terminate_pattern = re.compile(terminate_expression.encode(), re.MULTILINE)
+        self.chunk_size = chunk_size
+        self.forwarding_interval = None
+        if forwarded_lines_per_second:
+            self.forwarding_interval = 1.0 / forwarded_lines_per_second
+        self.last_forwarding_time = -float("inf")
+        self.incomplete_line = b""
+        self.terminate_expression_found = False
+        self.log_file_handler.addFilter(_is_not_forwarded_output)
+
+    def feed(self, chunk):
+        """Process a chunk of output.
+
+        Args:
+            chunk (bytes): Chunk of output
+
+        Returns:
+            bool: True if the terminate expression was found for the first time in this chunk
+        """
+        self._write(chunk)
+
+        last_line_end = chunk.rfind(b"\n")
+        if last_line_end == -1:
+            self.incomplete_line += chunk
+            if len(self.incomplete_line) < MAX_STREAMED_LINE_LENGTH:
+                return False
+            # scan overly long lines anyway to bound the memory
+            complete_lines, self.incomplete_line = self.incomplete_line, b""
+        else:
+            complete_lines = self.incomplete_line + chunk[:last_line_end]
+            self.incomplete_line = chunk[last_line_end + 1 :]
+        return self._process_lines(complete_lines)
+
+    def close(self):
+        """Process the remaining output and stop streaming."""
+        if self.incomplete_line:
+            self._process_lines(self.incomplete_line)
+            self.incomplete_line = b""
+        self.log_file_handler.removeFilter(_is_not_forwarded_output)
+
+    def _write(self, chunk):
+        """Write raw output to the log file.
+
+        Args:
+            chunk (bytes): Chunk of output
+        """
+        self.log_file_handler.acquire()
+        try:
+            # flush the text layer, such that the raw output is appended in the right order
+            self.log_file_handler.stream.flush()
+            self.log_file_handler.stream.buffer.write(chunk)
+            self.log_file_handler.stream.buffer.flush()
+        finally:
+            self.log_file_handler.release()
+
+    def _process_lines(self, lines):
+        """Search for the terminate expression and forward a line to the job logger.
+
+        Args:
+            lines (bytes): Complete lines of output
+
+        Returns:
+            bool: True if the terminate expression was found for the first time in the lines
+        """
+        found_terminate_expression = False
+        if self.terminate_pattern is not None and not self.terminate_expression_found:
+            match = self.terminate_pattern.search(lines)
+            if match is not None:
+                self.terminate_expression_found = found_terminate_expression = True
+                line_start = lines.rfind(b"\n", 0, match.start()) + 1
+                line_end = lines.find(b"\n", match.end())
+                line = lines[line_start : None if line_end == -1 else line_end]
+                self.job_logger.warning("run_subprocess detected terminate expression:")
+                self.job_logger.error(line.decode(errors="replace").rstrip())
+
+        now = time.monotonic()
+        if (
+            self.forwarding_interval is not None
+            and now - self.last_forwarding_time >= self.forwarding_interval
+        ):
+            self.last_forwarding_time = now
+            line = lines[lines.rfind(b"\n") + 1 :].decode(errors="replace").rstrip()
+            self.job_logger.info(line, extra={"forwarded_output": True})
+        return found_terminate_expression
+
+
+def _is_not_forwarded_output(record):
+    """Filter out output forwarded by a job output streamer.
+
+    Args:
+        record (logging.LogRecord): Log record
+
+    Returns:
+        bool: True if the record was not forwarded by a job output streamer
+    """
+    return not getattr(record, "forwarded_output", False)
+
+
+def job_logging_chunked(command_string, process, job_logger, output_streamer):
+    """Logging of job reading the output in chunks.
+
+    In contrast to *job_logging*, the output is not logged line by line but streamed to the log
+    file in chunks by the output streamer, which considerably reduces the overhead for jobs with
+    a large output.
+
+    Args:
+        command_string (str): Command string for the subprocess
+        process (obj): Subprocess object with binary output
+        job_logger (obj): Job logger object
+        output_streamer (JobOutputStreamer): Streamer of the output
+
+    Returns:
+        stderr (str): Error messages
+    """
+    job_logger.info("run_subprocess started with:")
+    job_logger.info(command_string)
+
+    # read stderr concurrently such that a full pipe does not block the subprocess
+    stderr_chunks = []
+    stderr_thread = threading.Thread(
+        target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True
+    )
+    stderr_thread.start()
+
+    terminate_timer = None
+    try:
+        while chunk := process.stdout.read1(output_streamer.chunk_size):
+            if output_streamer.feed(chunk) and terminate_timer is None:
+                # give program the chance to terminate by itself, because terminate expression
+                # will be found also if program terminates itself properly
+                terminate_timer = threading.Timer(
+                    2, _terminate_job_if_running, (process, job_logger)
+                )
+                terminate_timer.start()
+    finally:
+        output_streamer.close()
+
+    exit_code = process.wait()
+    if terminate_timer is not None:
+        terminate_timer.cancel()
+    stderr_thread.join()
+    job_logger.info("subprocess exited with code %s.", exit_code)
+
+    stderr = b"".join(stderr_chunks).decode(errors="replace")
+    if stderr:
+        job_logger.error("error message (if provided) follows:")
+        for errline in io.StringIO(stderr):
+            job_logger.error(errline)
+    return stderr
+
+
+def _terminate_job_if_running(process, job_logger):
+    """Terminate a job if it is still running.
+
+    Args:
+        process (obj): Subprocess object
+        job_logger (obj): Job logger object
+    """
+    if process.poll() is None:
+        job_logger.warning("running job will be terminated by QUEENS.")
+        process.terminate()
+
+
+async def job_logging_async(
+    command_string,
+    process,
+    job_logger,
+    terminate_expression,
+    output_timeout=2,
+    output_streamer=None,
+):
+    """Actual logging of job run by asyncio.
+
+    In contrast to *job_logging*, stdout and stderr are read concurrently without blocking the
+    event loop, such that many jobs can be logged by a single thread. Descendants of the
+    subprocess that outlive it and keep its output open are not waited for longer than
+    *output_timeout*.
+
+    Args:
+        command_string (str): Command string for the subprocess
+        process (asyncio.subprocess.Process): Subprocess object
+        job_logger (obj): Job logger object
+        terminate_expression (str): Expression on which to terminate
+        output_timeout (float, opt): Time in seconds to wait for the remaining output after the
+                                     subprocess exited
+        output_streamer (JobOutputStreamer, opt): Streamer of the output
+
+    Returns:
+        stderr (str): Error messages
+    """
+    job_logger.info("run_subprocess started with:")
+    job_logger.info(command_string)
+
+    if output_streamer is None:
+        terminate_pattern = re.compile(terminate_expression) if terminate_expression else None
+        stdout_task = asyncio.create_task(_log_stdout_async(process, job_logger, terminate_pattern))
+    else:
+        stdout_task = asyncio.create_task(_stream_stdout_async(process, output_streamer))
+    stderr_task = asyncio.create_task(process.stderr.read())
+
+    # if the output is not read anymore, the subprocess blocks on the full pipe
+    exit_task = asyncio.create_task(_wait_for_exit(process))
+    await asyncio.wait([exit_task, stdout_task], return_when=asyncio.FIRST_COMPLETED)
+    if stdout_task.done() and stdout_task.exception() is not None:
+        exit_task.cancel()
+        stderr_task.cancel()
+        stdout_task.result()
+    exit_code = await exit_task
+
+    done, pending = await asyncio.wait([stdout_task, stderr_task], timeout=output_timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        job_logger.warning("output of processes outliving the subprocess is not logged.")
+    if stdout_task in done:
+        stdout_task.result()
+    job_logger.info("subprocess exited with code %s.", exit_code)
+
+    stderr = "" if stderr_task in pending else stderr_task.result().decode(errors="replace")
+    if stderr:
+        job_logger.error("error message (if provided) follows:")
+        for errline in io.StringIO(stderr):
+            job_logger.error(errline)
+    return stderr
+
+
+async def _log_stdout_async(process, job_logger, terminate_pattern):
+    """Log the stdout of a subprocess run by asyncio.
+
+    The output is read in chunks and split into lines here, such that lines of any length are
+    logged like by *job_logging*.
+
+    Args:
+        process (asyncio.subprocess.Process): Subprocess object
+        job_logger (obj): Job logger object
+        terminate_pattern (re.Pattern, None): Pattern on which to terminate
+    """
+    terminate_task = None
+    # parts of the current line that is not yet terminated by a newline
+    line_parts = []
+
+    def log_line(line):
+        nonlocal terminate_task
+        line = line.decode(errors="replace").rstrip()
+        if terminate_pattern is not None and terminate_pattern.search(line):
+            job_logger.warning("run_subprocess detected terminate expression:")
+            job_logger.error(line)
+            # give program the chance to terminate by itself, because terminate expression
+            # will be found also if program terminates itself properly
+            if terminate_task is None:
+                terminate_task = asyncio.create_task(_terminate_job(process, job_logger))
+            return
+        job_logger.info(line)
+
+    try:
+        while chunk := await process.stdout.read(ASYNC_STDOUT_CHUNK_SIZE):
+            *lines, last_part = chunk.split(b"\n")
+            if lines:
+                line_parts.append(lines[0])
+                lines[0] = b"".join(line_parts)
+                line_parts = []
+            for line in lines:
+                log_line(line)
+            if last_part:
+                line_parts.append(last_part)
+        if line_parts:
+            log_line(b"".join(line_parts))
+    finally:
+        if terminate_task is not None:
+            terminate_task.cancel()
+
+
+async def _stream_stdout_async(process, output_streamer):
+    """Stream the stdout of a subprocess run by asyncio in chunks.
+
+    Args:
+        process (asyncio.subprocess.Process): Subprocess object
+        output_streamer (JobOutputStreamer): Streamer of the output
+    """
+    terminate_task = None
+    try:
+        while chunk := await process.stdout.read(output_streamer.chunk_size):
+            if output_streamer.feed(chunk) and terminate_task is None:
+                terminate_task = asyncio.create_task(
+                    _terminate_job(process, output_streamer.job_logger)
+                )
+    finally:
+        output_streamer.close()
+        if terminate_task is not None:
+            terminate_task.cancel()
+
+
+async def _wait_for_exit(process, poll_interval=0.1):
+    """Wait for the exit of a subprocess run by asyncio.
+
+    *process.wait()* also waits until the output of the subprocess is closed, which is delayed by
+    descendants that outlive the subprocess. Hence, the return code is polled in addition.
+
+    Args:
+        process (asyncio.subprocess.Process): Subprocess object
+        poll_interval (float, opt): Time in seconds between checks of the return code
+
+    Returns:
+        int: Return code of the subprocess
+    """
+    wait_task = asyncio.create_task(process.wait())
+    while process.returncode is None:
+        await asyncio.wait([wait_task], timeout=poll_interval)
+    wait_task.cancel()
+    return process.returncode
+
+
+async def _terminate_job(process, job_logger, delay=2):
+    """Terminate a job if it is still running after a delay.
+
+    Args:
+        process (asyncio.subprocess.Process): Subprocess object
+        job_logger (obj): Job logger object
+        delay (float, opt): Time in seconds to wait before the termination
+    """
+    await asyncio.sleep(delay)
+    if process.returncode is None:
+        job_logger.warning("running job will be terminated by QUEENS.")
+        process.terminate()
+
+
 def finish_job_logger(job_logger, lfh, efh, stream_handler):
     """Close and remove file handlers.
 
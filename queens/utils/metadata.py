@@ -14,7 +14,12 @@
 #
 """Metadata objects."""
 
-from contextlib import contextmanager
+import json
+import socket
+import sqlite3
+import tarfile
+import threading
+from contextlib import closing, contextmanager
 from datetime import datetime
 from pathlib import Path
 from time import perf_counter
@@ -23,12 +28,21 @@ import pandas as pd
 import yaml
 from pandas.io.json._normalize import nested_to_record
 
-from queens.utils.config_directories import job_dirs_in_experiment_dir
+from queens.utils.config_directories import (
+    job_archives_in_experiment_dir,
+    job_dirs_in_experiment_dir,
+)
 from queens.utils.io_utils import to_dict_with_standard_types
 from queens.utils.print_utils import get_str_table
 
 METADATA_FILENAME = "metadata"
 METADATA_FILETYPE = ".yaml"
+METADATA_STORE_FOLDER_NAME = "metadata_store"
+METADATA_STORE_TABLE = "metadata"
+
+# Time in seconds to wait for the lock of a metadata store held by another process
+METADATA_STORE_TIMEOUT = 600
+_STORE_LOCK = threading.Lock()
 
 
 class SimulationMetadata:
@@ -39,24 +53,28 @@ class SimulationMetadata:
     Attributes:
         job_id (int): Id of the job
         inputs (dict): Parameters for this job
-        file_path (pathlib.Path): Path to export the metadata
+        file_path (pathlib.Path, None): Path to export the metadata (None without yaml export)
         timestamp (str): Timestamp of the object creation
         outputs (tuple): Results obtain by the simulation
         times (dict): Wall times of code sections
     """
 
-    def __init__(self, job_id, inputs, job_dir):
+    def __init__(self, job_id, inputs, job_dir, export_yaml=True):
         """Init simulation metadata object.
 
         Args:
             job_id (int): Id of the job
             inputs (dict): Parameters for this job
             job_dir (pathlib.Path): Directory in which to write the metadata
+            export_yaml (bool, opt): If true, the metadata is exported to a yaml file in the job
+                                     directory
         """
         self.job_id = job_id
         self.timestamp = None
         self.inputs = inputs
-        self.file_path = (Path(job_dir) / METADATA_FILENAME).with_suffix(METADATA_FILETYPE)
+        self.file_path = None
+        if export_yaml:
+            self.file_path = (Path(job_dir) / METADATA_FILENAME).with_suffix(METADATA_FILETYPE)
         self.outputs = None
         self.times = {}
         self._create_timestamp()
@@ -75,8 +93,22 @@ class SimulationMetadata:
         dictionary.pop("file_path")
         return dictionary
 
+    def to_record(self):
+        """Create a flat record of the metadata, e.g., for a metadata store.
+
+        Returns:
+            dict: Flat dictionary with scalar values, lists are encoded as json
+        """
+        record = nested_to_record(to_dict_with_standard_types(self.to_dict()))
+        return {
+            key: json.dumps(value) if isinstance(value, list) else value
+            for key, value in record.items()
+        }
+
     def export(self):
         """Export the object to human readable format."""
+        if self.file_path is None:
+            return
         yaml_string = yaml.safe_dump(
             to_dict_with_standard_types(self.to_dict()), sort_keys=False, default_flow_style=False
         )
@@ -131,7 +163,8 @@ class SimulationMetadata:
 def get_metadata_from_experiment_dir(experiment_dir):
     """Get metadata from experiment_dir.
 
-    To keep memory usage limited, this is implemented as a generator.
+    To keep memory usage limited, this is implemented as a generator. The metadata of archived
+    job directories is yielded after the metadata of the job directories.
 
     Args:
         experiment_dir (pathlib.Path, str): Path with the job dirs
@@ -143,6 +176,142 @@ def get_metadata_from_experiment_dir(experiment_dir):
         metadata_path = (job_dir / METADATA_FILENAME).with_suffix(METADATA_FILETYPE)
         yield yaml.safe_load(metadata_path.read_text())
 
+    metadata_file_name = METADATA_FILENAME + METADATA_FILETYPE
+    for archive_path in job_archives_in_experiment_dir(experiment_dir):
+        with tarfile.open(archive_path) as archive:
+            for member in archive:
+                member_path = Path(member.name)
+                if member_path.name == metadata_file_name and member_path.parent.name.isdigit():
+                    yield yaml.safe_load(archive.extractfile(member).read())
+
+
+class MetadataStore:
+    """Append-only store of job metadata.
+
+    The metadata of each job is stored as one row of a sqlite table with one column per flattened
+    metadata entry, e.g., *inputs.x1* or *times.run_jobscript.time*. To avoid concurrent writes
+    to the same file from different hosts, each host writes its own database in the metadata store
+    folder of the experiment directory. The processes of a host are serialized by the lock of the
+    database, and records are appended in batches. The batches are written by the drivers in the
+    workers, i.e., one batch per driver run, as the records do not pass through the scheduler.
+
+    Attributes:
+        store_dir (Path): Directory of the databases
+    """
+
+    def __init__(self, experiment_dir):
+        """Initialize metadata store.
+
+        Args:
+            experiment_dir (pathlib.Path, str): Path to QUEENS experiment directory
+        """
+        self.store_dir = Path(experiment_dir) / METADATA_STORE_FOLDER_NAME
+
+    def append(self, records):
+        """Append records to the database of this host in one transaction.
+
+        Args:
+            records (list): Flat metadata records, see SimulationMetadata.to_record
+        """
+        if not records:
+            return
+        with _STORE_LOCK, closing(self._connect()) as connection:
+            # lock the database before reading the columns, other processes might add columns
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                columns = {
+                    row[1]
+                    for row in connection.execute(f"PRAGMA table_info({METADATA_STORE_TABLE})")
+                }
+                new_columns = {key for record in records for key in record} - columns
+                for column in sorted(new_columns):
+                    connection.execute(
+                        f"ALTER TABLE {METADATA_STORE_TABLE} ADD COLUMN {_quote(column)}"
+                    )
+                for record in records:
+                    keys = list(record)
+                    connection.execute(
+                        f"INSERT INTO {METADATA_STORE_TABLE} ({', '.join(map(_quote, keys))}) "
+                        f"VALUES ({', '.join('?' * len(keys))})",
+                        [record[key] for key in keys],
+                    )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _connect(self):
+        """Connect to the database of this host.
+
+        Returns:
+            connection (sqlite3.Connection): Connection to the database in autocommit mode
+        """
+        path = self.store_dir / f"{socket.gethostname()}.sqlite"
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, timeout=METADATA_STORE_TIMEOUT, isolation_level=None)
+        # The data is safe if the process dies, only an OS crash might lose the last jobs
+        connection.execute("PRAGMA synchronous=OFF")
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {METADATA_STORE_TABLE} (job_id)")
+        return connection
+
+    def databases(self):
+        """Get the databases of all processes.
+
+        Returns:
+            list: Sorted paths to the databases
+        """
+        return sorted(self.store_dir.glob("*.sqlite"))
+
+    def to_dataframe(self):
+        """Read the metadata of all jobs.
+
+        Returns:
+            pd.DataFrame: Metadata with one row per job, sorted by job id
+        """
+        dataframes = []
+        for database in self.databases():
+            with closing(sqlite3.connect(database)) as connection:
+                dataframes.append(pd.read_sql(f"SELECT * FROM {METADATA_STORE_TABLE}", connection))
+        if not dataframes:
+            return pd.DataFrame()
+        return pd.concat(dataframes, ignore_index=True).sort_values("job_id", ignore_index=True)
+
+
+def _quote(identifier):
+    """Quote an sqlite identifier.
+
+    Args:
+        identifier (str): Identifier, e.g., a column name
+
+    Returns:
+        str: Quoted identifier
+    """
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def get_metadata_dataframe(experiment_dir):
+    """Get the metadata of all jobs of an experiment.
+
+    The metadata is read in bulk from the metadata store. Experiments without a metadata store
+    are read from the yaml files of the jobs.
+
+    Args:
+        experiment_dir (pathlib.Path, str): Path with the job dirs
+
+    Returns:
+        pd.DataFrame: Metadata with one row per job
+    """
+    metadata_store = MetadataStore(experiment_dir)
+    if metadata_store.databases():
+        return metadata_store.to_dataframe()
+
+    data = []
+    for job_metadata in get_metadata_from_experiment_dir(experiment_dir):
+        # For proper csv the dictionary can not be nested
+        job_metadata = nested_to_record(job_metadata)
+        data.append(job_metadata)
+    return pd.DataFrame.from_dict(data)
+
 
 def write_metadata_to_csv(experiment_dir, csv_path=None):
     """Gather and write job metadata to csv.
@@ -155,10 +324,5 @@ def write_metadata_to_csv(experiment_dir, csv_path=None):
     if not csv_path:
         csv_path = experiment_dir / "metadata_gathered.csv"
 
-    data = []
-    for job_metadata in get_metadata_from_experiment_dir(experiment_dir):
-        # For proper csv the dictionary can not be nested
-        job_metadata = nested_to_record(job_metadata)
-        data.append(job_metadata)
-    df = pd.DataFrame.from_dict(data)
+    df = get_metadata_dataframe(experiment_dir)
     df.to_csv(csv_path)
@@ -14,12 +14,28 @@
 #
 """Pool utils."""
 
+import hashlib
 import logging
+import weakref
+from collections import OrderedDict
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
 
+import dill
+import numpy as np
 from pathos.multiprocessing import ProcessingPool as Pool
 
 _logger = logging.getLogger(__name__)
 
+# Maximum number of shared objects kept per worker process
+MAX_CACHED_OBJECTS = 8
+
+# Objects loaded by this (worker) process, keyed by the hash of their serialization
+_LOADED_OBJECTS = OrderedDict()
+
+# Shared array attached by this (worker) process
+_ATTACHED_ARRAY = {}
+
 
 def create_pool(number_of_workers):
     """Create pathos Pool from number of workers.
@@ -34,7 +50,160 @@ def create_pool(number_of_workers):
         _logger.info(
             "Activating parallel evaluation of samples with %s workers.\n", number_of_workers
         )
+        # Workers have to share the resource tracker of the main process. Otherwise, they would
+        # try to clean up shared memory that is released by the main process.
+        resource_tracker.ensure_running()
         pool = Pool(processes=number_of_workers)
     else:
         pool = None
     return pool
+
+
+def _release_shared_memory(shared_memory):
+    """Close and unlink a shared memory block.
+
+    Args:
+        shared_memory (SharedMemory): Shared memory block
+    """
+    shared_memory.close()
+    try:
+        shared_memory.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _create_shared_memory(size):
+    """Create a shared memory block that is released with its owner.
+
+    Args:
+        size (int): Size of the block in bytes
+
+    Returns:
+        SharedMemory: Shared memory block
+    """
+    # Blocks of size zero are not allowed
+    return SharedMemory(create=True, size=max(size, 1))
+
+
+class SharedObject:
+    """Object shared with pool workers through shared memory.
+
+    The object is serialized once by the main process and deserialized at most once per worker
+    process, no matter how many tasks use it. Only the name of the shared memory block is sent
+    with the tasks.
+
+    Attributes:
+        key (str): Hash of the serialized object
+        name (str): Name of the shared memory block
+        size (int): Size of the serialized object in bytes
+    """
+
+    def __init__(self, obj):
+        """Initialize shared object.
+
+        Args:
+            obj (obj): Object to share
+        """
+        payload = dill.dumps(obj)
+        self.key = hashlib.sha256(payload).hexdigest()
+        self.size = len(payload)
+        shared_memory = _create_shared_memory(self.size)
+        shared_memory.buf[: self.size] = payload
+        self.name = shared_memory.name
+        self._release = weakref.finalize(self, _release_shared_memory, shared_memory)
+
+    def __getstate__(self):
+        """Get the state sent to the workers.
+
+        Returns:
+            dict: Key, name and size of the shared object
+        """
+        return {"key": self.key, "name": self.name, "size": self.size}
+
+    def load(self):
+        """Load the object in a worker process.
+
+        Returns:
+            obj: Shared object
+        """
+        if self.key in _LOADED_OBJECTS:
+            _LOADED_OBJECTS.move_to_end(self.key)
+            return _LOADED_OBJECTS[self.key]
+
+        shared_memory = SharedMemory(name=self.name)
+        try:
+            payload = bytes(shared_memory.buf[: self.size])
+        finally:
+            shared_memory.close()
+        obj = dill.loads(payload)
+
+        _LOADED_OBJECTS[self.key] = obj
+        while len(_LOADED_OBJECTS) > MAX_CACHED_OBJECTS:
+            _LOADED_OBJECTS.popitem(last=False)
+        return obj
+
+    def close(self):
+        """Release the shared memory block in the main process."""
+        if hasattr(self, "_release"):
+            self._release()
+
+
+class SharedArray:
+    """Numpy array shared with pool workers through shared memory.
+
+    Attributes:
+        name (str): Name of the shared memory block
+        shape (tuple): Shape of the array
+        dtype (str): Data type of the array
+    """
+
+    def __init__(self, array):
+        """Initialize shared array.
+
+        Args:
+            array (np.ndarray): Array to share
+        """
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise TypeError("Arrays of Python objects can not be shared.")
+        self.shape = array.shape
+        self.dtype = array.dtype.str
+        shared_memory = _create_shared_memory(array.nbytes)
+        np.ndarray(self.shape, dtype=self.dtype, buffer=shared_memory.buf)[...] = array
+        self.name = shared_memory.name
+        self._release = weakref.finalize(self, _release_shared_memory, shared_memory)
+
+    def __getstate__(self):
+        """Get the state sent to the workers.
+
+        Returns:
+            dict: Name, shape and dtype of the shared array
+        """
+        return {"name": self.name, "shape": self.shape, "dtype": self.dtype}
+
+    def read(self, index):
+        """Read a copy of a part of the array in a worker process.
+
+        Args:
+            index (int, slice): Index of the rows to read
+
+        Returns:
+            np.ndarray: Copy of the rows
+        """
+        if _ATTACHED_ARRAY.get("name") != self.name:
+            if _ATTACHED_ARRAY:
+                # Drop the view before closing the block
+                _ATTACHED_ARRAY.pop("array")
+                _ATTACHED_ARRAY.pop("shared_memory").close()
+            shared_memory = SharedMemory(name=self.name)
+            _ATTACHED_ARRAY.update(
+                name=self.name,
+                shared_memory=shared_memory,
+                array=np.ndarray(self.shape, dtype=self.dtype, buffer=shared_memory.buf),
+            )
+        return _ATTACHED_ARRAY["array"][index].copy()
+
+    def close(self):
+        """Release the shared memory block in the main process."""
+        if hasattr(self, "_release"):
+            self._release()
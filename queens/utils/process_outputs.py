@@ -23,9 +23,13 @@ from sklearn.model_selection import GridSearchCV
 from sklearn.neighbors import KernelDensity
 
 from queens.utils.plot_outputs import plot_cdf, plot_icdf, plot_pdf
+from queens.utils.streaming_statistics import MomentAccumulator
 
 _logger = logging.getLogger(__name__)
 
+# number of entries of the kernel matrix evaluated at once in the kernel density estimation
+KDE_CHUNK_ENTRIES = 2**22
+
 
 def process_outputs(output_data, output_description, input_data=None):
     """Process output from QUEENS models.
@@ -132,6 +136,60 @@ def do_processing(output_data, output_description):
     return processed_results
 
 
+def process_streaming_statistics(statistics, output_description):
+    """Process streaming statistics of model outputs.
+
+    In contrast to *do_processing*, the raw outputs are not required. The pdf, cdf and icdf are
+    estimated from the histogram of the statistics.
+
+    Args:
+        statistics (StreamingStatistics): Statistics accumulated from the model outputs
+        output_description (dict): Dictionary describing desired output quantities
+
+    Returns:
+        dict: Dictionary with processed results
+    """
+    if output_description.get("bayesian", False):
+        warnings.warn(
+            "Warning: Streaming statistics do not contain posterior samples. "
+            "Not computing confidence intervals"
+        )
+    plot_results = output_description.get("plot_results", False)
+    est_all = output_description.get("estimate_all", False)
+
+    result_interval = output_description.get("result_interval", statistics.result_interval)
+    num_support_points = output_description.get("num_support_points", 100)
+    support_points = np.linspace(result_interval[0], result_interval[1], num_support_points)
+
+    processed_results = {}
+    processed_results["num_samples"] = statistics.num_samples
+    processed_results["mean"] = statistics.moments.mean
+    processed_results["var"] = statistics.moments.var
+    if output_description.get("cov", False):
+        processed_results["cov"] = statistics.moments.cov
+
+    if (output_description.get("estimate_pdf", False) or est_all) is True:
+        pdf_estimate = {"x": support_points, "mean": statistics.histogram.pdf(support_points)}
+        if plot_results is True:
+            plot_pdf(pdf_estimate, support_points, False)
+        processed_results["pdf_estimate"] = pdf_estimate
+
+    if (output_description.get("estimate_cdf", False) or est_all) is True:
+        cdf_estimate = {"x": support_points, "mean": statistics.histogram.cdf(support_points)}
+        if plot_results is True:
+            plot_cdf(cdf_estimate, support_points, False)
+        processed_results["cdf_estimate"] = cdf_estimate
+
+    if (output_description.get("estimate_icdf", False) or est_all) is True:
+        my_percentiles = 100 * np.linspace(0 + 1 / 1000, 1 - 1 / 1000, 999)
+        icdf_estimate = {"x": my_percentiles, "mean": statistics.histogram.icdf(my_percentiles)}
+        if plot_results is True:
+            plot_icdf(icdf_estimate, False)
+        processed_results["icdf_estimate"] = icdf_estimate
+
+    return processed_results
+
+
 def write_results(processed_results, file_path):
     """Write results to pickle file.
 
@@ -204,13 +262,8 @@ def estimate_cov(output_data):
     """
     samples = output_data["result"]
 
-    # we assume that rows represent observations and columns represent variables
-    row_variable = False
-
-    cov = np.zeros((samples.shape[1], samples.shape[2], samples.shape[2]))
-    for i in range(samples.shape[1]):
-        cov[i] = np.cov(samples[:, i, :], rowvar=row_variable)
-    return cov
+    # rows represent observations, the covariance is computed over the last axis
+    return MomentAccumulator(compute_cov=True).update(samples).cov
 
 
 def estimate_cdf(output_data, support_points, bayesian):
@@ -228,28 +281,20 @@ def estimate_cdf(output_data, support_points, bayesian):
     cdf["x"] = support_points
     if bayesian is False:
         raw_data = output_data["result"]
-        size_data = raw_data.size
-        cdf_values = []
-        for i in support_points:
-            # all the values in raw data less than the ith value in x_values
-            temp = raw_data[raw_data <= i]
-            # fraction of that value with respect to the size of the x_values
-            value = temp.size / size_data
-            cdf_values.append(value)
-        cdf["mean"] = cdf_values
+        # fraction of the values less than or equal to the support points
+        cdf["mean"] = empirical_cdf(raw_data.reshape(-1), support_points)
     else:
         raw_data = output_data["post_samples"]
-        size_data = len(support_points)
+        # sort all realizations at once
+        sorted_data = np.sort(raw_data, axis=0)
         num_realizations = raw_data.shape[1]
         cdf_values = np.zeros((num_realizations, len(support_points)))
         for i in range(num_realizations):
-            data = raw_data[:, i]
-            for j, point in enumerate(support_points):
-                # all the values in raw data less than the ith value in x_values
-                temp = data[data <= point]
-                # fraction of that value with respect to the size of the x_values
-                value = temp.size / size_data
-                cdf_values[i, j] = value
+            # number of values less than or equal to the support points, normalized by the number
+            # of support points
+            cdf_values[i] = np.searchsorted(sorted_data[:, i], support_points, side="right") / len(
+                support_points
+            )
 
         cdf["post_samples"] = cdf_values
         # now we compute mean, median cumulative distribution function
@@ -276,16 +321,10 @@ def estimate_icdf(output_data, bayesian):
     icdf["x"] = my_percentiles
     if bayesian is False:
         samples = output_data["result"]
-        icdf_values = np.zeros_like(my_percentiles)
-        for i, percentile in enumerate(my_percentiles):
-            icdf_values[i] = np.percentile(samples, percentile, axis=0)
-        icdf["mean"] = icdf_values
+        icdf["mean"] = np.percentile(samples, my_percentiles, axis=0).reshape(my_percentiles.shape)
     else:
         raw_data = output_data["post_samples"]
-        num_realizations = raw_data.shape[1]
-        icdf_values = np.zeros((len(my_percentiles), num_realizations))
-        for i, point in enumerate(my_percentiles):
-            icdf_values[i, :] = np.percentile(raw_data, point, axis=0)
+        icdf_values = np.percentile(raw_data, my_percentiles, axis=0)
 
         icdf["post_samples"] = icdf_values
         # now we compute mean, median cumulative distribution function
@@ -378,7 +417,32 @@ def perform_kde(samples, kernel_bandwidth, support_points):
     Returns:
         np.array: *pdf_estimate* at support points
     """
-    kde = KernelDensity(kernel="gaussian", bandwidth=kernel_bandwidth).fit(samples.reshape(-1, 1))
+    samples = np.asarray(samples, dtype=float).reshape(-1)
+    support_points = np.asarray(support_points, dtype=float).reshape(-1)
+
+    # sum the Gaussian kernels of chunks of samples to bound the memory of the distance matrix
+    chunk_size = max(1, KDE_CHUNK_ENTRIES // max(1, support_points.size))
+    y_density = np.zeros(support_points.size)
+    for start in range(0, samples.size, chunk_size):
+        scaled_distances = (
+            support_points[:, np.newaxis] - samples[np.newaxis, start : start + chunk_size]
+        ) / kernel_bandwidth
+        y_density += np.exp(-0.5 * scaled_distances**2).sum(axis=1)
+    return y_density / (samples.size * kernel_bandwidth * np.sqrt(2 * np.pi))
+
+
+def empirical_cdf(samples, points):
+    """Evaluate the empirical cdf of samples.
 
-    y_density = np.exp(kde.score_samples(support_points.reshape(-1, 1)))
-    return y_density
+    The samples are sorted once, and the number of samples less than or equal to each point is
+    found by binary search.
+
+    Args:
+        samples (np.array): One-dimensional samples
+        points (np.array):  Points where to evaluate the cdf
+
+    Returns:
+        np.array: Fraction of the samples less than or equal to the points
+    """
+    sorted_samples = np.sort(samples)
+    return np.searchsorted(sorted_samples, points, side="right") / sorted_samples.size
@@ -0,0 +1,85 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Server to run functions in a long-lived Python process on a remote host.
+
+The server is started by the *RemoteConnection* and listens on a port of the remote host, which
+is forwarded to the local host. It runs the cloudpickled functions it receives over one
+authenticated connection until the connection or the SSH channel it was started from is closed.
+"""
+
+import contextlib
+import io
+import os
+import pickle
+import sys
+import threading
+import traceback
+from multiprocessing.connection import Listener
+
+import cloudpickle
+
+
+def serve(connection):
+    """Run the functions received over a connection until it is closed.
+
+    Each received message is a cloudpickled function without arguments. It is answered by a
+    cloudpickled tuple of a success flag, the return value of the function (or the formatted
+    traceback if it failed) and the output it printed.
+
+    Args:
+        connection (multiprocessing.connection.Connection): Connection to the client
+    """
+    while True:
+        try:
+            payload = connection.recv_bytes()
+        except EOFError:
+            break
+
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                func = pickle.loads(payload)
+                return_value = func()
+            reply = cloudpickle.dumps((True, return_value, output.getvalue()))
+        except Exception:  # pylint: disable=broad-exception-caught
+            reply = cloudpickle.dumps((False, traceback.format_exc(), output.getvalue()))
+        connection.send_bytes(reply)
+
+
+def main():
+    """Serve one client authenticated with the key read from the standard input."""
+    authkey = bytes.fromhex(sys.stdin.readline().strip())
+
+    # the server lives as long as the SSH channel it was started from
+    def exit_on_closed_channel():
+        sys.stdin.read()
+        os._exit(0)  # pylint: disable=protected-access
+
+    threading.Thread(target=exit_on_closed_channel, daemon=True).start()
+
+    with Listener(("localhost", 0), authkey=authkey) as listener:
+        print(listener.address[1], flush=True)
+
+        # the standard streams of the channel are not read anymore
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.dup2(devnull, sys.stderr.fileno())
+
+        with listener.accept() as connection:
+            serve(connection)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,22 +15,34 @@
 """Module supplies functions to conduct operation on remote resource."""
 
 import atexit
+import io
 import json
 import logging
 import pickle
+import secrets
+import shlex
 import socket
 import time
 import uuid
 from functools import partial
+from multiprocessing.connection import Client
 from pathlib import Path
 
 import cloudpickle
 from fabric import Connection
 from invoke.exceptions import UnexpectedExit
 
+from queens.utils.exceptions import SubprocessError
 from queens.utils.path_utils import PATH_TO_QUEENS, is_empty
-from queens.utils.rsync import assemble_rsync_command
-from queens.utils.run_subprocess import start_subprocess
+from queens.utils.rsync import (
+    MANIFEST_FILE_NAME,
+    assemble_rsync_command,
+    get_outdated_files,
+    list_source_files,
+    rsync_files,
+    split_duplicate_files,
+)
+from queens.utils.run_subprocess import run_subprocess, start_subprocess
 
 _logger = logging.getLogger(__name__)
 
@@ -46,9 +58,25 @@ class RemoteConnection(Connection):
         remote_python (str): Path to Python with installed (editable) QUEENS
                             (see remote_queens_repository)
         remote_queens_repository (str, Path): Path to the QUEENS source code on the remote host
+        use_function_server (bool): Run functions in a long-lived Python process on the remote
+                                    host (see *start_function_server*)
     """
 
-    def __init__(self, host, remote_python, remote_queens_repository, user=None, gateway=None):
+    # class attributes such that fabric does not store them in its config
+    _function_server = None
+    _function_server_stdin = None
+    _function_server_ports = None
+    _remote_manifests = None
+
+    def __init__(
+        self,
+        host,
+        remote_python,
+        remote_queens_repository,
+        user=None,
+        gateway=None,
+        use_function_server=False,
+    ):
         """Initialize RemoteConnection object.
 
         Args:
@@ -60,6 +88,10 @@ class RemoteConnection(Connection):
             gateway (dict,Connection,None): An object to use as a proxy or gateway for this
                                             connection. See docs of Fabric's Connection object for
                                             details.
+            use_function_server (bool): If true, functions are run in a long-lived Python process
+                                        on the remote host, which is started on the first call of
+                                        *run_function*. Otherwise, a new remote Python interpreter
+                                        is started for every call.
         """
         if isinstance(gateway, dict):
             gateway = Connection(**gateway)
@@ -71,11 +103,19 @@ class RemoteConnection(Connection):
         self.remote_queens_repository = remote_queens_repository
         _logger.debug("remote queens repository: %s", self.remote_queens_repository)
 
+        self.use_function_server = use_function_server
+        self._remote_manifests = {}
+
     def open(self):
         """Initiate the SSH connection."""
         super().open()
         atexit.register(self.close)
 
+    def close(self):
+        """Close the connection to the function server and the SSH connection."""
+        self._close_function_server()
+        super().close()
+
     def start_cluster(
         self,
         workload_manager,
@@ -122,6 +162,13 @@ class RemoteConnection(Connection):
             return_value (obj): Return value of function
         """
         _logger.info("Running %s on %s", func.__name__, self.host)
+        partial_func = partial(func, *func_args, **func_kwargs)  # insert function arguments
+
+        if wait and self.use_function_server:
+            if self._function_server is None:
+                self.start_function_server()
+            return self._run_function_on_server(partial_func)
+
         func_file_name = f"temp_func_{str(uuid.uuid4())}.pickle"
         output_file_name = f"output_{str(uuid.uuid4())}.pickle"
         python_cmd = (
@@ -133,7 +180,6 @@ class RemoteConnection(Connection):
             f'file = open("{output_file_name}", "wb");'
             f"pickle.dump(result, file); file.close();'"
         )
-        partial_func = partial(func, *func_args, **func_kwargs)  # insert function arguments
         with open(func_file_name, "wb") as file:
             cloudpickle.dump(partial_func, file)  # pickle function by value
 
@@ -163,6 +209,89 @@ class RemoteConnection(Connection):
 
         return return_value
 
+    def start_function_server(self):
+        """Start a long-lived Python process on the remote host that runs functions.
+
+        The server listens on a remote port, which is forwarded to a local port. The functions are
+        sent cloudpickled over one connection to it, authenticated with a random key, such that a
+        call of *run_function* neither starts a new remote interpreter nor writes temporary files.
+        The server terminates when the SSH connection is closed.
+        """
+        _logger.info("Starting function server on %s", self.host)
+        authkey = secrets.token_bytes(32)
+        python_cmd = (
+            f"source /etc/profile;{self.remote_python} -m queens.utils.remote_function_server"
+        )
+        stdin, stdout, stderr = self.client.exec_command(python_cmd)
+
+        # the key is passed over the channel, such that it is not visible in the process list
+        stdin.write(f"{authkey.hex()}\n")
+        stdin.flush()
+        remote_port = stdout.readline().strip()
+        if not remote_port.isdigit():
+            raise RuntimeError(
+                f"Could not start the function server on {self.host}:\n"
+                f"{remote_port}{stderr.read().decode('ascii', errors='replace')}"
+            )
+        # the server is bound to the loopback interface of the remote host
+        local_port, _ = self.open_port_forwarding(
+            remote_port=int(remote_port), target_host="localhost"
+        )
+
+        for i in range(20, 0, -1):  # 20 tries to connect
+            _logger.debug("Trying to connect to function server: try #%d", i)
+            try:
+                self._function_server = Client(("localhost", local_port), authkey=authkey)
+                break
+            except (OSError, EOFError) as exc:
+                if i == 1:
+                    raise RuntimeError(
+                        f"Could not connect to the function server on {self.host}."
+                    ) from exc
+                time.sleep(1)
+
+        # keep the channel open, the server exits once it is closed
+        self._function_server_stdin = stdin
+        self._function_server_ports = (local_port, int(remote_port))
+
+    def _close_function_server(self):
+        """Close the connection, the channel and the port forwarding of the function server."""
+        if self._function_server is not None:
+            self._function_server.close()
+            self._function_server = None
+        if self._function_server_stdin is not None:
+            self._function_server_stdin.close()
+            self._function_server_stdin = None
+        if self._function_server_ports is not None:
+            self.close_port_forwarding(*self._function_server_ports, target_host="localhost")
+            self._function_server_ports = None
+
+    def _run_function_on_server(self, partial_func):
+        """Run a function in the function server.
+
+        Args:
+            partial_func (partial): Function with inserted arguments
+
+        Returns:
+            return_value (obj): Return value of function
+        """
+        try:
+            self._function_server.send_bytes(cloudpickle.dumps(partial_func))
+            succeeded, return_value, output = pickle.loads(self._function_server.recv_bytes())
+        except (OSError, EOFError) as exc:
+            # the next call starts a new server, so the old one must not keep its forwarding
+            self._close_function_server()
+            raise RuntimeError(
+                f"Lost the connection to the function server on {self.host}."
+            ) from exc
+        _logger.debug(output)
+
+        if not succeeded:
+            raise RuntimeError(
+                f"Running {partial_func.func.__name__} on {self.host} failed:\n{return_value}"
+            )
+        return return_value
+
     def get_free_local_port(self):
         """Get a free port on localhost."""
         return get_port()
@@ -171,12 +300,16 @@ class RemoteConnection(Connection):
         """Get a free port on remote host."""
         return self.run_function(get_port)
 
-    def open_port_forwarding(self, local_port=None, remote_port=None):
+    def open_port_forwarding(self, local_port=None, remote_port=None, target_host=None):
         """Open port forwarding.
 
         Args:
             local_port (int): free local port
             remote_port (int): free remote port
+            target_host (str, opt): host to which the remote host forwards the connection, e.g.,
+                                    localhost for services bound to its loopback interface.
+                                    Defaults to the remote host itself.
+
         Returns:
             local_port (int): used local port
             remote_port (int): used remote port
@@ -186,13 +319,7 @@ class RemoteConnection(Connection):
         if remote_port is None:
             remote_port = self.get_free_remote_port()
 
-        proxyjump = ""
-        if self.gateway is not None:
-            proxyjump = f"-J {self.gateway.user}@{self.gateway.host}:{self.gateway.port}"
-        cmd = (
-            f"ssh {proxyjump} -f -N -L {local_port}:{self.host}:{remote_port} "
-            f"{self.user}@{self.host}"
-        )
+        cmd = self._port_forwarding_command(local_port, remote_port, target_host)
         _logger.debug("\nOpening port-forwarding '%s'\n", cmd)
 
         start_subprocess(cmd)
@@ -203,6 +330,41 @@ class RemoteConnection(Connection):
 
         return local_port, remote_port
 
+    def close_port_forwarding(self, local_port, remote_port, target_host=None):
+        """Close a port forwarding opened by *open_port_forwarding*.
+
+        Args:
+            local_port (int): used local port
+            remote_port (int): used remote port
+            target_host (str, opt): host to which the remote host forwards the connection
+        """
+        cmd = self._port_forwarding_command(local_port, remote_port, target_host)
+        _logger.debug("Closing port-forwarding '%s'", cmd)
+        start_subprocess(f'pkill -f "{cmd}"')
+
+    def _port_forwarding_command(self, local_port, remote_port, target_host=None):
+        """Get the ssh command of a port forwarding.
+
+        Args:
+            local_port (int): local port
+            remote_port (int): remote port
+            target_host (str, opt): host to which the remote host forwards the connection.
+                                    Defaults to the remote host itself.
+
+        Returns:
+            str: ssh command
+        """
+        if target_host is None:
+            target_host = self.host
+
+        proxyjump = ""
+        if self.gateway is not None:
+            proxyjump = f"-J {self.gateway.user}@{self.gateway.host}:{self.gateway.port}"
+        return (
+            f"ssh {proxyjump} -f -N -L {local_port}:{target_host}:{remote_port} "
+            f"{self.user}@{self.host}"
+        )
+
     def create_remote_directory(self, remote_directory):
         """Make a directory (including parents) on the remote host.
 
@@ -223,10 +385,16 @@ class RemoteConnection(Connection):
         start_time = time.time()
         self.create_remote_directory(self.remote_queens_repository)
 
-        source = f"{PATH_TO_QUEENS}/"
-        self.copy_to_remote(
-            source, self.remote_queens_repository, exclude=".git", filters=":- .gitignore"
-        )
+        try:
+            files = _list_repository_files(PATH_TO_QUEENS)
+        except SubprocessError:
+            _logger.debug("Could not list the files of the repository. Copying all files.")
+            source = f"{PATH_TO_QUEENS}/"
+            self.copy_to_remote(
+                source, self.remote_queens_repository, exclude=".git", filters=":- .gitignore"
+            )
+        else:
+            self._sync_files_to_remote(files, self.remote_queens_repository)
         _logger.info("Sync of remote repository was successful.")
         _logger.info("It took: %s s.\n", time.time() - start_time)
 
@@ -243,10 +411,7 @@ class RemoteConnection(Connection):
         if not is_empty(source):
             host = f"{self.user}@{self.host}"
             _logger.debug("Copying from %s to %s", source, destination)
-            remote_shell_command = None
-            if self.gateway is not None:
-                remote_shell_command = f"ssh {self.gateway.user}@{self.gateway.host} ssh"
-                _logger.debug("Using remote shell command %s", remote_shell_command)
+            remote_shell_command = self._remote_shell_command()
             rsync_cmd = assemble_rsync_command(
                 source,
                 destination,
@@ -265,6 +430,86 @@ class RemoteConnection(Connection):
         else:
             _logger.debug("List of source files was empty. Did not copy anything.")
 
+    def sync_to_remote(self, source, destination, exclude=None):
+        """Copy only the files that changed since the last sync to remote.
+
+        Args:
+            source (str, Path, list): paths to copy
+            destination (str, Path): destination relative to host
+            exclude (str, list): patterns of file or directory names to exclude
+        """
+        if not is_empty(source):
+            self._sync_files_to_remote(list_source_files(source, exclude=exclude), destination)
+        else:
+            _logger.debug("List of source files was empty. Did not copy anything.")
+
+    def _sync_files_to_remote(self, files, destination):
+        """Copy the files whose content differs from the manifest of the remote destination.
+
+        The manifest with the content hashes of the files synced to the destination is stored at
+        the destination and memoized for this connection, such that repeated syncs of unchanged
+        files do not run rsync at all. Files whose content was synced under another name or to
+        another destination of this connection are hard-linked (or copied) on the remote host.
+
+        Args:
+            files (dict): Source root directory per path of a file relative to the destination
+            destination (str, Path): destination relative to host
+        """
+        manifest_path = f"{destination}/{MANIFEST_FILE_NAME}"
+        if manifest_path not in self._remote_manifests:
+            result = self.run(f"cat {manifest_path}", warn=True, hide=True, in_stream=False)
+            try:
+                self._remote_manifests[manifest_path] = (
+                    json.loads(result.stdout) if result.ok else {}
+                )
+            except json.JSONDecodeError:
+                self._remote_manifests[manifest_path] = {}
+        destination_manifest = self._remote_manifests[manifest_path]
+
+        manifest, outdated_files = get_outdated_files(files, destination_manifest, destination)
+        if not outdated_files:
+            return
+
+        synced_files = {
+            digest: f"{path[: -len(MANIFEST_FILE_NAME)]}{relative_path}"
+            for path, remote_manifest in self._remote_manifests.items()
+            for relative_path, (_, digest) in remote_manifest.items()
+        }
+        files_to_transfer, duplicate_files = split_duplicate_files(
+            outdated_files, manifest, destination, synced_files
+        )
+        if files_to_transfer:
+            rsync_files(
+                files_to_transfer,
+                destination,
+                rsh=self._remote_shell_command(),
+                host=f"{self.user}@{self.host}",
+            )
+        if duplicate_files:
+            link_commands = []
+            for relative_path, synced_path in duplicate_files.items():
+                source = shlex.quote(synced_path)
+                target = shlex.quote(f"{destination}/{relative_path}")
+                link_commands.append(
+                    f"mkdir -p $(dirname {target}) && "
+                    f"(ln -f {source} {target} 2>/dev/null || cp -p {source} {target})"
+                )
+            self.run(" && ".join(link_commands), hide=True, in_stream=False)
+        destination_manifest.update(manifest)
+        self.put(io.BytesIO(json.dumps(destination_manifest).encode()), remote=manifest_path)
+
+    def _remote_shell_command(self):
+        """Get the remote shell command of rsync for connections over a gateway.
+
+        Returns:
+            remote_shell_command (str): remote shell command or None without gateway
+        """
+        remote_shell_command = None
+        if self.gateway is not None:
+            remote_shell_command = f"ssh {self.gateway.user}@{self.gateway.host} ssh"
+            _logger.debug("Using remote shell command %s", remote_shell_command)
+        return remote_shell_command
+
     def build_remote_environment(
         self,
         package_manager=DEFAULT_PACKAGE_MANAGER,
@@ -326,6 +571,25 @@ class RemoteConnection(Connection):
         _logger.info("It took: %s s.\n", time.time() - start_time)
 
 
+def _list_repository_files(repository):
+    """List the files of a git repository that are not ignored.
+
+    Args:
+        repository (str, Path): Path to the repository
+
+    Returns:
+        files (dict): Repository path per path of a file relative to the repository
+    """
+    _, _, stdout, _ = run_subprocess(
+        f"git -C {repository} ls-files -z --cached --others --exclude-standard"
+    )
+    return {
+        relative_path: Path(repository)
+        for relative_path in stdout.split("\0")
+        if relative_path and (Path(repository) / relative_path).is_file()
+    }
+
+
 def get_port():
     """Get free port.
 
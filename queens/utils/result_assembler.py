@@ -0,0 +1,163 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Assembly of job results.
+
+The results of the individual jobs are written into preallocated arrays as soon as they arrive,
+instead of collecting them in lists and stacking them at the end.
+"""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+
+_logger = logging.getLogger(__name__)
+
+
+class ResultAssembler:
+    """Assemble results and gradients of jobs into preallocated arrays.
+
+    The arrays are allocated once the first result (gradient) is known and keep its dtype. If the
+    assembled array would exceed the memory limit, it is backed by a memory-mapped *.npy* file.
+
+    Attributes:
+        num_samples (int): Number of samples, i.e., rows of the assembled arrays
+        squeeze (bool): If true, singleton dimensions of the individual results are removed
+        memmap_dir (Path, None): Directory for memory-mapped arrays
+        memmap_name (str): Suffix of the names of the memory-mapped files
+        max_memory_in_mb (float, None): Size above which arrays are memory-mapped
+        results (np.ndarray, None): Assembled results
+        gradients (np.ndarray, None): Assembled gradients
+        num_gradients (int): Number of assembled gradients
+    """
+
+    def __init__(
+        self, num_samples, squeeze=False, memmap_dir=None, memmap_name="", max_memory_in_mb=None
+    ):
+        """Initialize result assembler.
+
+        Args:
+            num_samples (int): Number of samples, i.e., rows of the assembled arrays
+            squeeze (bool, opt): If true, singleton dimensions of the individual results are removed
+            memmap_dir (str, Path, opt): Directory for memory-mapped arrays
+            memmap_name (str, opt): Suffix of the names of the memory-mapped files
+            max_memory_in_mb (float, opt): Size above which arrays are memory-mapped. By default,
+                                           arrays are kept in memory.
+        """
+        self.num_samples = num_samples
+        self.squeeze = squeeze
+        self.memmap_dir = None if memmap_dir is None else Path(memmap_dir)
+        self.memmap_name = memmap_name
+        self.max_memory_in_mb = max_memory_in_mb
+        self.results = None
+        self.gradients = None
+        self.num_gradients = 0
+
+    def add(self, index, result, gradient=None):
+        """Write the result and gradient of a job into its row.
+
+        Args:
+            index (int): Row of the job
+            result (np.ndarray): Result of the job
+            gradient (np.ndarray, opt): Gradient of the job
+        """
+        result = np.asarray(result)
+        if self.squeeze:
+            # We should remove this squeeze! It is only introduced for consistency with old test.
+            result = np.atleast_1d(result.squeeze())
+        self.results = self._write_row(self.results, "result", index, result)
+
+        if gradient is not None:
+            self.gradients = self._write_row(
+                self.gradients, "gradient", index, np.asarray(gradient)
+            )
+            self.num_gradients += 1
+
+    def to_dict(self):
+        """Get the assembled results.
+
+        Returns:
+            result_dict (dict): Dictionary containing results and gradients
+        """
+        if self.num_gradients == 0:
+            gradients = np.array([None] * self.num_samples)
+        elif self.num_gradients == self.num_samples:
+            gradients = self.gradients
+        else:
+            raise ValueError(
+                f"Only {self.num_gradients} of {self.num_samples} jobs returned a gradient."
+            )
+
+        results = self.results
+        if results is None:
+            results = np.empty((0,))
+        return {"result": results, "gradient": gradients}
+
+    def _write_row(self, array, name, index, value):
+        """Write a value into a row of an array and allocate the array if necessary.
+
+        Args:
+            array (np.ndarray, None): Assembled array (None if not allocated yet)
+            name (str): Name of the array
+            index (int): Row index
+            value (np.ndarray): Value of the row
+
+        Returns:
+            array (np.ndarray): Assembled array
+        """
+        if array is None:
+            array = self._allocate(name, value.shape, value.dtype)
+        elif array.shape[1:] != value.shape:
+            raise ValueError(
+                f"The {name} of job {index} has shape {value.shape}, but previous jobs returned "
+                f"shape {array.shape[1:]}."
+            )
+        elif not np.can_cast(value.dtype, array.dtype, casting="safe"):
+            dtype = np.result_type(array.dtype, value.dtype)
+            _logger.debug("Promoting the %s array from %s to %s.", name, array.dtype, dtype)
+            # the promoted array is allocated like the original one to keep large arrays on disk
+            promoted_array = self._allocate(name, value.shape, dtype, suffix=f"_{dtype}")
+            promoted_array[:] = array
+            if isinstance(array, np.memmap):
+                Path(array.filename).unlink()
+            array = promoted_array
+        array[index] = value
+        return array
+
+    def _allocate(self, name, shape, dtype, suffix=""):
+        """Allocate an array for all samples.
+
+        Args:
+            name (str): Name of the array
+            shape (tuple): Shape of a single row
+            dtype (np.dtype): Data type of the array
+            suffix (str, opt): Suffix of the name of the memory-mapped file
+
+        Returns:
+            np.ndarray: Allocated array
+        """
+        shape = (self.num_samples, *shape)
+        size_in_mb = np.prod(shape) * dtype.itemsize / 1024**2
+        if (
+            self.memmap_dir is not None
+            and self.max_memory_in_mb is not None
+            and not dtype.hasobject
+            and size_in_mb > self.max_memory_in_mb
+        ):
+            self.memmap_dir.mkdir(parents=True, exist_ok=True)
+            memmap_path = self.memmap_dir / f"{name}{self.memmap_name}{suffix}.npy"
+            _logger.info("Writing the %.1f MB of %ss to %s.", size_in_mb, name, memmap_path)
+            return np.lib.format.open_memmap(memmap_path, mode="w+", dtype=dtype, shape=shape)
+        return np.empty(shape, dtype=dtype)
@@ -14,7 +14,14 @@
 #
 """Rsync utils."""
 
+import fnmatch
+import hashlib
+import json
 import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from queens.utils.path_utils import is_empty
@@ -22,6 +29,25 @@ from queens.utils.run_subprocess import run_subprocess
 
 _logger = logging.getLogger(__name__)
 
+# Name of the manifest file holding the content hashes of the files synced to a destination
+MANIFEST_FILE_NAME = ".queens_sync_manifest.json"
+
+# File sets with more files are transferred by several rsync processes in parallel
+PARALLEL_TRANSFER_MIN_FILES = 64
+MAX_PARALLEL_TRANSFERS = 4
+
+# Content hashes of this process, keyed by the path, size and modification time of the file
+_FILE_DIGESTS = {}
+
+# Path and size of the files synced to local destinations by this process, keyed by content hash
+_SYNCED_FILES = {}
+
+
+def _listify(obj):
+    if isinstance(obj, (str, Path)):
+        return [obj]
+    return obj
+
 
 def assemble_rsync_command(
     source,
@@ -50,12 +76,6 @@ def assemble_rsync_command(
     Returns:
         str command to run rsync
     """
-
-    def listify(obj):
-        if isinstance(obj, (str, Path)):
-            return [obj]
-        return obj
-
     options = []
     if archive:
         options.append("--archive")
@@ -64,13 +84,13 @@ def assemble_rsync_command(
     if filters:
         options.append(f"--filter='{filters}'")
     if exclude:
-        for e in listify(exclude):
+        for e in _listify(exclude):
             options.append(f"--exclude='{e}'")
     if rsync_options:
-        options.extend(listify(rsync_options))
+        options.extend(_listify(rsync_options))
     if rsh:
         options.append(f"--rsh='{rsh}'")
-    source = listify(source)
+    source = _listify(source)
     if host:
         destination = f"{host}:{destination}"
 
@@ -120,3 +140,257 @@ def rsync(
         run_subprocess(command)
     else:
         _logger.debug("List of source files was empty. Did not copy anything.")
+
+
+def file_digest(path):
+    """Get the content hash of a file.
+
+    The hash is memoized per path, size and modification time, such that files shared by
+    several syncs are read only once.
+
+    Args:
+        path (Path): Path to the file
+
+    Returns:
+        str: Hex digest of the file content
+    """
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    if key not in _FILE_DIGESTS:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(2**24), b""):
+                hasher.update(chunk)
+        _FILE_DIGESTS[key] = hasher.hexdigest()
+    return _FILE_DIGESTS[key]
+
+
+def list_source_files(source, exclude=None):
+    """List the files rsync copies from the source.
+
+    As for rsync, the content of a directory is copied into a directory of the same name unless
+    the path of the directory ends with a slash.
+
+    Args:
+        source (str, Path, list): paths to copy
+        exclude (str, list): patterns of file or directory names to exclude
+
+    Returns:
+        files (dict): Source root directory per path of a file relative to the destination
+    """
+    exclude = _listify(exclude) or []
+
+    def is_excluded(relative_path):
+        return any(
+            fnmatch.fnmatch(part, pattern) for part in relative_path.parts for pattern in exclude
+        )
+
+    files = {}
+    for path in _listify(source):
+        root = Path(path) if str(path).endswith("/") else Path(path).parent
+        path = Path(path)
+        if path.is_dir():
+            for directory, _, file_names in os.walk(path):
+                for file_name in sorted(file_names):
+                    relative_path = (Path(directory) / file_name).relative_to(root)
+                    if not is_excluded(relative_path):
+                        files[str(relative_path)] = root
+        elif path.is_file() and not is_excluded(Path(path.name)):
+            files[path.name] = root
+    return files
+
+
+def compute_manifest(files):
+    """Compute the manifest of files.
+
+    Args:
+        files (dict): Source root directory per path of a file relative to the destination
+
+    Returns:
+        manifest (dict): Size and content hash per relative path of a file
+    """
+    manifest = {}
+    for relative_path, root in files.items():
+        path = root / relative_path
+        manifest[relative_path] = [path.stat().st_size, file_digest(path)]
+    return manifest
+
+
+def get_outdated_files(files, destination_manifest, destination):
+    """Get the files whose content differs from the manifest of the destination.
+
+    Args:
+        files (dict): Source root directory per path of a file relative to the destination
+        destination_manifest (dict): Manifest of the files synced to the destination
+        destination (str, Path): destination of the files
+
+    Returns:
+        manifest (dict): Manifest of the files
+        outdated_files (dict): Source root directory per relative path of the outdated files
+    """
+    manifest = compute_manifest(files)
+    outdated_files = {
+        relative_path: files[relative_path]
+        for relative_path, entry in manifest.items()
+        if destination_manifest.get(relative_path) != entry
+    }
+    if outdated_files:
+        _logger.debug("Copying %d of %d files to %s.", len(outdated_files), len(files), destination)
+    else:
+        _logger.debug("All %d files are up to date in %s.", len(files), destination)
+    return manifest, outdated_files
+
+
+def split_duplicate_files(outdated_files, manifest, destination, synced_files):
+    """Split off the outdated files whose content was already synced.
+
+    Of several outdated files with the same content, only the first is transferred.
+
+    Args:
+        outdated_files (dict): Source root directory per relative path of the outdated files
+        manifest (dict): Manifest of the files
+        destination (str, Path): destination of the files
+        synced_files (dict): Path of a synced file per content hash
+
+    Returns:
+        files_to_transfer (dict): Source root directory per relative path of the files to transfer
+        duplicate_files (dict): Path of a synced file with the same content per relative path
+    """
+    synced_files = dict(synced_files)
+    files_to_transfer = {}
+    duplicate_files = {}
+    for relative_path, root in outdated_files.items():
+        digest = manifest[relative_path][1]
+        if digest in synced_files:
+            duplicate_files[relative_path] = synced_files[digest]
+        else:
+            files_to_transfer[relative_path] = root
+            synced_files[digest] = f"{destination}/{relative_path}"
+    if duplicate_files:
+        _logger.debug(
+            "Linking %d files with synced content in %s.", len(duplicate_files), destination
+        )
+    return files_to_transfer, duplicate_files
+
+
+def rsync_files(files, destination, rsh=None, host=None):
+    """Copy files with rsync, in parallel for large file sets.
+
+    Args:
+        files (dict): Source root directory per path of a file relative to the destination
+        destination (str, Path): destination relative to host
+        rsh (str): remote ssh command
+        host (str): host where to copy the files to
+    """
+    files_per_root = {}
+    for relative_path, root in files.items():
+        files_per_root.setdefault(root, []).append(relative_path)
+
+    num_transfers = 1
+    if len(files) >= PARALLEL_TRANSFER_MIN_FILES:
+        num_transfers = MAX_PARALLEL_TRANSFERS
+
+    with tempfile.TemporaryDirectory() as file_list_dir:
+        commands = []
+        for root, relative_paths in files_per_root.items():
+            # distribute the files by size, such that the transfers take similarly long
+            sizes = {
+                relative_path: (root / relative_path).stat().st_size
+                for relative_path in relative_paths
+            }
+            relative_paths.sort(key=sizes.get)
+            for i in range(min(num_transfers, len(relative_paths))):
+                file_list = Path(file_list_dir) / f"files_{len(commands)}"
+                file_list.write_text("\0".join(relative_paths[i::num_transfers]), encoding="utf-8")
+                commands.append(
+                    assemble_rsync_command(
+                        f"{root}/",
+                        destination,
+                        archive=True,
+                        verbose=False,
+                        rsh=rsh,
+                        host=host,
+                        rsync_options=[f"--files-from={file_list}", "--from0"],
+                    )
+                )
+        with ThreadPoolExecutor(max_workers=num_transfers) as executor:
+            list(executor.map(run_subprocess, commands))
+
+
+def sync_with_manifest(source, destination, exclude=None):
+    """Copy only the files that changed since the last sync to the destination.
+
+    The destination holds a manifest with the content hashes of the files synced to it. Files
+    whose content is already at the destination, e.g., as they are shared by several models of an
+    experiment, are not copied again. Files whose content was synced under another name or to
+    another destination by this process are hard-linked (or copied locally) from there. If nothing
+    changed, rsync is not run at all.
+
+    Args:
+        source (str, Path, list): paths to copy
+        destination (str, Path): destination directory
+        exclude (str, list): patterns of file or directory names to exclude
+    """
+    destination = Path(destination)
+    manifest_path = destination / MANIFEST_FILE_NAME
+    destination_manifest = {}
+    if manifest_path.is_file():
+        destination_manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    # files changed or removed at the destination since the last sync are copied again
+    destination_manifest = {
+        relative_path: entry
+        for relative_path, entry in destination_manifest.items()
+        if (destination / relative_path).is_file()
+        and (destination / relative_path).stat().st_size == entry[0]
+    }
+
+    files = list_source_files(source, exclude=exclude)
+    manifest, outdated_files = get_outdated_files(files, destination_manifest, destination)
+    if not outdated_files:
+        return
+
+    synced_files = {
+        digest: path
+        for digest, (path, size) in _SYNCED_FILES.items()
+        if Path(path).is_file() and Path(path).stat().st_size == size
+    }
+    for relative_path, (_, digest) in destination_manifest.items():
+        synced_files[digest] = str(destination / relative_path)
+    files_to_transfer, duplicate_files = split_duplicate_files(
+        outdated_files, manifest, destination, synced_files
+    )
+
+    destination.mkdir(parents=True, exist_ok=True)
+    if files_to_transfer:
+        rsync_files(files_to_transfer, destination)
+    for relative_path, synced_path in duplicate_files.items():
+        _link_or_copy(Path(synced_path), destination / relative_path)
+
+    destination_manifest.update(manifest)
+    temporary_path = manifest_path.with_name(f"{MANIFEST_FILE_NAME}.{os.getpid()}.tmp")
+    temporary_path.write_text(json.dumps(destination_manifest), encoding="utf-8")
+    os.replace(temporary_path, manifest_path)
+    for relative_path, (size, digest) in manifest.items():
+        _SYNCED_FILES[digest] = (str(destination / relative_path), size)
+
+
+def _link_or_copy(source, destination):
+    """Hard-link a file or copy it if the file system does not support the link.
+
+    rsync replaces files instead of writing into them, such that later syncs do not change the
+    other links of a file.
+
+    Args:
+        source (Path): Path to the file
+        destination (Path): Path of the link
+    """
+    if destination.exists():
+        if destination.samefile(source):
+            return
+        destination.unlink()
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
@@ -14,17 +14,40 @@
 #
 """Wrapped functions of subprocess stdlib module."""
 
+import asyncio
 import logging
+import os
 import subprocess
+import uuid
+from collections import deque
+
+import psutil
 
 from queens.utils.exceptions import SubprocessError
-from queens.utils.logger_settings import finish_job_logger, get_job_logger, job_logging
+from queens.utils.logger_settings import (
+    JobOutputStreamer,
+    finish_job_logger,
+    get_job_logger,
+    job_logging,
+    job_logging_async,
+    job_logging_chunked,
+)
 
 _logger = logging.getLogger(__name__)
 
 # Currently allowed errors that might appear but have no effect on subprocesses
 _ALLOWED_ERRORS = ["Invalid MIT-MAGIC-COOKIE-1 key", "No protocol specified"]
 
+# Environment variable marking all processes spawned by a logged subprocess. The marker is
+# inherited by all descendants, such that they can be found even after they were re-parented.
+SUBPROCESS_MARKER_VARIABLE = "QUEENS_SUBPROCESS_MARKER"
+
+# Markers and process ids of finished logged subprocesses, whose descendants might still be alive
+_FINISHED_SUBPROCESSES = deque(maxlen=1000)
+
+# Size in bytes above which reading the output of subprocesses run by asyncio is paused
+_STREAM_LIMIT = 2**20
+
 
 def run_subprocess(
     command,
@@ -74,6 +97,8 @@ def run_subprocess_with_logging(
     raise_error_on_subprocess_failure=True,
     additional_error_message=None,
     allowed_errors=None,
+    log_chunk_size=None,
+    forwarded_lines_per_second=1.0,
 ):
     """Run a system command outside of the Python script.
 
@@ -91,6 +116,13 @@ def run_subprocess_with_logging(
         raise_error_on_subprocess_failure (bool, optional): Raise or warn error defaults to True
         additional_error_message (str, optional): Additional error message to be displayed
         allowed_errors (lst, optional): List of strings to be removed from the error message
+        log_chunk_size (int, optional): If provided, the output is read in chunks of this size in
+                                        bytes and written to the log file as is. Only rate-limited
+                                        lines are forwarded to the logger. Use this for jobs with
+                                        a large output.
+        forwarded_lines_per_second (float, optional): Maximum number of lines forwarded to the
+                                                      logger per second if the output is read in
+                                                      chunks
     Returns:
         process_returncode (int): code for success of subprocess
         process_id (int): unique process id, the subprocess was assigned on computing machine
@@ -107,21 +139,41 @@ def run_subprocess_with_logging(
     )
 
     # run subprocess
-    process = start_subprocess(command)
+    marker = uuid.uuid4().hex
+    process = start_subprocess(
+        command,
+        env=os.environ | {SUBPROCESS_MARKER_VARIABLE: marker},
+        text=log_chunk_size is None,
+    )
 
     # actual logging of job
-    stderr = job_logging(
-        command_string=command,
-        process=process,
-        job_logger=job_logger,
-        terminate_expression=terminate_expression,
-    )
+    if log_chunk_size is None:
+        stderr = job_logging(
+            command_string=command,
+            process=process,
+            job_logger=job_logger,
+            terminate_expression=terminate_expression,
+        )
+    else:
+        stderr = job_logging_chunked(
+            command_string=command,
+            process=process,
+            job_logger=job_logger,
+            output_streamer=JobOutputStreamer(
+                job_logger,
+                log_file_handle,
+                terminate_expression,
+                chunk_size=log_chunk_size,
+                forwarded_lines_per_second=forwarded_lines_per_second,
+            ),
+        )
 
     stdout = ""
 
     # get ID and returncode of subprocess
     process_id = process.pid
     process_returncode = process.returncode
+    _FINISHED_SUBPROCESSES.append((marker, process_id))
 
     # close and remove file handlers (to prevent OSError: [Errno 24] Too many open files)
     finish_job_logger(
@@ -142,11 +194,122 @@ def run_subprocess_with_logging(
     return process_returncode, process_id, stdout, stderr
 
 
-def start_subprocess(command):
+async def run_subprocess_with_logging_async(
+    command,
+    terminate_expression,
+    logger_name,
+    log_file,
+    error_file,
+    full_log_formatting=True,
+    streaming=False,
+    raise_error_on_subprocess_failure=True,
+    additional_error_message=None,
+    allowed_errors=None,
+    log_chunk_size=None,
+    forwarded_lines_per_second=1.0,
+):
+    """Run a system command outside of the Python script using asyncio.
+
+    Coroutine version of *run_subprocess_with_logging*. The output of the subprocess is logged
+    without blocking the event loop, such that a single thread can run many subprocesses
+    concurrently.
+
+    Args:
+        command (str): command, that will be run in subprocess
+        terminate_expression (str): regular expression to terminate subprocess
+        logger_name (str): logger name to write to. Should be configured previously
+        log_file (str): path to log file
+        error_file (str): path to error file
+        full_log_formatting (bool): Flag to add logger metadata in the simulation logs
+        streaming (bool, optional): Flag for additional streaming to stdout
+        raise_error_on_subprocess_failure (bool, optional): Raise or warn error defaults to True
+        additional_error_message (str, optional): Additional error message to be displayed
+        allowed_errors (lst, optional): List of strings to be removed from the error message
+        log_chunk_size (int, optional): If provided, the output is read in chunks of this size in
+                                        bytes and written to the log file as is. Only rate-limited
+                                        lines are forwarded to the logger. Use this for jobs with
+                                        a large output.
+        forwarded_lines_per_second (float, optional): Maximum number of lines forwarded to the
+                                                      logger per second if the output is read in
+                                                      chunks
+    Returns:
+        process_returncode (int): code for success of subprocess
+        process_id (int): unique process id, the subprocess was assigned on computing machine
+        stdout (str): always None
+        stderr (str): standard error content
+    """
+    # setup job logging and get job logger as well as handlers
+    job_logger, log_file_handle, error_file_handler, stream_handler = get_job_logger(
+        logger_name=logger_name,
+        log_file=log_file,
+        error_file=error_file,
+        streaming=streaming,
+        full_log_formatting=full_log_formatting,
+    )
+
+    # run subprocess
+    marker = uuid.uuid4().hex
+    process = await asyncio.create_subprocess_shell(
+        command,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=os.environ | {SUBPROCESS_MARKER_VARIABLE: marker},
+        limit=_STREAM_LIMIT,
+    )
+
+    output_streamer = None
+    if log_chunk_size is not None:
+        output_streamer = JobOutputStreamer(
+            job_logger,
+            log_file_handle,
+            terminate_expression,
+            chunk_size=log_chunk_size,
+            forwarded_lines_per_second=forwarded_lines_per_second,
+        )
+
+    try:
+        # actual logging of job
+        stderr = await job_logging_async(
+            command_string=command,
+            process=process,
+            job_logger=job_logger,
+            terminate_expression=terminate_expression,
+            output_streamer=output_streamer,
+        )
+    finally:
+        if process.returncode is None:
+            process.kill()
+        _FINISHED_SUBPROCESSES.append((marker, process.pid))
+
+        # close and remove file handlers (to prevent OSError: [Errno 24] Too many open files)
+        finish_job_logger(
+            job_logger=job_logger,
+            lfh=log_file_handle,
+            efh=error_file_handler,
+            stream_handler=stream_handler,
+        )
+
+    stdout = ""
+    _raise_or_warn_error(
+        command=command,
+        stdout=stdout,
+        stderr=stderr,
+        raise_error_on_subprocess_failure=raise_error_on_subprocess_failure,
+        additional_error_message=additional_error_message,
+        allowed_errors=allowed_errors,
+    )
+    return process.returncode, process.pid, stdout, stderr
+
+
+def start_subprocess(command, env=None, text=True):
     """Start subprocess.
 
     Args:
         command (str): command, that will be run in subprocess
+        env (dict, optional): environment of the subprocess. Defaults to the current environment.
+        text (bool, optional): If true, the pipes of the subprocess are opened in text mode.
+                               Otherwise, the output is read as bytes.
 
     Returns:
          process (subprocess.Popen): subprocess object
@@ -157,11 +320,64 @@ def start_subprocess(command):
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         shell=True,
-        universal_newlines=True,
+        universal_newlines=text,
+        env=env,
     )
     return process
 
 
+def kill_orphaned_subprocesses(timeout=3):
+    """Kill processes of finished logged subprocesses that are still alive.
+
+    Solvers started through a jobscript, e.g. by mpirun, can outlive the shell started by
+    *run_subprocess_with_logging*. All descendants of the subprocess inherit a marker in their
+    environment, such that they are found even if they were re-parented. Only the processes of the
+    current user are scanned.
+
+    Args:
+        timeout (float, optional): Time in seconds to wait for termination before killing
+
+    Returns:
+        orphaned_processes (list): Process ids of the terminated processes
+    """
+    if not _FINISHED_SUBPROCESSES:
+        return []
+
+    finished_subprocesses = dict(_FINISHED_SUBPROCESSES)
+    _FINISHED_SUBPROCESSES.clear()
+
+    orphaned_processes = []
+    user_id = os.getuid()
+    for process in psutil.process_iter(["uids"]):
+        # reading the environment is expensive, skip the processes of other users upfront
+        if process.info["uids"] is None or process.info["uids"].real != user_id:
+            continue
+        try:
+            marker = process.environ().get(SUBPROCESS_MARKER_VARIABLE)
+        except (psutil.AccessDenied, psutil.NoSuchProcess, psutil.ZombieProcess):
+            continue
+        if marker in finished_subprocesses:
+            _logger.debug(
+                "Terminating process %d orphaned by subprocess %d.",
+                process.pid,
+                finished_subprocesses[marker],
+            )
+            orphaned_processes.append(process)
+
+    for process in orphaned_processes:
+        try:
+            process.terminate()
+        except psutil.NoSuchProcess:
+            continue
+    _, alive = psutil.wait_procs(orphaned_processes, timeout=timeout)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            continue
+    return [process.pid for process in orphaned_processes]
+
+
 def _raise_or_warn_error(
     command,
     stdout,
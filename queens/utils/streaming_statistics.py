@@ -0,0 +1,448 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Mergeable streaming statistics of model outputs.
+
+The accumulators are updated chunk by chunk and can be merged, e.g., across workers, such that
+statistics of large numbers of samples are computed with memory independent of the number of
+samples.
+"""
+
+import numpy as np
+
+
+class MomentAccumulator:
+    """Accumulator of the mean, variance and covariance of samples.
+
+    Chunks are combined with the parallel variant of Welford's algorithm (Chan et al.), which is
+    numerically stable and allows merging of independently accumulated statistics.
+
+    Attributes:
+        compute_cov (bool): True if the covariance over the last output axis is accumulated
+        num_samples (int): Number of accumulated samples
+        mean (np.ndarray): Mean of the samples
+        sum_of_squares (np.ndarray): Sum of the squared deviations from the mean
+        comoment (np.ndarray): Sum of the outer products of the deviations from the mean over the
+                               last output axis
+        minimum (np.ndarray): Elementwise minimum of the samples
+        maximum (np.ndarray): Elementwise maximum of the samples
+    """
+
+    def __init__(self, compute_cov=False):
+        """Initialize the moment accumulator.
+
+        Args:
+            compute_cov (bool, opt): Accumulate the covariance over the last output axis
+        """
+        self.compute_cov = compute_cov
+        self.num_samples = 0
+        self.mean = None
+        self.sum_of_squares = None
+        self.comoment = None
+        self.minimum = None
+        self.maximum = None
+
+    def update(self, samples):
+        """Add a chunk of samples.
+
+        Args:
+            samples (np.ndarray): Samples with shape (num_samples, ...)
+
+        Returns:
+            self (MomentAccumulator): Updated accumulator
+        """
+        samples = np.asarray(samples, dtype=float)
+        if len(samples) == 0:
+            return self
+        chunk = MomentAccumulator(self.compute_cov)
+        chunk.num_samples = len(samples)
+        chunk.mean = samples.mean(axis=0)
+        deviations = samples - chunk.mean
+        chunk.sum_of_squares = np.einsum("n...,n...->...", deviations, deviations)
+        if self.compute_cov:
+            chunk.comoment = np.einsum("n...i,n...j->...ij", deviations, deviations)
+        chunk.minimum = samples.min(axis=0)
+        chunk.maximum = samples.max(axis=0)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Merge the statistics of another accumulator into this one.
+
+        Args:
+            other (MomentAccumulator): Accumulator of other samples
+
+        Returns:
+            self (MomentAccumulator): Merged accumulator
+        """
+        if other.num_samples == 0:
+            return self
+        if self.compute_cov and not other.compute_cov:
+            raise ValueError("Cannot merge an accumulator without covariance.")
+        if self.num_samples == 0:
+            self.num_samples = other.num_samples
+            self.mean = other.mean.copy()
+            self.sum_of_squares = other.sum_of_squares.copy()
+            if self.compute_cov:
+                self.comoment = other.comoment.copy()
+            self.minimum = other.minimum.copy()
+            self.maximum = other.maximum.copy()
+            return self
+
+        num_samples = self.num_samples + other.num_samples
+        delta = other.mean - self.mean
+        weight = self.num_samples * other.num_samples / num_samples
+        self.mean = self.mean + delta * other.num_samples / num_samples
+        self.sum_of_squares = self.sum_of_squares + other.sum_of_squares + delta**2 * weight
+        if self.compute_cov:
+            self.comoment = (
+                self.comoment
+                + other.comoment
+                + np.einsum("...i,...j->...ij", delta, delta) * weight
+            )
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        self.num_samples = num_samples
+        return self
+
+    @property
+    def var(self):
+        """Unbiased variance estimate.
+
+        Returns:
+            np.ndarray: Variance of the samples
+        """
+        return self.sum_of_squares / (self.num_samples - 1)
+
+    @property
+    def cov(self):
+        """Unbiased covariance estimate over the last output axis.
+
+        Returns:
+            np.ndarray: Covariance of the samples with shape (..., dim, dim)
+        """
+        if not self.compute_cov:
+            raise ValueError("The covariance is not accumulated.")
+        return self.comoment / (self.num_samples - 1)
+
+    @property
+    def standard_error(self):
+        """Standard error of the mean estimate.
+
+        Returns:
+            np.ndarray: Standard error of the mean
+        """
+        return np.sqrt(self.var / self.num_samples)
+
+
+class HistogramAccumulator:
+    """Accumulator of an equidistant histogram of all sample values.
+
+    The histogram approximates the pdf, cdf and inverse cdf of the sample values. Its range grows
+    with the values: values outside of the bins double the bin width by merging pairs of
+    neighboring bins until all values are covered. The number of bins stays constant, such that
+    the memory is independent of the number and the range of the values.
+
+    Attributes:
+        num_bins (int): Number of bins
+        lower_bound (float): Lower edge of the first bin
+        bin_width (float): Width of the bins
+        counts (np.ndarray): Number of values per bin
+    """
+
+    def __init__(self, num_bins=1000, interval=None):
+        """Initialize the histogram accumulator.
+
+        Args:
+            num_bins (int, opt): Number of bins
+            interval (list, opt): Initial interval covered by the bins. If not provided, it is
+                                  estimated from the first chunk.
+        """
+        self.num_bins = num_bins
+        self.lower_bound = None
+        self.bin_width = None
+        self.counts = np.zeros(num_bins, dtype=np.int64)
+        if interval is not None:
+            self._set_interval(interval[0], interval[1])
+
+    def _set_interval(self, lower_bound, upper_bound):
+        """Set the interval covered by the bins.
+
+        Args:
+            lower_bound (float): Lower bound of the interval
+            upper_bound (float): Upper bound of the interval
+        """
+        if upper_bound <= lower_bound:
+            # the width is increased as soon as values differ
+            half_width = 1e-6 * max(abs(lower_bound), 1.0)
+            lower_bound, upper_bound = lower_bound - half_width, lower_bound + half_width
+        self.lower_bound = float(lower_bound)
+        self.bin_width = (upper_bound - lower_bound) / self.num_bins
+
+    @property
+    def upper_bound(self):
+        """Upper edge of the last bin.
+
+        Returns:
+            float: Upper bound of the bins
+        """
+        return self.lower_bound + self.num_bins * self.bin_width
+
+    @property
+    def bin_edges(self):
+        """Edges of the bins.
+
+        Returns:
+            np.ndarray: Bin edges
+        """
+        return self.lower_bound + self.bin_width * np.arange(self.num_bins + 1)
+
+    @property
+    def num_values(self):
+        """Number of accumulated values.
+
+        Returns:
+            int: Number of values
+        """
+        return int(self.counts.sum())
+
+    def _coarsen(self, extend_downward):
+        """Double the bin width by merging pairs of neighboring bins.
+
+        Args:
+            extend_downward (bool): Extend the range below the lower bound instead of above the
+                                    upper bound
+        """
+        offset = self.num_bins if extend_downward else 0
+        counts = np.zeros_like(self.counts)
+        np.add.at(counts, (np.arange(self.num_bins) + offset) // 2, self.counts)
+        self.counts = counts
+        if extend_downward:
+            self.lower_bound -= self.num_bins * self.bin_width
+        self.bin_width *= 2
+
+    def _cover(self, minimum, maximum):
+        """Coarsen the bins until they cover an interval.
+
+        Args:
+            minimum (float): Lower bound of the interval
+            maximum (float): Upper bound of the interval
+        """
+        while minimum < self.lower_bound:
+            self._coarsen(extend_downward=True)
+        while maximum > self.upper_bound:
+            self._coarsen(extend_downward=False)
+
+    def _add(self, values, counts=1):
+        """Add counts to the bins containing values.
+
+        Args:
+            values (np.ndarray): Values within the bins
+            counts (np.ndarray, int): Counts of the values
+        """
+        bin_index = np.floor((values - self.lower_bound) / self.bin_width).astype(int)
+        bin_index = np.clip(bin_index, 0, self.num_bins - 1)
+        self.counts += np.bincount(
+            bin_index, weights=np.broadcast_to(counts, bin_index.shape), minlength=self.num_bins
+        ).astype(np.int64)
+
+    def update(self, samples):
+        """Add a chunk of samples.
+
+        Args:
+            samples (np.ndarray): Samples, all values of which are accumulated
+
+        Returns:
+            self (HistogramAccumulator): Updated accumulator
+        """
+        values = np.asarray(samples, dtype=float).reshape(-1)
+        if values.size == 0:
+            return self
+        minimum, maximum = values.min(), values.max()
+        if self.lower_bound is None:
+            interval_length = maximum - minimum
+            self._set_interval(minimum - interval_length / 6, maximum + interval_length / 6)
+        self._cover(minimum, maximum)
+        self._add(values)
+        return self
+
+    def merge(self, other):
+        """Merge the counts of another accumulator into this one.
+
+        The counts of the other bins are assigned to the bins containing their centers, which is
+        exact if the bins of this accumulator are aligned with the other bins.
+
+        Args:
+            other (HistogramAccumulator): Accumulator of other samples
+
+        Returns:
+            self (HistogramAccumulator): Merged accumulator
+        """
+        occupied_bins = np.flatnonzero(other.counts)
+        if occupied_bins.size == 0:
+            return self
+        if self.lower_bound is None:
+            self.num_bins = other.num_bins
+            self.lower_bound = other.lower_bound
+            self.bin_width = other.bin_width
+            self.counts = other.counts.copy()
+            return self
+
+        while self.bin_width < other.bin_width:
+            self._coarsen(extend_downward=False)
+        other_edges = other.bin_edges
+        self._cover(other_edges[occupied_bins[0]], other_edges[occupied_bins[-1] + 1])
+        bin_centers = other.lower_bound + (occupied_bins + 0.5) * other.bin_width
+        self._add(bin_centers, other.counts[occupied_bins])
+        return self
+
+    def pdf(self, points):
+        """Estimate the pdf at points.
+
+        Args:
+            points (np.ndarray): Points where to evaluate the pdf
+
+        Returns:
+            np.ndarray: Histogram density at the points, zero outside of the bins
+        """
+        density = self.counts / (self.num_values * self.bin_width)
+        bin_index = np.floor((np.asarray(points) - self.lower_bound) / self.bin_width)
+        inside = (bin_index >= 0) & (bin_index < self.num_bins)
+        pdf = np.zeros(np.shape(points))
+        pdf[inside] = density[bin_index[inside].astype(int)]
+        return pdf
+
+    def _cumulative_probabilities(self):
+        """Compute the cdf at the bin edges.
+
+        Returns:
+            np.ndarray: Cumulative probabilities at the bin edges
+        """
+        return np.concatenate(([0], np.cumsum(self.counts))) / self.num_values
+
+    def cdf(self, points):
+        """Estimate the cdf at points.
+
+        The cdf is interpolated linearly within the bins.
+
+        Args:
+            points (np.ndarray): Points where to evaluate the cdf
+
+        Returns:
+            np.ndarray: Cdf at the points
+        """
+        return np.interp(points, self.bin_edges, self._cumulative_probabilities())
+
+    def icdf(self, percentiles):
+        """Estimate the inverse cdf at percentiles.
+
+        Args:
+            percentiles (np.ndarray): Percentiles in [0, 100]
+
+        Returns:
+            np.ndarray: Quantiles of the values
+        """
+        bin_edges = self.bin_edges
+        cumulative_probabilities = self._cumulative_probabilities()
+        # skip empty bins, whose edges share the same cumulative probability
+        unique_probabilities, first_index = np.unique(cumulative_probabilities, return_index=True)
+        last_index = np.append(first_index[1:] - 1, len(cumulative_probabilities) - 1)
+        edges = 0.5 * (bin_edges[first_index] + bin_edges[last_index])
+        edges[0] = bin_edges[last_index[0]]
+        edges[-1] = bin_edges[first_index[-1]]
+        return np.interp(np.asarray(percentiles) / 100, unique_probabilities, edges)
+
+
+class StreamingStatistics:
+    """Streaming statistics of model outputs for result processing.
+
+    Attributes:
+        moments (MomentAccumulator): Accumulator of the mean, variance and covariance
+        histogram (HistogramAccumulator): Accumulator of the histogram of the output values
+    """
+
+    def __init__(self, compute_cov=False, result_interval=None, num_bins=1000):
+        """Initialize the streaming statistics.
+
+        Args:
+            compute_cov (bool, opt): Accumulate the covariance over the last output axis
+            result_interval (list, opt): Initial interval covered by the histogram. If not
+                                         provided, it is estimated from the first chunk. The
+                                         histogram grows if values are outside of it.
+            num_bins (int, opt): Number of histogram bins
+        """
+        self.moments = MomentAccumulator(compute_cov)
+        self.histogram = HistogramAccumulator(num_bins, result_interval)
+
+    @classmethod
+    def from_output_description(cls, output_description):
+        """Create the streaming statistics required by an output description.
+
+        Args:
+            output_description (dict): Dictionary describing desired output quantities
+
+        Returns:
+            StreamingStatistics: Empty streaming statistics
+        """
+        return cls(
+            compute_cov=output_description.get("cov", False),
+            result_interval=output_description.get("result_interval", None),
+            num_bins=output_description.get("num_bins", 1000),
+        )
+
+    @property
+    def num_samples(self):
+        """Number of accumulated samples.
+
+        Returns:
+            int: Number of samples
+        """
+        return self.moments.num_samples
+
+    @property
+    def result_interval(self):
+        """Interval of the output values with small margins.
+
+        Returns:
+            list: Output interval
+        """
+        min_data = np.amin(self.moments.minimum)
+        max_data = np.amax(self.moments.maximum)
+        interval_length = max_data - min_data
+        return [min_data - interval_length / 6, max_data + interval_length / 6]
+
+    def update(self, samples):
+        """Add a chunk of output samples.
+
+        Args:
+            samples (np.ndarray): Output samples with shape (num_samples, ...)
+
+        Returns:
+            self (StreamingStatistics): Updated statistics
+        """
+        self.moments.update(samples)
+        self.histogram.update(samples)
+        return self
+
+    def merge(self, other):
+        """Merge other streaming statistics into these.
+
+        Args:
+            other (StreamingStatistics): Statistics of other samples
+
+        Returns:
+            self (StreamingStatistics): Merged statistics
+        """
+        self.moments.merge(other.moments)
+        self.histogram.merge(other.histogram)
+        return self
@@ -0,0 +1,122 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Recycling of dask workers.
+
+Restarting a worker after every job is expensive. The recycling policy decides on the worker
+itself, after each finished task, whether the worker has to be recycled.
+"""
+
+import logging
+import threading
+
+import psutil
+
+from queens.utils.run_subprocess import kill_orphaned_subprocesses
+
+_logger = logging.getLogger(__name__)
+
+# State of the current worker process. It is reset automatically when the worker is restarted.
+_WORKER_STATE = {"num_tasks": 0}
+_WORKER_STATE_LOCK = threading.Lock()
+
+
+class WorkerRecyclingPolicy:
+    """Policy when to recycle dask workers.
+
+    Attributes:
+        max_tasks_per_worker (int, None): Number of tasks after which a worker is recycled
+        max_memory_in_mb (float, None): Resident memory of a worker above which it is recycled
+        kill_orphaned_processes (bool): If true, processes left behind by the subprocesses of
+                                           a task are killed after the task
+    """
+
+    def __init__(
+        self, max_tasks_per_worker=None, max_memory_in_mb=None, kill_orphaned_processes=True
+    ):
+        """Initialize worker recycling policy.
+
+        Args:
+            max_tasks_per_worker (int, opt): Number of tasks after which a worker is recycled
+            max_memory_in_mb (float, opt): Resident memory (RSS) of a worker in MB above which it
+                                           is recycled
+            kill_orphaned_processes (bool, opt): If true, processes left behind by the
+                                                    subprocesses of a task are killed after the
+                                                    task
+        """
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_memory_in_mb = max_memory_in_mb
+        self.kill_orphaned_processes = kill_orphaned_processes
+
+    @classmethod
+    def from_restart_workers_option(cls, restart_workers):
+        """Create the policy from the *restart_workers* option of a scheduler.
+
+        Args:
+            restart_workers (bool, dict, WorkerRecyclingPolicy): If true, workers are recycled after
+                                                                 each task. A dict is passed as
+                                                                 keyword arguments to the policy.
+
+        Returns:
+            WorkerRecyclingPolicy, None: Recycling policy or None if workers are not recycled
+        """
+        if isinstance(restart_workers, cls):
+            return restart_workers
+        if isinstance(restart_workers, dict):
+            return cls(**restart_workers)
+        if restart_workers:
+            return cls(max_tasks_per_worker=1)
+        return None
+
+    def wrap(self, function):
+        """Wrap a function such that the policy is evaluated after each call on the worker.
+
+        Args:
+            function (callable): Function to be run on the worker, e.g. the driver run method
+
+        Returns:
+            callable: Wrapped function returning the original return value and a flag whether the
+                      worker has to be recycled
+        """
+
+        def function_with_recycling_check(*args, **kwargs):
+            try:
+                return_value = function(*args, **kwargs)
+            finally:
+                if self.kill_orphaned_processes:
+                    kill_orphaned_subprocesses()
+            return return_value, self.worker_needs_recycling()
+
+        return function_with_recycling_check
+
+    def worker_needs_recycling(self):
+        """Count the finished task and check if the current worker has to be recycled.
+
+        Returns:
+            bool: True if the worker has to be recycled
+        """
+        with _WORKER_STATE_LOCK:
+            _WORKER_STATE["num_tasks"] += 1
+            num_tasks = _WORKER_STATE["num_tasks"]
+
+        if self.max_tasks_per_worker is not None and num_tasks >= self.max_tasks_per_worker:
+            _logger.debug("Worker finished %d tasks and is recycled.", num_tasks)
+            return True
+
+        if self.max_memory_in_mb is not None:
+            memory_in_mb = psutil.Process().memory_info().rss / 1024**2
+            if memory_in_mb > self.max_memory_in_mb:
+                _logger.debug("Worker uses %.1f MB and is recycled.", memory_in_mb)
+                return True
+        return False
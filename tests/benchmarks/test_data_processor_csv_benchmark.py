@@ -0,0 +1,96 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Benchmark of the read-in of the csv data processor."""
+
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from queens.data_processor.data_processor_csv import DataProcessorCsv
+
+_logger = logging.getLogger(__name__)
+
+NUM_ROWS = 1_000_000
+
+
+@pytest.fixture(name="monitor_file", scope="module")
+def fixture_monitor_file(tmp_path_factory):
+    """Write a large monitor file as written by 4C."""
+    output_dir = tmp_path_factory.mktemp("output")
+    steps = np.arange(1, NUM_ROWS + 1)
+    data = np.column_stack([steps, 1e-3 * steps, np.sin(1e-3 * steps), np.cos(1e-3 * steps)])
+    header = "# monitor data\n#     step            time             d_x             d_y"
+    np.savetxt(
+        output_dir / "monitor.csv", data, fmt=["%10d"] + ["%16.6e"] * 3, header=header, comments=""
+    )
+    return output_dir / "monitor.csv"
+
+
+def read_and_filter_whole_file(data_processor, file_path):
+    """Read and filter the whole file as done without pushdown."""
+    raw_data = pd.read_csv(
+        file_path,
+        sep=r",|\s+",
+        usecols=data_processor.use_cols_lst,
+        skiprows=data_processor.skip_rows,
+        header=data_processor.header_row,
+        engine="python",
+        index_col=data_processor.index_column,
+    )
+    return data_processor.filter_and_manipulate_raw_data(raw_data)
+
+
+@pytest.mark.parametrize(
+    "filter_options",
+    [
+        {"type": "by_row_index", "rows": [10, 1000]},
+        {"type": "by_row_index", "rows": [-1]},
+        {"type": "by_range", "range": [1.0, 2.0], "tolerance": 1e-8},
+        {"type": "by_target_values", "target_values": [5.0, 50.0], "tolerance": 1e-8},
+        {"type": "entire_file"},
+    ],
+)
+def test_csv_pushdown_benchmark(monitor_file, filter_options):
+    """Compare the read-in with pushed-down filters to reading the whole file."""
+    data_processor = DataProcessorCsv(
+        file_name_identifier=monitor_file.name,
+        file_options_dict={
+            "header_row": 0,
+            "use_cols_lst": [1, 2, 3],
+            "skip_rows": 1,
+            "index_column": 0,
+            "filter": filter_options,
+        },
+    )
+
+    start_time = time.perf_counter()
+    expected_data = read_and_filter_whole_file(data_processor, monitor_file)
+    whole_file_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    data = data_processor.get_data_from_file(monitor_file.parent)
+    pushdown_time = time.perf_counter() - start_time
+
+    _logger.info(
+        "Filter %s: %.3fs without pushdown, %.3fs with pushdown",
+        filter_options["type"],
+        whole_file_time,
+        pushdown_time,
+    )
+    np.testing.assert_array_equal(data, expected_data)
+    assert pushdown_time < whole_file_time
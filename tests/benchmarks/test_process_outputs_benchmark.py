@@ -0,0 +1,102 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Benchmark of the cdf, icdf and pdf estimation of the result processing."""
+
+import logging
+import time
+
+import numpy as np
+import pytest
+from sklearn.neighbors import KernelDensity
+
+from queens.utils.process_outputs import estimate_cdf, estimate_icdf, perform_kde
+
+_logger = logging.getLogger(__name__)
+
+NUM_SAMPLES = 1_000_000
+
+
+@pytest.fixture(name="output_data", scope="module")
+def fixture_output_data():
+    """Outputs of a large Monte Carlo run."""
+    return {"result": np.random.default_rng(42).normal(size=(NUM_SAMPLES, 1))}
+
+
+@pytest.fixture(name="support_points", scope="module")
+def fixture_support_points():
+    """Default number of support points."""
+    return np.linspace(-5.0, 5.0, 100)
+
+
+def estimate_cdf_pointwise(output_data, support_points):
+    """Estimate the cdf point by point."""
+    raw_data = output_data["result"]
+    return [raw_data[raw_data <= point].size / raw_data.size for point in support_points]
+
+
+def estimate_icdf_pointwise(output_data):
+    """Estimate the icdf percentile by percentile."""
+    my_percentiles = 100 * np.linspace(0 + 1 / 1000, 1 - 1 / 1000, 999)
+    return np.array(
+        [np.percentile(output_data["result"], percentile) for percentile in my_percentiles]
+    )
+
+
+def perform_kde_with_tree(samples, kernel_bandwidth, support_points):
+    """Estimate the pdf with the tree-based kernel density of sklearn."""
+    kde = KernelDensity(kernel="gaussian", bandwidth=kernel_bandwidth).fit(samples.reshape(-1, 1))
+    return np.exp(kde.score_samples(support_points.reshape(-1, 1)))
+
+
+def log_and_compare(name, reference_function, vectorized_function):
+    """Time the reference and the vectorized estimation."""
+    start_time = time.perf_counter()
+    expected = reference_function()
+    reference_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    estimate = vectorized_function()
+    vectorized_time = time.perf_counter() - start_time
+
+    _logger.info("%s: %.3fs pointwise, %.3fs vectorized", name, reference_time, vectorized_time)
+    np.testing.assert_allclose(estimate, expected, rtol=1e-10, atol=1e-12)
+    assert vectorized_time < reference_time
+
+
+def test_cdf_benchmark(output_data, support_points):
+    """Compare the vectorized to the pointwise cdf estimation."""
+    log_and_compare(
+        "cdf",
+        lambda: estimate_cdf_pointwise(output_data, support_points),
+        lambda: estimate_cdf(output_data, support_points, bayesian=False)["mean"],
+    )
+
+
+def test_icdf_benchmark(output_data):
+    """Compare the vectorized to the pointwise icdf estimation."""
+    log_and_compare(
+        "icdf",
+        lambda: estimate_icdf_pointwise(output_data),
+        lambda: estimate_icdf(output_data, bayesian=False)["mean"],
+    )
+
+
+def test_pdf_benchmark(output_data, support_points):
+    """Compare the vectorized to the tree-based kernel density estimation."""
+    log_and_compare(
+        "pdf",
+        lambda: perform_kde_with_tree(output_data["result"], 0.1, support_points),
+        lambda: perform_kde(output_data["result"], 0.1, support_points),
+    )
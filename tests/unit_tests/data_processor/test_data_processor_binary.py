@@ -0,0 +1,61 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Tests for binary data processor."""
+
+import numpy as np
+import pytest
+
+from queens.data_processor.data_processor_binary import DataProcessorBinary
+
+
+@pytest.fixture(name="dummy_data")
+def fixture_dummy_data():
+    """Create some dummy data."""
+    return np.arange(20.0).reshape(10, 2)
+
+
+def test_npy_file(tmp_path, dummy_data):
+    """Test the selection of rows and columns of a numpy binary."""
+    np.save(tmp_path / "output.npy", dummy_data)
+    data_processor = DataProcessorBinary(
+        file_name_identifier="*.npy",
+        file_options_dict={"start": 1, "stride": 3, "columns": [1]},
+    )
+    np.testing.assert_array_equal(
+        data_processor.get_data_from_file(tmp_path), dummy_data[1::3, [1]]
+    )
+
+
+def test_raw_file(tmp_path, dummy_data):
+    """Test the read-in of raw binary data with a header."""
+    with open(tmp_path / "output.bin", "wb") as file:
+        file.write(b"header")
+        file.write(dummy_data.astype("<f4").tobytes())
+    data_processor = DataProcessorBinary(
+        file_name_identifier="*.bin",
+        file_options_dict={"dtype": "<f4", "offset": 6, "shape": [10, 2], "rows": [7, 2]},
+    )
+    processed_data = data_processor.get_data_from_file(tmp_path)
+    assert processed_data.dtype == np.float32
+    assert not isinstance(processed_data, np.memmap)
+    np.testing.assert_array_equal(processed_data, dummy_data[[7, 2]])
+
+
+def test_invalid_row_selection():
+    """Test that rows cannot be combined with a slice."""
+    with pytest.raises(ValueError):
+        DataProcessorBinary(
+            file_name_identifier="*.npy", file_options_dict={"rows": [1], "stride": 2}
+        )
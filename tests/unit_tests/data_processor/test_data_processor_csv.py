@@ -359,3 +359,121 @@ def test_filter_and_manipulate_raw_data_error(default_data_processor, default_ra
     default_data_processor.returned_filter_format = "stuff"
     with pytest.raises(queens.utils.valid_options_utils.InvalidOptionError):
         default_data_processor.filter_and_manipulate_raw_data(default_raw_data)
+
+
+@pytest.fixture(name="row_index_file_options")
+def fixture_row_index_file_options(tmp_path):
+    """File options of a data processor with cached row index."""
+    return {
+        "header_row": 0,
+        "use_cols_lst": [1, 2],
+        "skip_rows": 1,
+        "index_column": 0,
+        "returned_filter_format": "numpy",
+        "cache_row_index": True,
+        "row_index_dir": str(tmp_path / "row_indices"),
+        "filter": {
+            "type": "by_target_values",
+            "target_values": [0.4, 0.1],
+            "tolerance": 1e-8,
+        },
+    }
+
+
+def test_cached_row_index(tmp_path, monkeypatch, mocker, row_index_file_options):
+    """Test that later files are read by the cached row index."""
+    monkeypatch.setattr(queens.data_processor.data_processor_csv, "_ROW_INDICES", {})
+    data_processor = DataProcessorCsv(
+        file_name_identifier="*.csv", file_options_dict=row_index_file_options
+    )
+
+    def write_output(job_id, times, factor):
+        output_dir = tmp_path / str(job_id)
+        output_dir.mkdir()
+        rows = [f"{i} {time} {factor * time}\n" for i, time in enumerate(times)]
+        (output_dir / "output.csv").write_text("# comment\nstep time value\n" + "".join(rows))
+        return output_dir
+
+    times = [0.1, 0.2, 0.3, 0.4, 0.5]
+    read_indexed_rows = mocker.spy(data_processor, "_read_indexed_rows")
+
+    np.testing.assert_allclose(
+        data_processor.get_data_from_file(write_output(0, times, 1.0)), [[0.4], [0.1]]
+    )
+    np.testing.assert_allclose(
+        data_processor.get_data_from_file(write_output(1, times, 2.0)), [[0.8], [0.2]]
+    )
+    # the stored row index is reused by a new process
+    monkeypatch.setattr(queens.data_processor.data_processor_csv, "_ROW_INDICES", {})
+    np.testing.assert_allclose(
+        data_processor.get_data_from_file(write_output(2, times, 2.0)), [[0.8], [0.2]]
+    )
+    # a different order of rows of the same size is detected and the whole file is read
+    np.testing.assert_allclose(
+        data_processor.get_data_from_file(write_output(3, times[::-1], 2.0)), [[0.8], [0.2]]
+    )
+    # a file of another size gets another row index
+    np.testing.assert_allclose(
+        data_processor.get_data_from_file(write_output(4, [0.0] + times, 3.0)), [[1.2], [0.3]]
+    )
+    assert [raw_data is not None for raw_data in read_indexed_rows.spy_return_list] == [
+        True,
+        True,
+        False,
+    ]
+    assert len(list((tmp_path / "row_indices").glob("*.npz"))) == 2
+
+
+def test_cached_row_index_without_index_column(row_index_file_options):
+    """Test that a cached row index requires an index column."""
+    row_index_file_options["index_column"] = False
+    with pytest.raises(ValueError, match="cache_row_index"):
+        DataProcessorCsv(file_name_identifier="*.csv", file_options_dict=row_index_file_options)
+
+
+@pytest.mark.parametrize(
+    "filter_options",
+    [
+        {"type": "entire_file"},
+        {"type": "by_row_index", "rows": [7, 2]},
+        {"type": "by_row_index", "rows": [-1, -3]},
+        {"type": "by_row_index", "rows": [-1, 2]},
+        {"type": "by_range", "range": [0.06, 0.16], "tolerance": 1e-8},
+        {"type": "by_target_values", "target_values": [0.18, 0.04], "tolerance": 1e-8},
+    ],
+)
+def test_pushdown_read(dummy_csv_file, mocker, filter_options):
+    """Test that the read-in with pushed-down filters yields the same data."""
+    data_processor = DataProcessorCsv(
+        file_name_identifier="*.csv",
+        file_options_dict={
+            "header_row": 0,
+            "use_cols_lst": [1, 2, 3],
+            "skip_rows": 3,
+            "index_column": 0,
+            "filter": filter_options,
+        },
+    )
+    data_processor.chunk_size = 3
+    full_read = mocker.patch.object(
+        data_processor,
+        "_read_csv_with_pushdown",
+        side_effect=lambda file_path: pd.read_csv(
+            file_path,
+            sep=r",|\s+",
+            usecols=[1, 2, 3],
+            skiprows=3,
+            header=0,
+            engine="python",
+            index_col=0,
+        ),
+    )
+    expected_data = data_processor.get_data_from_file(dummy_csv_file.parent)
+    mocker.stop(full_read)
+
+    raw_data = data_processor.get_raw_data_from_file(dummy_csv_file)
+    if filter_options["type"] != "entire_file" and filter_options.get("rows") != [-1, 2]:
+        assert len(raw_data) < 10
+    np.testing.assert_array_equal(
+        data_processor.get_data_from_file(dummy_csv_file.parent), expected_data
+    )
@@ -0,0 +1,236 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Tests for the ensight data processor."""
+
+import numpy as np
+import pandas as pd
+import pytest
+import vtk
+from vtkmodules.util.numpy_support import numpy_to_vtk, vtk_to_numpy
+
+from queens.data_processor import data_processor_ensight
+from queens.data_processor.data_processor_ensight import DataProcessorEnsight
+
+TIMES = [0.0, 0.5, 1.0]
+
+
+def _ensight_string(text):
+    """Encode a string as an EnSight gold binary record."""
+    return text.encode().ljust(80, b"\0")
+
+
+def _ensight_int(value):
+    """Encode an integer as an EnSight gold binary record."""
+    return np.array([value], dtype=">i4").tobytes()
+
+
+@pytest.fixture(name="mesh", scope="module")
+def fixture_mesh():
+    """Tetrahedral mesh of the unit cube."""
+    image = vtk.vtkImageData()
+    image.SetDimensions(4, 4, 4)
+    image.SetSpacing(1 / 3, 1 / 3, 1 / 3)
+    tetrahedralize = vtk.vtkDataSetTriangleFilter()
+    tetrahedralize.SetInputData(image)
+    tetrahedralize.Update()
+    mesh = tetrahedralize.GetOutput()
+    points = vtk_to_numpy(mesh.GetPoints().GetData()).astype(">f4")
+    connectivity = vtk_to_numpy(mesh.GetCells().GetConnectivityArray()).reshape(-1, 4) + 1
+    return points, connectivity.astype(">i4")
+
+
+@pytest.fixture(name="case_file")
+def fixture_case_file(tmp_path, mesh):
+    """EnSight gold binary case with a point and a cell field."""
+    points, connectivity = mesh
+    (tmp_path / "mesh.geo").write_bytes(
+        b"".join(
+            [
+                _ensight_string("C Binary"),
+                _ensight_string("mesh"),
+                _ensight_string("unit cube"),
+                _ensight_string("node id off"),
+                _ensight_string("element id off"),
+                _ensight_string("part"),
+                _ensight_int(1),
+                _ensight_string("cube"),
+                _ensight_string("coordinates"),
+                _ensight_int(len(points)),
+                points.T.tobytes(),
+                _ensight_string("tetra4"),
+                _ensight_int(len(connectivity)),
+                connectivity.tobytes(),
+            ]
+        )
+    )
+    for step, time in enumerate(TIMES):
+        displacement = np.c_[points[:, 0] * (1 + time), points[:, 1] + time, points[:, 2] * time]
+        (tmp_path / f"result.{step}.displacement").write_bytes(
+            b"".join(
+                [
+                    _ensight_string("displacement"),
+                    _ensight_string("part"),
+                    _ensight_int(1),
+                    _ensight_string("coordinates"),
+                    displacement.T.astype(">f4").tobytes(),
+                ]
+            )
+        )
+        stress = np.arange(len(connectivity)) + time
+        (tmp_path / f"result.{step}.stress").write_bytes(
+            b"".join(
+                [
+                    _ensight_string("stress"),
+                    _ensight_string("part"),
+                    _ensight_int(1),
+                    _ensight_string("tetra4"),
+                    stress.astype(">f4").tobytes(),
+                ]
+            )
+        )
+    case_file = tmp_path / "result.case"
+    case_file.write_text(
+        "FORMAT\ntype: ensight gold\n\nGEOMETRY\nmodel: mesh.geo\n\nVARIABLE\n"
+        "vector per node: 1 displacement result.*.displacement\n"
+        "scalar per element: 1 stress result.*.stress\n\n"
+        f"TIME\ntime set: 1\nnumber of steps: {len(TIMES)}\nfilename start number: 0\n"
+        f"filename increment: 1\ntime values: {' '.join(str(time) for time in TIMES)}\n",
+        encoding="utf-8",
+    )
+    return str(case_file)
+
+
+@pytest.fixture(name="coordinates")
+def fixture_coordinates():
+    """Coordinates inside and outside of the mesh."""
+    return np.array([[0.1, 0.2, 0.3], [0.5, 0.5, 0.5], [0.9, 0.05, 0.7], [2.0, 2.0, 2.0]])
+
+
+@pytest.fixture(name="probe_mappings", autouse=True)
+def fixture_probe_mappings(monkeypatch):
+    """Empty in-memory cache of the probe mappings."""
+    probe_mappings = {}
+    monkeypatch.setattr(data_processor_ensight, "_PROBE_MAPPINGS", probe_mappings)
+    return probe_mappings
+
+
+def _data_processor(coordinates, vtk_array_type, vtk_field_label, probe_cache_dir=None):
+    """Create an ensight data processor reading at experimental coordinates."""
+
+    class ExperimentalDataReader:
+        """Experimental data reader returning the coordinates."""
+
+        @staticmethod
+        def get_experimental_data():
+            """Get the experimental data."""
+            experimental_data = pd.DataFrame(coordinates, columns=["x", "y", "z"])
+            return None, None, None, experimental_data, None, ["x", "y", "z"]
+
+    file_options_dict = {
+        "target_time_lst": [0.5, 1.0],
+        "time_tol": 1e-3,
+        "geometric_target": ["experimental_data"],
+        "physical_field_dict": {
+            "vtk_field_label": vtk_field_label,
+            "field_components": [0, 2] if vtk_array_type == "point_array" else [0],
+            "vtk_array_type": vtk_array_type,
+        },
+    }
+    if probe_cache_dir is not None:
+        file_options_dict["probe_cache_dir"] = str(probe_cache_dir)
+    return DataProcessorEnsight(
+        file_name_identifier="result.case",
+        file_options_dict=file_options_dict,
+        files_to_be_deleted_regex_lst=[],
+        experimental_data_reader=ExperimentalDataReader(),
+    )
+
+
+def _probe(case_file, coordinates, time_value, vtk_field_label):
+    """Interpolate a field with the vtkProbeFilter as reference."""
+    reader = vtk.vtkEnSightGoldBinaryReader()
+    reader.SetCaseFileName(case_file)
+    reader.SetTimeValue(time_value)
+    reader.Update()
+    points = vtk.vtkPoints()
+    points.SetData(numpy_to_vtk(coordinates))
+    polydata = vtk.vtkPolyData()
+    polydata.SetPoints(points)
+    probe_filter = vtk.vtkProbeFilter()
+    probe_filter.SetSourceData(reader.GetOutput().GetBlock(0))
+    probe_filter.SetInputData(polydata)
+    probe_filter.Update()
+    return vtk_to_numpy(probe_filter.GetOutput().GetPointData().GetArray(vtk_field_label))
+
+
+@pytest.mark.parametrize(
+    "vtk_array_type,vtk_field_label,components",
+    [("point_array", "displacement", [0, 2]), ("cell_array", "stress", None)],
+)
+def test_interpolation_matches_probe_filter(
+    case_file, coordinates, vtk_array_type, vtk_field_label, components
+):
+    """Test the interpolation with the cached mapping against the vtkProbeFilter."""
+    data_processor = _data_processor(coordinates, vtk_array_type, vtk_field_label)
+
+    raw_data = data_processor.get_raw_data_from_file(case_file)
+    processed_data = data_processor.filter_and_manipulate_raw_data(raw_data)
+
+    expected_data = []
+    for time_value in [0.5, 1.0]:
+        field = _probe(case_file, coordinates, time_value, vtk_field_label)
+        expected_data.append(field.reshape(-1, 1) if components is None else field[:, components])
+    np.testing.assert_allclose(processed_data, np.hstack(expected_data), rtol=1e-6, atol=1e-6)
+
+    # only the field of interest is read
+    block = raw_data.GetOutput().GetBlock(0)
+    assert block.GetPointData().GetNumberOfArrays() + block.GetCellData().GetNumberOfArrays() == 1
+
+
+@pytest.mark.usefixtures("case_file")
+def test_probe_mapping_is_cached(mocker, tmp_path, coordinates, probe_mappings):
+    """Test that the probe mapping is computed once for all jobs sharing the mesh."""
+    spy = mocker.spy(data_processor_ensight, "_compute_probe_mapping")
+    probe_cache_dir = tmp_path / "probe_cache"
+    data_processor = _data_processor(
+        coordinates, "point_array", "displacement", probe_cache_dir=probe_cache_dir
+    )
+
+    first_data = data_processor.get_data_from_file(tmp_path)
+    second_data = data_processor.get_data_from_file(tmp_path)
+    assert spy.call_count == 1
+    assert len(list(probe_cache_dir.glob("probe_mapping_*.npz"))) == 1
+
+    # a new process only finds the mapping in the probe cache directory
+    probe_mappings.clear()
+    third_data = _data_processor(
+        coordinates, "point_array", "displacement", probe_cache_dir=probe_cache_dir
+    ).get_data_from_file(tmp_path)
+    assert spy.call_count == 1
+
+    np.testing.assert_array_equal(first_data, second_data)
+    np.testing.assert_array_equal(first_data, third_data)
+
+
+@pytest.mark.usefixtures("case_file")
+def test_only_last_probe_mapping_is_kept(tmp_path, coordinates, probe_mappings):
+    """Test that only the last probe mapping is kept in memory."""
+    for target_coordinates in [coordinates[:2], coordinates]:
+        _data_processor(target_coordinates, "point_array", "displacement").get_data_from_file(
+            tmp_path
+        )
+        assert len(probe_mappings) == 1
+        (probe_mapping,) = probe_mappings.values()
+        assert len(probe_mapping["cell_ids"]) == len(target_coordinates)
@@ -16,9 +16,11 @@
 
 import numpy as np
 import pytest
+import vtk
 
 from queens.data_processor.data_processor_ensight_interface import (
     DataProcessorEnsightInterfaceDiscrepancy,
+    _intersect_lines_with_segments,
 )
 
 
@@ -142,8 +144,9 @@ def test_from_config_create_data_processor(mocker):
     )
 
 
-def test_read_monitorfile(mocker):
-    """Test reading of monitor file."""
+@pytest.mark.parametrize("additional_lines", ["", "\n1.2e+01 9.0 9.0 9.0 9.0"])
+def test_read_monitorfile(mocker, additional_lines):
+    """Test reading of monitor file, lines after the announced steps are ignored."""
     # monitor_string will be used to mock the content of a monitor file that is linked at
     # path_to_ref_data whereas the indentation is compulsory
     monitor_string = """#somecomment
@@ -161,6 +164,7 @@ steps 2 npoints 4
 # the vectors (x y)->(x' y') should point towards the interface
 4.0e+00 1.0 1.0 1.0 1.0  2.0 2.0 2.0 2.0  3.0 3.0 3.0 3.0  1.0 1.0 1.0 1.0 1.0 1.0
 8.0e+00 5.0 5.0 5.0 5.0  6.0 6.0 6.0 6.0  7.0 7.0 7.0 7.0  5.0 5.0 5.0 5.0 5.0 5.0"""
+    monitor_string += additional_lines
 
     mp = mocker.patch("builtins.open", mocker.mock_open(read_data=monitor_string))
     data = DataProcessorEnsightInterfaceDiscrepancy.read_monitorfile("dummy_path")
@@ -206,3 +210,80 @@ def test_compute_distance(default_data_processor):
     assert default_data_processor.compute_distance(
         [[2, 4, 6], [1, 2, 3], [3, 6, 9]], [[0, 0, 0], [0.1, 0.2, 0.3]]
     ) == pytest.approx(np.sqrt(14), abs=10e-12)
+
+
+def test_compute_distances(default_data_processor, all_dimensions):
+    """Test the vectorized distances against the intersection point by point."""
+    default_data_processor.problem_dimension = all_dimensions
+    image = vtk.vtkImageData()
+    image.SetDimensions(6, 6, 6 if all_dimensions == "3d" else 1)
+    image.SetSpacing(0.2, 0.2, 0.2)
+    geometry_filter = vtk.vtkGeometryFilter()
+    geometry_filter.SetInputData(image)
+    geometry_filter.Update()
+    outline_out, outline_data = (
+        default_data_processor._get_dim_dependent_vtk_output(  # pylint: disable=W0212
+            geometry_filter.GetOutput()
+        )
+    )
+
+    rng = np.random.default_rng(42)
+    root_points = rng.uniform(0.1, 0.9, (50, 3))
+    directions = rng.normal(scale=0.05, size=(50, 3))
+    if all_dimensions == "2d":
+        root_points[:, 2] = 0.0
+        directions[:, 2] = 0.0
+    measured_point_pairs = np.stack([root_points, root_points + directions], axis=1)
+
+    boundary_elements = default_data_processor._get_boundary_elements(  # pylint: disable=W0212
+        outline_out
+    )
+    distances = default_data_processor.compute_distances(boundary_elements, measured_point_pairs)
+
+    expected_distances = []
+    for measured_point_pair in measured_point_pairs.tolist():
+        point_vector = default_data_processor.stretch_vector(
+            measured_point_pair[0], measured_point_pair[1], 10
+        )
+        intersection_points = (
+            default_data_processor._get_intersection_points(  # pylint: disable=W0212
+                outline_data, outline_out, point_vector
+            )
+        )
+        expected_distances.append(
+            default_data_processor.compute_distance(intersection_points, measured_point_pair)
+        )
+    np.testing.assert_allclose(distances, expected_distances, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("scale", [1, 10, 100, 1000])
+def test_intersect_lines_with_segments(scale):
+    """Test the vectorized intersection against vtkLine.Intersection for random 2d lines."""
+    rng = np.random.default_rng(42)
+    num_lines = 500
+    # half of the lines cross their segment
+    crossing_points = rng.uniform(-scale, scale, (num_lines, 3))
+    line_directions = rng.normal(size=(num_lines, 3)) * scale
+    segment_directions = rng.normal(size=(num_lines, 3)) * scale
+    line_starts = crossing_points - rng.uniform(0.0, 1.0, (num_lines, 1)) * line_directions
+    segment_starts = crossing_points - rng.uniform(-1.0, 2.0, (num_lines, 1)) * segment_directions
+    for points in [line_starts, line_directions, segment_starts, segment_directions]:
+        points[:, 2] = 0.0
+    line_ends = line_starts + line_directions
+    segments = np.stack([segment_starts, segment_starts + segment_directions], axis=1)
+
+    for i in range(num_lines):
+        found, intersection_points = _intersect_lines_with_segments(
+            line_starts[i : i + 1], line_ends[i : i + 1], segments[i : i + 1]
+        )
+        line_coordinate, segment_coordinate = vtk.reference(0.0), vtk.reference(0.0)
+        expected_found = vtk.vtkLine.Intersection(
+            line_starts[i], line_ends[i], *segments[i], line_coordinate, segment_coordinate
+        )
+        assert found[0, 0] == (expected_found == vtk.vtkLine.Intersect)
+        if found[0, 0]:
+            np.testing.assert_allclose(
+                intersection_points[0, 0],
+                segments[i, 0] + float(segment_coordinate) * segment_directions[i],
+                atol=1e-10 * scale,
+            )
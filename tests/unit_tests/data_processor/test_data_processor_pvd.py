@@ -0,0 +1,105 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Tests for the pvd data processor."""
+
+import numpy as np
+import pytest
+import pyvista as pv
+
+from queens.data_processor import data_processor_pvd
+from queens.data_processor.data_processor_pvd import DataProcessorPvd
+
+TIMES = [0.0, 0.5, 1.0]
+
+
+def _write_pvd_collection(directory):
+    """Write a pvd collection with two parts and several fields per time step."""
+    directory.mkdir(parents=True, exist_ok=True)
+    mesh = pv.ImageData(dimensions=(4, 3, 2)).cast_to_unstructured_grid()
+    datasets = []
+    for step, time in enumerate(TIMES):
+        for part in range(2):
+            mesh.point_data["displacement"] = mesh.points * (time + part)
+            mesh.point_data["temperature"] = np.full(mesh.n_points, time)
+            mesh.cell_data["stress"] = np.arange(mesh.n_cells) * (time + 1) + part
+            file_name = f"output_{part}_{step}.vtu"
+            mesh.save(directory / file_name)
+            datasets.append(f'<DataSet timestep="{time}" part="{part}" file="{file_name}"/>')
+    pvd_file = directory / "output.pvd"
+    pvd_file.write_text(
+        '<?xml version="1.0"?>\n<VTKFile type="Collection" version="0.1">\n<Collection>\n'
+        + "\n".join(datasets)
+        + "\n</Collection>\n</VTKFile>\n",
+        encoding="utf-8",
+    )
+    return pvd_file
+
+
+@pytest.fixture(name="pvd_collections", autouse=True)
+def fixture_pvd_collections(monkeypatch):
+    """Empty cache of the parsed pvd collections."""
+    monkeypatch.setattr(data_processor_pvd, "_PVD_COLLECTIONS", {})
+
+
+@pytest.mark.parametrize(
+    "field_name,point_data,time_steps,block",
+    [
+        ("displacement", True, None, 0),
+        ("displacement", True, [0, 2], 1),
+        ("stress", False, [1, -1], 1),
+    ],
+)
+def test_selective_read(tmp_path, field_name, point_data, time_steps, block):
+    """Test the selective read-in against reading all data with the PVDReader."""
+    pvd_file = _write_pvd_collection(tmp_path)
+    data_processor = DataProcessorPvd(
+        field_name,
+        file_name_identifier="output.pvd",
+        file_options_dict={},
+        time_steps=time_steps,
+        block=block,
+        point_data=point_data,
+    )
+
+    processed_data = data_processor.filter_and_manipulate_raw_data(
+        data_processor.get_raw_data_from_file(pvd_file)
+    )
+
+    reader = pv.get_reader(pvd_file)
+    expected_data = []
+    for time_step in data_processor.time_steps:
+        reader.set_active_time_value(reader.time_values[time_step])
+        data = getattr(reader.read()[block], data_processor.data_attribute)[field_name]
+        expected_data.append(data)
+    np.testing.assert_array_equal(processed_data, np.vstack(expected_data))
+
+
+def test_collection_is_cached(mocker, tmp_path):
+    """Test that the collection is parsed once for all jobs with the same pvd file."""
+    spy = mocker.spy(DataProcessorPvd, "_parse_collection")
+    data_processor = DataProcessorPvd(
+        "temperature", file_name_identifier="output.pvd", file_options_dict={}
+    )
+
+    processed_data = [
+        data_processor.filter_and_manipulate_raw_data(
+            data_processor.get_raw_data_from_file(_write_pvd_collection(tmp_path / job_id))
+        )
+        for job_id in ["1", "2"]
+    ]
+
+    assert spy.call_count == 1
+    np.testing.assert_array_equal(processed_data[0], np.full((1, 24), 1.0))
+    np.testing.assert_array_equal(processed_data[1], processed_data[0])
@@ -14,6 +14,7 @@
 #
 """Tests for data processor txt routine."""
 
+import numpy as np
 import pytest
 
 from queens.data_processor.data_processor_txt import DataProcessorTxt
@@ -193,3 +194,61 @@ def test_extract_section_from_raw_data_start_marker(default_data_processor, defa
     assert len(timestep_raw_data[2]) == 80
     assert len(timestep_raw_data[3]) == 120
     assert len(timestep_raw_data[4]) == 130
+
+
+@pytest.mark.parametrize("remove_logger_prefix_from_raw_data", [True, False])
+@pytest.mark.parametrize(
+    "marker_type,regex_start,regex_end",
+    [
+        (
+            "start_end",
+            r"^=+ Standard Lagrange multiplier strategy =+$",
+            r"TimeMonitor results over \d+ processors",
+        ),
+        ("start_end", "DATA OF PREVIOUS TIME STEP", "Finalised step"),
+        ("start", r"\*{58}", ""),
+        ("end", "", r"^Parallel balance \(eles\): \d+\.\d+e[+-]\d+ \(limit \d+\.\d+\)$"),
+        ("start", "no matching line", ""),
+    ],
+)
+def test_iter_sections_from_file(
+    dummy_txt_file, remove_logger_prefix_from_raw_data, marker_type, regex_start, regex_end
+):
+    """Test that the streamed sections match the in-memory extraction."""
+    data_processor = DataProcessorTxt(
+        "queens_example_log.txt",
+        {},
+        [],
+        remove_logger_prefix_from_raw_data=remove_logger_prefix_from_raw_data,
+    )
+    raw_data = data_processor.get_raw_data_from_file(dummy_txt_file)
+    expected_sections = data_processor._extract_section_from_raw_data(  # pylint: disable=W0212
+        raw_data, marker_type, regex_start=regex_start, regex_end=regex_end
+    )
+
+    sections = data_processor._iter_sections_from_file(  # pylint: disable=W0212
+        dummy_txt_file, marker_type, regex_start=regex_start, regex_end=regex_end
+    )
+
+    assert list(sections) == [section for section in expected_sections if section]
+
+
+def test_extract_numeric_blocks_from_file(tmp_path):
+    """Test the parsing of numeric blocks between markers."""
+    prefix = "2023-11-22 16:24:15,523 - queens.drivers.driver_3 - INFO -"
+    lines = ["header", "BEGIN", "1.0 2.0", "3.0 4.0", "END", "BEGIN", "5.0 6.0", "END", "footer"]
+    file_path = tmp_path / "log.txt"
+    file_path.write_text("".join(f"{prefix} {line}\n" for line in lines), encoding="utf-8")
+    data_processor = DataProcessorTxt("log.txt", {}, [], stream_raw_data=True)
+
+    raw_data = data_processor.get_raw_data_from_file(file_path)
+    blocks = list(
+        data_processor._extract_numeric_blocks_from_file(  # pylint: disable=W0212
+            raw_data, "start_end", regex_start="^BEGIN$", regex_end="^END$"
+        )
+    )
+
+    assert raw_data == file_path
+    assert len(blocks) == 2
+    np.testing.assert_array_equal(blocks[0], [[1.0, 2.0], [3.0, 4.0]])
+    np.testing.assert_array_equal(blocks[1], [[5.0, 6.0]])
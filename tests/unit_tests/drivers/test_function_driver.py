@@ -0,0 +1,72 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Unit tests for the function driver."""
+
+import numpy as np
+import pytest
+
+from queens.distributions import FreeVariable
+from queens.drivers.function_driver import FunctionDriver
+from queens.parameters import Parameters
+from queens.schedulers.pool_scheduler import PoolScheduler
+
+
+def function_with_gradient(x1, x2):
+    """Test function returning its gradient."""
+    return x1**2 * x2, np.stack([2 * x1 * x2, x1**2], axis=-1)
+
+
+@pytest.fixture(name="parameters")
+def fixture_parameters():
+    """Parameters of the test functions."""
+    return Parameters(x1=FreeVariable(1), x2=FreeVariable(1), x3=FreeVariable(1))
+
+
+@pytest.fixture(name="samples")
+def fixture_samples():
+    """Samples for the test functions."""
+    np.random.seed(42)
+    return np.random.uniform(-np.pi, np.pi, size=(10, 3))
+
+
+@pytest.mark.parametrize("batch_size", [None, 3])
+def test_vectorized_mode_matches_per_sample_mode(test_name, parameters, samples, batch_size):
+    """Test that the vectorized mode yields the per-sample results."""
+    scheduler = PoolScheduler(experiment_name=test_name, verbose=False)
+    driver = FunctionDriver(parameters=parameters, function="ishigami90")
+    vectorized_driver = FunctionDriver(
+        parameters=parameters, function="ishigami90", vectorized=True, batch_size=batch_size
+    )
+
+    expected_response = scheduler.evaluate(samples, driver)
+    response = scheduler.evaluate(samples, vectorized_driver)
+    assert response["result"].shape == (10, 1)
+    np.testing.assert_allclose(response["result"], expected_response["result"])
+
+
+def test_vectorized_mode_with_gradient(test_name, samples):
+    """Test stacking of the gradients in vectorized mode."""
+    parameters = Parameters(x1=FreeVariable(1), x2=FreeVariable(1))
+    scheduler = PoolScheduler(experiment_name=test_name, verbose=False)
+    driver = FunctionDriver(parameters=parameters, function=function_with_gradient)
+    vectorized_driver = FunctionDriver(
+        parameters=parameters, function=function_with_gradient, vectorized=True, batch_size=4
+    )
+
+    expected_response = scheduler.evaluate(samples[:, :2], driver)
+    response = scheduler.evaluate(samples[:, :2], vectorized_driver)
+    assert response["gradient"].shape == (10, 1, 2)
+    np.testing.assert_allclose(response["result"], expected_response["result"])
+    np.testing.assert_allclose(response["gradient"], expected_response["gradient"])
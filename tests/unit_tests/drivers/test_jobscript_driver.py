@@ -14,13 +14,19 @@
 #
 """Unit tests for the jobscript driver."""
 
+import tarfile
+import threading
+
 import numpy as np
 import pytest
 import yaml
 
+from queens.data_processor.data_processor_txt import DataProcessorTxt
 from queens.distributions import FreeVariable
-from queens.drivers.jobscript_driver import JobOptions, JobscriptDriver
+from queens.drivers.jobscript_driver import JobOptions, JobscriptDriver, close_job_archives
 from queens.parameters import Parameters
+from queens.utils.config_directories import job_dirs_in_experiment_dir
+from queens.utils.metadata import METADATA_STORE_FOLDER_NAME, get_metadata_from_experiment_dir
 
 
 @pytest.fixture(name="parameters")
@@ -137,3 +143,164 @@ def test_jobscript_driver_multiple_input_files(
     for input_file in injected_input_files.values():
         for key, value in yaml.safe_load(input_file.read_text()).items():
             assert value == str(injectable_options[key])
+
+
+@pytest.fixture(name="layout_driver")
+def fixture_layout_driver(parameters, tmp_path):
+    """Jobscript driver writing its output next to the log file."""
+    input_template = tmp_path / "input_template.yaml"
+    input_template.write_text("parameter_1: {{ parameter_1 }}")
+
+    def create_driver(**kwargs):
+        return JobscriptDriver(
+            parameters=parameters,
+            input_templates=input_template,
+            jobscript_template="echo {{ job_id }} > {{ output_file }}.txt",
+            executable="",
+            **kwargs,
+        )
+
+    return create_driver
+
+
+def run_jobs(driver, experiment_dir, job_ids):
+    """Run the driver for some jobs."""
+    (experiment_dir / "input_template.yaml").write_text("parameter_1: {{ parameter_1 }}")
+    for job_id in job_ids:
+        driver.run(
+            sample=np.array([job_id, 0.0]),
+            job_id=job_id,
+            num_procs=1,
+            experiment_dir=experiment_dir,
+            experiment_name="test_experiment",
+        )
+
+
+def test_sharded_job_directories(layout_driver, tmp_path):
+    """Test the sharded layout of the job directories."""
+    experiment_dir = tmp_path / "experiment"
+    experiment_dir.mkdir()
+    run_jobs(layout_driver(shard_levels=2), experiment_dir, [5, 1234])
+
+    assert (experiment_dir / "12" / "34" / "1234" / "metadata.yaml").is_file()
+    assert (experiment_dir / "00" / "05" / "5" / "output" / "test_experiment_5.txt").is_file()
+    assert [job["job_id"] for job in get_metadata_from_experiment_dir(experiment_dir)] == [5, 1234]
+
+
+def test_disabled_metadata_store(layout_driver, tmp_path):
+    """Test that no metadata store is written if disabled."""
+    experiment_dir = tmp_path / "experiment"
+    experiment_dir.mkdir()
+    run_jobs(layout_driver(write_metadata_store=False), experiment_dir, [0])
+
+    assert (experiment_dir / "0" / "metadata.yaml").is_file()
+    assert not (experiment_dir / METADATA_STORE_FOLDER_NAME).exists()
+
+
+def test_scratch_directory(layout_driver, tmp_path, monkeypatch, mocker):
+    """Test that jobs run in the scratch directory and only outputs are copied back."""
+    experiment_dir = tmp_path / "experiment"
+    experiment_dir.mkdir()
+    monkeypatch.setenv("TMPDIR", str(tmp_path / "scratch"))
+    data_processor = DataProcessorTxt(
+        file_name_identifier="*.txt", file_options_dict={"regex_search_expression": ""}
+    )
+    mocker.patch.object(data_processor, "get_data_from_file", return_value=1.0)
+    run_jobs(
+        layout_driver(scratch_dir="$TMPDIR", data_processor=data_processor), experiment_dir, [7]
+    )
+
+    job_dir = experiment_dir / "7"
+    assert sorted(file.name for file in job_dir.iterdir()) == ["metadata.yaml", "output"]
+    assert sorted(file.name for file in (job_dir / "output").iterdir()) == [
+        "test_experiment_7.err",
+        "test_experiment_7.log",
+        "test_experiment_7.txt",
+    ]
+    assert not (tmp_path / "scratch" / "test_experiment" / "7").exists()
+
+
+def test_archived_job_directories(layout_driver, tmp_path):
+    """Test that finished job directories are archived."""
+    experiment_dir = tmp_path / "experiment"
+    experiment_dir.mkdir()
+    run_jobs(layout_driver(archive_job_dirs=True), experiment_dir, [0, 1])
+
+    assert not (experiment_dir / "0").exists()
+    (archive_path,) = (experiment_dir / "job_archives").glob("*.tar")
+    with tarfile.open(archive_path) as archive:
+        assert "1/output/test_experiment_1.txt" in archive.getnames()
+    assert [job["job_id"] for job in get_metadata_from_experiment_dir(experiment_dir)] == [0, 1]
+
+
+def test_archive_per_thread(layout_driver, tmp_path):
+    """Test that concurrent threads append to separate archives."""
+    experiment_dir = tmp_path / "experiment"
+    experiment_dir.mkdir()
+    driver = layout_driver(archive_job_dirs=True, shard_levels=1)
+    threads = [
+        threading.Thread(target=run_jobs, args=(driver, experiment_dir, range(i, 20, 2)))
+        for i in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    close_job_archives()
+
+    archive_paths = list((experiment_dir / "job_archives").glob("*.tar"))
+    assert len(archive_paths) == 2
+    names = []
+    for archive_path in archive_paths:
+        with tarfile.open(archive_path) as archive:
+            names.extend(archive.getnames())
+    assert all(f"{job_id:02d}/{job_id}/metadata.yaml" in names for job_id in range(20))
+    # the emptied shard directory is not mistaken for a job directory
+    assert job_dirs_in_experiment_dir(experiment_dir) == []
+
+
+def test_concurrent_jobs(layout_driver, tmp_path, mocker):
+    """Test that a batch of jobs is run concurrently."""
+    experiment_dir = tmp_path / "experiment"
+    experiment_dir.mkdir()
+    (experiment_dir / "input_template.yaml").write_text("parameter_1: {{ parameter_1 }}")
+    data_processor = DataProcessorTxt(
+        file_name_identifier="*.txt", file_options_dict={"regex_search_expression": ""}
+    )
+    mocker.patch.object(
+        data_processor,
+        "get_data_from_file",
+        side_effect=lambda output_dir: float(
+            (output_dir / f"{output_dir.parent.name}.txt").read_text()
+        ),
+    )
+    driver = layout_driver(max_concurrent_jobs=2, data_processor=data_processor)
+    driver.jobscript_template = "sleep 0.2; echo {{ job_id }} > {{ output_dir }}/{{ job_id }}.txt"
+
+    results, gradients = driver.run(
+        sample=np.array([[1.0, 0.0], [2.0, 0.0], [3.0, 0.0]]),
+        job_id=np.array([0, 1, 2]),
+        num_procs=1,
+        experiment_dir=experiment_dir,
+        experiment_name="test_experiment",
+    )
+
+    assert driver.vectorized
+    assert results == [0.0, 1.0, 2.0]
+    assert gradients is None
+    assert sorted(job["job_id"] for job in get_metadata_from_experiment_dir(experiment_dir)) == [
+        0,
+        1,
+        2,
+    ]
+
+
+def test_max_concurrent_jobs(layout_driver, mocker):
+    """Test the maximum number of concurrent jobs."""
+    mocker.patch("queens.drivers.jobscript_driver.available_cores", return_value=8)
+    assert layout_driver(max_concurrent_jobs="auto").get_max_concurrent_jobs(num_procs=3) == 2
+    assert layout_driver(max_concurrent_jobs="auto").get_max_concurrent_jobs(num_procs=16) == 1
+    assert layout_driver(max_concurrent_jobs=5).get_max_concurrent_jobs(num_procs=16) == 5
+    assert not layout_driver().vectorized
+    with pytest.raises(ValueError):
+        layout_driver(max_concurrent_jobs=0)
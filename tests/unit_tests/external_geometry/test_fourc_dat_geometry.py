@@ -17,6 +17,7 @@
 import numpy as np
 import pytest
 
+from queens.external_geometry import fourc_dat_geometry
 from queens.external_geometry.fourc_dat_geometry import FourcDatExternalGeometry
 
 
@@ -231,6 +232,7 @@ def test_init(mocker, tmp_path):
     assert geo_obj.line_topology == line_topology
     assert geo_obj.element_topology == element_topology
     assert geo_obj.random_fields == random_fields
+    assert geo_obj.geometry_cache_dir is None
 
 
 def test_read_external_data_comment(mocker, tmp_path, dat_dummy_comment, default_geo_obj):
@@ -487,3 +489,130 @@ def test_get_nodes_of_interest(default_geo_obj):
 
     default_geo_obj.get_nodes_of_interest()
     assert default_geo_obj.nodes_of_interest == [1, 2, 4, 9, 13]
+
+
+@pytest.fixture(name="dat_file")
+def fixture_dat_file(tmp_path):
+    """Write a dat file of a two element mesh with several geometric sets."""
+    lines = [
+        "-----------------------------------TITLE",
+        "two hex8 elements",
+        "-------------------------------MATERIALS",
+        "MAT 1 MAT_Struct_StVenantKirchhoff YOUNG 100 NUE 0.0 DENS 0.0",
+        "// MAT 3 MAT_Struct_StVenantKirchhoff YOUNG 300 NUE 0.0 DENS 0.0",
+        "MAT 2 MAT_Struct_StVenantKirchhoff YOUNG 200 NUE 0.0 DENS 0.0",
+        "---------------------DNODE-NODE TOPOLOGY",
+        "NODE 1 DNODE 1",
+        "NODE 12 DNODE 2",
+        "---------------------DSURF-NODE TOPOLOGY",
+        "NODE 3 DSURFACE 1",
+        "NODE 1 DSURFACE 1",
+        "",
+        "NODE 4 DSURFACE 1",
+        "NODE 2 DSURFACE 1",
+        "----------------------DVOL-NODE TOPOLOGY",
+    ]
+    lines += [f"NODE {node} DVOL 1" for node in [12, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]]
+    lines += ["-----------------------------NODE COORDS", "// nodes of the mesh"]
+    lines += [
+        f"NODE {node} COORD {0.5 * ((node - 1) // 4)} {(node - 1) % 2} {((node - 1) // 2) % 2}.1"
+        for node in range(1, 13)
+    ]
+    lines += [
+        "----------------------STRUCTURE ELEMENTS",
+        "1 SOLID HEX8 1 5 6 2 3 7 8 4 MAT 1 KINEM nonlinear",
+        "2 SOLID HEX8 5 9 10 6 7 11 12 8 MAT 2 KINEM nonlinear",
+        "------------------------------------END",
+    ]
+    path_to_dat_file = tmp_path / "two_elements.dat"
+    path_to_dat_file.write_text("\n".join(lines), encoding="utf-8")
+    return path_to_dat_file
+
+
+@pytest.mark.parametrize(
+    "list_geometric_sets, associated_material_numbers",
+    [
+        (["DSURFACE 1"], None),
+        (["DNODE 2", "DSURFACE 1"], None),
+        (["DVOL 1"], [[2]]),
+        (["DVOL 1", "STRUCTURE ELEMENTS"], [[1]]),
+    ],
+)
+def test_read_geometry_from_dat_file_in_bulk(
+    mocker, dat_file, list_geometric_sets, associated_material_numbers
+):
+    """Test that the bulk reader yields the geometry of the line-wise reader."""
+    mocker.patch.dict(fourc_dat_geometry._PARSED_DAT_FILES)  # pylint: disable=W0212
+    geometries = []
+    for read_geometry in ["read_geometry_from_dat_file", "read_geometry_from_dat_file_in_bulk"]:
+        geo_obj = FourcDatExternalGeometry(
+            input_template=dat_file,
+            list_geometric_sets=list_geometric_sets,
+            associated_material_numbers_geometric_set=associated_material_numbers,
+        )
+        geo_obj.organize_sections()
+        getattr(geo_obj, read_geometry)()
+        if associated_material_numbers:
+            geo_obj.finish_and_clean()
+        geometries.append(geo_obj)
+
+    line_wise, bulk = geometries[0], geometries[1]
+    for attribute in [
+        "node_topology",
+        "line_topology",
+        "surface_topology",
+        "volume_topology",
+        "node_coordinates",
+        "nodeset_names",
+        "element_topology",
+        "original_materials_in_dat",
+    ]:
+        assert getattr(bulk, attribute) == getattr(line_wise, attribute)
+    assert sorted(bulk.nodes_of_interest) == sorted(line_wise.nodes_of_interest)
+    np.testing.assert_array_equal(bulk.element_centers, line_wise.element_centers)
+
+
+def test_geometry_cache(mocker, tmp_path, dat_file):
+    """Test that the parsed dat file is reused from the geometry cache."""
+    mocker.patch.dict(fourc_dat_geometry._PARSED_DAT_FILES)  # pylint: disable=W0212
+    geometry_cache_dir = tmp_path / "geometry_cache"
+    geo_obj = FourcDatExternalGeometry(
+        input_template=dat_file,
+        list_geometric_sets=["DVOL 1"],
+        associated_material_numbers_geometric_set=[[1]],
+        geometry_cache_dir=geometry_cache_dir,
+    )
+    geo_obj.main_run()
+    assert len(list(geometry_cache_dir.glob("fourc_dat_*.npz"))) == 1
+
+    fourc_dat_geometry._PARSED_DAT_FILES.clear()  # pylint: disable=W0212
+    mp = mocker.patch("queens.external_geometry.fourc_dat_geometry.parse_dat_file")
+    cached_geo_obj = FourcDatExternalGeometry(
+        input_template=dat_file,
+        list_geometric_sets=["DVOL 1"],
+        associated_material_numbers_geometric_set=[[1]],
+        geometry_cache_dir=geometry_cache_dir,
+    )
+    cached_geo_obj.main_run()
+    mp.assert_not_called()
+    assert cached_geo_obj.node_coordinates == geo_obj.node_coordinates
+    assert cached_geo_obj.element_topology == geo_obj.element_topology
+    np.testing.assert_array_equal(cached_geo_obj.element_centers, geo_obj.element_centers)
+    np.testing.assert_allclose(cached_geo_obj.element_centers, [[0.25, 0.5, 0.6]])
+
+
+def test_only_last_dat_file_is_kept(mocker, tmp_path, dat_file):
+    """Test that only the last parsed dat file is kept in memory."""
+    mocker.patch.dict(fourc_dat_geometry._PARSED_DAT_FILES)  # pylint: disable=W0212
+    other_dat_file = tmp_path / "other.dat"
+    other_dat_file.write_text(dat_file.read_text() + "\n// other file\n")
+    for input_template in [dat_file, other_dat_file]:
+        FourcDatExternalGeometry(
+            input_template=input_template,
+            list_geometric_sets=["DVOL 1"],
+            associated_material_numbers_geometric_set=[[1]],
+        ).main_run()
+
+    assert list(fourc_dat_geometry._PARSED_DAT_FILES) == [  # pylint: disable=W0212
+        fourc_dat_geometry._dat_file_key(other_dat_file)  # pylint: disable=W0212
+    ]
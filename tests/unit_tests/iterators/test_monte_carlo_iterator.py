@@ -84,3 +84,96 @@ def test_correct_results(default_mc_iterator):
     np.testing.assert_allclose(
         default_mc_iterator.output["result"][0:10], ref_results, 1e-09, 1e-09
     )
+
+
+def test_chunked_run(global_settings, default_simulation_model, default_parameters_mixed):
+    """Test that the chunked mode accumulates the statistics of all chunks."""
+    default_simulation_model.driver.parameters = default_parameters_mixed
+    iterator = MonteCarloIterator(
+        model=default_simulation_model,
+        parameters=default_parameters_mixed,
+        global_settings=global_settings,
+        seed=42,
+        num_samples=100,
+        result_description={"write_results": True, "cov": True},
+        chunk_size=30,
+        spill_outputs=True,
+    )
+    iterator.pre_run()
+    iterator.core_run()
+    iterator.post_run()
+
+    chunk_files = sorted(global_settings.output_dir.glob("*_chunk_*.npz"))
+    assert len(chunk_files) == 4
+    chunks = [np.load(chunk_file) for chunk_file in chunk_files]
+    samples = np.concatenate([chunk["samples"] for chunk in chunks])
+    results = np.concatenate([chunk["result"] for chunk in chunks])
+    np.testing.assert_allclose(
+        default_simulation_model.evaluate(samples)["result"], results, rtol=1e-12
+    )
+
+    assert iterator.statistics.num_samples == 100
+    np.testing.assert_allclose(iterator.statistics.moments.mean, np.mean(results, axis=0))
+    np.testing.assert_allclose(iterator.statistics.moments.var, np.var(results, ddof=1, axis=0))
+    assert global_settings.result_file(".pickle").exists()
+
+
+def test_chunked_run_stops_early(
+    global_settings, default_simulation_model, default_parameters_mixed
+):
+    """Test that the sampling stops once the target precision is reached."""
+    default_simulation_model.driver.parameters = default_parameters_mixed
+    iterator = MonteCarloIterator(
+        model=default_simulation_model,
+        parameters=default_parameters_mixed,
+        global_settings=global_settings,
+        seed=42,
+        num_samples=10000,
+        chunk_size=50,
+        target_confidence_interval_width=1e6,
+        min_samples=120,
+    )
+    iterator.pre_run()
+    iterator.core_run()
+    # the precision is only checked once the minimum number of samples is reached
+    assert iterator.statistics.num_samples == 150
+    assert iterator.num_chunks == 3
+
+    iterator.target_confidence_interval_width = 1e-6
+    assert not iterator.precision_reached()
+    iterator.target_relative_standard_error = 1e6
+    iterator.target_confidence_interval_width = None
+    assert iterator.precision_reached()
+    iterator.min_samples = 1000
+    assert not iterator.precision_reached()
+
+
+def test_early_stopping_requires_chunks(
+    global_settings, default_simulation_model, default_parameters_mixed
+):
+    """Test that early stopping is rejected without chunks."""
+    with pytest.raises(ValueError):
+        MonteCarloIterator(
+            model=default_simulation_model,
+            parameters=default_parameters_mixed,
+            global_settings=global_settings,
+            seed=42,
+            num_samples=100,
+            target_relative_standard_error=0.01,
+        )
+
+
+def test_chunked_estimates_require_interval(
+    global_settings, default_simulation_model, default_parameters_mixed
+):
+    """Test that distribution estimates in chunked mode require a result interval."""
+    with pytest.raises(ValueError, match="result_interval"):
+        MonteCarloIterator(
+            model=default_simulation_model,
+            parameters=default_parameters_mixed,
+            global_settings=global_settings,
+            seed=42,
+            num_samples=100,
+            result_description={"write_results": False, "estimate_cdf": True},
+            chunk_size=10,
+        )
@@ -21,7 +21,15 @@ import pytest
 from mock import Mock
 
 from queens.distributions.normal import NormalDistribution
+from queens.distributions.uniform import UniformDistribution
+from queens.drivers.function_driver import FunctionDriver
+from queens.example_simulator_functions.park91a import park91a_hifi_on_grid_with_gradients
 from queens.models.likelihood_models.gaussian_likelihood import GaussianLikelihood
+from queens.models.reducers import SelectionReducer
+from queens.models.simulation_model import SimulationModel
+from queens.parameters.parameters import Parameters
+from queens.schedulers.pool_scheduler import PoolScheduler
+from queens.utils.exceptions import InvalidOptionError
 
 
 # ---------------- some fixtures ---------------------------------- #
@@ -192,3 +200,65 @@ def test_grad(my_lik_model):
     grad = my_lik_model.grad(samples, upstream_gradient=upstream_gradient)
     expected_grad = np.array([[-42.2666153056, -41.2666153056], [-68.0000000000, -67.0000000000]])
     np.testing.assert_almost_equal(expected_grad, grad)
+
+
+@pytest.mark.parametrize("num_jobs", [1, 2])
+def test_reduce_on_workers(test_name, num_jobs):
+    """Test that reducing on the workers yields the same log-likelihood and gradient."""
+    parameters = Parameters(x1=UniformDistribution(0.01, 0.99), x2=UniformDistribution(0.01, 0.99))
+    samples = np.random.default_rng(42).uniform(0.1, 0.9, (4, 2))
+    upstream_gradient = np.random.default_rng(43).random((4, 1))
+
+    responses = []
+    for reduce_on_workers in [False, True]:
+        forward_model = SimulationModel(
+            PoolScheduler(experiment_name=test_name, num_jobs=num_jobs, verbose=False),
+            FunctionDriver(parameters, function=park91a_hifi_on_grid_with_gradients),
+        )
+        gauss_lik_obj = GaussianLikelihood(
+            forward_model=forward_model,
+            noise_type="fixed_variance",
+            noise_value=0.5,
+            y_obs=np.linspace(1, 3, 16),
+            reduce_on_workers=reduce_on_workers,
+        )
+        log_likelihood = gauss_lik_obj.evaluate(samples)["result"]
+        gradient = gauss_lik_obj.grad(samples, upstream_gradient=upstream_gradient)
+        responses.append((log_likelihood, gradient, gauss_lik_obj.response["result"].shape))
+        # the forward model itself still returns the full outputs
+        assert forward_model.reducer is None
+
+    np.testing.assert_allclose(responses[1][0], responses[0][0])
+    np.testing.assert_allclose(responses[1][1], responses[0][1])
+    assert responses[0][2] == (4, 16)
+    assert responses[1][2] == (4, 1)
+
+
+def test_reduce_on_workers_invalid_options():
+    """Test that reducing on the workers is rejected if the outputs are needed on the client."""
+    forward_model = SimulationModel(scheduler=Mock(), driver=Mock())
+    with pytest.raises(InvalidOptionError):
+        GaussianLikelihood(
+            forward_model=forward_model,
+            noise_type="MAP_jeffrey_variance",
+            noise_value=0.5,
+            y_obs=np.array([1.0]),
+            reduce_on_workers=True,
+        )
+    with pytest.raises(InvalidOptionError):
+        GaussianLikelihood(
+            forward_model=Mock(),
+            noise_type="fixed_variance",
+            noise_value=0.5,
+            y_obs=np.array([1.0]),
+            reduce_on_workers=True,
+        )
+    forward_model.reducer = SelectionReducer([0])
+    with pytest.raises(InvalidOptionError):
+        GaussianLikelihood(
+            forward_model=forward_model,
+            noise_type="fixed_variance",
+            noise_value=0.5,
+            y_obs=np.array([1.0]),
+            reduce_on_workers=True,
+        )
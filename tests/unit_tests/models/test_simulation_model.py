@@ -18,7 +18,11 @@ import numpy as np
 import pytest
 from mock import Mock
 
+from queens.distributions.uniform import UniformDistribution
+from queens.drivers.function_driver import FunctionDriver
+from queens.models.reducers import ReducingDriver, SelectionReducer
 from queens.models.simulation_model import SimulationModel
+from queens.parameters.parameters import Parameters
 
 
 # ------------------ actual unit tests --------------------------- #
@@ -59,3 +63,48 @@ def test_grad():
     model.response = {"mean": None}
     with pytest.raises(ValueError):
         model.grad(None, upstream_gradient=upstream_gradient)
+
+
+def test_reducing_driver():
+    """Test that the reducer is applied to the outputs of the driver on the workers."""
+    parameters = Parameters(x1=UniformDistribution(0, 1), x2=UniformDistribution(0, 1))
+    driver = FunctionDriver(
+        parameters,
+        function=lambda x1, x2: (np.array([x1, x2, 1.0]), np.eye(2, 3)),
+    )
+    reducing_driver = ReducingDriver(driver, SelectionReducer([0, 2]))
+    assert reducing_driver.vectorized == driver.vectorized
+    result, gradient = reducing_driver.run(
+        np.array([0.2, 0.3]), 0, num_procs=1, experiment_dir=None, experiment_name=None
+    )
+    np.testing.assert_array_equal(result, [0.2, 1.0])
+    np.testing.assert_array_equal(gradient, [[1.0, 0.0], [0.0, 0.0]])
+
+
+def test_get_worker_driver():
+    """Test that the reducing driver is only rebuilt if the reducer changes."""
+    model = SimulationModel(scheduler=Mock(), driver=Mock(files_to_copy=[]))
+    assert model.get_worker_driver() is model.driver
+
+    model.reducer = SelectionReducer([0])
+    worker_driver = model.get_worker_driver()
+    assert isinstance(worker_driver, ReducingDriver)
+    assert model.get_worker_driver() is worker_driver
+
+    model.reducer = SelectionReducer([1])
+    assert model.get_worker_driver() is not worker_driver
+
+
+def test_reducing_view():
+    """Test that the reducing view shares the simulation but leaves the model unchanged."""
+    model = SimulationModel(scheduler=Mock(), driver=Mock(files_to_copy=[]))
+    reducer = SelectionReducer([0])
+    view = model.reducing_view(reducer)
+
+    assert view.scheduler is model.scheduler
+    assert view.driver is model.driver
+    assert view.reducer is reducer
+    assert model.reducer is None
+    assert isinstance(view.get_worker_driver(), ReducingDriver)
+    assert model.get_worker_driver() is model.driver
+    model.scheduler.copy_files_to_experiment_dir.assert_called_once()
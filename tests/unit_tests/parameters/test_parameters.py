@@ -113,6 +113,15 @@ def test_sample_as_dict(parameters_set_1):
     assert sample_dict == {"x1": 0.5, "x2_0": 0.1, "x2_1": 0.6}
 
 
+def test_samples_as_dict(parameters_set_1):
+    """Test *samples_as_dict* method."""
+    samples = np.array([[0.5, 0.1, 0.6], [1.5, 1.1, 1.6]])
+    samples_dict = parameters_set_1.samples_as_dict(samples)
+    assert list(samples_dict) == ["x1", "x2_0", "x2_1"]
+    np.testing.assert_array_equal(samples_dict["x1"], [0.5, 1.5])
+    np.testing.assert_array_equal(samples_dict["x2_1"], [0.6, 1.6])
+
+
 def test_to_list(parameters_set_1):
     """Test *to_list* method."""
     parameters_list = parameters_set_1.to_list()
@@ -0,0 +1,102 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Unit tests for the pool scheduler."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from queens.distributions import FreeVariable
+from queens.drivers.function_driver import FunctionDriver
+from queens.parameters import Parameters
+from queens.schedulers.pool_scheduler import PoolScheduler
+
+
+@pytest.fixture(name="driver")
+def fixture_driver():
+    """Function driver for the ishigami function."""
+    parameters = Parameters(x1=FreeVariable(1), x2=FreeVariable(1), x3=FreeVariable(1))
+    return FunctionDriver(parameters=parameters, function="ishigami90")
+
+
+@pytest.fixture(name="samples")
+def fixture_samples():
+    """Samples for the ishigami function."""
+    np.random.seed(42)
+    return np.random.uniform(-np.pi, np.pi, size=(6, 3))
+
+
+@pytest.mark.parametrize("num_jobs", [1, 2])
+def test_submit_and_as_completed(test_name, driver, samples, num_jobs):
+    """Test that the streamed results match the blocking evaluation."""
+    scheduler = PoolScheduler(experiment_name=test_name, num_jobs=num_jobs, verbose=False)
+    expected_result = scheduler.evaluate(samples, driver)["result"]
+
+    handle = scheduler.submit(samples, driver)
+    np.testing.assert_array_equal(handle.job_ids, np.arange(6, 12))
+
+    indices = []
+    for index, result, gradient in scheduler.as_completed(handle):
+        indices.append(index)
+        np.testing.assert_array_equal(result, expected_result[index])
+        assert gradient is None
+    assert sorted(indices) == list(range(6))
+
+
+def test_evaluate_with_memmapped_results(test_name, driver, samples):
+    """Test that results exceeding the memory limit are memory-mapped."""
+    expected_result = PoolScheduler(experiment_name=test_name, verbose=False).evaluate(
+        samples, driver
+    )["result"]
+
+    scheduler = PoolScheduler(experiment_name=test_name, verbose=False, max_result_memory_in_mb=0)
+    result = scheduler.evaluate(samples, driver)["result"]
+
+    assert isinstance(result, np.memmap)
+    np.testing.assert_array_equal(result, expected_result)
+    assert Path(result.filename).parent == scheduler.experiment_dir / "results"
+    assert Path(result.filename).name.startswith("result_jobs_0-5_")
+
+    # repeated job ids do not overwrite the results of earlier evaluations
+    scheduler.next_job_id = 0
+    scheduler.evaluate(2 * samples, driver)
+    np.testing.assert_array_equal(result, expected_result)
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_evaluate_with_pool(test_name, samples, vectorized):
+    """Test the evaluation with a pool."""
+    parameters = Parameters(x1=FreeVariable(1), x2=FreeVariable(1), x3=FreeVariable(1))
+    driver = FunctionDriver(parameters=parameters, function="ishigami90", vectorized=vectorized)
+    expected_result = PoolScheduler(experiment_name=test_name, verbose=False).evaluate(
+        samples, driver
+    )["result"]
+
+    scheduler = PoolScheduler(experiment_name=test_name, num_jobs=2, verbose=False)
+    assert scheduler.get_chunksize(len(samples)) == 1
+    for _ in range(2):
+        np.testing.assert_allclose(scheduler.evaluate(samples, driver)["result"], expected_result)
+    assert scheduler.task_duration is not None
+
+
+def test_adaptive_chunksize(test_name):
+    """Test that cheap tasks are sent in larger chunks."""
+    scheduler = PoolScheduler(experiment_name=test_name, num_jobs=2, verbose=False)
+    scheduler.task_duration = 1e-3
+    assert scheduler.get_chunksize(1000) == 100
+    assert scheduler.get_chunksize(40) == 5
+    scheduler.task_duration = 1.0
+    assert scheduler.get_chunksize(1000) == 1
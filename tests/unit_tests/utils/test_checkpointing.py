@@ -0,0 +1,329 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Unit tests for checkpointing of iterator runs."""
+
+import functools
+
+import numpy as np
+import pytest
+
+from queens.distributions import FreeVariable
+from queens.distributions.normal import NormalDistribution
+from queens.drivers.function_driver import FunctionDriver
+from queens.iterators.black_box_variational_bayes import BBVIIterator
+from queens.iterators.iterator import Iterator
+from queens.iterators.metropolis_hastings_iterator import MetropolisHastingsIterator
+from queens.iterators.reparameteriztion_based_variational_inference import RPVIIterator
+from queens.iterators.sequential_monte_carlo_iterator import SequentialMonteCarloIterator
+from queens.main import run_iterator
+from queens.models.differentiable_simulation_model_fd import DifferentiableSimulationModelFD
+from queens.models.likelihood_models.gaussian_likelihood import GaussianLikelihood
+from queens.models.simulation_model import SimulationModel
+from queens.parameters import Parameters
+from queens.schedulers.pool_scheduler import PoolScheduler
+from queens.stochastic_optimizers.adam import Adam
+from queens.utils.checkpointing import Checkpoint
+from queens.variational_distributions.mean_field_normal import MeanFieldNormalVariational
+
+EVALUATED_SAMPLES = []
+FAILING_CALL = {"call": None}
+
+
+def counting_function(x):
+    """Function that counts its evaluations and fails on request."""
+    EVALUATED_SAMPLES.append(x)
+    if len(EVALUATED_SAMPLES) == FAILING_CALL["call"]:
+        raise RuntimeError("Walltime exceeded.")
+    return x**2
+
+
+class RandomWalkIterator(Iterator):
+    """Iterator that evaluates the model for a random walk."""
+
+    def __init__(self, model, parameters, global_settings, num_steps):
+        """Initialize iterator."""
+        super().__init__(model, parameters, global_settings)
+        self.num_steps = num_steps
+        self.position = None
+        self.outputs = []
+
+    def pre_run(self):
+        """Set the initial position."""
+        np.random.seed(42)
+        self.position = np.zeros((1, 1))
+
+    def core_run(self):
+        """Walk randomly and evaluate the model."""
+        for _ in range(self.num_steps):
+            self.position = self.position + np.random.randn(1, 1)
+            self.outputs.append(self.model.evaluate(self.position)["result"].item())
+
+
+class ResumableRandomWalkIterator(RandomWalkIterator):
+    """Random walk iterator that can resume from its state."""
+
+    def __init__(self, model, parameters, global_settings, num_steps):
+        """Initialize iterator."""
+        super().__init__(model, parameters, global_settings, num_steps)
+        self.step = 0
+
+    def core_run(self):
+        """Walk randomly and evaluate the model."""
+        while self.step < self.num_steps:
+            self.checkpoint()
+            self.position = self.position + np.random.randn(1, 1)
+            self.outputs.append(self.model.evaluate(self.position)["result"].item())
+            self.step += 1
+
+
+@pytest.fixture(name="create_iterator")
+def fixture_create_iterator(global_settings):
+    """Create a random walk iterator."""
+    EVALUATED_SAMPLES.clear()
+
+    def create_iterator(iterator_class=RandomWalkIterator):
+        parameters = Parameters(x=FreeVariable(1))
+        scheduler = PoolScheduler(global_settings.experiment_name, verbose=False)
+        driver = FunctionDriver(parameters=parameters, function=counting_function)
+        model = SimulationModel(scheduler=scheduler, driver=driver)
+        return iterator_class(model, parameters, global_settings, num_steps=5)
+
+    return create_iterator
+
+
+def test_restart_replays_evaluations(create_iterator, global_settings):
+    """Test that a restart replays the evaluations before the failure."""
+    iterator = create_iterator()
+    run_iterator(iterator, global_settings, checkpoint_every=1)
+    expected_outputs = iterator.outputs
+    assert iterator.model.scheduler.next_job_id == 5
+
+    EVALUATED_SAMPLES.clear()
+    FAILING_CALL["call"] = 4
+    with pytest.raises(RuntimeError):
+        run_iterator(create_iterator(), global_settings, checkpoint_every=1)
+    FAILING_CALL["call"] = None
+
+    EVALUATED_SAMPLES.clear()
+    iterator = create_iterator()
+    run_iterator(iterator, global_settings, restart=True)
+
+    # Only the failed and the remaining evaluations are run again
+    assert len(EVALUATED_SAMPLES) == 2
+    np.testing.assert_allclose(iterator.outputs, expected_outputs)
+    assert iterator.model.scheduler.next_job_id == 5
+
+
+def test_state(create_iterator):
+    """Test getting and setting the state of an iterator."""
+    iterator = create_iterator()
+    iterator.pre_run()
+    iterator.model.scheduler.next_job_id = 3
+    state = iterator.get_state()
+    assert set(state["attributes"]) == {"num_steps", "position", "outputs"}
+    random_number = np.random.randn()
+
+    new_iterator = create_iterator()
+    new_iterator.set_state(state)
+    assert np.random.randn() == random_number
+    assert new_iterator.model.scheduler.next_job_id == 3
+    np.testing.assert_array_equal(new_iterator.position, np.zeros((1, 1)))
+
+
+def test_restart_without_checkpoint(create_iterator, global_settings):
+    """Test that a restart without checkpoint raises an error."""
+    with pytest.raises(FileNotFoundError):
+        run_iterator(create_iterator(), global_settings, restart=True)
+
+
+def test_restart_from_snapshot(create_iterator, global_settings):
+    """Test that a restart continues from the latest state snapshot."""
+    checkpoint_dir = global_settings.output_dir / "checkpoint"
+    iterator = create_iterator(ResumableRandomWalkIterator)
+    iterator.run()
+    expected_outputs = iterator.outputs
+
+    EVALUATED_SAMPLES.clear()
+    FAILING_CALL["call"] = 4
+    with pytest.raises(RuntimeError):
+        with Checkpoint(
+            create_iterator(ResumableRandomWalkIterator), checkpoint_dir, checkpoint_every=2
+        ) as checkpoint:
+            checkpoint.run()
+    FAILING_CALL["call"] = None
+    # The log only holds the evaluation after the snapshot
+    assert [path.name for path in checkpoint_dir.glob("evaluations_*.pickle")] == [
+        "evaluations_1.pickle"
+    ]
+
+    EVALUATED_SAMPLES.clear()
+    iterator = create_iterator(ResumableRandomWalkIterator)
+    with Checkpoint(iterator, checkpoint_dir, checkpoint_every=2, restart=True) as checkpoint:
+        checkpoint.run()
+
+    # The snapshot after two evaluations is restored and only the third evaluation is replayed
+    assert checkpoint.num_replayed == 1
+    assert checkpoint.num_evaluations == 5
+    assert len(EVALUATED_SAMPLES) == 2
+    np.testing.assert_allclose(iterator.outputs, expected_outputs)
+    assert iterator.model.scheduler.next_job_id == 5
+
+
+def test_submit_is_rejected(create_iterator, global_settings):
+    """Test that submissions outside of evaluations are rejected during checkpointing."""
+    iterator = create_iterator()
+    scheduler = iterator.model.scheduler
+    with Checkpoint(iterator, global_settings.output_dir / "checkpoint") as checkpoint:
+        with pytest.raises(RuntimeError):
+            scheduler.submit(np.zeros((1, 1)), iterator.model.driver)
+        assert checkpoint.num_evaluations == 0
+    assert scheduler.evaluate(np.ones((1, 1)), iterator.model.driver)["result"].item() == 1
+
+
+class ColumnLikelihood(GaussianLikelihood):
+    """Gaussian likelihood returning the log-likelihood as column vector."""
+
+    def evaluate(self, samples):
+        """Evaluate the log-likelihood as column vector."""
+        return {"result": super().evaluate(samples)["result"].reshape(-1, 1)}
+
+
+def create_likelihood_model(
+    global_settings, parameters, forward_model=SimulationModel, likelihood_class=GaussianLikelihood
+):
+    """Create a Gaussian likelihood of the counting function."""
+    scheduler = PoolScheduler(global_settings.experiment_name, verbose=False)
+    driver = FunctionDriver(parameters=parameters, function=counting_function)
+    return likelihood_class(
+        forward_model=forward_model(scheduler=scheduler, driver=driver),
+        noise_type="fixed_variance",
+        noise_value=1.0,
+        y_obs=np.array([1.0]),
+    )
+
+
+def create_metropolis_hastings(global_settings, parameters):
+    """Create a Metropolis-Hastings iterator."""
+    return MetropolisHastingsIterator(
+        model=create_likelihood_model(global_settings, parameters),
+        parameters=parameters,
+        global_settings=global_settings,
+        result_description=None,
+        proposal_distribution=NormalDistribution(mean=0.0, covariance=1.0),
+        num_samples=6,
+        num_burn_in=4,
+        seed=42,
+    )
+
+
+def create_sequential_monte_carlo(global_settings, parameters):
+    """Create a Sequential Monte Carlo iterator."""
+    return SequentialMonteCarloIterator(
+        model=create_likelihood_model(
+            global_settings, parameters, likelihood_class=ColumnLikelihood
+        ),
+        parameters=parameters,
+        global_settings=global_settings,
+        num_particles=5,
+        result_description=None,
+        seed=42,
+        temper_type="bayes",
+        mcmc_proposal_distribution=NormalDistribution(mean=0.0, covariance=1.0),
+        num_rejuvenation_steps=2,
+    )
+
+
+def create_variational_inference(global_settings, parameters, iterator_class):
+    """Create a variational inference iterator."""
+    options = {}
+    forward_model = SimulationModel
+    if iterator_class is BBVIIterator:
+        options = {
+            "control_variates_scaling_type": "averaged",
+            "loo_control_variates_scaling": False,
+        }
+    else:
+        forward_model = functools.partial(
+            DifferentiableSimulationModelFD, finite_difference_method="2-point"
+        )
+    return iterator_class(
+        model=create_likelihood_model(global_settings, parameters, forward_model),
+        parameters=parameters,
+        global_settings=global_settings,
+        result_description={"write_results": False},
+        variational_distribution=MeanFieldNormalVariational(dimension=1),
+        n_samples_per_iter=2,
+        random_seed=42,
+        max_feval=1000,
+        stochastic_optimizer=Adam(
+            optimization_type="max",
+            learning_rate=0.1,
+            rel_l1_change_threshold=-1,
+            rel_l2_change_threshold=-1,
+            max_iteration=6,
+        ),
+        variational_parameter_initialization="prior",
+        natural_gradient=False,
+        **options,
+    )
+
+
+@pytest.mark.parametrize(
+    "create_sampler,get_result",
+    [
+        pytest.param(create_metropolis_hastings, lambda iterator: iterator.chains, id="mh"),
+        pytest.param(create_sequential_monte_carlo, lambda iterator: iterator.particles, id="smc"),
+        pytest.param(
+            functools.partial(create_variational_inference, iterator_class=BBVIIterator),
+            lambda iterator: iterator.variational_params,
+            id="bbvi",
+        ),
+        pytest.param(
+            functools.partial(create_variational_inference, iterator_class=RPVIIterator),
+            lambda iterator: iterator.variational_params,
+            id="rpvi",
+        ),
+    ],
+)
+def test_iterator_restart_from_snapshot(global_settings, create_sampler, get_result):
+    """Test that iterators resume from the snapshots of their main loops."""
+    checkpoint_dir = global_settings.output_dir / "checkpoint"
+    parameters = Parameters(x=NormalDistribution(mean=0.0, covariance=1.0))
+    EVALUATED_SAMPLES.clear()
+    # not all iterators seed the random number generators themselves
+    np.random.seed(42)
+    iterator = create_sampler(global_settings, parameters)
+    iterator.run()
+    expected_result = get_result(iterator)
+    num_samples = len(EVALUATED_SAMPLES)
+
+    EVALUATED_SAMPLES.clear()
+    np.random.seed(42)
+    FAILING_CALL["call"] = num_samples * 3 // 4
+    with pytest.raises(RuntimeError):
+        with Checkpoint(create_sampler(global_settings, parameters), checkpoint_dir) as checkpoint:
+            checkpoint.run()
+    FAILING_CALL["call"] = None
+    num_evaluations = checkpoint.num_evaluations
+
+    EVALUATED_SAMPLES.clear()
+    iterator = create_sampler(global_settings, parameters)
+    with Checkpoint(iterator, checkpoint_dir, restart=True) as checkpoint:
+        checkpoint.run()
+
+    # The run resumes from a snapshot within the main loop
+    assert checkpoint.num_replayed < num_evaluations
+    assert len(EVALUATED_SAMPLES) < num_samples // 2
+    np.testing.assert_allclose(get_result(iterator), expected_result)
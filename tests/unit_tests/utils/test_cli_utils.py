@@ -18,7 +18,7 @@ from pathlib import Path
 
 import pytest
 
-from queens.utils.cli_utils import get_cli_options
+from queens.utils.cli_utils import get_checkpoint_cli_options, get_cli_options
 from queens.utils.exceptions import CLIError
 
 
@@ -58,3 +58,14 @@ def test_get_cli_options_debug(debug_flag):
     assert input_file == Path("input_file")
     assert output_dir == Path("output_dir")
     assert debug == debug_flag
+
+
+def test_get_checkpoint_cli_options():
+    """Test if checkpoint options are read in correctly."""
+    args = ["--input", "input_file", "--output_dir", "output_dir"]
+    assert not get_checkpoint_cli_options(args)
+    assert get_cli_options(args + ["--restart", "--checkpoint_every", "5"])[2] is False
+    assert get_checkpoint_cli_options(args + ["--restart", "--checkpoint_every", "5"]) == {
+        "restart": True,
+        "checkpoint_every": 5,
+    }
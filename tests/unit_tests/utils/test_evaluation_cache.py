@@ -0,0 +1,154 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Unit tests for the evaluation cache."""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from queens.distributions import FreeVariable
+from queens.drivers.function_driver import FunctionDriver
+from queens.models.simulation_model import SimulationModel
+from queens.parameters import Parameters
+from queens.schedulers.pool_scheduler import PoolScheduler
+from queens.utils.evaluation_cache import EvaluationCache, fingerprint_object
+
+FINGERPRINT_SCRIPT = """
+import sqlite3
+import sys
+import tarfile
+import threading
+
+from queens.distributions import FreeVariable
+from queens.drivers.function_driver import FunctionDriver
+from queens.parameters import Parameters
+from queens.utils.evaluation_cache import fingerprint_object
+
+driver = FunctionDriver(parameters=Parameters(x1=FreeVariable(1)), function="ishigami90")
+driver.lock = threading.Lock()
+driver.connection = sqlite3.connect(":memory:")
+driver.archive = tarfile.open(sys.argv[1], "w")
+driver.thread = threading.Thread(target=print)
+driver.callback = object()
+print(fingerprint_object(driver))
+"""
+
+
+def quadratic(x1, x2):
+    """Quadratic test function."""
+    return x1**2 + x2
+
+
+def linear(x1, x2):
+    """Linear test function."""
+    return x1 + x2
+
+
+@pytest.fixture(name="parameters")
+def fixture_parameters():
+    """Parameters of the test functions."""
+    return Parameters(x1=FreeVariable(1), x2=FreeVariable(1))
+
+
+@pytest.fixture(name="scheduler")
+def fixture_scheduler(test_name, mocker):
+    """Pool scheduler with a spy on its evaluate method."""
+    scheduler = PoolScheduler(experiment_name=test_name, num_jobs=1, verbose=False)
+    mocker.spy(scheduler, "evaluate")
+    return scheduler
+
+
+@pytest.fixture(name="samples")
+def fixture_samples():
+    """Samples including a duplicate."""
+    return np.array([[1.0, 2.0], [3.0, 4.0], [1.0, 2.0], [5.0, 6.0]])
+
+
+def test_repeated_samples_are_served_from_cache(tmp_path, parameters, scheduler, samples):
+    """Test that only unseen samples are submitted to the scheduler."""
+    driver = FunctionDriver(parameters=parameters, function=quadratic)
+    model = SimulationModel(
+        scheduler=scheduler,
+        driver=driver,
+        evaluation_cache=EvaluationCache(cache_dir=tmp_path / "cache"),
+    )
+    expected_result = (samples[:, 0] ** 2 + samples[:, 1]).reshape(-1, 1)
+
+    response = model.evaluate(samples)
+    np.testing.assert_array_equal(response["result"], expected_result)
+    np.testing.assert_array_equal(
+        scheduler.evaluate.call_args.args[0], samples[[0, 1, 3]], strict=True
+    )
+
+    response = model.evaluate(samples[::-1])
+    np.testing.assert_array_equal(response["result"], expected_result[::-1])
+    assert scheduler.evaluate.call_count == 1
+    assert model.evaluation_cache.num_hits == 5
+    assert model.evaluation_cache.num_misses == 3
+
+
+def test_cache_persists_across_instances(tmp_path, parameters, scheduler, samples):
+    """Test that a restarted experiment reuses the stored entries."""
+    driver = FunctionDriver(parameters=parameters, function=quadratic)
+    EvaluationCache(cache_dir=tmp_path).evaluate(samples, scheduler, driver)
+
+    evaluation_cache = EvaluationCache(cache_dir=tmp_path)
+    evaluation_cache.evaluate(samples, scheduler, driver)
+    assert scheduler.evaluate.call_count == 1
+    assert evaluation_cache.num_misses == 0
+
+
+def test_driver_fingerprint_separates_entries(tmp_path, parameters, scheduler, samples):
+    """Test that entries of different drivers are not mixed."""
+    quadratic_driver = FunctionDriver(parameters=parameters, function=quadratic)
+    linear_driver = FunctionDriver(parameters=parameters, function=linear)
+    assert fingerprint_object(quadratic_driver) != fingerprint_object(linear_driver)
+    assert fingerprint_object(quadratic_driver) == fingerprint_object(
+        FunctionDriver(parameters=parameters, function=quadratic)
+    )
+
+    evaluation_cache = EvaluationCache(cache_dir=tmp_path)
+    evaluation_cache.evaluate(samples, scheduler, quadratic_driver)
+    response = evaluation_cache.evaluate(samples, scheduler, linear_driver)
+    np.testing.assert_array_equal(response["result"], samples.sum(axis=1, keepdims=True))
+    assert scheduler.evaluate.call_count == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, parameters, scheduler, samples):
+    """Test the size-bounded eviction."""
+    driver = FunctionDriver(parameters=parameters, function=quadratic)
+    evaluation_cache = EvaluationCache(cache_dir=tmp_path, max_size_in_mb=1e-9)
+    evaluation_cache.evaluate(samples, scheduler, driver)
+    evaluation_cache.evaluate(samples, scheduler, driver)
+    assert scheduler.evaluate.call_count == 2
+    assert not list((tmp_path / "blobs").rglob("*.npz"))
+
+
+def test_fingerprint_is_the_same_in_new_processes(tmp_path):
+    """Test that runtime handles do not change the fingerprint between processes."""
+
+    def fingerprint_in_new_process(process_id):
+        return subprocess.run(
+            [sys.executable, "-c", FINGERPRINT_SCRIPT, str(tmp_path / f"{process_id}.tar")],
+            capture_output=True,
+            check=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        ).stdout
+
+    assert fingerprint_in_new_process(0) == fingerprint_in_new_process(1)
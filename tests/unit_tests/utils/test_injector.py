@@ -14,10 +14,19 @@
 #
 """Test injector util."""
 
+import pickle
+
+import numpy as np
 import pytest
+from jinja2 import Environment, StrictUndefined
 from jinja2.exceptions import UndefinedError
 
-from queens.utils.injector import render_template
+from queens.utils.injector import (
+    InjectionTemplate,
+    TemplateCache,
+    render_template,
+    split_at_placeholders,
+)
 
 
 @pytest.mark.parametrize(
@@ -49,3 +58,61 @@ def test_injection_strict_is_false(injection_parameters, expected_result):
 
     obtained_output = render_template(injection_parameters, template, strict=False)
     assert obtained_output == expected_result
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "{{ parameter_1 }}",
+        "a {{parameter_1}} b\n{{ parameter_2 }}\n",
+        "ä {{ parameter_1 }}\r\nb {{ parameter_1 }}\n\n",
+        "{{ parameter_1 | round(1) }} {{ parameter_2 }}",
+        "{% for i in range(2) %}{{ parameter_1 }}{% endfor %}",
+        "{{ true }} {# comment #} {{ parameter_2 }}",
+    ],
+)
+def test_injection_template_matches_jinja(template, tmp_path):
+    """Test that spliced and compiled templates render like jinja."""
+    params = {"parameter_1": 1.25, "parameter_2": np.float64(2.5)}
+    expected_result = Environment(undefined=StrictUndefined).from_string(template).render(**params)
+
+    injection_template = InjectionTemplate(template)
+    assert injection_template.render(params) == expected_result
+
+    output_file = tmp_path / "output.txt"
+    injection_template.write(params, output_file)
+    assert output_file.read_bytes() == expected_result.encode("utf-8")
+
+
+def test_split_at_placeholders():
+    """Test splitting of simple and other templates."""
+    assert split_at_placeholders("a {{ x }} b {{y}}") == (["a ", " b ", ""], ["x", "y"])
+    assert split_at_placeholders("a {{ x.y }}") == (None, None)
+    assert split_at_placeholders("{{ none }}") == (None, None)
+
+
+def test_spliced_strict_injection(tmp_path):
+    """Test that missing parameters raise an error and do not leave a file behind."""
+    output_file = tmp_path / "output.txt"
+    with pytest.raises(UndefinedError):
+        InjectionTemplate("{{ parameter_1 }} {{ parameter_2 }}").write(
+            {"parameter_1": 1}, output_file
+        )
+    assert not output_file.exists()
+
+
+def test_template_cache(tmp_path):
+    """Test that templates are compiled once and recompiled after changes."""
+    template_path = tmp_path / "template.txt"
+    template_path.write_text("{{ parameter_1 }}")
+    template_cache = TemplateCache()
+
+    template = template_cache.from_file(template_path)
+    assert template_cache.from_file(template_path) is template
+    assert template.render({"parameter_1": 1}) == "1"
+
+    template_path.write_text("new {{ parameter_1 }}")
+    assert template_cache.from_file(template_path).render({"parameter_1": 1}) == "new 1"
+
+    unpickled_cache = pickle.loads(pickle.dumps(template_cache))
+    assert unpickled_cache.from_file(template_path) is not template
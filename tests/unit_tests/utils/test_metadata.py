@@ -0,0 +1,71 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Unit tests for the metadata utils."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from queens.utils import metadata
+from queens.utils.metadata import MetadataStore, SimulationMetadata, write_metadata_to_csv
+
+
+@pytest.fixture(name="simulation_metadata")
+def fixture_simulation_metadata(tmp_path):
+    """Metadata of a finished job."""
+    simulation_metadata = SimulationMetadata(
+        job_id=3, inputs={"x1": np.float64(0.5)}, job_dir=tmp_path, export_yaml=False
+    )
+    with simulation_metadata.time_code("run_jobscript"):
+        simulation_metadata.outputs = (np.array([1.0, 2.0]), None)
+    return simulation_metadata
+
+
+def test_optional_yaml_export(simulation_metadata, tmp_path):
+    """Test that no yaml file is written if disabled."""
+    assert simulation_metadata.file_path is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_metadata_store(simulation_metadata, tmp_path, mocker):
+    """Test appending to and reading from the metadata store."""
+    store = MetadataStore(tmp_path)
+    store.append([simulation_metadata.to_record()])
+    store.append([{"job_id": 1, "inputs.x1": 0.1, "times.new_section.time": 2.0}])
+
+    # Simulate a worker on a second host
+    mocker.patch.object(metadata.socket, "gethostname", return_value="other_host")
+    store.append([{"job_id": 2, "inputs.x1": 0.2}])
+
+    assert len(store.databases()) == 2
+    dataframe = store.to_dataframe()
+    assert dataframe["job_id"].tolist() == [1, 2, 3]
+    np.testing.assert_allclose(dataframe["inputs.x1"], [0.1, 0.2, 0.5])
+    assert dataframe["times.run_jobscript.status"].iloc[2] == "successful"
+    assert json.loads(dataframe["outputs"].iloc[2]) == [[1.0, 2.0], None]
+    assert dataframe["times.new_section.time"].iloc[0] == 2.0
+
+
+def test_write_metadata_to_csv_from_store(simulation_metadata, tmp_path):
+    """Test that the csv is written from the metadata store."""
+    MetadataStore(tmp_path).append([simulation_metadata.to_record()])
+    csv_path = tmp_path / "metadata.csv"
+    write_metadata_to_csv(tmp_path, csv_path)
+
+    dataframe = pd.read_csv(csv_path, index_col=0)
+    assert dataframe["job_id"].tolist() == [3]
+    assert dataframe["inputs.x1"].tolist() == [0.5]
@@ -0,0 +1,54 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Unit tests for the pool utils."""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from queens.utils import pool_utils
+from queens.utils.pool_utils import SharedArray, SharedObject
+
+
+def test_shared_object_is_loaded_once(mocker):
+    """Test that a shared object is deserialized only once per process."""
+    mocker.patch.object(pool_utils, "_LOADED_OBJECTS", pool_utils.OrderedDict())
+    shared_object = SharedObject({"a": np.arange(3)})
+    sent_object = pickle.loads(pickle.dumps(shared_object))
+
+    spy = mocker.spy(pool_utils.dill, "loads")
+    first = sent_object.load()
+    second = sent_object.load()
+
+    assert spy.call_count == 1
+    assert first is second
+    np.testing.assert_array_equal(first["a"], np.arange(3))
+    shared_object.close()
+
+
+def test_shared_array_read():
+    """Test reading rows of a shared array."""
+    array = np.arange(12, dtype=np.float32).reshape(4, 3)
+    shared_array = SharedArray(array)
+    sent_array = pickle.loads(pickle.dumps(shared_array))
+
+    np.testing.assert_array_equal(sent_array.read(1), array[1])
+    np.testing.assert_array_equal(sent_array.read(slice(2, 4)), array[2:4])
+    assert sent_array.read(0).dtype == np.float32
+    shared_array.close()
+
+    with pytest.raises(TypeError):
+        SharedArray(np.array([None, 1]))
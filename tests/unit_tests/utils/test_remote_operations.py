@@ -0,0 +1,169 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Unit tests for remote operations."""
+
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from queens.utils.path_utils import PATH_TO_QUEENS
+from queens.utils.remote_operations import (
+    RemoteConnection,
+    _list_repository_files,
+    get_port,
+)
+
+
+@pytest.fixture(name="server_processes")
+def fixture_server_processes():
+    """Function server processes started by the tests."""
+    processes = []
+    yield processes
+    for process in processes:
+        process.kill()
+        process.wait()
+
+
+@pytest.fixture(name="remote_connection")
+def fixture_remote_connection(mocker, server_processes):
+    """Connection whose remote host is the local host."""
+    remote_connection = RemoteConnection(
+        host="localhost",
+        remote_python=sys.executable,
+        remote_queens_repository=PATH_TO_QUEENS,
+        use_function_server=True,
+    )
+
+    def exec_command(command):
+        """Run the command locally with the stream types of a paramiko channel."""
+        process = subprocess.Popen(  # pylint: disable=consider-using-with
+            ["bash", "-c", command],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=PATH_TO_QUEENS,
+        )
+        server_processes.append(process)
+        stdin = io.TextIOWrapper(process.stdin, write_through=True)
+        return stdin, io.TextIOWrapper(process.stdout), process.stderr
+
+    remote_connection.client = mocker.Mock()
+    remote_connection.client.exec_command.side_effect = exec_command
+    mocker.patch.object(
+        remote_connection,
+        "open_port_forwarding",
+        side_effect=lambda remote_port, target_host: (remote_port, remote_port),
+    )
+    mocker.patch.object(remote_connection, "close_port_forwarding")
+    return remote_connection
+
+
+def test_run_function_on_function_server(mocker, remote_connection, server_processes):
+    """Test that functions are run in one long-lived remote process."""
+    assert isinstance(remote_connection.run_function(get_port), int)
+
+    first_pid, args = remote_connection.run_function(lambda *args, **kwargs: (os.getpid(), args), 1)
+    second_pid, _ = remote_connection.run_function(lambda: (os.getpid(), None))
+    assert args == (1,)
+    assert first_pid == second_pid == server_processes[0].pid
+    remote_connection.client.exec_command.assert_called_once()
+    remote_connection.open_port_forwarding.assert_called_once_with(
+        remote_port=mocker.ANY, target_host="localhost"
+    )
+
+    with pytest.raises(RuntimeError, match="ZeroDivisionError"):
+        remote_connection.run_function(lambda: 1 / 0)
+    assert remote_connection.run_function(lambda x, y: x + y, 1, y=2) == 3
+
+    remote_connection.close()
+    assert server_processes[0].wait(timeout=10) == 0
+
+
+def test_restart_function_server_after_lost_connection(mocker, remote_connection, server_processes):
+    """Test that a lost function server is cleaned up before a new one is started."""
+    remote_connection.run_function(get_port)
+    server_processes[0].kill()
+    server_processes[0].wait()
+
+    with pytest.raises(RuntimeError, match="Lost the connection"):
+        remote_connection.run_function(get_port)
+    assert server_processes[0].stdin.closed
+    remote_connection.close_port_forwarding.assert_called_once_with(
+        mocker.ANY, mocker.ANY, target_host="localhost"
+    )
+
+    assert remote_connection.run_function(os.getpid) == server_processes[1].pid
+    remote_connection.close()
+    assert server_processes[1].wait(timeout=10) == 0
+    assert remote_connection.close_port_forwarding.call_count == 2
+
+
+def test_open_port_forwarding_to_target_host(mocker):
+    """Test that the remote host forwards to the target host."""
+    remote_connection = RemoteConnection(
+        host="host", remote_python="python", remote_queens_repository="queens", user="user"
+    )
+    mp_start_subprocess = mocker.patch("queens.utils.remote_operations.start_subprocess")
+    mocker.patch("queens.utils.remote_operations.atexit.register")
+
+    remote_connection.open_port_forwarding(local_port=1, remote_port=2)
+    assert "-L 1:host:2 user@host" in mp_start_subprocess.call_args.args[0]
+    remote_connection.open_port_forwarding(local_port=1, remote_port=2, target_host="localhost")
+    assert "-L 1:localhost:2 user@host" in mp_start_subprocess.call_args.args[0]
+
+
+def test_sync_to_remote(mocker, tmp_path):
+    """Test that unchanged files are not copied to remote again."""
+    remote_connection = RemoteConnection(
+        host="host", remote_python="python", remote_queens_repository="queens", user="user"
+    )
+    mocker.patch.object(remote_connection, "run", return_value=mocker.Mock(ok=False))
+    mp_put = mocker.patch.object(remote_connection, "put")
+    mp_rsync_files = mocker.patch("queens.utils.remote_operations.rsync_files")
+    source_file = tmp_path / "input_file"
+    source_file.write_text("input")
+
+    remote_connection.sync_to_remote(source_file, "experiment_dir")
+    remote_connection.sync_to_remote([source_file], "experiment_dir")
+    mp_rsync_files.assert_called_once_with(
+        {"input_file": tmp_path}, "experiment_dir", rsh=None, host="user@host"
+    )
+    remote_connection.run.assert_called_once()
+    mp_put.assert_called_once()
+
+    source_file.write_text("changed input")
+    remote_connection.sync_to_remote(source_file, "experiment_dir")
+    assert mp_rsync_files.call_count == 2
+
+    # the same content under another name and in another destination is linked remotely
+    (tmp_path / "renamed_file").write_text("changed input")
+    remote_connection.sync_to_remote(tmp_path / "renamed_file", "other_experiment_dir")
+    assert mp_rsync_files.call_count == 2
+    assert remote_connection.run.call_args.args[0] == (
+        "mkdir -p $(dirname other_experiment_dir/renamed_file) && "
+        "(ln -f experiment_dir/input_file other_experiment_dir/renamed_file 2>/dev/null || "
+        "cp -p experiment_dir/input_file other_experiment_dir/renamed_file)"
+    )
+
+
+def test_list_repository_files():
+    """Test that the repository files exclude git internals and ignored files."""
+    files = _list_repository_files(PATH_TO_QUEENS)
+    assert "queens/utils/remote_operations.py" in files
+    assert not any(relative_path.startswith(".git/") for relative_path in files)
+    assert not any("__pycache__" in relative_path for relative_path in files)
@@ -0,0 +1,93 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Unit tests for the result assembler."""
+
+import numpy as np
+import pytest
+
+from queens.utils.result_assembler import ResultAssembler
+
+
+def test_assembly_out_of_order():
+    """Test that rows are written in place and the dtype is preserved."""
+    result_assembler = ResultAssembler(3)
+    for index in [2, 0, 1]:
+        result_assembler.add(
+            index, np.full(2, index, dtype=np.float32), np.full((2, 3), index, dtype=np.float32)
+        )
+    result_dict = result_assembler.to_dict()
+
+    assert result_dict["result"].dtype == np.float32
+    np.testing.assert_array_equal(result_dict["result"], [[0, 0], [1, 1], [2, 2]])
+    assert result_dict["gradient"].shape == (3, 2, 3)
+    np.testing.assert_array_equal(result_dict["gradient"][:, 0, 0], [0, 1, 2])
+
+
+def test_assembly_without_gradients():
+    """Test the assembly of results without gradients."""
+    result_assembler = ResultAssembler(2, squeeze=True)
+    result_assembler.add(0, np.array([[1.0]]))
+    result_assembler.add(1, 2)
+    result_dict = result_assembler.to_dict()
+
+    np.testing.assert_array_equal(result_dict["result"], [[1.0], [2.0]])
+    np.testing.assert_array_equal(result_dict["gradient"], [None, None])
+
+
+def test_dtype_promotion():
+    """Test that the dtype is promoted if necessary."""
+    result_assembler = ResultAssembler(2)
+    result_assembler.add(0, np.array([1], dtype=np.int64))
+    result_assembler.add(1, np.array([1.5]))
+
+    result = result_assembler.to_dict()["result"]
+    assert result.dtype == np.float64
+    np.testing.assert_array_equal(result, [[1.0], [1.5]])
+
+
+def test_inconsistent_shapes():
+    """Test that results with inconsistent shapes raise an error."""
+    result_assembler = ResultAssembler(2)
+    result_assembler.add(0, np.ones(2))
+    with pytest.raises(ValueError, match="shape"):
+        result_assembler.add(1, np.ones(3))
+
+
+def test_memmap(tmp_path):
+    """Test that large results are memory-mapped."""
+    result_assembler = ResultAssembler(
+        4, memmap_dir=tmp_path, memmap_name="_jobs_0-3", max_memory_in_mb=0
+    )
+    for index in range(4):
+        result_assembler.add(index, np.full(5, index))
+    result = result_assembler.to_dict()["result"]
+
+    assert isinstance(result, np.memmap)
+    result.flush()
+    np.testing.assert_array_equal(np.load(tmp_path / "result_jobs_0-3.npy"), result)
+
+
+def test_memmap_dtype_promotion(tmp_path):
+    """Test that a promoted memory-mapped array stays memory-mapped."""
+    result_assembler = ResultAssembler(
+        2, memmap_dir=tmp_path, memmap_name="_jobs_0-1", max_memory_in_mb=0
+    )
+    result_assembler.add(0, np.array([1], dtype=np.int64))
+    result_assembler.add(1, np.array([1.5]))
+    result = result_assembler.to_dict()["result"]
+
+    assert isinstance(result, np.memmap)
+    np.testing.assert_array_equal(result, [[1.0], [1.5]])
+    assert [path.name for path in tmp_path.iterdir()] == ["result_jobs_0-1_float64.npy"]
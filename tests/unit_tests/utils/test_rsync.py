@@ -15,10 +15,19 @@
 """Test copying with rsync."""
 
 import filecmp
+import shlex
+import shutil
+from pathlib import Path
 
 import pytest
 
-from queens.utils.rsync import rsync
+from queens.utils.rsync import (
+    MANIFEST_FILE_NAME,
+    PARALLEL_TRANSFER_MIN_FILES,
+    list_source_files,
+    rsync,
+    sync_with_manifest,
+)
 
 
 @pytest.fixture(name="files_to_copy")
@@ -75,3 +84,91 @@ def test_directory(_create_source_files, source_path, destination_path, files_to
     assert len(match) == len(files_to_copy)  # all files are copied
     assert not mismatch  # no mismatches
     assert not errors  # no errors
+
+
+@pytest.fixture(name="rsync_commands")
+def fixture_rsync_commands(mocker, monkeypatch):
+    """Run rsync commands with file lists as local copies and record the copied files."""
+    monkeypatch.setattr("queens.utils.rsync._SYNCED_FILES", {})
+    copied_files = []
+
+    def run_subprocess(command):
+        *options, source, destination = shlex.split(command)
+        file_list = next(option for option in options if option.startswith("--files-from="))
+        relative_paths = Path(file_list.split("=", 1)[1]).read_text(encoding="utf-8").split("\0")
+        copied_files.append(relative_paths)
+        for relative_path in relative_paths:
+            (Path(destination) / relative_path).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(Path(source) / relative_path, Path(destination) / relative_path)
+        return 0, 0, "", ""
+
+    mocker.patch("queens.utils.rsync.run_subprocess", side_effect=run_subprocess)
+    return copied_files
+
+
+def test_list_source_files(_create_source_files, source_path, files_to_copy):
+    """Test that the files are listed relative to the destination as rsync copies them."""
+    (source_path / "ignored").mkdir()
+    (source_path / "ignored" / "fileC").write_text("fileC")
+    assert list_source_files(source_path, exclude="ignored") == {
+        f"source/{file}": source_path.parent for file in files_to_copy
+    }
+    assert list_source_files(f"{source_path}/", exclude="ignored") == {
+        file: source_path for file in files_to_copy
+    }
+    assert list_source_files(source_path / files_to_copy[0]) == {files_to_copy[0]: source_path}
+
+
+def test_sync_with_manifest(
+    rsync_commands, _create_source_files, source_path, destination_path, files_to_copy, tmp_path
+):
+    """Test that only changed files are copied."""
+    other_destination_path = tmp_path / "other_destination"
+    sync_with_manifest(source_path, destination_path)
+    assert rsync_commands == [[f"source/{file}" for file in files_to_copy]]
+    assert (destination_path / MANIFEST_FILE_NAME).is_file()
+    match, _, _ = filecmp.cmpfiles(
+        destination_path / source_path.name, source_path, common=files_to_copy
+    )
+    assert len(match) == len(files_to_copy)
+
+    # nothing changed
+    sync_with_manifest(source_path, destination_path)
+    assert len(rsync_commands) == 1
+
+    # changed in the source or removed from the destination
+    (source_path / files_to_copy[0]).write_text("changed")
+    (destination_path / "source" / files_to_copy[1]).unlink()
+    sync_with_manifest(source_path, destination_path)
+    assert sorted(rsync_commands[1]) == [f"source/{file}" for file in files_to_copy]
+    assert (destination_path / "source" / files_to_copy[0]).read_text() == "changed"
+
+    # files shared with another sync are linked from the synced files
+    sync_with_manifest(source_path / files_to_copy[0], destination_path)
+    sync_with_manifest(source_path / files_to_copy[0], destination_path)
+    sync_with_manifest(source_path / files_to_copy[0], other_destination_path)
+    assert len(rsync_commands) == 2
+    for path in [destination_path, other_destination_path]:
+        assert (path / files_to_copy[0]).samefile(destination_path / "source" / files_to_copy[0])
+    assert (other_destination_path / MANIFEST_FILE_NAME).is_file()
+
+
+def test_sync_with_manifest_of_identical_files(rsync_commands, source_path, destination_path):
+    """Test that identical files of a sync are transferred once."""
+    for file in ["fileA", "fileB"]:
+        (source_path / file).write_text("identical")
+    sync_with_manifest(f"{source_path}/", destination_path)
+    assert rsync_commands == [["fileA"]]
+    assert (destination_path / "fileB").read_text() == "identical"
+
+
+def test_sync_with_manifest_in_parallel(rsync_commands, source_path, destination_path):
+    """Test that large file sets are copied by parallel transfers."""
+    files = [f"file_{i}" for i in range(PARALLEL_TRANSFER_MIN_FILES)]
+    for i, file in enumerate(files):
+        (source_path / file).write_text(file * i)
+    sync_with_manifest(f"{source_path}/", destination_path)
+    assert len(rsync_commands) > 1
+    assert sorted(file for copied_files in rsync_commands for file in copied_files) == sorted(files)
+    match, _, _ = filecmp.cmpfiles(destination_path, source_path, common=files)
+    assert len(match) == len(files)
@@ -0,0 +1,166 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Unit tests for the subprocess utils."""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from queens.utils.run_subprocess import (
+    run_subprocess_with_logging,
+    run_subprocess_with_logging_async,
+)
+
+
+def test_run_subprocess_with_logging_async(tmp_path):
+    """Test that concurrent subprocesses are logged to their own files."""
+
+    async def run_subprocesses():
+        return await asyncio.gather(
+            *(
+                run_subprocess_with_logging_async(
+                    f"sleep 0.5; echo output_{i}; echo error_{i} >&2",
+                    terminate_expression=None,
+                    logger_name=f"test_run_subprocess_with_logging_async_{i}",
+                    log_file=tmp_path / f"{i}.log",
+                    error_file=tmp_path / f"{i}.err",
+                    raise_error_on_subprocess_failure=False,
+                )
+                for i in range(4)
+            )
+        )
+
+    start_time = time.perf_counter()
+    outputs = asyncio.run(run_subprocesses())
+    assert time.perf_counter() - start_time < 2.0
+
+    for i, (returncode, _, _, stderr) in enumerate(outputs):
+        assert returncode == 0
+        assert stderr.strip() == f"error_{i}"
+        assert f"output_{i}" in (tmp_path / f"{i}.log").read_text()
+        assert f"error_{i}" in (tmp_path / f"{i}.err").read_text()
+
+
+def test_terminate_expression_async(tmp_path):
+    """Test that a subprocess is terminated on the terminate expression."""
+    start_time = time.perf_counter()
+    returncode, _, _, _ = asyncio.run(
+        run_subprocess_with_logging_async(
+            "echo 'PROC 1 ERROR'; sleep 30",
+            terminate_expression="PROC.*ERROR",
+            logger_name="test_terminate_expression_async",
+            log_file=tmp_path / "log",
+            error_file=tmp_path / "err",
+        )
+    )
+    assert returncode != 0
+    assert time.perf_counter() - start_time < 10
+    assert "terminated by QUEENS" in (tmp_path / "log").read_text()
+
+
+def test_long_lines_async(tmp_path):
+    """Test that lines longer than the stream limit are logged without blocking the pipe."""
+    command = (
+        "python -c \"import sys; sys.stdout.write('x' * 2**21 + chr(10)); "
+        "sys.stdout.write(('line' + chr(10)) * 2**16); sys.stdout.write('last line')\""
+    )
+    returncode, _, _, _ = asyncio.run(
+        asyncio.wait_for(
+            run_subprocess_with_logging_async(
+                command,
+                terminate_expression="ERROR",
+                logger_name="test_long_lines_async",
+                log_file=tmp_path / "log",
+                error_file=tmp_path / "err",
+                full_log_formatting=False,
+            ),
+            timeout=60,
+        )
+    )
+    assert returncode == 0
+    lines = (tmp_path / "log").read_text().splitlines()
+    assert "x" * 2**21 in lines
+    assert lines.count("line") == 2**16
+    assert "last line" in lines
+
+
+class ListHandler(logging.Handler):
+    """Handler collecting log messages."""
+
+    def __init__(self):
+        """Initialize the handler."""
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        """Collect a message."""
+        self.messages.append(record.getMessage())
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_chunked_logging(tmp_path, asynchronous):
+    """Test that the output is streamed to the log file in chunks."""
+    logger_name = f"test_chunked_logging_{asynchronous}"
+    handler = ListHandler()
+    logging.getLogger(logger_name).addHandler(handler)
+
+    subprocess_kwargs = {
+        "command": "seq 100000; echo error >&2",
+        "terminate_expression": "PROC.*ERROR",
+        "logger_name": logger_name,
+        "log_file": tmp_path / "log",
+        "error_file": tmp_path / "err",
+        "raise_error_on_subprocess_failure": False,
+        "log_chunk_size": 4096,
+        "forwarded_lines_per_second": 0,
+    }
+    if asynchronous:
+        returncode, _, _, stderr = asyncio.run(
+            run_subprocess_with_logging_async(**subprocess_kwargs)
+        )
+    else:
+        returncode, _, _, stderr = run_subprocess_with_logging(**subprocess_kwargs)
+    logging.getLogger(logger_name).removeHandler(handler)
+
+    assert returncode == 0
+    assert stderr.strip() == "error"
+    log_lines = (tmp_path / "log").read_text().splitlines()
+    assert log_lines[2:100002] == [str(i) for i in range(1, 100001)]
+    assert log_lines[100002].endswith("subprocess exited with code 0.")
+    assert "error" in (tmp_path / "err").read_text()
+    assert not any(message.isdigit() for message in handler.messages)
+
+
+def test_chunked_logging_terminate_expression(tmp_path):
+    """Test the terminate expression split between chunks and the forwarded lines."""
+    handler = ListHandler()
+    logging.getLogger("test_chunked_logging_terminate_expression").addHandler(handler)
+    returncode, _, _, _ = run_subprocess_with_logging(
+        "echo start; echo 'PROC 1 ERROR'; exec sleep 30",
+        terminate_expression="PROC.*ERROR",
+        logger_name="test_chunked_logging_terminate_expression",
+        log_file=tmp_path / "log",
+        error_file=tmp_path / "err",
+        log_chunk_size=4,
+    )
+    logging.getLogger("test_chunked_logging_terminate_expression").removeHandler(handler)
+
+    assert returncode != 0
+    assert "PROC 1 ERROR" in (tmp_path / "err").read_text()
+    assert "terminated by QUEENS" in (tmp_path / "log").read_text()
+    assert "start" in handler.messages
+    assert (tmp_path / "log").read_text().splitlines().count("start") == 1
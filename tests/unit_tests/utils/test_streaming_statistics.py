@@ -0,0 +1,129 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Unit tests for the streaming statistics."""
+
+import numpy as np
+import pytest
+
+from queens.utils.process_outputs import process_streaming_statistics
+from queens.utils.streaming_statistics import (
+    HistogramAccumulator,
+    MomentAccumulator,
+    StreamingStatistics,
+)
+
+
+@pytest.fixture(name="samples")
+def fixture_samples():
+    """Samples with a multi-dimensional output."""
+    return np.random.default_rng(42).normal(1.0, 2.0, size=(1000, 3, 4))
+
+
+def test_moments_chunked(samples):
+    """Test that chunked moments equal the moments of all samples."""
+    moments = MomentAccumulator(compute_cov=True)
+    for chunk in np.array_split(samples, 7):
+        moments.update(chunk)
+
+    assert moments.num_samples == 1000
+    np.testing.assert_allclose(moments.mean, np.mean(samples, axis=0))
+    np.testing.assert_allclose(moments.var, np.var(samples, ddof=1, axis=0))
+    np.testing.assert_allclose(
+        moments.cov, np.stack([np.cov(samples[:, i], rowvar=False) for i in range(3)])
+    )
+    np.testing.assert_allclose(moments.minimum, np.min(samples, axis=0))
+    np.testing.assert_allclose(moments.maximum, np.max(samples, axis=0))
+    np.testing.assert_allclose(moments.standard_error, np.sqrt(moments.var / 1000))
+
+
+def test_moments_merge(samples):
+    """Test that merged accumulators equal a single accumulator."""
+    first = MomentAccumulator().update(samples[:300])
+    second = MomentAccumulator().update(samples[300:])
+    merged = MomentAccumulator().merge(first).merge(second)
+
+    reference = MomentAccumulator().update(samples)
+    assert merged.num_samples == reference.num_samples
+    np.testing.assert_allclose(merged.mean, reference.mean)
+    np.testing.assert_allclose(merged.var, reference.var)
+    with pytest.raises(ValueError):
+        _ = merged.cov
+
+
+def test_histogram():
+    """Test the pdf, cdf and icdf of the histogram."""
+    histogram = HistogramAccumulator(num_bins=4, interval=[0.0, 4.0])
+    histogram.update(np.array([0.5, 1.5, 1.5, 3.5]))
+    histogram.merge(HistogramAccumulator(num_bins=4, interval=[0.0, 4.0]).update(np.array([2.5])))
+
+    assert histogram.num_values == 5
+    np.testing.assert_allclose(histogram.pdf(np.array([-0.5, 0.5, 1.5, 4.5])), [0, 0.2, 0.4, 0])
+    np.testing.assert_allclose(histogram.cdf(np.array([-2.0, 0.0, 2.0, 6.0])), [0, 0, 0.6, 1])
+    np.testing.assert_allclose(histogram.icdf(np.array([20, 60])), [1.0, 2.0], atol=1e-12)
+
+
+def test_histogram_grows():
+    """Test that values outside of the bins coarsen the histogram without losing counts."""
+    histogram = HistogramAccumulator(num_bins=4, interval=[0.0, 4.0])
+    histogram.update(np.array([0.5, 1.5, 1.5, 3.5]))
+    histogram.update(np.array([-1.0, 5.0]))
+
+    np.testing.assert_array_equal(histogram.bin_edges, [-4.0, 0.0, 4.0, 8.0, 12.0])
+    np.testing.assert_array_equal(histogram.counts, [1, 4, 1, 0])
+
+    other = HistogramAccumulator(num_bins=4, interval=[10.0, 12.0]).update(np.array([10.5]))
+    histogram.merge(other)
+    assert histogram.num_values == 7
+    assert histogram.upper_bound >= 10.5
+
+
+@pytest.mark.parametrize("first_chunk", [np.ones((10, 1)), np.linspace(-0.1, 0.1, 10)[:, None]])
+def test_small_first_chunk(first_chunk):
+    """Test that the quantiles do not depend on the range of the first chunk."""
+    samples = np.random.default_rng(1).normal(size=(100000, 1))
+    statistics = StreamingStatistics().update(first_chunk)
+    for chunk in np.array_split(samples, 10):
+        statistics.update(chunk)
+
+    np.testing.assert_allclose(
+        statistics.histogram.icdf(np.array([1, 50, 99])),
+        np.percentile(np.concatenate([first_chunk, samples]), [1, 50, 99]),
+        atol=0.02,
+    )
+    np.testing.assert_allclose(statistics.histogram.cdf(np.array([-10, 10])), [0, 1])
+
+
+def test_process_streaming_statistics():
+    """Test result processing based on streaming statistics."""
+    samples = np.random.default_rng(0).normal(2.0, 3.0, size=(20000, 1))
+    statistics = StreamingStatistics.from_output_description({"result_interval": [-15, 20]})
+    for chunk in np.array_split(samples, 4):
+        statistics.update(chunk)
+
+    results = process_streaming_statistics(statistics, {"estimate_all": True})
+    assert results["num_samples"] == 20000
+    np.testing.assert_allclose(results["mean"], np.mean(samples, axis=0))
+    np.testing.assert_allclose(results["var"], np.var(samples, ddof=1, axis=0))
+    np.testing.assert_allclose(
+        results["cdf_estimate"]["mean"],
+        np.mean(samples.reshape(-1, 1) <= results["cdf_estimate"]["x"], axis=0),
+        atol=1e-3,
+    )
+    np.testing.assert_allclose(
+        results["icdf_estimate"]["mean"],
+        np.percentile(samples, results["icdf_estimate"]["x"]),
+        atol=0.1,
+    )
+    assert results["pdf_estimate"]["mean"].shape == (100,)
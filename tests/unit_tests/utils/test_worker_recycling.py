@@ -0,0 +1,85 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (c) 2024, QUEENS contributors.
+#
+# This file is part of QUEENS.
+#
+# QUEENS is free software: you can redistribute it and/or modify it under the terms of the GNU
+# Lesser General Public License as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version. QUEENS is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more details. You
+# should have received a copy of the GNU Lesser General Public License along with QUEENS. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+"""Unit tests for the worker recycling policy."""
+
+import os
+
+import psutil
+import pytest
+
+from queens.utils import run_subprocess, worker_recycling
+from queens.utils.run_subprocess import kill_orphaned_subprocesses, run_subprocess_with_logging
+from queens.utils.worker_recycling import WorkerRecyclingPolicy
+
+
+@pytest.fixture(name="fresh_worker", autouse=True)
+def fixture_fresh_worker(monkeypatch):
+    """Reset the state of the worker process."""
+    monkeypatch.setattr(worker_recycling, "_WORKER_STATE", {"num_tasks": 0})
+
+
+@pytest.mark.parametrize(
+    "restart_workers,expected_max_tasks",
+    [(False, None), (True, 1), ({"max_tasks_per_worker": 3}, 3)],
+)
+def test_from_restart_workers_option(restart_workers, expected_max_tasks):
+    """Test the creation of the policy from the scheduler option."""
+    policy = WorkerRecyclingPolicy.from_restart_workers_option(restart_workers)
+    if expected_max_tasks is None:
+        assert policy is None
+    else:
+        assert policy.max_tasks_per_worker == expected_max_tasks
+
+
+def test_recycling_after_max_tasks():
+    """Test that the worker is recycled after the maximum number of tasks."""
+    run_task = WorkerRecyclingPolicy(max_tasks_per_worker=2).wrap(lambda x: 2 * x)
+    assert run_task(1) == (2, False)
+    assert run_task(2) == (4, True)
+
+
+def test_recycling_above_memory_threshold():
+    """Test that the worker is recycled if it uses too much memory."""
+    assert WorkerRecyclingPolicy(max_memory_in_mb=0).worker_needs_recycling()
+    assert not WorkerRecyclingPolicy(max_memory_in_mb=1e9).worker_needs_recycling()
+
+
+def test_kill_orphaned_subprocesses(tmp_path):
+    """Test that processes outliving the subprocess shell are killed."""
+    pid_file = tmp_path / "pid"
+    run_subprocess_with_logging(
+        f"sleep 60 > /dev/null 2>&1 & echo $! > {pid_file}",
+        terminate_expression=None,
+        logger_name="test_kill_orphaned_subprocesses",
+        log_file=tmp_path / "log",
+        error_file=tmp_path / "err",
+    )
+    orphan_pid = int(pid_file.read_text())
+    assert psutil.pid_exists(orphan_pid)
+
+    assert kill_orphaned_subprocesses() == [orphan_pid]
+    assert not psutil.pid_exists(orphan_pid) or (
+        psutil.Process(orphan_pid).status() == psutil.STATUS_ZOMBIE
+    )
+
+
+def test_kill_orphaned_subprocesses_of_current_user_only(mocker):
+    """Test that the processes of other users are not inspected."""
+    mocker.patch.object(run_subprocess, "_FINISHED_SUBPROCESSES", [("marker", 1)])
+    foreign_process = mocker.Mock(info={"uids": mocker.Mock(real=os.getuid() + 1)})
+    mocker.patch.object(run_subprocess.psutil, "process_iter", return_value=[foreign_process])
+
+    assert kill_orphaned_subprocesses() == []
+    foreign_process.environ.assert_not_called()